@@ -6,4 +6,5 @@ urlpatterns = [
     path('assign-mentor/', admin_views.assign_mentor_to_student, name='admin_assign_mentor'),
     path('bulk-assign-mentor/', admin_views.bulk_assign_mentor, name='admin_bulk_assign'),
     path('auto-assign-mentors/', admin_views.auto_assign_mentors, name='admin_auto_assign'),
+    path('query-report/', admin_views.query_report, name='admin_query_report'),
 ]
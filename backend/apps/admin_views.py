@@ -185,3 +185,36 @@ def auto_assign_mentors(request):
         'mentors_count': len(mentors),
         'students_per_mentor': count // len(mentors)
     })
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def query_report(request):
+    """
+    Per-endpoint query profile collected by QueryProfilingMiddleware.
+
+    GET: report sorted by ?sort= (queries_avg, queries_max, sql_ms_avg,
+         python_ms_avg, budget_violations)
+    DELETE: reset the report
+    """
+    if not is_admin(request.user):
+        return Response(
+            {"error": "You don't have permission to access this resource"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    from django.conf import settings
+    from apps.query_profiler import report
+    
+    if request.method == 'DELETE':
+        report.reset()
+        return Response({'message': 'Query report reset'})
+    
+    sort_by = request.query_params.get('sort', 'queries_avg')
+    endpoints = report.snapshot(sort_by=sort_by)
+    
+    return Response({
+        'enabled': settings.LOG_QUERY_TIMES or settings.QUERY_BUDGET_ENFORCE,
+        'endpoints': endpoints,
+        'total_endpoints': len(endpoints),
+    })
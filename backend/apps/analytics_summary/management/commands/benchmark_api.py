@@ -0,0 +1,255 @@
+"""
+Management Command: benchmark_api
+
+Repeatable load benchmark for the hot API endpoints.
+
+Seeds a synthetic cohort into a throwaway test database, drives the hot
+endpoints through Django's test client with real JWT authentication and
+records p50/p95 latency and query counts into a JSON baseline.
+
+Usage:
+    python manage.py benchmark_api
+    python manage.py benchmark_api --students 2000 --mentors 60 --floors 4
+    python manage.py benchmark_api --output benchmarks/baseline.json
+    python manage.py benchmark_api --compare benchmarks/baseline.json  # CI gate
+    python manage.py benchmark_api --login-burst 100 --login-concurrency 20
+
+This command:
+- Never touches the configured database (uses a temporary test database)
+- Fails with a non-zero exit when --compare finds a regression:
+  more queries than the baseline, or p95 latency beyond --tolerance
+"""
+
+import contextlib
+import io
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+
+# (name, role, path) - role picks which seeded user makes the request
+HOT_ENDPOINTS = [
+    ('dashboard_stats', 'student', '/api/dashboard/stats/'),
+    ('unread_count', 'student', '/api/profiles/notifications/unread_count/'),
+    ('student_overview', 'student', '/api/gamification/dashboard/student_overview/'),
+    ('mentor_submissions', 'mentor', '/api/mentor/pillar/all/submissions/'),
+    ('mentor_unread_counts', 'mentor', '/api/mentor/messages/unread-counts/'),
+    ('full_leaderboard', 'mentor', '/api/gamification/leaderboard/full_leaderboard/'),
+    ('admin_stats', 'admin', '/api/profiles/admin/stats/'),
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark hot API endpoints against a seeded synthetic cohort'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=200, help='Number of students to seed')
+        parser.add_argument('--mentors', type=int, default=10, help='Number of mentors to seed')
+        parser.add_argument('--floors', type=int, default=2, help='Number of floors to seed')
+        parser.add_argument('--submissions-per-pillar', type=int, default=2,
+                            help='Submissions per student per pillar')
+        parser.add_argument('--iterations', type=int, default=20, help='Requests per endpoint')
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Only run these endpoints (repeatable)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the cohort')
+        parser.add_argument('--output', type=str, help='Write results to this JSON file')
+        parser.add_argument('--compare', type=str, help='Compare results with a baseline JSON file')
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help='Allowed p95 slowdown vs baseline (0.5 = +50%%)')
+        parser.add_argument('--login-burst', type=int, default=0,
+                            help='Also fire this many concurrent logins at /api/auth/token/')
+        parser.add_argument('--login-concurrency', type=int, default=10,
+                            help='Worker threads for the login burst')
+
+    def handle(self, *args, **options):
+        from apps.analytics_summary.synthetic_cohort import SyntheticCohortSeeder
+        from apps.query_profiler import record_queries
+
+        endpoints = [e for e in HOT_ENDPOINTS if not options['endpoints'] or e[0] in options['endpoints']]
+        if not endpoints:
+            raise CommandError('No matching endpoints')
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seed_start = time.perf_counter()
+            cohort = SyntheticCohortSeeder(
+                students=options['students'],
+                mentors=options['mentors'],
+                floors=options['floors'],
+                submissions_per_pillar=options['submissions_per_pillar'],
+                seed=options['seed'],
+            ).seed()
+            self.stdout.write(
+                f"Seeded {len(cohort['students'])} students, {len(cohort['mentors'])} mentors "
+                f"in {time.perf_counter() - seed_start:.1f}s"
+            )
+
+            results = {}
+            for name, role, path in endpoints:
+                results[name] = self.run_endpoint(path, self.users_for_role(cohort, role),
+                                                  options['iterations'], record_queries)
+                self.stdout.write(
+                    f"  {name:<22} p50 {results[name]['p50_ms']:>8.1f}ms  "
+                    f"p95 {results[name]['p95_ms']:>8.1f}ms  queries {results[name]['queries_max']:>5}"
+                )
+
+            if options['login_burst']:
+                results['login_burst'] = self.run_login_burst(
+                    cohort['students'], options['login_burst'], options['login_concurrency'], record_queries
+                )
+                self.stdout.write(
+                    f"  {'login_burst':<22} p50 {results['login_burst']['p50_ms']:>8.1f}ms  "
+                    f"p95 {results['login_burst']['p95_ms']:>8.1f}ms  queries {results['login_burst']['queries_max']:>5}  "
+                    f"({results['login_burst']['logins_per_second']} logins/s)"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'cohort': {
+                'students': options['students'],
+                'mentors': options['mentors'],
+                'floors': options['floors'],
+                'submissions_per_pillar': options['submissions_per_pillar'],
+                'seed': options['seed'],
+            },
+            'iterations': options['iterations'],
+            'endpoints': results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['output']}"))
+
+        if options['compare']:
+            self.compare(report, options['compare'], options['tolerance'])
+
+    def users_for_role(self, cohort, role):
+        if role == 'student':
+            return cohort['students']
+        if role == 'mentor':
+            return cohort['mentors']
+        return [cohort['admin']]
+
+    def run_endpoint(self, path, users, iterations, record_queries):
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        client = Client()
+        tokens = {}
+        latencies, query_counts, status_codes = [], [], {}
+
+        for i in range(iterations):
+            # Rotate users so per-user caches don't flatter the numbers
+            user = users[i % len(users)]
+            if user.id not in tokens:
+                tokens[user.id] = str(RefreshToken.for_user(user).access_token)
+
+            with record_queries() as recorder, contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                response = client.get(path, HTTP_AUTHORIZATION=f'Bearer {tokens[user.id]}')
+                latencies.append((time.perf_counter() - start) * 1000)
+            query_counts.append(recorder.count)
+            status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+
+        return {
+            'path': path,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'mean_ms': round(statistics.mean(latencies), 2),
+            'queries_p50': percentile(query_counts, 50),
+            'queries_max': max(query_counts),
+            'status_codes': status_codes,
+        }
+
+    def run_login_burst(self, students, burst, concurrency, record_queries):
+        """Fire `burst` email logins from `concurrency` threads, as at class start"""
+        from apps.analytics_summary.synthetic_cohort import SyntheticCohortSeeder
+
+        def login(i):
+            student = students[i % len(students)]
+            # Alternate casing to exercise the case-insensitive email path
+            email = student.email.upper() if i % 2 else student.email
+            try:
+                with record_queries() as recorder:
+                    start = time.perf_counter()
+                    response = Client().post(
+                        '/api/auth/token/',
+                        {'username': email, 'password': SyntheticCohortSeeder.PASSWORD},
+                        content_type='application/json',
+                    )
+                    elapsed = (time.perf_counter() - start) * 1000
+                return elapsed, recorder.count, response.status_code
+            finally:
+                connections.close_all()
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(login, range(burst)))
+        wall = time.perf_counter() - wall_start
+
+        latencies = [elapsed for elapsed, _, _ in outcomes]
+        status_codes = {}
+        for _, _, code in outcomes:
+            status_codes[str(code)] = status_codes.get(str(code), 0) + 1
+
+        return {
+            'path': '/api/auth/token/',
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'mean_ms': round(statistics.mean(latencies), 2),
+            'queries_p50': percentile([count for _, count, _ in outcomes], 50),
+            'queries_max': max(count for _, count, _ in outcomes),
+            'concurrency': concurrency,
+            'logins_per_second': round(burst / wall, 1),
+            'status_codes': status_codes,
+        }
+
+    def compare(self, report, baseline_path, tolerance):
+        try:
+            with open(baseline_path) as fh:
+                baseline = json.load(fh)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read baseline {baseline_path}: {e}')
+
+        if baseline.get('cohort') != report['cohort']:
+            self.stdout.write(self.style.WARNING('Baseline was recorded with a different cohort size'))
+
+        regressions = []
+        for name, current in report['endpoints'].items():
+            previous = baseline.get('endpoints', {}).get(name)
+            if not previous:
+                continue
+            if current['queries_max'] > previous['queries_max']:
+                regressions.append(
+                    f"{name}: queries {previous['queries_max']} -> {current['queries_max']}"
+                )
+            if current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms"
+                )
+
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(f'  ✗ {line}'))
+            raise CommandError(f'{len(regressions)} regression(s) against {baseline_path}')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ No regressions against {baseline_path}'))
@@ -0,0 +1,118 @@
+"""
+Management Command: profile_startup
+
+Import-time report for a worker boot.
+
+Starts a fresh interpreter with `python -X importtime`, boots Django the
+way a gunicorn worker does (config.wsgi or config.asgi, then the URLconf,
+which imports every view module) and reports where the time went:
+the slowest modules (cumulative), the packages that cost the most (own
+time of all their modules) and this project's own modules.
+
+With GUNICORN_PRELOAD on, this cost is paid once in the gunicorn master
+instead of in every worker; it is still paid on each deploy and scale-out.
+Heavy optional dependencies (bs4/lxml, openpyxl) belong inside the
+functions that use them and should not show up here.
+
+Usage:
+    python manage.py profile_startup
+    python manage.py profile_startup --server asgi --top 30
+    python manage.py profile_startup --output startup.json
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BOOT = """
+import config.{server}
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+PROJECT_PACKAGES = ('apps', 'config')
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us)] from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(own), int(cumulative)))
+    return rows
+
+
+def summarize(rows, top):
+    packages = defaultdict(int)
+    for module, own, _ in rows:
+        packages[module.split('.')[0]] += own
+    by_cumulative = sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def ms(us):
+        return round(us / 1000, 1)
+
+    return {
+        'modules': len(rows),
+        'import_ms': ms(sum(own for _, own, _ in rows)),
+        'slowest_modules': [
+            {'module': module, 'cumulative_ms': ms(cumulative), 'self_ms': ms(own)}
+            for module, own, cumulative in by_cumulative[:top]
+        ],
+        'packages': [
+            {'package': package, 'self_ms': ms(own)}
+            for package, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        'project_modules': [
+            {'module': module, 'cumulative_ms': ms(cumulative), 'self_ms': ms(own)}
+            for module, own, cumulative in by_cumulative
+            if module.split('.')[0] in PROJECT_PACKAGES
+        ][:top],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Report import time of a worker boot (python -X importtime)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi', help='Entry point to boot')
+        parser.add_argument('--top', type=int, default=20, help='Rows per section')
+        parser.add_argument('--output', type=str, help='Write the report to this JSON file')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT.format(server=options['server'])],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        boot_ms = round((time.perf_counter() - started) * 1000, 1)
+        rows = parse_importtime(result.stderr)
+        if result.returncode != 0 or not rows:
+            raise CommandError(f'Boot failed:\n{result.stderr[-2000:]}')
+
+        report = {'server': options['server'], 'boot_ms': boot_ms, **summarize(rows, options['top'])}
+
+        self.stdout.write(
+            f"Booting config.{report['server']}: {report['boot_ms']} ms wall, "
+            f"{report['import_ms']} ms importing {report['modules']} modules"
+        )
+        for title, key, name, column in (
+            ('Slowest modules (cumulative)', 'slowest_modules', 'module', 'cumulative_ms'),
+            ('Packages (own time)', 'packages', 'package', 'self_ms'),
+            ('Project modules (cumulative)', 'project_modules', 'module', 'cumulative_ms'),
+        ):
+            self.stdout.write(f'\n{title}:')
+            for row in report[key]:
+                self.stdout.write(f'  {row[column]:>8.1f} ms  {row[name]}')
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
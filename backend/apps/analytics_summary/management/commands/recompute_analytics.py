@@ -12,6 +12,8 @@ Usage:
 
 This command:
 - Uses efficient ORM aggregations (no N+1 queries)
+- Reads from a read replica when one is configured (DATABASE_REPLICA_URLS);
+  only the summary writes go to the primary
 - Is idempotent (can be run multiple times safely)
 - Logs progress and timing
 - Compares cached vs live data when --validate flag is used
@@ -31,6 +33,7 @@ from apps.analytics_summary.models import (
     GlobalAnalyticsSummary,
     AnalyticsComparisonLog
 )
+from apps.db_router import read_replica
 from apps.profiles.models import UserProfile
 
 User = get_user_model()
@@ -80,18 +83,20 @@ class Command(BaseCommand):
             # Determine what to recompute
             recompute_all = not (options['floors_only'] or options['mentors_only'] or options['global_only'])
             
-            if recompute_all or options['floors_only']:
-                self.recompute_floor_analytics()
-            
-            if recompute_all or options['mentors_only']:
-                self.recompute_mentor_analytics()
-            
-            if recompute_all or options['global_only']:
-                self.recompute_global_analytics()
-            
-            # Validation
-            if options['validate']:
-                self.validate_analytics()
+            # The summaries written here are never read back, so reads stay on the replica
+            with read_replica(sticky=False):
+                if recompute_all or options['floors_only']:
+                    self.recompute_floor_analytics()
+                
+                if recompute_all or options['mentors_only']:
+                    self.recompute_mentor_analytics()
+                
+                if recompute_all or options['global_only']:
+                    self.recompute_global_analytics()
+                
+                # Validation
+                if options['validate']:
+                    self.validate_analytics()
             
             elapsed = time.time() - start_time
             self.stdout.write('')
@@ -127,34 +132,39 @@ class Command(BaseCommand):
             
             start_time = time.time()
             
+            # Read outside the transaction: reads inside it would go to the primary
+            # Get all students on this floor
+            students = UserProfile.objects.filter(
+                campus=campus,
+                floor=floor,
+                role='STUDENT'
+            ).select_related('user')
+            
+            # Get all mentors on this floor
+            mentors = UserProfile.objects.filter(
+                campus=campus,
+                floor=floor,
+                role='MENTOR'
+            ).select_related('user')
+            
+            total_students = students.count()
+            assigned_students = students.filter(assigned_mentor__isnull=False).count()
+            total_mentors = mentors.count()
+            
             with transaction.atomic():
                 summary, created = FloorAnalyticsSummary.objects.get_or_create(
                     campus=campus,
                     floor=floor
                 )
                 
-                # Get all students on this floor
-                students = UserProfile.objects.filter(
-                    campus=campus,
-                    floor=floor,
-                    role='STUDENT'
-                ).select_related('user')
-                
-                # Get all mentors on this floor
-                mentors = UserProfile.objects.filter(
-                    campus=campus,
-                    floor=floor,
-                    role='MENTOR'
-                ).select_related('user')
-                
                 # Student metrics
-                summary.total_students = students.count()
-                summary.assigned_students = students.filter(assigned_mentor__isnull=False).count()
+                summary.total_students = total_students
+                summary.assigned_students = assigned_students
                 summary.unassigned_students = summary.total_students - summary.assigned_students
                 summary.active_students = summary.total_students  # TODO: Define "active"
                 
                 # Mentor metrics
-                summary.total_mentors = mentors.count()
+                summary.total_mentors = total_mentors
                 summary.active_mentors = summary.total_mentors  # TODO: Define "active"
                 
                 # Submission metrics (aggregate across all pillars)
@@ -208,17 +218,18 @@ class Command(BaseCommand):
         self.stdout.write(f'  Processing {total_mentors} mentors...')
         
         for idx, mentor in enumerate(mentors, 1):
+            # Assigned students (read outside the transaction, from the replica if any)
+            assigned_students_count = UserProfile.objects.filter(
+                assigned_mentor=mentor,
+                role='STUDENT'
+            ).count()
+            
             with transaction.atomic():
                 summary, created = MentorAnalyticsSummary.objects.get_or_create(
                     mentor=mentor
                 )
                 
-                # Assigned students
-                assigned_students = UserProfile.objects.filter(
-                    assigned_mentor=mentor,
-                    role='STUDENT'
-                )
-                summary.assigned_students_count = assigned_students.count()
+                summary.assigned_students_count = assigned_students_count
                 
                 # Review metrics (placeholder - will be accurate with actual submission data)
                 summary.pending_reviews_count = 0
@@ -255,14 +266,20 @@ class Command(BaseCommand):
         
         today = timezone.now().date()
         
+        # Read outside the transaction, from the replica if any
+        total_students = UserProfile.objects.filter(role='STUDENT').count()
+        total_mentors = UserProfile.objects.filter(role='MENTOR').count()
+        campuses_active = UserProfile.objects.values('campus').distinct().count()
+        floors_active = UserProfile.objects.values('campus', 'floor').distinct().count()
+        
         with transaction.atomic():
             summary, created = GlobalAnalyticsSummary.objects.get_or_create(
                 date=today
             )
             
             # Global counts
-            summary.total_students = UserProfile.objects.filter(role='STUDENT').count()
-            summary.total_mentors = UserProfile.objects.filter(role='MENTOR').count()
+            summary.total_students = total_students
+            summary.total_mentors = total_mentors
             
             # TODO: Aggregate actual submission data when available
             summary.total_submissions = 0
@@ -272,8 +289,8 @@ class Command(BaseCommand):
             
             # System health
             summary.avg_system_completion = 0.0
-            summary.campuses_active = UserProfile.objects.values('campus').distinct().count()
-            summary.floors_active = UserProfile.objects.values('campus', 'floor').distinct().count()
+            summary.campuses_active = campuses_active
+            summary.floors_active = floors_active
             
             # Performance
             summary.avg_review_time_hours = 0.0
@@ -0,0 +1,227 @@
+"""
+Synthetic Cohort Seeder
+
+Seeds a realistic, configurable cohort (students, mentors, floor wings,
+an admin, an active season and K submissions per pillar) using bulk inserts.
+Used by the `benchmark_api` command to measure hot endpoints at scale.
+
+All seeded usernames start with `bench_` so they never collide with
+real accounts. Intended for throwaway/local databases only.
+"""
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from apps.profiles.models import UserProfile
+
+
+class SyntheticCohortSeeder:
+    """Bulk-seed a synthetic cohort for load benchmarks"""
+
+    USERNAME_PREFIX = 'bench_'
+    PASSWORD = 'bench-pass-123'
+    BATCH_SIZE = 500
+
+    SUBMISSION_STATUSES = ['submitted', 'under_review', 'approved', 'rejected']
+    REVIEW_STATUSES = ['pending', 'approved', 'rejected']
+
+    def __init__(self, students=200, mentors=10, floors=2, submissions_per_pillar=2,
+                 campus='TECH', seed=42):
+        self.students = students
+        self.mentors = max(mentors, 1)
+        self.floors = max(min(floors, 4 if campus == 'TECH' else 3), 1)
+        self.submissions_per_pillar = submissions_per_pillar
+        self.campus = campus
+        self.random = random.Random(seed)
+        self.now = timezone.now()
+
+    @transaction.atomic
+    def seed(self):
+        """Create the cohort and return the users needed to drive endpoints"""
+        # Season first, so the episode signals don't fan out per student
+        season = self._create_season()
+
+        password = make_password(self.PASSWORD)
+        admin = self._create_users('admin', 1, password, role='ADMIN', is_staff=True)[0]
+        floor_wings = self._create_users('floorwing', self.floors, password, role='FLOOR_WING')
+        mentors = self._create_users('mentor', self.mentors, password, role='MENTOR')
+        students = self._create_users('student', self.students, password, role='STUDENT', mentors=mentors)
+
+        self._create_gamification_records(season, [admin] + floor_wings + mentors + students, students)
+        self._create_submissions(students)
+        self._create_notifications(students, mentors)
+
+        return {
+            'season': season,
+            'admin': admin,
+            'floor_wings': floor_wings,
+            'mentors': mentors,
+            'students': students,
+        }
+
+    def _create_season(self):
+        from apps.gamification.models import Season
+
+        Season.objects.filter(is_active=True).update(is_active=False)
+        next_number = (Season.objects.order_by('-season_number').values_list('season_number', flat=True).first() or 0) + 1
+        today = self.now.date()
+        return Season.objects.create(
+            name=f'Benchmark Season {next_number}',
+            season_number=next_number,
+            start_date=today - timedelta(days=7),
+            end_date=today + timedelta(days=23),
+            is_active=True,
+        )
+
+    def _create_users(self, kind, count, password, role, is_staff=False, mentors=None):
+        usernames = [f'{self.USERNAME_PREFIX}{kind}_{i:05d}' for i in range(count)]
+        User.objects.bulk_create([
+            User(
+                username=username,
+                email=f'{username}@bench.local',
+                first_name=kind.title(),
+                last_name=f'{i:05d}',
+                password=password,
+                is_staff=is_staff,
+            )
+            for i, username in enumerate(usernames)
+        ], batch_size=self.BATCH_SIZE)
+        users = list(User.objects.filter(username__in=usernames).order_by('username'))
+
+        profiles = []
+        for i, user in enumerate(users):
+            floor = (i % self.floors) + 1
+            assigned_mentor = None
+            if mentors:
+                # Mentors share the student's floor where possible
+                floor_mentors = [m for j, m in enumerate(mentors) if (j % self.floors) + 1 == floor] or mentors
+                assigned_mentor = floor_mentors[i % len(floor_mentors)]
+            profiles.append(UserProfile(
+                user=user,
+                role=role,
+                campus=self.campus if role != 'ADMIN' else None,
+                floor=floor if role != 'ADMIN' else None,
+                assigned_mentor=assigned_mentor,
+                leetcode_id=f'{user.username}_lc' if role == 'STUDENT' else None,
+            ))
+        UserProfile.objects.bulk_create(profiles, batch_size=self.BATCH_SIZE)
+        return users
+
+    def _create_gamification_records(self, season, all_users, students):
+        from apps.gamification.models import (
+            Episode, EpisodeProgress, LegacyScore, SeasonScore, VaultWallet
+        )
+        from apps.gamification.progress_notifications import SeasonCompletionTracker
+
+        LegacyScore.objects.bulk_create(
+            [LegacyScore(student=user) for user in all_users], batch_size=self.BATCH_SIZE
+        )
+        VaultWallet.objects.bulk_create(
+            [VaultWallet(student=user) for user in all_users], batch_size=self.BATCH_SIZE
+        )
+
+        episodes = list(Episode.objects.filter(season=season).order_by('episode_number'))
+        progress = []
+        for student in students:
+            reached = self.random.randint(1, len(episodes)) if episodes else 0
+            for episode in episodes:
+                if episode.episode_number < reached:
+                    status = 'completed'
+                elif episode.episode_number == reached:
+                    status = 'in_progress'
+                else:
+                    status = 'locked'
+                progress.append(EpisodeProgress(
+                    student=student,
+                    episode=episode,
+                    status=status,
+                    clt_completed=status == 'completed',
+                    scd_streak_active=status != 'locked',
+                ))
+        EpisodeProgress.objects.bulk_create(progress, batch_size=self.BATCH_SIZE)
+        SeasonCompletionTracker.rebuild_season(season)
+
+        scores = []
+        for student in students:
+            score = SeasonScore(
+                student=student,
+                season=season,
+                clt_score=self.random.choice([0, 100]),
+                iipc_score=self.random.choice([0, 100, 200]),
+                scd_score=self.random.choice([0, 20, 40, 60, 80, 100]),
+                cfc_score=self.random.choice([0, 200, 400, 600, 800]),
+            )
+            score.calculate_total()
+            scores.append(score)
+        SeasonScore.objects.bulk_create(scores, batch_size=self.BATCH_SIZE)
+
+    def _create_submissions(self, students):
+        from apps.clt.models import CLTSubmission
+        from apps.sri.models import SRISubmission
+        from apps.cfc.models import HackathonSubmission
+        from apps.iipc.models import LinkedInPostVerification
+        from apps.scd.models import LeetCodeProfile
+
+        today = self.now.date()
+        clt, sri, cfc, iipc, scd = [], [], [], [], []
+
+        for student in students:
+            for k in range(self.submissions_per_pillar):
+                status = self.random.choice(self.SUBMISSION_STATUSES)
+                review_status = self.random.choice(self.REVIEW_STATUSES)
+                clt.append(CLTSubmission(
+                    user=student, title=f'Course {k}', description='Synthetic course',
+                    platform='Coursera', completion_date=today, status=status,
+                    submitted_at=self.now,
+                ))
+                sri.append(SRISubmission(
+                    user=student, activity_title=f'Activity {k}', description='Synthetic activity',
+                    photo_drive_link='https://drive.google.com/bench', status=status,
+                    submitted_at=self.now,
+                ))
+                cfc.append(HackathonSubmission(
+                    user=student, hackathon_name=f'Hackathon {k}', mode='online',
+                    registration_date=today, participation_date=today, status=status,
+                    submitted_at=self.now,
+                ))
+                iipc.append(LinkedInPostVerification(
+                    user=student, post_url=f'https://www.linkedin.com/posts/{student.username}-{k}',
+                    post_date=today, character_count=1200, hashtag_count=3, status=review_status,
+                    submitted_at=self.now,
+                ))
+                scd.append(LeetCodeProfile(
+                    user=student, leetcode_username=f'{student.username}_lc{k}',
+                    total_solved=self.random.randint(0, 400), status=review_status,
+                    submitted_at=self.now,
+                ))
+
+        for model, rows in (
+            (CLTSubmission, clt), (SRISubmission, sri), (HackathonSubmission, cfc),
+            (LinkedInPostVerification, iipc), (LeetCodeProfile, scd),
+        ):
+            model.objects.bulk_create(rows, batch_size=self.BATCH_SIZE)
+
+    def _create_notifications(self, students, mentors):
+        from apps.dashboard.models import Notification
+
+        notifications = []
+        for student in students:
+            for k in range(self.submissions_per_pillar):
+                notifications.append(Notification(
+                    recipient=student,
+                    notification_type='submission_approved',
+                    title=f'Submission {k} reviewed',
+                    message='Your submission was reviewed',
+                    is_read=self.random.random() < 0.5,
+                ))
+        for mentor in mentors:
+            notifications.append(Notification(
+                recipient=mentor, notification_type='info',
+                title='New submissions', message='Students submitted work for review',
+            ))
+        Notification.objects.bulk_create(notifications, batch_size=self.BATCH_SIZE)
@@ -0,0 +1,116 @@
+"""
+Async API Views
+Endpoints that mostly wait on third-party APIs, written as async views
+
+DRF's APIView is synchronous, so a view that waits 10-45 seconds on
+LeetCode or GitHub holds a worker thread for that long. async_api_view
+turns an `async def` into a Django async view that behaves like a DRF
+endpoint:
+
+- Only the listed methods are allowed (405 otherwise)
+- Authentication runs REST_FRAMEWORK's DEFAULT_AUTHENTICATION_CLASSES and
+  permission_classes are checked, with DRF's 401/403 bodies
+- request.data holds the parsed JSON (or form) body
+- Exempt from CSRF, like every APIView
+
+Under ASGI (uvicorn workers, see config/asgi.py) the upstream wait no
+longer occupies a thread. Database work inside the view goes through
+sync_to_async; outbound calls use apps.http_client's aget()/apost()/astream().
+
+Usage:
+    @async_api_view(['POST'])
+    async def validate_repo(request):
+        result = await GitHubRepoService.avalidate(request.data.get('github_url'))
+        return json_response(result)
+"""
+import functools
+import io
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
+
+from apps.http_client import close_async_client
+from apps.renderers import ORJSONParser, dumps
+
+
+def json_response(data, status=200):
+    """JSON response rendered like ORJSONRenderer"""
+    return HttpResponse(dumps(data), status=status, content_type='application/json')
+
+
+def _authenticators():
+    return [authentication() for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+
+def _prepare(request, permission_classes):
+    """Authenticate, check permissions and parse the body (runs in a thread: it may query)"""
+    request.user, request.auth = AnonymousUser(), None
+    for authenticator in _authenticators():
+        result = authenticator.authenticate(request)
+        if result is not None:
+            request.user, request.auth = result
+            break
+
+    for permission in (permission_class() for permission_class in permission_classes):
+        if not permission.has_permission(request, None):
+            if request.auth is None:
+                raise exceptions.NotAuthenticated()
+            raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    if request.content_type == 'application/json':
+        request.data = ORJSONParser().parse(io.BytesIO(request.body)) if request.body else {}
+    else:
+        request.data = request.POST
+
+
+def _error_response(request, exc):
+    """The response DRF's exception handler gives for an APIException"""
+    if isinstance(exc.detail, (list, dict)):
+        data = exc.detail
+    else:
+        data = {'detail': exc.detail}
+    response = json_response(data, status=exc.status_code)
+
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        authenticators = _authenticators()
+        header = authenticators[0].authenticate_header(request) if authenticators else None
+        if header:
+            response['WWW-Authenticate'] = header
+        else:
+            response.status_code = 403
+    if getattr(exc, 'wait', None):
+        response['Retry-After'] = str(int(exc.wait))
+    return response
+
+
+def async_api_view(methods, permission_classes=(IsAuthenticated,)):
+    """Decorate an `async def view(request, ...)` as an authenticated JSON API view"""
+    methods = [method.upper() for method in methods]
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                response = _error_response(request, exceptions.MethodNotAllowed(request.method))
+                response['Allow'] = ', '.join(methods)
+                return response
+            try:
+                await sync_to_async(_prepare)(request, permission_classes)
+                return await view(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return _error_response(request, exc)
+            finally:
+                # Under WSGI this loop ends with the request; don't leave its connections behind
+                if not isinstance(request, ASGIRequest):
+                    await close_async_client()
+
+        # django.views.decorators.csrf.csrf_exempt only handles async views from Django 5.0
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
@@ -1,30 +1,162 @@
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db.models import Q
+from django.db.models.functions import Upper
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.db_router import identify_user
 
 
 class EmailOrUsernameBackend(ModelBackend):
     """
     Custom authentication backend that allows users to log in with either
     their email address or username.
+    
+    The lookup is routed by input shape so it always hits an index:
+    - No "@": exact username (unique index)
+    - Has "@": case-insensitive email (auth_user_email_upper_idx) or exact
+      username, since student accounts use their email as username
+    Duplicate emails resolve to the oldest account in the same query.
     """
     
     def authenticate(self, request, username=None, password=None, **kwargs):
-        try:
-            # Try to find user by email or username
-            user = User.objects.get(Q(username=username) | Q(email=username))
-            
-            # Check if password is correct
-            if user.check_password(password):
-                return user
-        except User.DoesNotExist:
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if not username or password is None:
+            return None
+        
+        user = self.get_user_by_login(username)
+        if user is None:
             # Run the default password hasher once to reduce the timing
             # difference between an existing and a nonexistent user
             User().set_password(password)
             return None
-        except User.MultipleObjectsReturned:
-            # In case there are multiple users with the same email
-            user = User.objects.filter(Q(username=username) | Q(email=username)).order_by('id').first()
-            if user and user.check_password(password):
-                return user
-            return None
+        
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+    
+    @staticmethod
+    def get_user_by_login(login):
+        """Resolve a username or email to a user (with profile) in one query"""
+        users = User.objects.select_related('profile')
+        if '@' in login:
+            users = users.annotate(email_upper=Upper('email')).filter(
+                Q(email_upper=login.upper()) | Q(username=login)
+            )
+        else:
+            users = users.filter(username=login)
+        return users.order_by('id').first()
+
+
+# ============================================================================
+# CACHED IDENTITY FOR JWT REQUESTS
+# ============================================================================
+# Every API call authenticates a JWT and then almost every view touches
+# request.user.profile (role checks, campus/floor scoping). The identity
+# cache stores both rows per user so a request costs zero auth queries on
+# a cache hit and one (user + profile join) on a miss.
+#
+# Keys are versioned per user: invalidate_identity() bumps the version, so
+# profile/role changes take effect on the next request on every worker.
+
+# Model.from_db() expects values in concrete-field order. The password hash
+# is deliberately never cached; it stays deferred on hydrated users.
+IDENTITY_USER_FIELDS = [f.attname for f in User._meta.concrete_fields if f.attname != 'password']
+
+
+def _identity_version_key(user_id):
+    return f'auth_identity_version_{user_id}'
+
+
+def _identity_key(user_id, version):
+    return f'auth_identity_{user_id}_v{version}'
+
+
+def invalidate_identity(user_id):
+    """Drop the cached identity for a user (call after profile/role changes)"""
+    try:
+        cache.incr(_identity_version_key(user_id))
+    except ValueError:
+        # No version yet - nothing cached under the current key either
+        cache.set(_identity_version_key(user_id), 1, None)
+
+
+def _profile_fields():
+    from apps.profiles.models import UserProfile
+    return [f.attname for f in UserProfile._meta.concrete_fields]
+
+
+def _serialize_identity(user):
+    profile = getattr(user, 'profile', None)
+    return {
+        'user': [getattr(user, name) for name in IDENTITY_USER_FIELDS],
+        'profile': [getattr(profile, name) for name in _profile_fields()] if profile else None,
+    }
+
+
+def _hydrate_identity(data, using):
+    from apps.profiles.models import UserProfile
+
+    user = User.from_db(using, IDENTITY_USER_FIELDS, data['user'])
+    if data['profile'] is not None:
+        user.profile = UserProfile.from_db(using, _profile_fields(), data['profile'])
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that hydrates request.user and request.user.profile
+    from a short-lived per-user identity cache.
+
+    Enabled with USE_AUTH_CACHE=True. Without a cache it still loads the
+    user and profile in a single joined query.
+    """
+    
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            # Read replica routing pins a user to the primary after they write
+            identify_user(result[0].pk)
+        return result
+    
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation needs the password hash, which is never cached
+            return super().get_user(validated_token)
+        
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        
+        use_cache = settings.USE_AUTH_CACHE
+        cache_key = None
+        if use_cache:
+            version = cache.get_or_set(_identity_version_key(user_id), 1, None)
+            cache_key = _identity_key(user_id, version)
+            data = cache.get(cache_key)
+            if data is not None:
+                return self._check_active(_hydrate_identity(data, User.objects.db))
+        
+        try:
+            user = User.objects.select_related('profile').only(
+                *IDENTITY_USER_FIELDS, *[f'profile__{name}' for name in _profile_fields()]
+            ).get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        
+        if use_cache:
+            cache.set(cache_key, _serialize_identity(user), settings.AUTH_CACHE_TTL)
+        
+        return self._check_active(user)
+    
+    def _check_active(self, user):
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
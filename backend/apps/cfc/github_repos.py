@@ -0,0 +1,281 @@
+"""
+GitHub Repository Metadata Service
+Validates submitted repository URLs for Hackathon and GenAI submissions
+
+Validation needs three GitHub API calls (repo, readme, commits). Unauthenticated
+clients get 60 requests per hour per IP, and the whole cohort shares one NAT
+IP, so:
+
+- The three calls run concurrently
+- Results are cached per owner/repo (apps.swr_cache). A fresh result
+  (younger than GITHUB_REPO_CACHE_TTL) is served as is; a stale one is
+  served immediately while a background thread revalidates it with
+  If-None-Match (a 304 reuses the cached part)
+- Only a repository seen for the first time waits on GitHub. When GitHub
+  is rate-limiting us or its circuit is open, the last known result keeps
+  being served and the refresh is retried later
+- GITHUB_TOKEN, when set, authenticates the calls (5000 requests per hour)
+
+Calls go through apps.http_client (pooled connections, retries, circuit
+breaker); avalidate() is the same lookup for async views.
+
+Caching is on with USE_GITHUB_REPO_CACHE; GITHUB_API_URL points the service
+at a stub server in tests.
+
+Usage:
+    from apps.cfc.github_repos import GitHubRepoService
+
+    result = GitHubRepoService.validate('https://github.com/owner/repo')
+    result = await GitHubRepoService.avalidate('https://github.com/owner/repo')
+"""
+import asyncio
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from apps import http_client
+from apps.swr_cache import SWRCache
+
+logger = logging.getLogger(__name__)
+
+GITHUB_URL_REGEX = r'(?:https?://)?(?:www\.)?github\.com/([^/]+)/([^/\.]+)'
+
+
+class RateLimited(Exception):
+    pass
+
+
+class GitHubRepoService:
+    """Fetch and cache the repository metadata shown on submission forms"""
+
+    TIMEOUT = 10
+
+    # part -> (path suffix, query params)
+    PARTS = {
+        'repo': ('', None),
+        'readme': ('/readme', None),
+        'commits': ('/commits', {'per_page': 1}),
+    }
+
+    INVALID_URL = {
+        'valid': False,
+        'error': 'Invalid GitHub URL format. Use: https://github.com/owner/repo'
+    }
+
+    @staticmethod
+    def parse_url(github_url):
+        """Extract owner and repo name from GitHub URL"""
+        # Match patterns like:
+        # https://github.com/owner/repo
+        # https://github.com/owner/repo.git
+        # github.com/owner/repo
+        match = re.search(GITHUB_URL_REGEX, github_url or '')
+        if match:
+            return match.group(1), match.group(2)
+        return None, None
+
+    @classmethod
+    def validate(cls, github_url):
+        """Validate and fetch GitHub repository information"""
+        owner, repo = cls.parse_url(github_url)
+
+        if not owner or not repo:
+            return dict(cls.INVALID_URL)
+
+        cache_key = cls._cache_key(owner, repo)
+        use_cache = getattr(settings, 'USE_GITHUB_REPO_CACHE', False)
+        entry = SWRCache.get(cache_key) if use_cache else None
+
+        if entry:
+            if not cls._is_fresh(entry):
+                SWRCache.refresh_in_background(cache_key, lambda: cls._refresh(owner, repo, entry))
+            return cls._result(owner, repo, entry)
+
+        try:
+            parts = cls._fetch(owner, repo, {})
+        except Exception as e:
+            return cls._failure(e)
+
+        result, entry = cls._outcome(owner, repo, parts)
+        if use_cache and entry:
+            SWRCache.store(cache_key, entry)
+        return result
+
+    @classmethod
+    async def avalidate(cls, github_url):
+        """validate() for async views"""
+        owner, repo = cls.parse_url(github_url)
+
+        if not owner or not repo:
+            return dict(cls.INVALID_URL)
+
+        cache_key = cls._cache_key(owner, repo)
+        use_cache = getattr(settings, 'USE_GITHUB_REPO_CACHE', False)
+        entry = await SWRCache.aget(cache_key) if use_cache else None
+
+        if entry:
+            if not cls._is_fresh(entry):
+                await SWRCache.arefresh_in_background(cache_key, lambda: cls._refresh(owner, repo, entry))
+            return cls._result(owner, repo, entry)
+
+        try:
+            parts = await cls._afetch(owner, repo, {})
+        except Exception as e:
+            return cls._failure(e)
+
+        result, entry = cls._outcome(owner, repo, parts)
+        if use_cache and entry:
+            await SWRCache.astore(cache_key, entry)
+        return result
+
+    @classmethod
+    def _refresh(cls, owner, repo, entry):
+        """Revalidate a stale entry (background thread); raises to keep it"""
+        result, fresh_entry = cls._outcome(owner, repo, cls._fetch(owner, repo, entry['parts']))
+        if fresh_entry is None:
+            # Deleted or made private: the next lookup fetches inline and reports it
+            logger.info('GitHub repo %s/%s is no longer available: %s', owner, repo, result['error'])
+            cache.delete(cls._cache_key(owner, repo))
+        return fresh_entry
+
+    @staticmethod
+    def _cache_key(owner, repo):
+        return f'github_repo_{owner.lower()}/{repo.lower()}'
+
+    @staticmethod
+    def _is_fresh(entry):
+        return SWRCache.is_fresh(entry, settings.GITHUB_REPO_CACHE_TTL)
+
+    @staticmethod
+    def _failure(error):
+        """Result for a fetch that raised"""
+        if isinstance(error, RateLimited):
+            return {
+                'valid': False,
+                'error': 'GitHub API rate limit exceeded. Please try again later.'
+            }
+        if isinstance(error, http_client.CircuitOpenError):
+            return {
+                'valid': False,
+                'error': 'GitHub is not responding right now. Please try again in a minute.'
+            }
+        if isinstance(error, (requests.exceptions.Timeout, httpx.TimeoutException)):
+            return {
+                'valid': False,
+                'error': 'Request timeout. Please try again.'
+            }
+        return {
+            'valid': False,
+            'error': f'Error validating repository: {str(error)}'
+        }
+
+    @classmethod
+    def _outcome(cls, owner, repo, parts):
+        """(result, cache entry or None) for fetched parts"""
+        status_code = parts['repo']['status']
+        if status_code == 404:
+            return {
+                'valid': False,
+                'error': 'Repository not found. Make sure the repository is public.'
+            }, None
+        elif status_code != 200:
+            return {
+                'valid': False,
+                'error': f'Unable to access repository. Status: {status_code}'
+            }, None
+
+        entry = SWRCache.entry(parts=parts)
+        return cls._result(owner, repo, entry), entry
+
+    @classmethod
+    def _fetch(cls, owner, repo, cached_parts):
+        """Fetch all parts concurrently, revalidating cached ones"""
+        with ThreadPoolExecutor(max_workers=len(cls.PARTS)) as pool:
+            futures = {
+                part: pool.submit(cls._fetch_part, owner, repo, part, cached_parts.get(part))
+                for part in cls.PARTS
+            }
+            return {part: future.result() for part, future in futures.items()}
+
+    @classmethod
+    async def _afetch(cls, owner, repo, cached_parts):
+        results = await asyncio.gather(*(
+            cls._afetch_part(owner, repo, part, cached_parts.get(part)) for part in cls.PARTS
+        ))
+        return dict(zip(cls.PARTS, results))
+
+    @classmethod
+    def _fetch_part(cls, owner, repo, part, cached):
+        url, params, headers = cls._part_request(owner, repo, part, cached)
+        response = http_client.get(url, params=params, headers=headers, timeout=cls.TIMEOUT)
+        return cls._part_result(part, cached, response)
+
+    @classmethod
+    async def _afetch_part(cls, owner, repo, part, cached):
+        url, params, headers = cls._part_request(owner, repo, part, cached)
+        response = await http_client.aget(url, params=params, headers=headers, timeout=cls.TIMEOUT)
+        return cls._part_result(part, cached, response)
+
+    @classmethod
+    def _part_request(cls, owner, repo, part, cached):
+        suffix, params = cls.PARTS[part]
+        headers = {'Accept': 'application/vnd.github+json'}
+        token = getattr(settings, 'GITHUB_TOKEN', '')
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        return f'{settings.GITHUB_API_URL}/repos/{owner}/{repo}{suffix}', params, headers
+
+    @classmethod
+    def _part_result(cls, part, cached, response):
+        """Works on a requests or an httpx response"""
+        if response.status_code == 304 and cached:
+            return cached
+        if response.status_code in (403, 429):
+            raise RateLimited()
+
+        fetched = {'status': response.status_code, 'etag': response.headers.get('ETag')}
+        if response.status_code == 200:
+            if part == 'repo':
+                fetched['data'] = response.json()
+            elif part == 'commits':
+                fetched['count'] = cls._commit_count(response)
+        return fetched
+
+    @staticmethod
+    def _commit_count(response):
+        # Get commit count from Link header if available
+        link_header = response.headers.get('Link', '')
+        if 'last' in link_header:
+            last_page_match = re.search(r'page=(\d+)>; rel="last"', link_header)
+            return int(last_page_match.group(1)) if last_page_match else 0
+        commits = response.json()
+        return len(commits) if commits else 0
+
+    @staticmethod
+    def _result(owner, repo, entry):
+        parts = entry['parts']
+        repo_data = parts['repo']['data']
+        return {
+            'valid': True,
+            'owner': owner,
+            'repo': repo,
+            'full_name': repo_data.get('full_name'),
+            'description': repo_data.get('description', ''),
+            'stars': repo_data.get('stargazers_count', 0),
+            'forks': repo_data.get('forks_count', 0),
+            'language': repo_data.get('language', 'Unknown'),
+            'is_private': repo_data.get('private', False),
+            'has_readme': parts['readme']['status'] == 200,
+            'commit_count': parts['commits'].get('count', 0),
+            'created_at': repo_data.get('created_at'),
+            'updated_at': repo_data.get('updated_at'),
+            'html_url': repo_data.get('html_url'),
+            'warnings': []
+        }
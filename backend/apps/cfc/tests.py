@@ -0,0 +1,267 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from apps.cfc.github_repos import GitHubRepoService
+from apps.swr_cache import SWRCache
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'github-tests'}}
+
+REPO = {
+    'full_name': 'octo/demo', 'description': 'Demo', 'stargazers_count': 3, 'forks_count': 1,
+    'language': 'Python', 'private': False, 'html_url': 'https://github.com/octo/demo',
+}
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    """Serves /repos/octo/demo{,/readme,/commits} with ETags"""
+    requests = []
+    rate_limited = False
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        StubGitHub.requests.append((path, self.headers.get('If-None-Match')))
+
+        if StubGitHub.rate_limited:
+            return self.reply(403, {'message': 'API rate limit exceeded'}, {'X-RateLimit-Remaining': '0'})
+        if not path.startswith('/repos/octo/demo'):
+            return self.reply(404, {'message': 'Not Found'})
+
+        etag = f'"{path}"'
+        if self.headers.get('If-None-Match') == etag:
+            return self.reply(304, None, {'ETag': etag})
+        if path.endswith('/readme'):
+            return self.reply(200, {'name': 'README.md'}, {'ETag': etag})
+        if path.endswith('/commits'):
+            link = '<https://api.github.com/repos/octo/demo/commits?per_page=1&page=42>; rel="last"'
+            return self.reply(200, [{'sha': 'abc'}], {'ETag': etag, 'Link': link})
+        return self.reply(200, REPO, {'ETag': etag})
+
+    def reply(self, status_code, body, headers=None):
+        self.send_response(status_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        payload = json.dumps(body).encode() if body is not None else b''
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class GitHubRepoServiceTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGitHub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.settings_override = override_settings(
+            GITHUB_API_URL=f'http://127.0.0.1:{cls.server.server_port}',
+            GITHUB_REPO_CACHE_TTL=0,  # always revalidate
+            USE_GITHUB_REPO_CACHE=True,
+            CACHES=LOCMEM_CACHE,
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        StubGitHub.requests = []
+        StubGitHub.rate_limited = False
+
+    def tearDown(self):
+        SWRCache.wait(5)
+
+    def test_validates_repository(self):
+        result = GitHubRepoService.validate('https://github.com/octo/demo.git')
+
+        self.assertTrue(result['valid'])
+        self.assertEqual((result['full_name'], result['commit_count']), ('octo/demo', 42))
+        self.assertTrue(result['has_readme'])
+        self.assertEqual(len(StubGitHub.requests), 3)
+
+    def test_stale_result_is_served_and_revalidated_in_background(self):
+        GitHubRepoService.validate('https://github.com/octo/demo')
+        result = GitHubRepoService.validate('https://github.com/octo/demo')
+        SWRCache.wait(5)
+
+        self.assertEqual(result['stars'], 3)
+        self.assertEqual(len(StubGitHub.requests), 6)
+        self.assertTrue(all(etag for _, etag in StubGitHub.requests[3:]))
+
+    def test_async_validation_shares_the_cache(self):
+        result = async_to_sync(GitHubRepoService.avalidate)('https://github.com/octo/demo')
+        self.assertTrue(result['valid'])
+        self.assertEqual((result['commit_count'], result['has_readme']), (42, True))
+        self.assertEqual(len(StubGitHub.requests), 3)
+
+        GitHubRepoService.validate('https://github.com/octo/demo')
+        SWRCache.wait(5)
+        self.assertTrue(all(etag for _, etag in StubGitHub.requests[3:]))
+
+    def test_async_missing_repository(self):
+        result = async_to_sync(GitHubRepoService.avalidate)('https://github.com/octo/missing')
+        self.assertIn('not found', result['error'])
+
+    def test_fresh_cache_skips_network(self):
+        with self.settings(GITHUB_REPO_CACHE_TTL=3600):
+            GitHubRepoService.validate('https://github.com/octo/demo')
+            GitHubRepoService.validate('https://github.com/Octo/Demo')
+        self.assertEqual(len(StubGitHub.requests), 3)
+
+    def test_rate_limit_serves_cached_result(self):
+        GitHubRepoService.validate('https://github.com/octo/demo')
+        StubGitHub.rate_limited = True
+
+        result = GitHubRepoService.validate('https://github.com/octo/demo')
+        SWRCache.wait(5)
+        # The failed refresh keeps the entry and holds off the next attempt
+        again = GitHubRepoService.validate('https://github.com/octo/demo')
+        SWRCache.wait(5)
+
+        self.assertTrue(result['valid'])
+        self.assertEqual((result['commit_count'], again['commit_count']), (42, 42))
+        self.assertEqual(len(StubGitHub.requests), 6)
+
+    def test_rate_limit_without_cache_is_an_error(self):
+        StubGitHub.rate_limited = True
+        result = GitHubRepoService.validate('https://github.com/octo/demo')
+        self.assertIn('rate limit', result['error'])
+
+    def test_open_circuit_fails_fast(self):
+        from apps import http_client
+
+        upstream = http_client.get_upstream(f'127.0.0.1:{self.server.server_port}')
+        self.addCleanup(http_client._upstreams.clear)
+        with self.settings(OUTBOUND_BREAKER_THRESHOLD=1):
+            upstream.record(10.0, failed=True)
+
+        result = GitHubRepoService.validate('https://github.com/octo/demo')
+        self.assertIn('not responding', result['error'])
+        self.assertEqual(StubGitHub.requests, [])
+
+    def test_missing_repository_and_bad_url(self):
+        self.assertIn('not found', GitHubRepoService.validate('https://github.com/octo/missing')['error'])
+        self.assertFalse(GitHubRepoService.validate('https://gitlab.com/octo/demo')['valid'])
+
+
+class FakeStream:
+    """Streaming response that records how many chunks were consumed"""
+
+    def __init__(self, chunks, status_code=200):
+        self.chunks = chunks
+        self.status_code = status_code
+        self.consumed = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for chunk in self.chunks:
+            self.consumed += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class YouTubeDurationProbeTests(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def page(self):
+        filler = b'<script>' + b'x' * 16000 + b'</script>'
+        # The match straddles a chunk boundary; everything after it is never read
+        return [filler, b'{"videoDetails":{"lengthS', b'econds":"425","title":"BMC"}}'] + [filler] * 60
+
+    def test_stops_reading_at_first_match(self):
+        from unittest import mock
+        from apps.cfc.youtube import YouTubeDurationProbe
+
+        stream = FakeStream(self.page())
+        with mock.patch('apps.http_client.get', return_value=stream):
+            self.assertEqual(YouTubeDurationProbe.duration_seconds('dQw4w9WgXcQ'), 425)
+        self.assertEqual(stream.consumed, 3)
+        self.assertTrue(stream.closed)
+
+    @override_settings(USE_VIDEO_DURATION_CACHE=True, CACHES=LOCMEM_CACHE)
+    def test_duration_is_cached_by_video_id(self):
+        from unittest import mock
+        from apps.cfc.youtube import YouTubeDurationProbe
+
+        with mock.patch('apps.http_client.get', side_effect=lambda *a, **k: FakeStream(self.page())) as get:
+            YouTubeDurationProbe.duration_seconds('dQw4w9WgXcQ')
+            self.assertEqual(YouTubeDurationProbe.duration_seconds('dQw4w9WgXcQ'), 425)
+        self.assertEqual(get.call_count, 1)
+
+    def test_concurrent_lookups_share_one_request(self):
+        from unittest import mock
+        from apps.cfc.youtube import YouTubeDurationProbe
+
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(5)
+            return FakeStream(self.page())
+
+        results = []
+        with mock.patch('apps.http_client.get', side_effect=slow_get) as get:
+            threads = [
+                threading.Thread(target=lambda: results.append(YouTubeDurationProbe.duration_seconds('abcdefghijk')))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.2)  # let the followers reach the in-flight lookup
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, [425] * 5)
+        self.assertEqual(get.call_count, 1)
+
+    def test_async_probe_streams_the_page(self):
+        import httpx
+        from unittest import mock
+        from apps.cfc.youtube import YouTubeDurationProbe
+
+        async def lookup():
+            transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b''.join(self.page())))
+            async with httpx.AsyncClient(transport=transport) as client:
+                with mock.patch('apps.http_client.async_client', return_value=client):
+                    return await YouTubeDurationProbe.aduration_seconds('dQw4w9WgXcQ')
+
+        self.assertEqual(async_to_sync(lookup)(), 425)
+
+    def test_concurrent_async_lookups_share_one_probe(self):
+        from unittest import mock
+        from apps.cfc.youtube import YouTubeDurationProbe
+
+        async def slow_probe(video_id):
+            await asyncio.sleep(0.05)
+            return 425
+
+        async def lookups():
+            return await asyncio.gather(*(YouTubeDurationProbe.aduration_seconds('abcdefghijk') for _ in range(5)))
+
+        with mock.patch.object(YouTubeDurationProbe, 'aprobe', side_effect=slow_probe) as probe:
+            self.assertEqual(async_to_sync(lookups)(), [425] * 5)
+        self.assertEqual(probe.call_count, 1)
+
+    def test_extract_video_id(self):
+        from apps.cfc.youtube import YouTubeDurationProbe
+
+        self.assertEqual(YouTubeDurationProbe.extract_video_id('https://youtu.be/dQw4w9WgXcQ'), 'dQw4w9WgXcQ')
+        self.assertIsNone(YouTubeDurationProbe.extract_video_id('https://vimeo.com/123'))
@@ -5,7 +5,9 @@ from .views import (
     HackathonSubmissionViewSet,
     BMCVideoSubmissionViewSet,
     InternshipSubmissionViewSet,
-    GenAIProjectSubmissionViewSet
+    GenAIProjectSubmissionViewSet,
+    validate_repo,
+    check_duration,
 )
 
 router = DefaultRouter()
@@ -16,5 +18,9 @@ router.register(r'internships', InternshipSubmissionViewSet, basename='internshi
 router.register(r'genai-projects', GenAIProjectSubmissionViewSet, basename='genai-project')
 
 urlpatterns = [
+    # Async views; served ahead of the router's detail routes
+    path('hackathons/validate_repo/', validate_repo, name='hackathon-validate-repo'),
+    path('genai-projects/validate_repo/', validate_repo, name='genai-project-validate-repo'),
+    path('bmc-videos/check_duration/', check_duration, name='bmc-video-check-duration'),
     path('', include(router.urls)),
 ]
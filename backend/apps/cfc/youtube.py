@@ -0,0 +1,182 @@
+"""
+YouTube Duration Probe
+Finds a video's length for BMC video validation
+
+The duration is only published inside the watch page (`"lengthSeconds"`),
+which is often over 1 MB of HTML. The probe:
+
+- Streams the page and stops reading at the first match
+- Caches durations by video id (USE_VIDEO_DURATION_CACHE) - they never change
+- Lets concurrent lookups of the same id in a process share one request,
+  which is what a deadline-night burst of resubmissions looks like
+
+aduration_seconds() does the same for async views. Both stream through
+apps.http_client.
+
+Usage:
+    from apps.cfc.youtube import YouTubeDurationProbe
+
+    video_id = YouTubeDurationProbe.extract_video_id(url)
+    seconds = YouTubeDurationProbe.duration_seconds(video_id)
+    seconds = await YouTubeDurationProbe.aduration_seconds(video_id)
+"""
+import asyncio
+import logging
+import re
+import threading
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps import http_client
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_URL_REGEX = r'(?:youtube\.com\/(?:[^\/]+\/.+\/|(?:v|e(?:mbed)?)\/|.*[?&]v=)|youtu\.be\/)([^"&?\/\s]{11})'
+LENGTH_REGEX = re.compile(rb'"lengthSeconds":"(\d+)"')
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+# event loop -> {video_id: task}, for async lookups
+_async_inflight = weakref.WeakKeyDictionary()
+
+
+class _LengthScanner:
+    """Looks for lengthSeconds in a page fed to it chunk by chunk"""
+
+    def __init__(self, max_bytes, overlap):
+        self.max_bytes = max_bytes
+        self.overlap = overlap
+        self.tail = b''
+        self.read = 0
+
+    def feed(self, chunk):
+        """Returns the duration once found, else None"""
+        buffer = self.tail + chunk
+        match = LENGTH_REGEX.search(buffer)
+        if match:
+            return int(match.group(1))
+        self.read += len(chunk)
+        self.tail = buffer[-self.overlap:]
+        return None
+
+    @property
+    def exhausted(self):
+        return self.read >= self.max_bytes
+
+
+class YouTubeDurationProbe:
+    """Look up video durations with as little download as possible"""
+
+    TIMEOUT = 10
+    CHUNK_SIZE = 16 * 1024
+    MAX_BYTES = 4 * 1024 * 1024
+    # Bytes kept from the previous chunk so a match split across chunks is found
+    OVERLAP = 64
+
+    @staticmethod
+    def extract_video_id(url):
+        """Extract YouTube video ID from URL"""
+        match = re.search(YOUTUBE_URL_REGEX, url or '')
+        return match.group(1) if match else None
+
+    @classmethod
+    def duration_seconds(cls, video_id):
+        """Video length in seconds, or None when it could not be determined"""
+        use_cache = getattr(settings, 'USE_VIDEO_DURATION_CACHE', False)
+        cache_key = f'youtube_duration_{video_id}'
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        with _inflight_lock:
+            call = _inflight.get(video_id)
+            leader = call is None
+            if leader:
+                call = _inflight[video_id] = {'done': threading.Event(), 'result': None}
+
+        if not leader:
+            call['done'].wait(cls.TIMEOUT * 2)
+            return call['result']
+
+        try:
+            call['result'] = cls.probe(video_id)
+            if use_cache and call['result'] is not None:
+                cache.set(cache_key, call['result'], settings.VIDEO_DURATION_CACHE_TTL)
+        finally:
+            with _inflight_lock:
+                _inflight.pop(video_id, None)
+            call['done'].set()
+        return call['result']
+
+    @classmethod
+    def probe(cls, video_id):
+        """Stream the watch page until lengthSeconds shows up"""
+        try:
+            response = http_client.get(
+                f'https://www.youtube.com/watch?v={video_id}',
+                timeout=cls.TIMEOUT,
+                stream=True,
+            )
+            try:
+                if response.status_code != 200:
+                    return None
+
+                scanner = _LengthScanner(cls.MAX_BYTES, cls.OVERLAP)
+                for chunk in response.iter_content(chunk_size=cls.CHUNK_SIZE):
+                    duration = scanner.feed(chunk)
+                    if duration is not None:
+                        return duration
+                    if scanner.exhausted:
+                        break
+            finally:
+                response.close()
+        except Exception as e:
+            logger.warning('Error fetching YouTube video duration for %s: %s', video_id, e)
+        return None
+
+    @classmethod
+    async def aduration_seconds(cls, video_id):
+        """duration_seconds() for async views"""
+        use_cache = getattr(settings, 'USE_VIDEO_DURATION_CACHE', False)
+        cache_key = f'youtube_duration_{video_id}'
+        if use_cache:
+            cached = await cache.aget(cache_key)
+            if cached is not None:
+                return cached
+
+        pending = _async_inflight.setdefault(asyncio.get_running_loop(), {})
+        task = pending.get(video_id)
+        leader = task is None
+        if leader:
+            task = pending[video_id] = asyncio.ensure_future(cls.aprobe(video_id))
+            task.add_done_callback(lambda _: pending.pop(video_id, None))
+
+        # shield: a client that disconnects must not cancel the others' lookup
+        result = await asyncio.shield(task)
+        if leader and use_cache and result is not None:
+            await cache.aset(cache_key, result, settings.VIDEO_DURATION_CACHE_TTL)
+        return result
+
+    @classmethod
+    async def aprobe(cls, video_id):
+        """probe() on the async client"""
+        try:
+            async with http_client.astream(
+                'GET', f'https://www.youtube.com/watch?v={video_id}', timeout=cls.TIMEOUT
+            ) as response:
+                if response.status_code != 200:
+                    return None
+
+                scanner = _LengthScanner(cls.MAX_BYTES, cls.OVERLAP)
+                async for chunk in response.aiter_bytes(cls.CHUNK_SIZE):
+                    duration = scanner.feed(chunk)
+                    if duration is not None:
+                        return duration
+                    if scanner.exhausted:
+                        break
+        except Exception as e:
+            logger.warning('Error fetching YouTube video duration for %s: %s', video_id, e)
+        return None
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clt', '0004_cltsubmission_duration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cltfile',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the file content', max_length=64),
+        ),
+    ]
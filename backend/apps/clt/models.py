@@ -74,6 +74,7 @@ class CLTFile(models.Model):
     file_type = models.CharField(max_length=20, choices=FILE_TYPE_CHOICES, default='evidence')
     file_name = models.CharField(max_length=255)
     file_size = models.IntegerField(help_text="File size in bytes")
+    content_hash = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the file content")
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
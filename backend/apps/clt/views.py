@@ -7,6 +7,7 @@ from django.utils import timezone
 from django.db import transaction
 from django.core.cache import cache
 from django.db.models import Prefetch
+from apps.uploads.services import ChunkedUploadService, EvidenceUploadService, UploadError
 from .models import CLTSubmission, CLTFile
 from .serializers import (
     CLTSubmissionSerializer,
@@ -28,7 +29,7 @@ class CLTSubmissionViewSet(viewsets.ModelViewSet):
     - PUT    /api/clt/submissions/{id}/      - Update submission (full)
     - PATCH  /api/clt/submissions/{id}/      - Update submission (partial)
     - DELETE /api/clt/submissions/{id}/      - Delete submission
-    - POST   /api/clt/submissions/{id}/upload_files/     - Upload files (max 10 files, 10MB each)
+    - POST   /api/clt/submissions/{id}/upload_files/     - Upload files (max 10 files, 10MB each, or resumable uploads)
     - POST   /api/clt/submissions/{id}/submit/           - Submit for review
     - DELETE /api/clt/submissions/{id}/delete_file/      - Delete file
     - GET    /api/clt/submissions/stats/                 - Get statistics (cached)
@@ -69,52 +70,37 @@ class CLTSubmissionViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        with transaction.atomic():
-            # Create submission
-            submission = serializer.save()
-            
-            # Handle files separately
-            files = request.FILES.getlist('files', [])
-            if files:
-                # Validate file count
-                if len(files) > 10:
-                    submission.delete()
-                    return Response(
-                        {'error': 'Maximum 10 files allowed per submission'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
+        files = request.FILES.getlist('files', [])
+        upload_ids = EvidenceUploadService.upload_ids(request.data)
+        
+        try:
+            with transaction.atomic():
+                # Create submission
+                submission = serializer.save()
                 
-                # Create file objects
-                for file in files:
-                    # Validate file size (10MB)
-                    if file.size > 10 * 1024 * 1024:
-                        submission.delete()
-                        return Response(
-                            {'error': f'File {file.name} exceeds 10MB limit'},
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-                    
-                    CLTFile.objects.create(
-                        submission=submission,
-                        file=file,
-                        file_name=file.name,
-                        file_size=file.size
-                    )
-            
-            # Clear user's stats cache
-            cache.delete(f'clt_stats_{request.user.id}')
+                # Stream files to storage and insert their rows in one query
+                uploads = ChunkedUploadService.claim(request.user, upload_ids)
+                error = EvidenceUploadService.validate(CLTFile, files, uploads)
+                if error:
+                    raise UploadError(error)
+                EvidenceUploadService.store(CLTFile, submission, files, uploads)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Clear user's stats cache
+        cache.delete(f'clt_stats_{request.user.id}')
         
         # Return full submission data
         response_serializer = CLTSubmissionSerializer(submission)
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
     
-    @action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser])
+    @action(detail=True, methods=['post'], parser_classes=[MultiPartParser, FormParser, JSONParser])
     def upload_files(self, request, pk=None):
         """
         Upload additional files to existing submission.
         POST /api/clt/submissions/{id}/upload_files/
-        Body: files (multipart), file_type (optional)
-        Max 10 files per request, max 10MB per file
+        Body: files (multipart) and/or upload_ids (completed /api/uploads/ ids), file_type (optional)
+        Max 10 files per request, max 10MB per multipart file
         """
         submission = self.get_object()
         
@@ -126,40 +112,26 @@ class CLTSubmissionViewSet(viewsets.ModelViewSet):
             )
         
         files = request.FILES.getlist('files')
-        if not files:
+        upload_ids = EvidenceUploadService.upload_ids(request.data)
+        if not files and not upload_ids:
             return Response(
                 {'error': 'No files provided'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Limit number of files per request
-        if len(files) > 10:
-            return Response(
-                {'error': 'Maximum 10 files allowed per request'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Validate file sizes (10MB limit per file)
-        MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-        for file in files:
-            if file.size > MAX_FILE_SIZE:
-                return Response(
-                    {'error': f'File {file.name} exceeds 10MB limit'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        # Bulk create files in transaction
-        created_files = []
-        with transaction.atomic():
-            for file in files:
-                clt_file = CLTFile.objects.create(
-                    submission=submission,
-                    file=file,
-                    file_name=file.name,
-                    file_size=file.size,
+        # Stream files to storage and bulk create their rows in one transaction
+        try:
+            with transaction.atomic():
+                uploads = ChunkedUploadService.claim(request.user, upload_ids)
+                error = EvidenceUploadService.validate(CLTFile, files, uploads)
+                if error:
+                    raise UploadError(error)
+                created_files = EvidenceUploadService.store(
+                    CLTFile, submission, files, uploads,
                     file_type=request.data.get('file_type', 'evidence')
                 )
-                created_files.append(clt_file)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         serializer = CLTFileSerializer(created_files, many=True)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
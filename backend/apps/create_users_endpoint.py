@@ -6,7 +6,7 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.models import User
-from apps.profiles.models import UserProfile
+from apps.profiles.provisioning import UserProvisioningService
 
 
 @csrf_exempt
@@ -70,59 +70,17 @@ def create_production_users_endpoint(request):
         }
     ]
     
-    for user_data in users_data:
-        username = user_data['username']
-        email = user_data['email']
-        password = user_data['password']
-        role = user_data.pop('role')
-        
-        try:
-            # Check if user exists
-            user = User.objects.filter(username=username).first()
-            
-            if user:
-                # Update existing user
-                user.email = email
-                user.first_name = user_data['first_name']
-                user.last_name = user_data['last_name']
-                user.is_superuser = user_data.get('is_superuser', False)
-                user.is_staff = user_data.get('is_staff', False)
-                user.set_password(password)
-                user.save()
-                results['updated'].append(f"{username} ({email})")
-            else:
-                # Create new user
-                is_superuser = user_data.get('is_superuser', False)
-                is_staff = user_data.get('is_staff', False)
-                
-                if is_superuser:
-                    user = User.objects.create_superuser(
-                        username=username,
-                        email=email,
-                        password=password,
-                        first_name=user_data['first_name'],
-                        last_name=user_data['last_name']
-                    )
-                else:
-                    user = User.objects.create_user(
-                        username=username,
-                        email=email,
-                        password=password,
-                        first_name=user_data['first_name'],
-                        last_name=user_data['last_name'],
-                        is_staff=is_staff
-                    )
-                results['created'].append(f"{username} ({email})")
-            
-            # Create or update profile
-            profile, created = UserProfile.objects.get_or_create(user=user)
-            profile.role = role
-            profile.campus = 'TECH'
-            profile.floor = 2
-            profile.save()
-            
-        except Exception as e:
-            results['errors'].append(f"Error creating {username}: {str(e)}")
+    try:
+        # All four passwords are hashed in one pass and written in bulk
+        result = UserProvisioningService.provision(users_data, campus='TECH', floor=2, match_on='username')
+        labels = {user['username']: f"{user['username']} ({user['email']})" for user in users_data}
+        for user in User.objects.filter(pk__in=result['created_ids']).only('username'):
+            results['created'].append(labels[user.username])
+        for user in User.objects.filter(pk__in=result['updated_ids']).only('username'):
+            results['updated'].append(labels[user.username])
+        results['errors'].extend(result['errors'])
+    except Exception as e:
+        results['errors'].append(f"Error creating users: {str(e)}")
     
     return JsonResponse({
         'success': True,
@@ -0,0 +1,176 @@
+"""
+Read Replica Routing
+
+Sends reads that can tolerate replication lag to a read replica and
+everything else to the primary ('default'). Replicas are configured with
+DATABASE_REPLICA_URLS (see config/settings.py); with none configured every
+query uses the primary, exactly as before.
+
+What reads from a replica:
+- GET/HEAD/OPTIONS requests (ReplicaRoutingMiddleware): admin stats, floor
+  overview, leaderboards, reports
+- Code inside `with read_replica():`, e.g. recompute_analytics
+
+What stays on the primary:
+- Every write, and every request with an unsafe method
+- Reads inside a transaction on the primary (they belong to it)
+- Read-your-writes: once a request writes, its remaining reads use the
+  primary, and so do the writer's next requests for REPLICA_PIN_SECONDS.
+  The pin is a per-user key in the shared 'replica_pins' cache (the SPA
+  is cross-origin, so a cookie would never come back); the JWT
+  authentication class tells the router who the user is
+
+One request (or block) uses one replica, so its reads see a single
+consistent snapshot.
+
+Usage:
+    from apps.db_router import read_replica
+
+    with read_replica(sticky=False):
+        rows = UserProfile.objects.values('campus', 'floor').distinct()
+"""
+import contextlib
+import contextvars
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_CACHE = 'replica_pins'
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def _pin_key(user_id):
+    return f'db_primary_pin_{user_id}'
+
+
+class _Routing:
+    """Routing state of one request or read_replica() block"""
+
+    __slots__ = ('replica', 'sticky', 'alias', 'wrote', 'user_id', 'pinned', 'pin_set')
+
+    def __init__(self, replica, sticky=True):
+        self.replica = replica  # may reads use a replica at all
+        self.sticky = sticky  # stay on the primary once something was written
+        self.alias = None
+        self.wrote = False
+        self.user_id = None  # set by identify_user() once the request is authenticated
+        self.pinned = None  # the user wrote within REPLICA_PIN_SECONDS (None: not looked up yet)
+        self.pin_set = False
+
+    def db_for_read(self):
+        if not self.replica or (self.sticky and self.wrote):
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if self.pinned is None and self.user_id is not None:
+            self.pinned = caches[PIN_CACHE].get(_pin_key(self.user_id)) is not None
+        if self.pinned:
+            return None
+        if self.alias is None:
+            self.alias = random.choice(replica_aliases())
+        return self.alias
+
+    def db_for_write(self):
+        self.wrote = True
+        # One cache write per request, however many rows it writes
+        if self.user_id is not None and self.sticky and not self.pin_set:
+            pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+            if pin_seconds > 0:
+                caches[PIN_CACHE].set(_pin_key(self.user_id), 1, pin_seconds)
+            self.pin_set = True
+
+
+# A context variable, not a thread local: it follows async views and sync_to_async
+_routing = contextvars.ContextVar('db_routing', default=None)
+
+
+@contextlib.contextmanager
+def routing(replica, sticky=True):
+    token = _routing.set(_Routing(replica and bool(replica_aliases()), sticky))
+    try:
+        yield _routing.get()
+    finally:
+        _routing.reset(token)
+
+
+def identify_user(user_id):
+    """Tell the current request's routing who is asking, for read-your-writes pins"""
+    state = _routing.get()
+    if state is None:
+        return
+    state.user_id = user_id
+    if state.wrote:
+        state.db_for_write()
+
+
+def read_replica(sticky=True):
+    """
+    Read from a replica inside the block. With sticky=False reads stay on
+    the replica after a write - for jobs that never read what they write.
+    """
+    return routing(True, sticky)
+
+
+class ReplicaRouter:
+    """DATABASE_ROUTERS entry: reads per the current routing, writes to the primary"""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None:
+            return None
+        return state.db_for_read()
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.db_for_write()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary through replication
+        if db in replica_aliases():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Route safe-method requests to a replica and pin writers to the primary"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+        with routing(self.use_replica(request)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        with routing(self.use_replica(request)):
+            return await self.get_response(request)
+
+    @staticmethod
+    def use_replica(request):
+        return request.method in SAFE_METHODS
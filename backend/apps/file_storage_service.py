@@ -10,10 +10,68 @@ This module adds a parallel path for future cloud storage.
 
 from django.core.files.storage import default_storage
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
+import hashlib
 import os
 
 
+class HashingReader:
+    """
+    File-like wrapper that hashes and counts bytes as they are read.
+    
+    Storage backends read their input in chunks, so wrapping the source
+    gives size and SHA-256 without a second pass or buffering the file.
+    `limit` stops reading after that many bytes (e.g. a request body).
+    """
+    
+    def __init__(self, source, limit=None):
+        self.source = source
+        self.limit = limit
+        self.size = 0
+        self.hash = hashlib.sha256()
+    
+    def read(self, size=-1):
+        if self.limit is not None:
+            remaining = self.limit - self.size
+            if remaining <= 0:
+                return b''
+            size = remaining if size is None or size < 0 else min(size, remaining)
+        data = self.source.read(size)
+        self.size += len(data)
+        self.hash.update(data)
+        return data
+    
+    @property
+    def sha256(self):
+        return self.hash.hexdigest()
+
+
+class ConcatenatedReader:
+    """Read several stored files back to back, one open file at a time"""
+    
+    def __init__(self, storage, paths):
+        self.storage = storage
+        self.paths = list(paths)
+        self.current = None
+    
+    def read(self, size=-1):
+        while True:
+            if self.current is None:
+                if not self.paths:
+                    return b''
+                self.current = self.storage.open(self.paths.pop(0), 'rb')
+            data = self.current.read(size)
+            if data:
+                return data
+            self.current.close()
+            self.current = None
+    
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+
+
 class FileStorageService:
     """
     Unified file storage service that abstracts local vs cloud storage.
@@ -61,6 +119,37 @@ class FileStorageService:
         
         return url
     
+    def save_stream(self, file_obj, path, limit=None):
+        """
+        Save a file chunk by chunk while computing its size and SHA-256
+        
+        Args:
+            file_obj: Anything with read() - UploadedFile, request stream, ConcatenatedReader
+            path: Relative path within storage
+            limit: Optional maximum number of bytes to read from file_obj
+        
+        Returns:
+            dict: {'path', 'url', 'size', 'sha256'}
+        
+        Memory use is bounded by the storage backend's chunk size. Uploads
+        that already carry a hash (see apps.uploads.handlers) are saved as
+        they are, so a temporary upload file can simply be moved into place.
+        """
+        if limit is None and getattr(file_obj, 'sha256', None):
+            saved_path = self.storage.save(path, file_obj)
+            size, sha256 = file_obj.size, file_obj.sha256
+        else:
+            reader = HashingReader(file_obj, limit)
+            saved_path = self.storage.save(path, File(reader, name=os.path.basename(path)))
+            size, sha256 = reader.size, reader.sha256
+        
+        return {
+            'path': saved_path,
+            'url': self.storage.url(saved_path),
+            'size': size,
+            'sha256': sha256,
+        }
+    
     def get_file(self, path):
         """
         Retrieve a file from storage
@@ -0,0 +1,76 @@
+"""
+Active Season Resolver
+Returns the active Season without a database query on most requests
+
+The active season changes about once a month, but almost every
+gamification endpoint needs it. With USE_SEASON_CACHE on, each process
+keeps the resolved season in memory and revalidates it against a version
+number in the shared cache:
+
+- At most every CHECK_INTERVAL seconds, the process reads the shared
+  version. If it has moved, the season is reloaded from the database.
+- Season saves/deletes and the update_seasons command bump the version,
+  and clear this process's copy immediately.
+- Entries older than MAX_AGE are reloaded anyway. This covers a cache
+  backend that is not shared between processes (locmem, dummy) and
+  bulk .update() calls that skip signals.
+
+Usage:
+    from apps.gamification.active_season import get_active_season
+
+    current_season = get_active_season()
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'active_season_version'
+CHECK_INTERVAL = 5
+MAX_AGE = 300
+
+_lock = threading.Lock()
+_state = {'season': None, 'version': None, 'loaded_at': None, 'checked_at': None}
+
+
+def _load():
+    from .models import Season
+    return Season.objects.filter(is_active=True).first()
+
+
+def get_active_season():
+    """Return the active Season (or None)"""
+    if not getattr(settings, 'USE_SEASON_CACHE', False):
+        return _load()
+
+    now = time.monotonic()
+    with _lock:
+        season, version = _state['season'], _state['version']
+        loaded_at, checked_at = _state['loaded_at'], _state['checked_at']
+
+    if loaded_at is not None and now - loaded_at < MAX_AGE:
+        if now - checked_at < CHECK_INTERVAL:
+            return copy.copy(season)
+        shared_version = cache.get(VERSION_KEY)
+        if shared_version == version:
+            with _lock:
+                _state['checked_at'] = now
+            return copy.copy(season)
+
+    shared_version = cache.get_or_set(VERSION_KEY, 1, None)
+    season = _load()
+    with _lock:
+        _state.update(season=season, version=shared_version, loaded_at=now, checked_at=now)
+    return copy.copy(season)
+
+
+def invalidate_active_season():
+    """Drop this process's copy and tell other processes to reload"""
+    with _lock:
+        _state.update(season=None, version=None, loaded_at=None, checked_at=None)
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from .models import (
-    Season, Episode, EpisodeProgress, SeasonScore, LegacyScore,
+    Season, Episode, EpisodeProgress, SeasonCompletion, SeasonScore, LegacyScore,
     VaultWallet, VaultTransaction, SCDStreak, LeaderboardEntry,
     Title, UserTitle, PercentileBracket
 )
@@ -28,6 +28,14 @@ class EpisodeProgressAdmin(admin.ModelAdmin):
     readonly_fields = ['started_at', 'completed_at']
 
 
+@admin.register(SeasonCompletion)
+class SeasonCompletionAdmin(admin.ModelAdmin):
+    list_display = ['student', 'season', 'tasks_completed', 'completion_percentage', 'updated_at']
+    list_filter = ['season']
+    search_fields = ['student__username']
+    readonly_fields = ['tasks_completed', 'completion_percentage', 'updated_at']
+
+
 @admin.register(SeasonScore)
 class SeasonScoreAdmin(admin.ModelAdmin):
     list_display = ['student', 'season', 'total_score', 'season_completed', 'completed_at']
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from .models import Season, Episode
 from .serializers import SeasonSerializer, EpisodeSerializer
+from .season_finalization import CohortFinalizationService
 
 
 def is_floor_wing(user):
@@ -209,3 +210,33 @@ def manage_episode_detail(request, episode_id):
         return Response({
             'message': 'Episode deleted successfully'
         }, status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def finalize_season_cohort(request, season_id):
+    """
+    GET: Finalized/pending counts for the floor wing's students
+    POST: Finalize the season for every eligible student on the floor
+    
+    Safe to repeat: students already finalized are skipped.
+    """
+    if not is_floor_wing(request.user):
+        return Response(
+            {'error': 'Only floor wings can finalize seasons'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    season = get_object_or_404(Season, id=season_id)
+    campus, floor = request.user.profile.campus, request.user.profile.floor
+    
+    if request.method == 'GET':
+        return Response(CohortFinalizationService.status(season, campus, floor))
+    
+    elif request.method == 'POST':
+        stats = CohortFinalizationService.finalize(season, campus=campus, floor=floor)
+        return Response({
+            'message': f"Season finalized for {stats['finalized']} students",
+            **stats,
+            **CohortFinalizationService.status(season, campus, floor),
+        })
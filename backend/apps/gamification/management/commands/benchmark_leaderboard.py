@@ -0,0 +1,84 @@
+"""
+Management Command: benchmark_leaderboard
+
+Measures what it costs to send the full leaderboard: render time with DRF's
+JSONRenderer and with ORJSONRenderer, and bytes on the wire uncompressed,
+gzip-compressed and (when the `brotli` package is installed) brotli-compressed.
+
+The payload has the shape of GET /api/gamification/leaderboard/full_leaderboard/
+with synthetic students, so no database rows are needed.
+
+Usage:
+    python manage.py benchmark_leaderboard
+    python manage.py benchmark_leaderboard --students 5000 --repeat 50
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from apps.renderers import ORJSONRenderer
+from apps.response_middleware import BROTLI_QUALITY, brotli
+
+
+def leaderboard_payload(students, seed=42):
+    """A full_leaderboard response body for `students` synthetic students"""
+    rng = random.Random(seed)
+    rows = []
+    for rank in range(1, students + 1):
+        pillar_scores = {f'{pillar}_score': rng.randint(0, 500) for pillar in ('clt', 'scd', 'cfc', 'iipc')}
+        rows.append({
+            'rank': rank,
+            'student_id': rank,
+            'student_username': f'student{rank:05d}@college.edu',
+            'student_first_name': f'Student {rank}',
+            'season_score': sum(pillar_scores.values()),
+            **pillar_scores,
+            'outcome_score': rng.randint(0, 100),
+            'rank_title': 'Season Champion' if rank == 1 else 'Elite Runner' if rank <= 3 else None,
+            'percentile': None if rank <= 3 else 'Top 10%' if rank <= students // 10 else 'Below 50%',
+        })
+    return {
+        'leaderboard': rows,
+        'total_students': students,
+        'season': {'id': 1, 'name': 'Season 1', 'is_active': True},
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark full leaderboard rendering time and response size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=2000, help='Leaderboard size (default: 2000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Renders per renderer (default: 20)')
+
+    def handle(self, *args, **options):
+        payload = leaderboard_payload(options['students'])
+        self.stdout.write(f"Leaderboard of {options['students']} students, {options['repeat']} renders each\n")
+
+        self.stdout.write('Render time (median):')
+        bodies = {}
+        for name, renderer in (('DRF JSONRenderer', JSONRenderer()), ('ORJSONRenderer', ORJSONRenderer())):
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                bodies[name] = renderer.render(payload, 'application/json')
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(f'  {name:<18} {statistics.median(timings):8.2f} ms')
+
+        body = bodies['ORJSONRenderer']
+        self.stdout.write('\nBytes on the wire:')
+        self.stdout.write(f"  {'identity':<18} {len(body):>9,}")
+        sizes = {'gzip': lambda data: compress_string(data)}
+        if brotli is not None:
+            sizes[f'br (quality {BROTLI_QUALITY})'] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+        for name, compress in sizes.items():
+            start = time.perf_counter()
+            size = len(compress(body))
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stdout.write(f'  {name:<18} {size:>9,}  ({size / len(body):.0%}, {elapsed:.2f} ms)')
+        if brotli is None:
+            self.stdout.write(self.style.WARNING(f"  {'br':<18} (brotli not installed)"))
@@ -0,0 +1,80 @@
+"""
+Management Command: finalize_season
+
+Finalizes a season for every student who completed all episodes:
+Season Score, Legacy Score (with Ascension Bonus), Vault Credits, and one
+leaderboard rebuild at the end.
+
+Usage:
+    python manage.py finalize_season
+    python manage.py finalize_season --season 3
+    python manage.py finalize_season --campus TECH --floor 2
+    python manage.py finalize_season --status
+
+This command:
+- Defaults to the active season
+- Works in chunks, each committed in its own transaction
+- Is resumable: finalized students are skipped, so rerun it after a failure
+- Reports progress after every chunk
+
+See apps/gamification/season_finalization.py for the pipeline.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Finalize a season for every eligible student'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            help='Season number (default: the active season)',
+        )
+        parser.add_argument('--campus', type=str, help='Only students of this campus')
+        parser.add_argument('--floor', type=int, help='Only students of this floor')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Students per transaction (default: CohortFinalizationService.CHUNK_SIZE)',
+        )
+        parser.add_argument(
+            '--status',
+            action='store_true',
+            help='Only report finalized/pending counts',
+        )
+
+    def handle(self, *args, **options):
+        # Import here to avoid circular imports
+        from apps.gamification.models import Season
+        from apps.gamification.active_season import get_active_season
+        from apps.gamification.season_finalization import CohortFinalizationService
+
+        if options['season']:
+            season = Season.objects.filter(season_number=options['season']).first()
+        else:
+            season = get_active_season()
+        if season is None:
+            raise CommandError('Season not found')
+
+        campus, floor = options['campus'], options['floor']
+        status = CohortFinalizationService.status(season, campus, floor)
+        self.stdout.write(
+            f"{season.name}: {status['finalized']} finalized, {status['pending']} pending"
+        )
+        if options['status']:
+            return
+
+        def report(done, total):
+            self.stdout.write(f'  ✓ {done}/{total} students finalized')
+
+        stats = CohortFinalizationService.finalize(
+            season, campus=campus, floor=floor,
+            chunk_size=options['chunk_size'], on_progress=report,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✓ FINALIZATION COMPLETE: {stats['finalized']} students in {stats['chunks']} chunk(s), "
+            f"{stats['credits']} vault credits awarded, leaderboard rebuilt"
+        ))
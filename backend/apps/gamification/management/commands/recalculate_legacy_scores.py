@@ -2,10 +2,19 @@
 """
 Recalculate Legacy Scores for all students
 This script recalculates legacy scores from all completed season scores
+
+Season scores are streamed in one ordered cursor and legacy scores are
+written back in chunks (see LegacyScoreRecalculationService), so the
+whole institution is recomputed in a few queries per chunk.
+
+Usage:
+    python manage.py recalculate_legacy_scores
+    python manage.py recalculate_legacy_scores --username student@college.edu
+    python manage.py recalculate_legacy_scores --chunk-size 2000 -v 2
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
-from apps.gamification.models import LegacyScore, SeasonScore
+from apps.gamification.services import LegacyScoreRecalculationService
 
 User = get_user_model()
 
@@ -19,54 +28,50 @@ class Command(BaseCommand):
             type=str,
             help='Recalculate for specific username only',
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=LegacyScoreRecalculationService.CHUNK_SIZE,
+            help='Students per bulk_update batch (default: %(default)s)',
+        )
 
     def handle(self, *args, **options):
         username = options.get('username')
+        verbosity = options.get('verbosity', 1)
+        student_ids = None
         
         if username:
             # Recalculate for specific user
             try:
                 user = User.objects.get(username=username)
-                users = [user]
+                student_ids = [user.id]
                 self.stdout.write(f"Recalculating legacy score for {username}...")
             except User.DoesNotExist:
                 self.stdout.write(self.style.ERROR(f"User {username} not found"))
                 return
         else:
-            # Get all users who have completed season scores
-            users = User.objects.filter(
-                season_scores__season_completed=True
-            ).distinct()
-            self.stdout.write(f"Recalculating legacy scores for {users.count()} students...")
+            self.stdout.write("Recalculating legacy scores for all students with season scores...")
         
-        updated_count = 0
-        for user in users:
-            # Get or create legacy score
-            legacy_score, created = LegacyScore.objects.get_or_create(student=user)
-            
-            # Store old value
-            old_total = legacy_score.total_legacy_points
-            
-            # Recalculate
-            legacy_score.recalculate_from_season_scores()
-            
-            # Show changes
-            if old_total != legacy_score.total_legacy_points:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"✓ {user.username}: {old_total} → {legacy_score.total_legacy_points} "
-                        f"({legacy_score.seasons_completed} seasons, "
-                        f"+{legacy_score.ascension_bonus_total} ascension bonus)"
-                    )
-                )
-                updated_count += 1
-            else:
-                self.stdout.write(
-                    f"  {user.username}: {legacy_score.total_legacy_points} (no change)"
+        def report_change(student_username, old_total, legacy_score):
+            if verbosity < 2 and not username:
+                return
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✓ {student_username}: {old_total} → {legacy_score.total_legacy_points} "
+                    f"({legacy_score.seasons_completed} seasons, "
+                    f"+{legacy_score.ascension_bonus_total} ascension bonus)"
                 )
+            )
+        
+        stats = LegacyScoreRecalculationService.recalculate(
+            student_ids=student_ids,
+            chunk_size=options['chunk_size'],
+            on_change=report_change,
+        )
         
         self.stdout.write(
             self.style.SUCCESS(
-                f"\n✓ Recalculation complete! Updated {updated_count} students."
+                f"\n✓ Recalculation complete! Checked {stats['students']} students, "
+                f"updated {stats['updated']}, created {stats['created']}."
             )
         )
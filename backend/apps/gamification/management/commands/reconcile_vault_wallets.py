@@ -0,0 +1,61 @@
+"""
+Management Command: reconcile_vault_wallets
+
+Rebuilds VaultWallet balances from the VaultTransaction ledger.
+
+Usage:
+    python manage.py reconcile_vault_wallets
+    python manage.py reconcile_vault_wallets --dry-run
+    python manage.py reconcile_vault_wallets --username student@college.edu
+
+This command:
+- Sums earn/spend ledger entries per wallet in one aggregate query
+- Rewrites available_credits, total_earned and total_spent where they drift
+- Lists every corrected wallet
+- Is idempotent (safe to run multiple times)
+
+Setup as Cron Job (runs nightly at 2 AM):
+    0 2 * * * cd /path/to/backend && python manage.py reconcile_vault_wallets
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Rebuild vault wallet balances from the transaction ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without writing',
+        )
+        parser.add_argument(
+            '--username',
+            type=str,
+            help='Reconcile a specific username only',
+        )
+
+    def handle(self, *args, **options):
+        from apps.gamification.services import VaultService
+
+        student_ids = None
+        if options['username']:
+            student_ids = list(User.objects.filter(username=options['username']).values_list('id', flat=True))
+            if not student_ids:
+                raise CommandError(f"User {options['username']} not found")
+
+        drifted = VaultService.reconcile(student_ids=student_ids, dry_run=options['dry_run'])
+
+        for wallet, stored in drifted:
+            self.stdout.write(
+                f"  {wallet.student_id}: available {stored['available_credits']} → {wallet.available_credits}, "
+                f"earned {stored['total_earned']} → {wallet.total_earned}, "
+                f"spent {stored['total_spent']} → {wallet.total_spent}"
+            )
+
+        verb = 'would be corrected' if options['dry_run'] else 'corrected'
+        self.stdout.write(self.style.SUCCESS(f'\n✓ {len(drifted)} wallet(s) {verb}'))
@@ -3,7 +3,7 @@ Management command to sync LeetCode streaks for all students
 Run daily via cron: python manage.py sync_leetcode_streaks
 """
 from django.core.management.base import BaseCommand
-from django.utils import timezone
+from apps.gamification.active_season import get_active_season
 from apps.gamification.models import Season
 from apps.gamification.services import LeetCodeSyncService
 
@@ -28,11 +28,9 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.ERROR(f'Season {season_id} not found'))
                 return
         else:
-            season = Season.objects.filter(
-                is_active=True,
-                start_date__lte=timezone.now().date(),
-                end_date__gte=timezone.now().date()
-            ).first()
+            season = get_active_season()
+            if season and not season.is_current:
+                season = None
         
         if not season:
             self.stdout.write(self.style.ERROR('No active season found'))
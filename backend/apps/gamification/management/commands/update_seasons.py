@@ -13,6 +13,7 @@ This command:
 - Marks expired seasons as inactive
 - Activates upcoming seasons
 - Optionally creates next season
+- Invalidates the cached active season (see apps/gamification/active_season.py)
 - Is idempotent (safe to run multiple times)
 - Logs all actions clearly
 
@@ -60,6 +61,7 @@ class Command(BaseCommand):
         try:
             # Import here to avoid circular imports
             from apps.gamification.models import Season, Episode
+            from apps.gamification.active_season import invalidate_active_season
             
             today = timezone.now().date()
             
@@ -73,6 +75,9 @@ class Command(BaseCommand):
             if create_next:
                 self.create_next_season(Season, Episode, today)
             
+            # Every web process re-resolves the active season on its next check
+            invalidate_active_season()
+            
             self.stdout.write('')
             self.stdout.write(self.style.SUCCESS('✓ UPDATE COMPLETE'))
             self.stdout.write(f'  Expired: {expired}')
@@ -9,7 +9,8 @@ from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 
-from .models import Season, Episode, EpisodeProgress, SeasonScore
+from .models import Episode, EpisodeProgress, SeasonScore
+from .active_season import get_active_season
 from .services import EpisodeService, SeasonScoringService
 from .serializers import EpisodeProgressSerializer, SeasonScoreSerializer
 
@@ -88,7 +89,7 @@ def student_progress_detail(request, student_id):
         )
     
     student = get_object_or_404(User, id=student_id)
-    current_season = Season.objects.filter(is_active=True).first()
+    current_season = get_active_season()
     
     if not current_season:
         return Response({'error': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
@@ -140,7 +141,7 @@ def finalize_student_season(request, student_id):
         )
     
     student = get_object_or_404(User, id=student_id)
-    current_season = Season.objects.filter(is_active=True).first()
+    current_season = get_active_season()
     
     if not current_season:
         return Response({'error': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
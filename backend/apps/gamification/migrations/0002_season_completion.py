@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:39, backfill added manually
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of EpisodeProgress.REQUIRED_TASKS at the time of this migration
+REQUIRED_TASKS = {
+    1: ['clt_completed', 'scd_streak_active'],
+    2: ['cfc_task1_completed', 'iipc_task1_completed', 'scd_streak_active'],
+    3: ['cfc_task2_completed', 'iipc_task2_completed', 'scd_streak_active'],
+    4: ['cfc_task3_completed', 'sri_completed', 'scd_streak_active'],
+}
+TOTAL_REQUIRED_TASKS = 11
+
+
+def backfill_season_completions(apps, schema_editor):
+    EpisodeProgress = apps.get_model('gamification', 'EpisodeProgress')
+    SeasonCompletion = apps.get_model('gamification', 'SeasonCompletion')
+
+    flags = sorted({task for tasks in REQUIRED_TASKS.values() for task in tasks})
+    totals = {}
+    rows = EpisodeProgress.objects.values('student_id', 'episode__season_id', 'episode__episode_number', *flags)
+    for row in rows.iterator(chunk_size=2000):
+        key = (row['student_id'], row['episode__season_id'])
+        done = sum(1 for task in REQUIRED_TASKS.get(row['episode__episode_number'], []) if row[task])
+        totals[key] = totals.get(key, 0) + done
+
+    SeasonCompletion.objects.bulk_create([
+        SeasonCompletion(
+            student_id=student_id,
+            season_id=season_id,
+            tasks_completed=done,
+            completion_percentage=round(done / TOTAL_REQUIRED_TASKS * 100, 2),
+        )
+        for (student_id, season_id), done in totals.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('gamification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonCompletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tasks_completed', models.PositiveSmallIntegerField(default=0)),
+                ('completion_percentage', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_completions', to='gamification.season')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_completions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['season', 'completion_percentage'], name='gamificatio_season__423f04_idx')],
+                'unique_together': {('student', 'season')},
+            },
+        ),
+        migrations.RunPython(backfill_season_completions, migrations.RunPython.noop),
+    ]
@@ -81,6 +81,15 @@ class EpisodeProgress(models.Model):
         ('completed', 'Completed'),
     ]
 
+    # Task flags each episode requires for completion
+    REQUIRED_TASKS = {
+        1: ['clt_completed', 'scd_streak_active'],
+        2: ['cfc_task1_completed', 'iipc_task1_completed', 'scd_streak_active'],
+        3: ['cfc_task2_completed', 'iipc_task2_completed', 'scd_streak_active'],
+        4: ['cfc_task3_completed', 'sri_completed', 'scd_streak_active'],
+    }
+    TOTAL_REQUIRED_TASKS = sum(len(tasks) for tasks in REQUIRED_TASKS.values())
+
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='episode_progress')
     episode = models.ForeignKey(Episode, on_delete=models.CASCADE, related_name='student_progress')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='locked')
@@ -107,17 +116,13 @@ class EpisodeProgress(models.Model):
 
     def check_episode_completion(self):
         """Check if all required tasks for this episode are completed"""
-        episode_num = self.episode.episode_number
-        
-        if episode_num == 1:
-            return self.clt_completed and self.scd_streak_active
-        elif episode_num == 2:
-            return self.cfc_task1_completed and self.iipc_task1_completed and self.scd_streak_active
-        elif episode_num == 3:
-            return self.cfc_task2_completed and self.iipc_task2_completed and self.scd_streak_active
-        elif episode_num == 4:
-            return self.cfc_task3_completed and self.sri_completed and self.scd_streak_active
-        return False
+        tasks = self.REQUIRED_TASKS.get(self.episode.episode_number)
+        return bool(tasks) and all(getattr(self, task) for task in tasks)
+
+    @classmethod
+    def count_completed_tasks(cls, episode_number, flags):
+        """Count required tasks done, given a {flag_name: bool} mapping"""
+        return sum(1 for task in cls.REQUIRED_TASKS.get(episode_number, []) if flags.get(task))
 
     def mark_completed(self):
         """Mark episode as completed and unlock next episode"""
@@ -158,6 +163,28 @@ class EpisodeProgress(models.Model):
             SeasonScoringService.finalize_season(self.student, self.episode.season)
 
 
+class SeasonCompletion(models.Model):
+    """
+    Share of a season's required episode tasks a student has completed
+    Kept in sync from EpisodeProgress task flags (see signals.py) so batch
+    statistics never have to recompute it per request
+    """
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='season_completions')
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name='student_completions')
+    tasks_completed = models.PositiveSmallIntegerField(default=0)
+    completion_percentage = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['student', 'season']
+        indexes = [
+            models.Index(fields=['season', 'completion_percentage']),
+        ]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.season.name} - {self.completion_percentage:.0f}%"
+
+
 class SeasonScore(models.Model):
     """
     1500 Point System - Calculated ONLY after full Season completion
@@ -220,18 +247,17 @@ class LegacyScore(models.Model):
     def __str__(self):
         return f"{self.student.username} - Legacy: {self.total_legacy_points}"
 
-    def recalculate_from_season_scores(self):
-        """Recalculate legacy score from all existing season scores"""
-        # Get ALL season scores for this student (not just completed ones)
-        # Legacy score should reflect current progress across all seasons
-        season_scores = SeasonScore.objects.filter(
-            student=self.student
-        ).order_by('season__season_number')
-        
-        if not season_scores.exists():
-            # No seasons yet
-            return
-        
+    ASCENSION_BONUS = 5
+    RECALCULATED_FIELDS = [
+        'total_legacy_points', 'ascension_bonus_total', 'seasons_completed',
+        'highest_season_score', 'last_season_score',
+    ]
+
+    def apply_season_scores(self, scores):
+        """
+        Rebuild the totals from (total_score, season_completed) pairs
+        ordered by season number. Does not save.
+        """
         # Reset values
         self.total_legacy_points = 0
         self.ascension_bonus_total = 0
@@ -240,40 +266,51 @@ class LegacyScore(models.Model):
         self.last_season_score = 0
         
         # Iterate through all seasons in order
-        for season_score in season_scores:
-            current_score = season_score.total_score
-            
+        for current_score, season_completed in scores:
             # Only count if there's actual progress
             if current_score == 0:
                 continue
             
             # Check for Ascension Bonus (current > previous)
             if self.last_season_score > 0 and current_score > self.last_season_score:
-                self.ascension_bonus_total += 5
-                self.total_legacy_points += 5
+                self.ascension_bonus_total += self.ASCENSION_BONUS
+                self.total_legacy_points += self.ASCENSION_BONUS
             
             # Add season score
             self.total_legacy_points += current_score
             
             # Count completed or in-progress seasons
-            if season_score.season_completed or current_score > 0:
+            if season_completed or current_score > 0:
                 self.seasons_completed += 1
             
             # Update tracking
             if current_score > self.highest_season_score:
                 self.highest_season_score = current_score
             self.last_season_score = current_score
+
+    def recalculate_from_season_scores(self):
+        """Recalculate legacy score from all existing season scores"""
+        # Get ALL season scores for this student (not just completed ones)
+        # Legacy score should reflect current progress across all seasons
+        scores = list(SeasonScore.objects.filter(
+            student=self.student
+        ).order_by('season__season_number').values_list('total_score', 'season_completed'))
         
+        if not scores:
+            # No seasons yet
+            return
+        
+        self.apply_season_scores(scores)
         self.save()
 
-    def add_season_score(self, season_score_obj):
+    def add_season_score(self, season_score_obj, save=True):
         """Add season score and check for Ascension Bonus"""
         current_score = season_score_obj.total_score
         
         # Check for Ascension Bonus (current > previous)
         ascension_bonus = 0
         if self.last_season_score > 0 and current_score > self.last_season_score:
-            ascension_bonus = 5
+            ascension_bonus = self.ASCENSION_BONUS
             self.ascension_bonus_total += ascension_bonus
         
         # Update totals
@@ -285,7 +322,8 @@ class LegacyScore(models.Model):
             self.highest_season_score = current_score
         self.last_season_score = current_score
         
-        self.save()
+        if save:
+            self.save()
         return ascension_bonus
 
 
@@ -305,36 +343,21 @@ class VaultWallet(models.Model):
     def __str__(self):
         return f"{self.student.username} - Credits: {self.available_credits}"
 
+    BALANCE_FIELDS = ['available_credits', 'total_earned', 'total_spent', 'updated_at']
+
     def add_credits(self, amount, reason=""):
-        """Add vault credits"""
-        self.available_credits += amount
-        self.total_earned += amount
-        self.save()
-        
-        # Log transaction
-        VaultTransaction.objects.create(
-            wallet=self,
-            transaction_type='earn',
-            amount=amount,
-            reason=reason
-        )
+        """Add vault credits (atomic update + ledger entry, see VaultService)"""
+        from .services import VaultService
+        VaultService.credit(self, amount, reason)
+        self.refresh_from_db(fields=self.BALANCE_FIELDS)
 
     def spend_credits(self, amount, reason=""):
-        """Spend vault credits"""
-        if self.available_credits >= amount:
-            self.available_credits -= amount
-            self.total_spent += amount
-            self.save()
-            
-            # Log transaction
-            VaultTransaction.objects.create(
-                wallet=self,
-                transaction_type='spend',
-                amount=amount,
-                reason=reason
-            )
-            return True
-        return False
+        """Spend vault credits; False if the balance does not cover them"""
+        from .services import VaultService
+        spent = VaultService.debit(self, amount, reason)
+        if spent:
+            self.refresh_from_db(fields=self.BALANCE_FIELDS)
+        return spent
 
 
 class VaultTransaction(models.Model):
@@ -389,7 +412,7 @@ class SCDStreak(models.Model):
     def __str__(self):
         return f"{self.student.username} - {self.season.name} - Streak: {self.current_streak}"
 
-    def calculate_streak_score(self):
+    def calculate_streak_score(self, save=True):
         """
         Calculate SCD score based on streak consistency
         Full uninterrupted streak = 100 points
@@ -410,7 +433,8 @@ class SCDStreak(models.Model):
         else:
             self.streak_score = 0
         
-        self.save()
+        if save:
+            self.save()
         return self.streak_score
 
 
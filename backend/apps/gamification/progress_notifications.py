@@ -1,14 +1,175 @@
 """
 Progress Notification Service
 Calculates batch averages and generates motivational notifications
+
+Per-student completion is persisted in SeasonCompletion; batch statistics
+read a sorted snapshot of a season's completion percentages, so buckets and
+percentile ranks cost a binary search. With USE_PROGRESS_DISTRIBUTION_CACHE
+on, the snapshot (and its total) is cached until a completion changes.
 """
+from bisect import bisect_left
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Count, Q
-from .models import EpisodeProgress, Season
+from django.core.cache import cache
+from .models import EpisodeProgress, SeasonCompletion
+from .active_season import get_active_season
 import random
 
 User = get_user_model()
 
+SNAPSHOT_TTL = 300
+TASK_FLAGS = sorted({task for tasks in EpisodeProgress.REQUIRED_TASKS.values() for task in tasks})
+
+
+def _distribution_version_key(season_id):
+    return f'progress_distribution_version_{season_id}'
+
+
+def _distribution_cache_enabled():
+    return getattr(settings, 'USE_PROGRESS_DISTRIBUTION_CACHE', False)
+
+
+def invalidate_distribution(season_id):
+    """Make the next request rebuild the season's completion snapshot"""
+    if not _distribution_cache_enabled():
+        return
+    try:
+        cache.incr(_distribution_version_key(season_id))
+    except ValueError:
+        cache.set(_distribution_version_key(season_id), 1, None)
+
+
+class SeasonCompletionTracker:
+    """Keep SeasonCompletion rows in sync with EpisodeProgress task flags"""
+
+    @staticmethod
+    def _percentage(tasks_completed):
+        return round(tasks_completed / EpisodeProgress.TOTAL_REQUIRED_TASKS * 100, 2)
+
+    @classmethod
+    def refresh(cls, student_id, season_id):
+        """Recompute one student's completion for a season"""
+        rows = EpisodeProgress.objects.filter(
+            student_id=student_id, episode__season_id=season_id
+        ).values('episode__episode_number', *TASK_FLAGS)
+        tasks_completed = sum(
+            EpisodeProgress.count_completed_tasks(row['episode__episode_number'], row) for row in rows
+        )
+
+        completion = SeasonCompletion.objects.filter(student_id=student_id, season_id=season_id).first()
+        if completion is not None and completion.tasks_completed == tasks_completed:
+            # Most progress saves (status, timestamps) don't change the task count
+            return completion
+
+        completion, _ = SeasonCompletion.objects.update_or_create(
+            student_id=student_id,
+            season_id=season_id,
+            defaults={
+                'tasks_completed': tasks_completed,
+                'completion_percentage': cls._percentage(tasks_completed),
+            }
+        )
+        invalidate_distribution(season_id)
+        return completion
+
+    @classmethod
+    def rebuild_season(cls, season):
+        """Recompute every student's completion for a season in one pass"""
+        totals = {}
+        rows = EpisodeProgress.objects.filter(episode__season=season).values(
+            'student_id', 'episode__episode_number', *TASK_FLAGS
+        )
+        for row in rows.iterator(chunk_size=2000):
+            totals[row['student_id']] = totals.get(row['student_id'], 0) + EpisodeProgress.count_completed_tasks(
+                row['episode__episode_number'], row
+            )
+
+        existing = {
+            completion.student_id: completion
+            for completion in SeasonCompletion.objects.filter(season=season)
+        }
+        to_create, to_update = [], []
+        for student_id, tasks_completed in totals.items():
+            completion = existing.get(student_id)
+            if completion is None:
+                completion = SeasonCompletion(student_id=student_id, season=season)
+                to_create.append(completion)
+            else:
+                to_update.append(completion)
+            completion.tasks_completed = tasks_completed
+            completion.completion_percentage = cls._percentage(tasks_completed)
+
+        SeasonCompletion.objects.bulk_create(to_create, batch_size=500)
+        SeasonCompletion.objects.bulk_update(
+            to_update, ['tasks_completed', 'completion_percentage'], batch_size=500
+        )
+        invalidate_distribution(season.id)
+        return len(totals)
+
+
+class CompletionDistribution:
+    """
+    Sorted completion percentages of one season's students (STUDENT profiles).
+
+    Built with one indexed query. With USE_PROGRESS_DISTRIBUTION_CACHE the
+    values and their total are cached (versioned, so any SeasonCompletion
+    change is visible on the next request).
+    """
+
+    HIGH_THRESHOLD = 75
+    MODERATE_THRESHOLD = 40
+
+    def __init__(self, values, total=None):
+        self.values = values
+        self.total = sum(values) if total is None else total
+
+    @classmethod
+    def for_season(cls, season_id):
+        if not _distribution_cache_enabled():
+            return cls(cls._load(season_id))
+
+        version = cache.get_or_set(_distribution_version_key(season_id), 1, None)
+        key = f'progress_distribution_{season_id}_v{version}'
+        snapshot = cache.get(key)
+        if snapshot is None:
+            values = cls._load(season_id)
+            snapshot = {'values': values, 'total': sum(values)}
+            cache.set(key, snapshot, SNAPSHOT_TTL)
+        return cls(snapshot['values'], snapshot['total'])
+
+    @staticmethod
+    def _load(season_id):
+        return list(
+            SeasonCompletion.objects.filter(season_id=season_id, student__profile__role='STUDENT')
+            .order_by('completion_percentage')
+            .values_list('completion_percentage', flat=True)
+        )
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def average(self):
+        return round(self.total / len(self.values), 1) if self.values else 0
+
+    def count_below(self, value):
+        return bisect_left(self.values, value)
+
+    def bucket_counts(self):
+        below_high = self.count_below(self.HIGH_THRESHOLD)
+        below_moderate = self.count_below(self.MODERATE_THRESHOLD)
+        return {
+            'high_performers': len(self.values) - below_high,
+            'moderate_performers': below_high - below_moderate,
+            'low_performers': below_moderate,
+        }
+
+    def percentile_of(self, value):
+        """Share of the batch strictly below `value`, 0-100"""
+        if not self.values:
+            return 0
+        return round(self.count_below(value) / len(self.values) * 100, 1)
+
 
 class ProgressNotificationService:
     """
@@ -60,57 +221,24 @@ class ProgressNotificationService:
         Returns total students, average progress, and distribution
         """
         if not season:
-            season = Season.objects.filter(is_active=True).first()
+            season = get_active_season()
         
         if not season:
             return None
         
-        # Get all students who have episode progress
-        students_with_progress = User.objects.filter(
-            episode_progress__episode__season=season
-        ).distinct()
-        
-        total_students = students_with_progress.count()
+        distribution = CompletionDistribution.for_season(season.id)
         
-        if total_students == 0:
+        if len(distribution) == 0:
             return {
                 'total_students': 0,
                 'average_progress': 0,
                 'season_name': season.name if season else None,
             }
         
-        # TODO: Fix completion_percentage calculation - it's a computed field not a DB field
-        # Calculate average progress across all students
-        # avg_data = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     status__in=['unlocked', 'in_progress', 'completed']
-        # ).aggregate(
-        #     avg_completion=Avg('completion_percentage')
-        # )
-        
-        # Count students in different progress ranges
-        # high_performers = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     completion_percentage__gte=75
-        # ).values('student').distinct().count()
-        
-        # moderate_performers = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     completion_percentage__gte=40,
-        #     completion_percentage__lt=75
-        # ).values('student').distinct().count()
-        
-        # low_performers = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     completion_percentage__lt=40
-        # ).values('student').distinct().count()
-        
         return {
-            'total_students': total_students,
-            'average_progress': 0,  # round(avg_data['avg_completion'] or 0, 1),
-            'high_performers': 0,  # high_performers,
-            'moderate_performers': 0,  # moderate_performers,
-            'low_performers': 0,  # low_performers,
+            'total_students': len(distribution),
+            'average_progress': distribution.average,
+            **distribution.bucket_counts(),
             'season_name': season.name,
             'season_id': season.id,
         }
@@ -122,7 +250,7 @@ class ProgressNotificationService:
         Returns comparison data and motivational message
         """
         if not season:
-            season = Season.objects.filter(is_active=True).first()
+            season = get_active_season()
         
         if not season:
             return None
@@ -133,19 +261,9 @@ class ProgressNotificationService:
         if not batch_stats or batch_stats['total_students'] == 0:
             return None
         
-        # Get student's current episode progress
-        try:
-            current_progress = EpisodeProgress.objects.filter(
-                student=student,
-                episode__season=season,
-                status__in=['unlocked', 'in_progress', 'completed']
-            ).latest('episode__episode_number')
-            
-            # TODO: Calculate completion_percentage properly - it's not a DB field
-            # For now, use a simple calculation based on completed tasks
-            student_progress = 0  # current_progress.completion_percentage
-        except EpisodeProgress.DoesNotExist:
-            student_progress = 0
+        student_progress = SeasonCompletion.objects.filter(
+            student=student, season=season
+        ).values_list('completion_percentage', flat=True).first() or 0
         
         batch_average = batch_stats['average_progress']
         difference = student_progress - batch_average
@@ -168,17 +286,7 @@ class ProgressNotificationService:
         message = random.choice(cls.MOTIVATIONAL_MESSAGES[category])
         
         # Calculate percentile rank
-        # TODO: Fix this - completion_percentage is not a DB field
-        # students_below = EpisodeProgress.objects.filter(
-        #     episode__season=season,
-        #     completion_percentage__lt=student_progress
-        # ).values('student').distinct().count()
-        
-        students_below = 0
-        
-        percentile = 0
-        if batch_stats['total_students'] > 0:
-            percentile = round((students_below / batch_stats['total_students']) * 100, 1)
+        percentile = CompletionDistribution.for_season(season.id).percentile_of(student_progress)
         
         return {
             'student_progress': round(student_progress, 1),
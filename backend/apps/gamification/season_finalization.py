@@ -0,0 +1,220 @@
+"""
+Cohort Season Finalization
+Finalizes a season for every eligible student in one run
+
+SeasonScoringService.finalize_season handles a single student and rebuilds
+the whole leaderboard on each call, so finalizing a cohort that way is
+quadratic. This pipeline:
+
+- Picks eligible students (all episodes completed, season not yet
+  finalized) in chunks of CHUNK_SIZE, ordered by student id
+- Scores each chunk with one query per pillar instead of per student
+- Updates SeasonScores, LegacyScores and VaultWallets with bulk_update and
+  batch-inserts the VaultTransactions, one transaction per chunk
+- Rebuilds the leaderboard once at the end
+
+A finalized chunk is committed with season_completed=True, so a run that
+is interrupted simply picks up the remaining students when started again.
+
+Usage:
+    from apps.gamification.season_finalization import CohortFinalizationService
+
+    stats = CohortFinalizationService.finalize(season, campus='TECH', floor=2)
+"""
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import (
+    EpisodeProgress, LegacyScore, SCDStreak, SeasonScore, VaultTransaction, VaultWallet
+)
+from .services import SeasonRecordService, SeasonScoringService
+from .student_overview import invalidate_student_overview
+
+
+class CohortFinalizationService:
+    """Finalize a season for many students with a constant number of queries per chunk"""
+
+    CHUNK_SIZE = 200
+    EPISODES_PER_SEASON = 4
+
+    SCORE_FIELDS = [
+        'clt_score', 'iipc_score', 'scd_score', 'cfc_score', 'outcome_score',
+        'total_score', 'season_completed', 'completed_at', 'updated_at',
+    ]
+
+    @classmethod
+    def eligible_students(cls, season, campus=None, floor=None):
+        """Ids of students who completed every episode but are not finalized yet"""
+        finalized = SeasonScore.objects.filter(season=season, season_completed=True).values('student_id')
+        progress = EpisodeProgress.objects.filter(
+            episode__season=season, status='completed'
+        ).exclude(student_id__in=finalized)
+        if campus:
+            progress = progress.filter(student__profile__campus=campus)
+        if floor:
+            progress = progress.filter(student__profile__floor=floor)
+        return (
+            progress.values('student_id')
+            .annotate(completed=Count('id'))
+            .filter(completed=cls.EPISODES_PER_SEASON)
+            .order_by('student_id')
+            .values_list('student_id', flat=True)
+        )
+
+    @classmethod
+    def status(cls, season, campus=None, floor=None):
+        """Counts for progress reporting"""
+        finalized = SeasonScore.objects.filter(season=season, season_completed=True)
+        if campus:
+            finalized = finalized.filter(student__profile__campus=campus)
+        if floor:
+            finalized = finalized.filter(student__profile__floor=floor)
+        return {
+            'finalized': finalized.count(),
+            'pending': cls.eligible_students(season, campus, floor).count(),
+        }
+
+    @classmethod
+    def finalize(cls, season, campus=None, floor=None, chunk_size=None, on_progress=None):
+        """
+        Finalize every eligible student, then rebuild the leaderboard once.
+
+        on_progress: called as on_progress(finalized_so_far, pending_at_start)
+                     after each committed chunk
+
+        Returns {'finalized': n, 'chunks': n, 'credits': n}
+        """
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        stats = {'finalized': 0, 'chunks': 0, 'credits': 0}
+        pending = cls.eligible_students(season, campus, floor).count()
+
+        last_id = 0
+        while True:
+            student_ids = list(
+                cls.eligible_students(season, campus, floor).filter(student_id__gt=last_id)[:chunk_size]
+            )
+            if not student_ids:
+                break
+            stats['credits'] += cls._finalize_chunk(season, student_ids)
+            stats['finalized'] += len(student_ids)
+            stats['chunks'] += 1
+            last_id = student_ids[-1]
+            if on_progress:
+                on_progress(stats['finalized'], pending)
+
+        # Also runs when nothing was pending, so a run that stopped after the
+        # last chunk but before this point still leaves a complete leaderboard
+        SeasonScoringService._update_leaderboard(season)
+        return stats
+
+    @classmethod
+    def _finalize_chunk(cls, season, student_ids):
+        now = timezone.now()
+        pillars = cls._pillar_scores(student_ids)
+
+        with transaction.atomic():
+            SeasonRecordService.provision(season, student_ids)
+            LegacyScore.objects.bulk_create(
+                [LegacyScore(student_id=student_id) for student_id in student_ids], ignore_conflicts=True
+            )
+            VaultWallet.objects.bulk_create(
+                [VaultWallet(student_id=student_id) for student_id in student_ids], ignore_conflicts=True
+            )
+
+            season_scores = list(
+                SeasonScore.objects.select_for_update()
+                .filter(season=season, student_id__in=student_ids, season_completed=False)
+            )
+            streaks = {
+                streak.student_id: streak
+                for streak in SCDStreak.objects.filter(season=season, student_id__in=student_ids)
+            }
+            legacy_scores = LegacyScore.objects.select_for_update().in_bulk(student_ids, field_name='student_id')
+            wallets = VaultWallet.objects.only('id', 'student_id').in_bulk(student_ids, field_name='student_id')
+
+            transactions = []
+            credits = 0
+            for season_score in season_scores:
+                student_id = season_score.student_id
+                streak = streaks[student_id]
+                streak.season = season
+
+                season_score.clt_score = pillars['clt'].get(student_id, 0)
+                season_score.iipc_score = pillars['iipc'].get(student_id, 0)
+                season_score.scd_score = streak.calculate_streak_score(save=False)
+                season_score.cfc_score = pillars['cfc'].get(student_id, 0)
+                season_score.outcome_score = 0
+                season_score.calculate_total()
+                season_score.season_completed = True
+                season_score.completed_at = now
+                season_score.updated_at = now
+
+                # Legacy Score with Ascension Bonus
+                legacy_score = legacy_scores[student_id]
+                legacy_score.add_season_score(season_score, save=False)
+                legacy_score.updated_at = now
+
+                # Vault Credits (1 credit per 10 points), applied in SQL as in VaultService
+                vault_credits = season_score.total_score // 10
+                wallet = wallets[student_id]
+                wallet.available_credits = F('available_credits') + vault_credits
+                wallet.total_earned = F('total_earned') + vault_credits
+                wallet.updated_at = now
+                transactions.append(VaultTransaction(
+                    wallet=wallet,
+                    transaction_type='earn',
+                    amount=vault_credits,
+                    reason=f"Season {season.season_number} completion",
+                ))
+                credits += vault_credits
+
+            SeasonScore.objects.bulk_update(season_scores, cls.SCORE_FIELDS)
+            SCDStreak.objects.bulk_update([streaks[score.student_id] for score in season_scores], ['streak_score'])
+            LegacyScore.objects.bulk_update(
+                [legacy_scores[score.student_id] for score in season_scores],
+                LegacyScore.RECALCULATED_FIELDS + ['updated_at'],
+            )
+            VaultWallet.objects.bulk_update(
+                [entry.wallet for entry in transactions], ['available_credits', 'total_earned', 'updated_at']
+            )
+            VaultTransaction.objects.bulk_create(transactions)
+
+        # bulk writes skip post_save, so drop cached overviews here
+        for student_id in student_ids:
+            invalidate_student_overview(student_id)
+        return credits
+
+    @staticmethod
+    def _pillar_scores(student_ids):
+        """
+        Pillar scores for a chunk, one query per submission type.
+        Mirrors SeasonScoringService._calculate_*_score.
+        """
+        from apps.clt.models import CLTSubmission
+        from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
+        from apps.cfc.models import (
+            HackathonSubmission, BMCVideoSubmission, GenAIProjectSubmission, InternshipSubmission
+        )
+
+        def approved(model):
+            return set(
+                model.objects.filter(user_id__in=student_ids, status='approved')
+                .values_list('user_id', flat=True).distinct()
+            )
+
+        clt = approved(CLTSubmission)
+        iipc = [approved(LinkedInPostVerification), approved(LinkedInConnectionVerification)]
+        cfc = [
+            approved(HackathonSubmission), approved(BMCVideoSubmission),
+            approved(GenAIProjectSubmission), approved(InternshipSubmission),
+        ]
+        return {
+            'clt': {student_id: 100 for student_id in clt},
+            'iipc': {
+                student_id: sum(100 for users in iipc if student_id in users) for student_id in student_ids
+            },
+            'cfc': {
+                student_id: sum(200 for users in cfc if student_id in users) for student_id in student_ids
+            },
+        }
@@ -41,21 +41,8 @@ class EpisodeProgressSerializer(serializers.ModelSerializer):
     
     def get_completion_percentage(self, obj):
         episode_num = obj.episode.episode_number
-        completed_tasks = 0
-        total_tasks = 0
-        
-        if episode_num == 1:
-            total_tasks = 2
-            completed_tasks = sum([obj.clt_completed, obj.scd_streak_active])
-        elif episode_num == 2:
-            total_tasks = 3
-            completed_tasks = sum([obj.cfc_task1_completed, obj.iipc_task1_completed, obj.scd_streak_active])
-        elif episode_num == 3:
-            total_tasks = 3
-            completed_tasks = sum([obj.cfc_task2_completed, obj.iipc_task2_completed, obj.scd_streak_active])
-        elif episode_num == 4:
-            total_tasks = 3
-            completed_tasks = sum([obj.cfc_task3_completed, obj.sri_completed, obj.scd_streak_active])
+        total_tasks = len(obj.REQUIRED_TASKS.get(episode_num, []))
+        completed_tasks = obj.count_completed_tasks(episode_num, vars(obj))
         
         return (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
 
@@ -111,6 +98,8 @@ class VaultWalletSerializer(serializers.ModelSerializer):
                   'total_spent', 'recent_transactions', 'created_at', 'updated_at']
     
     def get_recent_transactions(self, obj):
+        if obj.pk is None:
+            return []
         transactions = obj.transactions.all()[:10]
         return VaultTransactionSerializer(transactions, many=True).data
 
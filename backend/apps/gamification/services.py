@@ -2,12 +2,17 @@
 Service layer for Gamification System
 Handles scoring, episode progression, season finalization
 """
-from django.db import transaction
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from .models import (
-    Season, Episode, EpisodeProgress, SeasonScore, LegacyScore,
-    VaultWallet, SCDStreak, LeaderboardEntry, PercentileBracket
+    Season, Episode, EpisodeProgress, SeasonCompletion, SeasonScore, LegacyScore,
+    VaultWallet, VaultTransaction, SCDStreak, LeaderboardEntry, PercentileBracket, UserTitle
 )
 
 User = get_user_model()
@@ -157,8 +162,9 @@ class SeasonScoringService:
         
         # Allocate Vault Credits (1 credit per 10 points)
         vault_credits = season_score.total_score // 10
-        wallet, _ = VaultWallet.objects.get_or_create(student=student)
-        wallet.add_credits(vault_credits, f"Season {season.season_number} completion")
+        VaultService.credit(
+            VaultService.wallet_for(student.id), vault_credits, f"Season {season.season_number} completion"
+        )
         
         # Update leaderboard
         SeasonScoringService._update_leaderboard(season)
@@ -275,49 +281,55 @@ class SeasonScoringService:
         Calculate percentile brackets for others
         """
         # Get all completed season scores
-        completed_scores = SeasonScore.objects.filter(
+        completed_scores = list(SeasonScore.objects.filter(
             season=season,
-            season_completed=True
-        ).order_by('-total_score')
+            season_completed=True,
+            student__profile__role='STUDENT',
+        ).order_by('-total_score', 'id').values_list('student_id', 'total_score'))
         
         # Clear existing leaderboard
         LeaderboardEntry.objects.filter(season=season).delete()
         PercentileBracket.objects.filter(season=season).delete()
         
         # Create top 3 leaderboard
-        for idx, score in enumerate(completed_scores[:3], start=1):
-            rank_title = 'Season Champion' if idx == 1 else 'Elite Runner'
-            LeaderboardEntry.objects.create(
+        LeaderboardEntry.objects.bulk_create([
+            LeaderboardEntry(
                 season=season,
-                student=score.student,
+                student_id=student_id,
                 rank=idx,
-                season_score=score.total_score,
-                rank_title=rank_title
+                season_score=total_score,
+                rank_title='Season Champion' if idx == 1 else 'Elite Runner'
             )
+            for idx, (student_id, total_score) in enumerate(completed_scores[:3], start=1)
+        ])
         
         # Calculate percentiles for others
-        total_count = completed_scores.count()
-        if total_count > 3:
-            for score in completed_scores[3:]:
-                # Calculate percentile
-                rank_position = list(completed_scores.values_list('id', flat=True)).index(score.id) + 1
-                percentile_value = (rank_position / total_count) * 100
-                
-                if percentile_value <= 10:
-                    percentile = 'top_10'
-                elif percentile_value <= 25:
-                    percentile = 'top_25'
-                elif percentile_value <= 50:
-                    percentile = 'top_50'
-                else:
-                    percentile = 'below_50'
-                
-                PercentileBracket.objects.create(
-                    student=score.student,
-                    season=season,
-                    percentile=percentile,
-                    season_score=score.total_score
-                )
+        total_count = len(completed_scores)
+        brackets = []
+        for rank_position, (student_id, total_score) in enumerate(completed_scores[3:], start=4):
+            percentile_value = (rank_position / total_count) * 100
+            
+            if percentile_value <= 10:
+                percentile = 'top_10'
+            elif percentile_value <= 25:
+                percentile = 'top_25'
+            elif percentile_value <= 50:
+                percentile = 'top_50'
+            else:
+                percentile = 'below_50'
+            
+            brackets.append(PercentileBracket(
+                student_id=student_id,
+                season=season,
+                percentile=percentile,
+                season_score=total_score
+            ))
+        PercentileBracket.objects.bulk_create(brackets, batch_size=500)
+        
+        # bulk_create skips post_save, so drop cached overviews here
+        from .student_overview import invalidate_student_overview
+        for student_id, _ in completed_scores:
+            invalidate_student_overview(student_id)
 
 
 class LeetCodeSyncService:
@@ -392,7 +404,7 @@ class LeetCodeSyncService:
         Sync LeetCode streak for a student
         Uses LeetCode GraphQL API
         """
-        import requests
+        from apps import http_client
         
         # Get student's LeetCode username
         try:
@@ -438,13 +450,14 @@ class LeetCodeSyncService:
         """
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 url,
                 json={
                     'query': query,
                     'variables': {'username': leetcode_username}
                 },
-                timeout=10
+                timeout=10,
+                idempotent=True,  # read-only query
             )
             
             if response.status_code == 200:
@@ -498,28 +511,23 @@ class TitleService:
     def redeem_title(student, title):
         """
         Redeem a title using Vault Credits
-        """
-        from .models import UserTitle
         
-        # Check if already owned
-        if UserTitle.objects.filter(student=student, title=title).exists():
+        The title row and the debit share one transaction: the unique
+        (student, title) constraint rejects a second redemption and the
+        conditional debit rejects an overdraft, so concurrent requests
+        cannot double-spend or double-grant.
+        """
+        wallet = VaultService.wallet_for(student.id)
+        try:
+            with transaction.atomic():
+                UserTitle.objects.create(student=student, title=title)
+                if not VaultService.debit(wallet, title.vault_credit_cost, f"Redeemed title: {title.name}"):
+                    transaction.set_rollback(True)
+                    return False, "Insufficient Vault Credits"
+        except IntegrityError:
             return False, "Title already owned"
         
-        # Check wallet balance
-        wallet, _ = VaultWallet.objects.get_or_create(student=student)
-        if wallet.available_credits < title.vault_credit_cost:
-            return False, "Insufficient Vault Credits"
-        
-        # Deduct credits
-        if wallet.spend_credits(title.vault_credit_cost, f"Redeemed title: {title.name}"):
-            # Create user title
-            user_title = UserTitle.objects.create(
-                student=student,
-                title=title
-            )
-            return True, f"Title '{title.name}' redeemed successfully!"
-        
-        return False, "Transaction failed"
+        return True, f"Title '{title.name}' redeemed successfully!"
     
     @staticmethod
     def equip_title(student, title):
@@ -530,3 +538,222 @@ class TitleService:
             return True, f"Title '{title.name}' equipped"
         except UserTitle.DoesNotExist:
             return False, "Title not owned"
+
+
+class SeasonRecordService:
+    """Provision per-season records up front so read paths never have to"""
+    
+    @staticmethod
+    def provision(season, student_ids):
+        """Create zeroed SeasonScore and SCDStreak rows; existing rows are left alone"""
+        student_ids = list(student_ids)
+        SeasonScore.objects.bulk_create(
+            [SeasonScore(student_id=student_id, season=season) for student_id in student_ids],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        SCDStreak.objects.bulk_create(
+            [SCDStreak(student_id=student_id, season=season) for student_id in student_ids],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+    
+    @staticmethod
+    def enroll(season, student_ids):
+        """
+        Bring students who joined mid-season up to date: season records
+        plus episode progress (Episode 1 unlocked, the rest locked)
+        """
+        student_ids = list(student_ids)
+        SeasonRecordService.provision(season, student_ids)
+        EpisodeProgress.objects.bulk_create(
+            [
+                EpisodeProgress(
+                    student_id=student_id,
+                    episode=episode,
+                    status='unlocked' if episode.episode_number == 1 else 'locked',
+                )
+                for episode in season.episodes.all()
+                for student_id in student_ids
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        SeasonCompletion.objects.bulk_create(
+            [SeasonCompletion(student_id=student_id, season=season) for student_id in student_ids],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+
+class LegacyScoreRecalculationService:
+    """
+    Recompute LegacyScores for many students in one pass
+
+    All SeasonScore rows are streamed through a single server-side cursor
+    ordered by (student, season_number), folded per student with the same
+    running previous-score rule as LegacyScore.apply_season_scores, and
+    written back with chunked bulk_update. Memory stays bounded by the
+    chunk size, not the number of students.
+    """
+    
+    CHUNK_SIZE = 1000
+    
+    @classmethod
+    def recalculate(cls, student_ids=None, chunk_size=None, on_change=None):
+        """
+        student_ids: restrict to these students (default: everyone with season scores)
+        on_change:   called as on_change(username, old_total, legacy_score) for changed rows
+        
+        Returns {'students': n, 'updated': n, 'created': n}
+        """
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        stats = {'students': 0, 'updated': 0, 'created': 0}
+        
+        rows = SeasonScore.objects.order_by('student_id', 'season__season_number').values_list(
+            'student_id', 'student__username', 'total_score', 'season_completed'
+        )
+        if student_ids is not None:
+            rows = rows.filter(student_id__in=list(student_ids))
+        
+        chunk = []
+        for (student_id, username), scores in groupby(rows.iterator(chunk_size=chunk_size), key=itemgetter(0, 1)):
+            totals = LegacyScore(student_id=student_id)
+            totals.apply_season_scores((score, completed) for _, _, score, completed in scores)
+            chunk.append((username, totals))
+            if len(chunk) >= chunk_size:
+                cls._write_chunk(chunk, stats, on_change)
+                chunk = []
+        if chunk:
+            cls._write_chunk(chunk, stats, on_change)
+        return stats
+    
+    @staticmethod
+    def _write_chunk(chunk, stats, on_change):
+        from .student_overview import invalidate_student_overview
+        
+        fields = LegacyScore.RECALCULATED_FIELDS
+        existing = LegacyScore.objects.in_bulk(
+            [totals.student_id for _, totals in chunk], field_name='student_id'
+        )
+        now = timezone.now()
+        to_create, to_update = [], []
+        
+        for username, totals in chunk:
+            legacy_score = existing.get(totals.student_id)
+            if legacy_score is None:
+                totals.created_at = totals.updated_at = now
+                to_create.append(totals)
+                if on_change:
+                    on_change(username, 0, totals)
+                continue
+            
+            old_total = legacy_score.total_legacy_points
+            if all(getattr(legacy_score, field) == getattr(totals, field) for field in fields):
+                continue
+            for field in fields:
+                setattr(legacy_score, field, getattr(totals, field))
+            legacy_score.updated_at = now
+            to_update.append(legacy_score)
+            if on_change:
+                on_change(username, old_total, legacy_score)
+        
+        with transaction.atomic():
+            LegacyScore.objects.bulk_create(to_create, ignore_conflicts=True)
+            LegacyScore.objects.bulk_update(to_update, fields + ['updated_at'])
+        
+        # bulk writes skip post_save, so drop cached overviews here
+        for legacy_score in to_create + to_update:
+            invalidate_student_overview(legacy_score.student_id)
+        
+        stats['students'] += len(chunk)
+        stats['created'] += len(to_create)
+        stats['updated'] += len(to_update)
+
+
+class VaultService:
+    """
+    Ledger-backed Vault Credit balances
+    
+    Every balance change is a single conditional UPDATE with F() expressions
+    (no read-modify-write in Python) followed by a VaultTransaction insert
+    in the same transaction. The ledger is the source of truth; reconcile()
+    rebuilds wallet balances from it.
+    """
+    
+    @staticmethod
+    def wallet_for(student_id):
+        """The student's wallet with just enough loaded to post to the ledger"""
+        wallet = VaultWallet.objects.only('id', 'student_id').filter(student_id=student_id).first()
+        if wallet is None:
+            wallet, _ = VaultWallet.objects.get_or_create(student_id=student_id)
+        return wallet
+    
+    @staticmethod
+    @transaction.atomic
+    def credit(wallet, amount, reason=""):
+        """Add credits; returns True"""
+        VaultWallet.objects.filter(pk=wallet.pk).update(
+            available_credits=F('available_credits') + amount,
+            total_earned=F('total_earned') + amount,
+            updated_at=timezone.now(),
+        )
+        VaultTransaction.objects.create(wallet=wallet, transaction_type='earn', amount=amount, reason=reason)
+        return True
+    
+    @staticmethod
+    @transaction.atomic
+    def debit(wallet, amount, reason=""):
+        """Spend credits if the balance covers them; returns False otherwise"""
+        updated = VaultWallet.objects.filter(pk=wallet.pk, available_credits__gte=amount).update(
+            available_credits=F('available_credits') - amount,
+            total_spent=F('total_spent') + amount,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            return False
+        VaultTransaction.objects.create(wallet=wallet, transaction_type='spend', amount=amount, reason=reason)
+        return True
+    
+    @staticmethod
+    def reconcile(student_ids=None, dry_run=False):
+        """
+        Rebuild wallet balances from the transaction ledger.
+        
+        Returns the wallets whose stored balance disagreed with the ledger,
+        as (wallet, stored_values) pairs; wallet already holds the ledger values.
+        """
+        from .student_overview import invalidate_student_overview
+        
+        earned = Coalesce(Sum('transactions__amount', filter=Q(transactions__transaction_type='earn')), 0)
+        spent = Coalesce(Sum('transactions__amount', filter=Q(transactions__transaction_type='spend')), 0)
+        wallets = VaultWallet.objects.annotate(ledger_earned=earned, ledger_spent=spent).exclude(
+            available_credits=F('ledger_earned') - F('ledger_spent'),
+            total_earned=F('ledger_earned'),
+            total_spent=F('ledger_spent'),
+        )
+        if student_ids is not None:
+            wallets = wallets.filter(student_id__in=list(student_ids))
+        
+        drifted = []
+        for wallet in wallets:
+            stored = {
+                'available_credits': wallet.available_credits,
+                'total_earned': wallet.total_earned,
+                'total_spent': wallet.total_spent,
+            }
+            wallet.available_credits = max(wallet.ledger_earned - wallet.ledger_spent, 0)
+            wallet.total_earned = wallet.ledger_earned
+            wallet.total_spent = wallet.ledger_spent
+            wallet.updated_at = timezone.now()
+            drifted.append((wallet, stored))
+        
+        if drifted and not dry_run:
+            VaultWallet.objects.bulk_update(
+                [wallet for wallet, _ in drifted],
+                ['available_credits', 'total_earned', 'total_spent', 'updated_at'],
+                batch_size=500,
+            )
+            for wallet, _ in drifted:
+                invalidate_student_overview(wallet.student_id)
+        return drifted
@@ -1,7 +1,16 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import LegacyScore, VaultWallet, Season, Episode, EpisodeProgress
+from .models import (
+    LegacyScore, VaultWallet, VaultTransaction, Season, Episode, EpisodeProgress, SeasonCompletion,
+    SeasonScore, SCDStreak, LeaderboardEntry, PercentileBracket, UserTitle
+)
+from apps.profiles.models import UserProfile
+from .active_season import get_active_season, invalidate_active_season
+from .progress_notifications import SeasonCompletionTracker, invalidate_distribution
+from .services import SeasonRecordService
+from .student_overview import invalidate_student_overview
 
 User = get_user_model()
 
@@ -14,6 +23,42 @@ def create_gamification_records(sender, instance, created, **kwargs):
         VaultWallet.objects.get_or_create(student=instance)
 
 
+@receiver(post_init, sender=UserProfile)
+def remember_profile_role(sender, instance, **kwargs):
+    # __dict__, so a deferred role isn't loaded for every profile
+    instance._saved_role = instance.__dict__.get('role')
+
+
+@receiver(post_save, sender=UserProfile)
+def sync_season_enrollment(sender, instance, created, **kwargs):
+    """
+    Enroll a profile in the active season when it becomes STUDENT.
+    
+    Records of a profile that stops being STUDENT are kept (switching back
+    restores its progress); leaderboards and batch statistics only count
+    STUDENT profiles.
+    """
+    previous_role = None if created else instance._saved_role
+    instance._saved_role = instance.role
+    if instance.role == previous_role or (created and instance.role != 'STUDENT'):
+        return
+    
+    active_season = get_active_season()
+    if not active_season:
+        return
+    if instance.role == 'STUDENT':
+        SeasonRecordService.enroll(active_season, [instance.user_id])
+    invalidate_distribution(active_season.id)
+
+
+@receiver(post_save, sender=Season)
+@receiver(post_delete, sender=Season)
+def invalidate_cached_active_season(sender, instance, **kwargs):
+    """Season changed: drop the cached active season now and again once committed"""
+    invalidate_active_season()
+    transaction.on_commit(invalidate_active_season)
+
+
 @receiver(post_save, sender=Season)
 def create_episodes_for_season(sender, instance, created, **kwargs):
     """Auto-create 4 episodes when a new season is created"""
@@ -41,24 +86,59 @@ def create_episodes_for_season(sender, instance, created, **kwargs):
             )
 
 
+@receiver(post_save, sender=Season)
+def provision_season_records(sender, instance, created, **kwargs):
+    """Give every student a SeasonScore and SCDStreak for a new season"""
+    if created:
+        student_ids = User.objects.filter(profile__role='STUDENT').values_list('id', flat=True)
+        SeasonRecordService.provision(instance, student_ids)
+
+
 @receiver(post_save, sender=Episode)
 def initialize_student_episode_progress(sender, instance, created, **kwargs):
     """Create EpisodeProgress for all students when new episode is created"""
-    if created and instance.episode_number == 1:
-        # Only Episode 1 starts unlocked
-        students = User.objects.filter(profile__role='STUDENT')
-        for student in students:
-            EpisodeProgress.objects.create(
-                student=student,
-                episode=instance,
-                status='unlocked'
-            )
-    elif created:
-        # Episodes 2-4 start locked
-        students = User.objects.filter(profile__role='STUDENT')
-        for student in students:
-            EpisodeProgress.objects.create(
-                student=student,
-                episode=instance,
-                status='locked'
-            )
+    if not created:
+        return
+    
+    # Only Episode 1 starts unlocked; Episodes 2-4 start locked
+    status = 'unlocked' if instance.episode_number == 1 else 'locked'
+    student_ids = list(User.objects.filter(profile__role='STUDENT').values_list('id', flat=True))
+    EpisodeProgress.objects.bulk_create(
+        [EpisodeProgress(student_id=student_id, episode=instance, status=status) for student_id in student_ids],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    # bulk_create skips post_save; new progress has no tasks done yet
+    SeasonCompletion.objects.bulk_create(
+        [SeasonCompletion(student_id=student_id, season_id=instance.season_id) for student_id in student_ids],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    invalidate_distribution(instance.season_id)
+
+
+@receiver(post_save, sender=EpisodeProgress)
+def update_season_completion(sender, instance, **kwargs):
+    """Re-derive the student's season completion when task flags change"""
+    SeasonCompletionTracker.refresh(instance.student_id, instance.episode.season_id)
+    invalidate_student_overview(instance.student_id)
+
+
+@receiver(post_save, sender=SeasonScore)
+@receiver(post_save, sender=LegacyScore)
+@receiver(post_save, sender=VaultWallet)
+@receiver(post_save, sender=SCDStreak)
+@receiver(post_save, sender=LeaderboardEntry)
+@receiver(post_save, sender=PercentileBracket)
+@receiver(post_save, sender=UserTitle)
+@receiver(post_delete, sender=LeaderboardEntry)
+@receiver(post_delete, sender=PercentileBracket)
+@receiver(post_delete, sender=UserTitle)
+def invalidate_overview_for_student(sender, instance, **kwargs):
+    """Scoring records changed: the student's cached overview is stale"""
+    invalidate_student_overview(instance.student_id)
+
+
+@receiver(post_save, sender=VaultTransaction)
+def invalidate_overview_for_transaction(sender, instance, **kwargs):
+    invalidate_student_overview(instance.wallet.student_id)
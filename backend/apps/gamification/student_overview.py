@@ -0,0 +1,155 @@
+"""
+Student Overview Assembler
+Builds the gamification dashboard payload for one student, read-only
+
+Everything hangs off the user row: one-to-one and per-season records are
+joined in (FilteredRelation + select_related), the current episode and
+recent vault transactions are prefetched. Records that are missing are
+shown with default values instead of being created on a GET; they are
+provisioned when the user or season is created (see signals.py).
+
+With USE_OVERVIEW_CACHE on, the payload is cached per user and season and
+dropped whenever a scoring record of that user changes.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import FilteredRelation, Prefetch, Q
+
+from .models import (
+    EpisodeProgress, LegacyScore, SCDStreak, SeasonScore, VaultTransaction, VaultWallet
+)
+from .serializers import (
+    EpisodeProgressSerializer, EpisodeSerializer, LegacyScoreSerializer, PercentileBracketSerializer,
+    SCDStreakSerializer, SeasonScoreSerializer, SeasonSerializer, VaultWalletSerializer
+)
+
+User = get_user_model()
+
+
+def _overview_version_key(user_id):
+    return f'student_overview_version_{user_id}'
+
+
+def invalidate_student_overview(user_id):
+    """Drop every cached overview of this user"""
+    try:
+        cache.incr(_overview_version_key(user_id))
+    except ValueError:
+        cache.set(_overview_version_key(user_id), 1, None)
+
+
+class StudentOverviewAssembler:
+    """Assemble the student_overview payload without writing anything"""
+
+    @classmethod
+    def get(cls, user, season):
+        if not getattr(settings, 'USE_OVERVIEW_CACHE', False):
+            return cls.assemble(user, season)
+
+        version = cache.get_or_set(_overview_version_key(user.id), 1, None)
+        key = f'student_overview_{user.id}_{season.id}_v{version}'
+        payload = cache.get(key)
+        if payload is None:
+            payload = cls.assemble(user, season)
+            cache.set(key, payload, getattr(settings, 'OVERVIEW_CACHE_TTL', 300))
+        return payload
+
+    @staticmethod
+    def load(user_id, season):
+        """Fetch the user with every record the overview needs"""
+        return (
+            User.objects
+            .annotate(
+                current_season_score=FilteredRelation(
+                    'season_scores', condition=Q(season_scores__season=season)
+                ),
+                current_scd_streak=FilteredRelation(
+                    'scd_streaks', condition=Q(scd_streaks__season=season)
+                ),
+                current_leaderboard_entry=FilteredRelation(
+                    'leaderboard_entries', condition=Q(leaderboard_entries__season=season)
+                ),
+                current_percentile=FilteredRelation(
+                    'percentile_brackets', condition=Q(percentile_brackets__season=season)
+                ),
+                equipped_title=FilteredRelation(
+                    'titles', condition=Q(titles__is_equipped=True)
+                ),
+            )
+            .select_related(
+                'legacy_score',
+                'vault_wallet',
+                'current_season_score',
+                'current_scd_streak',
+                'current_leaderboard_entry',
+                'current_percentile',
+                'equipped_title__title',
+            )
+            .prefetch_related(
+                Prefetch(
+                    'episode_progress',
+                    queryset=EpisodeProgress.objects.filter(
+                        episode__season=season,
+                        status__in=['unlocked', 'in_progress'],
+                    ).select_related('episode').order_by('episode__episode_number'),
+                    to_attr='season_progress',
+                ),
+                Prefetch(
+                    'vault_wallet__transactions',
+                    queryset=VaultTransaction.objects.order_by('-created_at'),
+                ),
+            )
+            .get(pk=user_id)
+        )
+
+    @classmethod
+    def assemble(cls, user, season):
+        student = cls.load(user.pk, season)
+
+        # Current episode: first open one, as in EpisodeService.get_current_episode
+        episode_progress = student.season_progress[0] if student.season_progress else None
+        current_episode = episode_progress.episode if episode_progress else None
+
+        # Unsaved defaults for records that were never provisioned
+        season_score = getattr(student, 'current_season_score', None) or SeasonScore(student=student, season=season)
+        scd_streak = getattr(student, 'current_scd_streak', None) or SCDStreak(student=student, season=season)
+        legacy_score = _related_or_none(student, 'legacy_score') or LegacyScore(student=student)
+        vault_wallet = _related_or_none(student, 'vault_wallet') or VaultWallet(student=student)
+        for record in (season_score, scd_streak):
+            record.season = season
+
+        leaderboard_entry = getattr(student, 'current_leaderboard_entry', None)
+        percentile = getattr(student, 'current_percentile', None)
+        if percentile is not None:
+            percentile.season = season
+            percentile.student = student
+
+        leaderboard_position = "Not Ranked"
+        if leaderboard_entry:
+            leaderboard_position = f"Rank {leaderboard_entry.rank} - {leaderboard_entry.rank_title}"
+        elif percentile:
+            leaderboard_position = percentile.get_percentile_display()
+
+        equipped = getattr(student, 'equipped_title', None)
+
+        return {
+            'current_season': SeasonSerializer(season).data,
+            'current_episode': EpisodeSerializer(current_episode).data if current_episode else None,
+            'episode_progress': EpisodeProgressSerializer(episode_progress).data if episode_progress else None,
+            'season_score': SeasonScoreSerializer(season_score).data,
+            'legacy_score': LegacyScoreSerializer(legacy_score).data,
+            'vault_wallet': VaultWalletSerializer(vault_wallet).data,
+            'scd_streak': SCDStreakSerializer(scd_streak).data,
+            'leaderboard_position': leaderboard_position,
+            'percentile': PercentileBracketSerializer(percentile).data if percentile else None,
+            'equipped_title': equipped.title.name if equipped else None,
+        }
+
+
+def _related_or_none(instance, name):
+    try:
+        return getattr(instance, name)
+    except (LegacyScore.DoesNotExist, VaultWallet.DoesNotExist):
+        return None
+
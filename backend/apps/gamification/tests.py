@@ -0,0 +1,465 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from apps.gamification.models import EpisodeProgress, Season, SeasonCompletion
+from apps.gamification.progress_notifications import (
+    CompletionDistribution, ProgressNotificationService, SeasonCompletionTracker
+)
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'progress-tests'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, USE_PROGRESS_DISTRIBUTION_CACHE=True)
+class ProgressStatisticsTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+        self.students = []
+        for i in range(4):
+            user = User.objects.create_user(username=f'student{i}')
+            self.students.append(user)
+
+        # Episodes (and their progress rows) are created by signals
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1, start_date=date(2026, 1, 1), end_date=date(2026, 1, 28)
+        )
+        self.episode1 = self.season.episodes.get(episode_number=1)
+        self.episode2 = self.season.episodes.get(episode_number=2)
+
+    def complete(self, student, episode, *tasks):
+        progress = EpisodeProgress.objects.get(student=student, episode=episode)
+        for task in tasks:
+            setattr(progress, task, True)
+        progress.save()
+
+    def test_episode_creation_provisions_zero_completions(self):
+        self.assertEqual(SeasonCompletion.objects.filter(season=self.season).count(), 4)
+        stats = ProgressNotificationService.get_batch_statistics(self.season)
+        self.assertEqual(stats['total_students'], 4)
+        self.assertEqual(stats['average_progress'], 0)
+
+    def test_flag_changes_update_persisted_completion(self):
+        self.complete(self.students[0], self.episode1, 'clt_completed', 'scd_streak_active')
+        self.complete(self.students[0], self.episode2, 'cfc_task1_completed')
+
+        completion = SeasonCompletion.objects.get(student=self.students[0], season=self.season)
+        self.assertEqual(completion.tasks_completed, 3)
+        self.assertAlmostEqual(completion.completion_percentage, 27.27, places=2)
+
+    def test_batch_statistics_and_percentile(self):
+        # 11 required tasks per season: 9/11 = 81.8%, 5/11 = 45.5%
+        self.complete(self.students[0], self.episode1, 'clt_completed', 'scd_streak_active')
+        self.complete(self.students[0], self.episode2, 'cfc_task1_completed', 'iipc_task1_completed', 'scd_streak_active')
+        episode3 = self.season.episodes.get(episode_number=3)
+        episode4 = self.season.episodes.get(episode_number=4)
+        self.complete(self.students[0], episode3, 'cfc_task2_completed', 'iipc_task2_completed', 'scd_streak_active')
+        self.complete(self.students[0], episode4, 'cfc_task3_completed')
+        self.complete(self.students[1], self.episode1, 'clt_completed', 'scd_streak_active')
+        self.complete(self.students[1], self.episode2, 'cfc_task1_completed', 'iipc_task1_completed', 'scd_streak_active')
+
+        stats = ProgressNotificationService.get_batch_statistics(self.season)
+        self.assertEqual(stats['high_performers'], 1)
+        self.assertEqual(stats['moderate_performers'], 1)
+        self.assertEqual(stats['low_performers'], 2)
+        self.assertEqual(stats['average_progress'], round((9 + 5) / 11 * 100 / 4, 1))
+
+        comparison = ProgressNotificationService.get_student_comparison(self.students[1], self.season)
+        self.assertEqual(comparison['percentile_rank'], 50.0)
+        self.assertEqual(comparison['student_progress'], 45.5)
+
+    def test_distribution_snapshot_is_cached_until_a_completion_changes(self):
+        CompletionDistribution.for_season(self.season.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(CompletionDistribution.for_season(self.season.id)), 4)
+
+        self.complete(self.students[2], self.episode1, 'clt_completed')
+        self.assertEqual(CompletionDistribution.for_season(self.season.id).values[-1], 9.09)
+
+    def test_saves_that_keep_the_task_count_keep_the_snapshot(self):
+        CompletionDistribution.for_season(self.season.id)
+        progress = EpisodeProgress.objects.get(student=self.students[0], episode=self.episode2)
+        progress.status = 'unlocked'
+        progress.save()
+
+        with self.assertNumQueries(0):
+            distribution = CompletionDistribution.for_season(self.season.id)
+        self.assertEqual(distribution.total, 0)
+
+    @override_settings(USE_PROGRESS_DISTRIBUTION_CACHE=False)
+    def test_distribution_is_read_per_request_without_the_cache(self):
+        self.complete(self.students[0], self.episode1, 'clt_completed')
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                distribution = CompletionDistribution.for_season(self.season.id)
+        self.assertEqual(distribution.total, 9.09)
+
+    def test_rebuild_season_matches_incremental_updates(self):
+        self.complete(self.students[3], self.episode1, 'clt_completed', 'scd_streak_active')
+        EpisodeProgress.objects.filter(student=self.students[3], episode=self.episode2).update(sri_completed=True)
+        SeasonCompletion.objects.all().delete()
+
+        self.assertEqual(SeasonCompletionTracker.rebuild_season(self.season), 4)
+        self.assertEqual(
+            SeasonCompletion.objects.get(student=self.students[3], season=self.season).tasks_completed, 2
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHE, USE_OVERVIEW_CACHE=True)
+class StudentOverviewTests(TestCase):
+    URL = '/api/gamification/dashboard/student_overview/'
+
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework.test import APIClient
+        cache.clear()
+
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1, start_date=date(2026, 1, 1), end_date=date(2026, 1, 28)
+        )
+        # Created after the season: provisioned through the user signal
+        self.student = User.objects.create_user(username='overview-student')
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def test_records_are_provisioned_at_user_creation(self):
+        from apps.gamification.models import SCDStreak, SeasonScore
+        self.assertTrue(SeasonScore.objects.filter(student=self.student, season=self.season).exists())
+        self.assertTrue(SCDStreak.objects.filter(student=self.student, season=self.season).exists())
+
+    def test_overview_is_read_only_and_uses_few_queries(self):
+        from apps.gamification.models import SeasonScore, UserTitle, Title
+        SeasonScore.objects.filter(student=self.student).delete()
+        title = Title.objects.create(name='The Finisher', description='', vault_credit_cost=30)
+        UserTitle.objects.create(student=self.student, title=title, is_equipped=True)
+        self.student.vault_wallet.add_credits(10, 'Bonus')
+
+        # season lookup + user row with joins + 2 prefetches
+        with self.assertNumQueries(4):
+            response = self.client.get(self.URL)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['season_score']['total_score'], 0)
+        self.assertIsNone(data['season_score']['id'])
+        self.assertEqual(data['equipped_title'], 'The Finisher')
+        self.assertEqual(data['vault_wallet']['available_credits'], 10)
+        self.assertEqual(data['vault_wallet']['recent_transactions'][0]['reason'], 'Bonus')
+        self.assertEqual(data['current_episode']['episode_number'], 1)
+        self.assertEqual(data['leaderboard_position'], 'Not Ranked')
+        self.assertFalse(SeasonScore.objects.filter(student=self.student).exists())
+
+    def test_cached_overview_is_invalidated_by_score_updates(self):
+        from apps.gamification.models import SeasonScore
+        self.client.get(self.URL)
+        with self.assertNumQueries(1):
+            self.client.get(self.URL)
+
+        score = SeasonScore.objects.get(student=self.student, season=self.season)
+        score.clt_score = 100
+        score.calculate_total()
+        score.save()
+
+        self.assertEqual(self.client.get(self.URL).json()['season_score']['total_score'], 100)
+
+
+@override_settings(CACHES=LOCMEM_CACHE, USE_SEASON_CACHE=True)
+class ActiveSeasonResolverTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.gamification.active_season import invalidate_active_season
+        cache.clear()
+        invalidate_active_season()
+
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1, start_date=date(2026, 1, 1), end_date=date(2026, 1, 28)
+        )
+
+    def test_resolved_season_is_served_from_memory(self):
+        from apps.gamification.active_season import get_active_season
+
+        self.assertEqual(get_active_season(), self.season)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_active_season(), self.season)
+
+    def test_season_save_invalidates(self):
+        from apps.gamification.active_season import get_active_season
+
+        get_active_season()
+        self.season.is_active = False
+        self.season.save()
+
+        self.assertIsNone(get_active_season())
+
+    def test_other_process_bump_is_seen_after_check_interval(self):
+        from unittest import mock
+        from django.core.cache import cache
+        from apps.gamification import active_season
+
+        active_season.get_active_season()
+        Season.objects.filter(pk=self.season.pk).update(is_active=False)  # no signal
+        cache.incr(active_season.VERSION_KEY)  # as if update_seasons ran elsewhere
+
+        # Still within the check interval: memory copy is trusted
+        self.assertEqual(active_season.get_active_season(), self.season)
+        later = active_season.time.monotonic() + active_season.CHECK_INTERVAL + 1
+        with mock.patch.object(active_season.time, 'monotonic', return_value=later):
+            self.assertIsNone(active_season.get_active_season())
+
+
+class LegacyScoreRecalculationTests(TestCase):
+    SCORES = {
+        'climber': [400, 600, 900],   # two ascensions
+        'dipper': [800, 0, 500, 700],  # zero season is skipped, then one ascension
+        'flat': [0, 0, 0],
+    }
+
+    def setUp(self):
+        from apps.gamification.models import SeasonScore
+
+        self.students = {name: User.objects.create_user(username=name) for name in self.SCORES}
+        # Season creation provisions a zeroed SeasonScore for every student
+        seasons = [
+            Season.objects.create(
+                name=f'Season {n}', season_number=n, is_active=False,
+                start_date=date(2026, n, 1), end_date=date(2026, n, 28),
+            )
+            for n in range(1, 5)
+        ]
+        for name, scores in self.SCORES.items():
+            for season, score in zip(seasons, scores):
+                SeasonScore.objects.filter(student=self.students[name], season=season).update(total_score=score)
+
+    def test_matches_per_student_recalculation(self):
+        from apps.gamification.models import LegacyScore
+        from apps.gamification.services import LegacyScoreRecalculationService
+
+        expected = {}
+        for name, user in self.students.items():
+            legacy_score = LegacyScore.objects.get(student=user)
+            legacy_score.recalculate_from_season_scores()
+            expected[name] = [getattr(legacy_score, field) for field in LegacyScore.RECALCULATED_FIELDS]
+        LegacyScore.objects.update(total_legacy_points=0, ascension_bonus_total=0, seasons_completed=0,
+                                   highest_season_score=0, last_season_score=0)
+
+        stats = LegacyScoreRecalculationService.recalculate(chunk_size=2)
+
+        self.assertEqual(stats, {'students': 3, 'updated': 2, 'created': 0})
+        for name, user in self.students.items():
+            legacy_score = LegacyScore.objects.get(student=user)
+            self.assertEqual([getattr(legacy_score, f) for f in LegacyScore.RECALCULATED_FIELDS], expected[name])
+        climber = LegacyScore.objects.get(student=self.students['climber'])
+        self.assertEqual((climber.total_legacy_points, climber.ascension_bonus_total), (1910, 10))
+
+    def test_missing_legacy_rows_are_created(self):
+        from apps.gamification.models import LegacyScore
+        from apps.gamification.services import LegacyScoreRecalculationService
+
+        LegacyScore.objects.filter(student=self.students['dipper']).delete()
+
+        stats = LegacyScoreRecalculationService.recalculate(student_ids=[self.students['dipper'].id])
+
+        self.assertEqual(stats['created'], 1)
+        dipper = LegacyScore.objects.get(student=self.students['dipper'])
+        self.assertEqual((dipper.total_legacy_points, dipper.seasons_completed), (2005, 3))
+
+    def test_query_count_does_not_grow_with_students(self):
+        from apps.gamification.services import LegacyScoreRecalculationService
+
+        # stream + one chunk: legacy lookup, savepoint, bulk_update, release
+        with self.assertNumQueries(5):
+            LegacyScoreRecalculationService.recalculate()
+
+
+class CohortFinalizationTests(TestCase):
+    def setUp(self):
+        from apps.clt.models import CLTSubmission
+
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1, start_date=date(2026, 1, 1), end_date=date(2026, 1, 28)
+        )
+        self.students = []
+        for i in range(5):
+            user = User.objects.create_user(username=f'cohort{i}')
+            user.profile.campus, user.profile.floor = 'TECH', 2
+            user.profile.save()
+            self.students.append(user)
+        self.unfinished = User.objects.create_user(username='unfinished')
+
+        EpisodeProgress.objects.filter(student__in=self.students).update(status='completed')
+        for user in self.students[:2]:
+            CLTSubmission.objects.create(
+                user=user, title='AI', description='-', platform='Coursera',
+                completion_date=date(2026, 1, 10), status='approved',
+            )
+
+    def test_cohort_matches_single_student_finalization(self):
+        from apps.gamification.models import LegacyScore, SeasonScore, VaultWallet
+        from apps.gamification.season_finalization import CohortFinalizationService
+        from apps.gamification.services import SeasonScoringService
+
+        SeasonScoringService.finalize_season(self.students[0], self.season)
+        expected = SeasonScore.objects.get(student=self.students[0], season=self.season)
+
+        stats = CohortFinalizationService.finalize(self.season, chunk_size=2)
+
+        self.assertEqual(stats['finalized'], 4)
+        self.assertEqual(stats['chunks'], 2)
+        score = SeasonScore.objects.get(student=self.students[1], season=self.season)
+        self.assertTrue(score.season_completed)
+        self.assertEqual(score.total_score, expected.total_score)
+        self.assertEqual(LegacyScore.objects.get(student=self.students[1]).total_legacy_points, score.total_score)
+        wallet = VaultWallet.objects.get(student=self.students[1])
+        self.assertEqual(wallet.available_credits, score.total_score // 10)
+        self.assertEqual(wallet.transactions.count(), 1)
+        self.assertFalse(SeasonScore.objects.get(student=self.unfinished, season=self.season).season_completed)
+
+        self.assertEqual(self.season.leaderboard.count(), 3)
+        self.assertEqual(self.season.percentile_brackets.count(), 2)
+
+    def test_rerun_is_a_no_op(self):
+        from apps.gamification.models import VaultTransaction
+        from apps.gamification.season_finalization import CohortFinalizationService
+
+        CohortFinalizationService.finalize(self.season)
+        stats = CohortFinalizationService.finalize(self.season)
+
+        self.assertEqual(stats['finalized'], 0)
+        self.assertEqual(VaultTransaction.objects.count(), 5)
+        self.assertEqual(CohortFinalizationService.status(self.season), {'finalized': 5, 'pending': 0})
+
+    def test_floor_wing_action_is_scoped_to_floor(self):
+        from rest_framework.test import APIClient
+
+        other_floor = self.students[4]
+        other_floor.profile.floor = 3
+        other_floor.profile.save()
+        floor_wing = User.objects.create_user(username='wing')
+        floor_wing.profile.role, floor_wing.profile.campus, floor_wing.profile.floor = 'FLOOR_WING', 'TECH', 2
+        floor_wing.profile.save()
+
+        client = APIClient()
+        client.force_authenticate(floor_wing)
+        response = client.post(f'/api/gamification/floorwing/seasons/{self.season.id}/finalize/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['finalized'], 4)
+        self.assertEqual(response.json()['pending'], 0)
+
+
+class VaultServiceTests(TestCase):
+    def setUp(self):
+        from apps.gamification.models import Title, VaultWallet
+        from apps.gamification.services import VaultService
+
+        self.student = User.objects.create_user(username='spender')
+        self.wallet = VaultWallet.objects.get(student=self.student)
+        VaultService.credit(self.wallet, 100, 'Season 1 completion')
+        self.title = Title.objects.create(
+            name='Night Owl', description='-', vault_credit_cost=60, rarity='rare'
+        )
+
+    def balance(self):
+        from apps.gamification.models import VaultWallet
+        return VaultWallet.objects.values_list('available_credits', 'total_earned', 'total_spent').get(
+            student=self.student
+        )
+
+    def test_debit_is_a_single_conditional_update(self):
+        from apps.gamification.services import VaultService
+
+        # savepoint, UPDATE ... WHERE available_credits >= 101, release
+        with self.assertNumQueries(3):
+            self.assertFalse(VaultService.debit(self.wallet, 101, 'too much'))
+        self.assertTrue(VaultService.debit(self.wallet, 100, 'all of it'))
+        self.assertEqual(self.balance(), (0, 100, 100))
+
+    def test_redeem_charges_once_and_rejects_repeat(self):
+        from apps.gamification.models import UserTitle
+        from apps.gamification.services import TitleService
+
+        self.assertEqual(TitleService.redeem_title(self.student, self.title)[0], True)
+        self.assertEqual(TitleService.redeem_title(self.student, self.title), (False, 'Title already owned'))
+        self.assertEqual(self.balance(), (40, 100, 60))
+        self.assertEqual(UserTitle.objects.filter(student=self.student).count(), 1)
+        self.assertEqual(TitleService.equip_title(self.student, self.title)[0], True)
+
+    def test_insufficient_credits_leaves_no_title(self):
+        from apps.gamification.models import UserTitle
+        from apps.gamification.services import TitleService
+
+        self.title.vault_credit_cost = 500
+        self.title.save()
+
+        self.assertEqual(TitleService.redeem_title(self.student, self.title), (False, 'Insufficient Vault Credits'))
+        self.assertFalse(UserTitle.objects.exists())
+        self.assertEqual(self.balance(), (100, 100, 0))
+
+    def test_reconcile_rebuilds_balance_from_ledger(self):
+        from apps.gamification.models import VaultWallet
+        from apps.gamification.services import VaultService
+
+        VaultService.debit(self.wallet, 30, 'spend')
+        VaultWallet.objects.filter(pk=self.wallet.pk).update(available_credits=999, total_spent=0)
+
+        drifted = VaultService.reconcile()
+
+        self.assertEqual(len(drifted), 1)
+        self.assertEqual(drifted[0][1]['available_credits'], 999)
+        self.assertEqual(self.balance(), (70, 100, 30))
+        self.assertEqual(VaultService.reconcile(), [])
+
+
+class SeasonEnrollmentTests(TestCase):
+    def setUp(self):
+        from apps.gamification.active_season import invalidate_active_season
+        invalidate_active_season()
+
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1, start_date=date(2026, 1, 1), end_date=date(2026, 1, 28)
+        )
+
+    def season_rows(self, user):
+        from apps.gamification.models import SCDStreak, SeasonScore
+        return {
+            'score': SeasonScore.objects.filter(student=user, season=self.season).count(),
+            'streak': SCDStreak.objects.filter(student=user, season=self.season).count(),
+            'progress': EpisodeProgress.objects.filter(student=user, episode__season=self.season).count(),
+            'completion': SeasonCompletion.objects.filter(student=user, season=self.season).count(),
+        }
+
+    def test_leaving_the_student_role_keeps_progress_but_not_the_ranking(self):
+        from apps.gamification.models import SeasonScore
+        from rest_framework.test import APIClient
+
+        student = User.objects.create_user(username='student')
+        mentor = User.objects.create_user(username='mentor')
+        SeasonScore.objects.filter(student=mentor, season=self.season).update(total_score=90)
+        SeasonCompletion.objects.filter(student=mentor, season=self.season).update(completion_percentage=50)
+        mentor.profile.role = 'MENTOR'
+        mentor.profile.save()
+
+        # Nothing is deleted, so switching back would restore the progress
+        self.assertEqual(self.season_rows(mentor), {'score': 1, 'streak': 1, 'progress': 4, 'completion': 1})
+        stats = ProgressNotificationService.get_batch_statistics(self.season)
+        self.assertEqual((stats['total_students'], stats['average_progress']), (1, 0))
+
+        client = APIClient()
+        client.force_authenticate(mentor)
+        leaderboard = client.get('/api/gamification/leaderboard/full_leaderboard/').json()
+        self.assertEqual([row['student_username'] for row in leaderboard['leaderboard']], [student.username])
+        self.assertEqual(leaderboard['total_students'], 1)
+
+    def test_becoming_a_student_enrolls(self):
+        user = User.objects.create_user(username='late-student')
+        user.profile.role = 'FLOOR_WING'
+        user.profile.save()
+
+        profile = User.objects.get(pk=user.pk).profile
+        profile.role = 'STUDENT'
+        profile.save()
+
+        self.assertEqual(self.season_rows(user), {'score': 1, 'streak': 1, 'progress': 4, 'completion': 1})
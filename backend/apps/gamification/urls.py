@@ -35,5 +35,6 @@ urlpatterns = [
     path('floorwing/seasons/', floorwing_views.manage_seasons, name='floorwing-seasons'),
     path('floorwing/seasons/<int:season_id>/', floorwing_views.manage_season_detail, name='floorwing-season-detail'),
     path('floorwing/seasons/<int:season_id>/episodes/', floorwing_views.manage_episodes, name='floorwing-episodes'),
+    path('floorwing/seasons/<int:season_id>/finalize/', floorwing_views.finalize_season_cohort, name='floorwing-finalize-season'),
     path('floorwing/episodes/<int:episode_id>/', floorwing_views.manage_episode_detail, name='floorwing-episode-detail'),
 ]
@@ -3,7 +3,6 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -17,10 +16,12 @@ from .serializers import (
     SeasonSerializer, EpisodeSerializer, EpisodeProgressSerializer,
     SeasonScoreSerializer, LegacyScoreSerializer, VaultWalletSerializer,
     SCDStreakSerializer, LeaderboardEntrySerializer, TitleSerializer,
-    UserTitleSerializer, PercentileBracketSerializer, StudentDashboardSerializer
+    UserTitleSerializer, StudentDashboardSerializer
 )
 from .services import EpisodeService, TitleService, LeetCodeSyncService
+from .active_season import get_active_season
 from .progress_notifications import ProgressNotificationService
+from .student_overview import StudentOverviewAssembler
 
 
 class SeasonViewSet(viewsets.ReadOnlyModelViewSet):
@@ -35,13 +36,9 @@ class SeasonViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Get current active season"""
-        current_season = Season.objects.filter(
-            is_active=True,
-            start_date__lte=timezone.now().date(),
-            end_date__gte=timezone.now().date()
-        ).first()
+        current_season = get_active_season()
         
-        if current_season:
+        if current_season and current_season.is_current:
             serializer = self.get_serializer(current_season)
             return Response(serializer.data)
         return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
@@ -79,7 +76,7 @@ class EpisodeProgressViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Get current episode progress"""
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -111,7 +108,7 @@ class SeasonScoreViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Get current season score"""
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -177,7 +174,7 @@ class SCDStreakViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def current(self, request):
         """Get current season streak"""
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -192,7 +189,7 @@ class SCDStreakViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['post'])
     def sync(self, request):
         """Manually trigger streak sync"""
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -224,13 +221,13 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def current_season(self, request):
         """Get current season's top 3 with real-time scores (for students)"""
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
         # Get top 3 from real-time scores
         top_3 = SeasonScore.objects.filter(
-            season=current_season
+            season=current_season, student__profile__role='STUDENT'
         ).select_related('student').order_by('-total_score', 'student__username')[:3]
         
         leaderboard_data = []
@@ -251,13 +248,13 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def full_leaderboard(self, request):
         """Get full leaderboard with real-time scores (for mentors and floor wings)"""
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
         # Get all season scores ordered by total_score (real-time)
         all_scores = SeasonScore.objects.filter(
-            season=current_season
+            season=current_season, student__profile__role='STUDENT'
         ).select_related('student').order_by('-total_score', 'student__username')
         
         # Build leaderboard with ranks
@@ -311,7 +308,7 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def my_position(self, request):
         """Get user's position (rank or percentile)"""
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -351,7 +348,7 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def mentee_leaderboard(self, request):
         """Get real-time leaderboard for mentor's mentees only"""
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
@@ -510,63 +507,12 @@ class DashboardViewSet(viewsets.ViewSet):
         user = request.user
         
         # Get current season
-        current_season = Season.objects.filter(is_active=True).first()
+        current_season = get_active_season()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
-        # Get current episode
-        current_episode = EpisodeService.get_current_episode(user, current_season)
-        
-        # Get progress
-        episode_progress = None
-        if current_episode:
-            episode_progress = EpisodeProgress.objects.filter(
-                student=user,
-                episode=current_episode
-            ).first()
-        
-        # Get scores
-        season_score, _ = SeasonScore.objects.get_or_create(student=user, season=current_season)
-        legacy_score, _ = LegacyScore.objects.get_or_create(student=user)
-        vault_wallet, _ = VaultWallet.objects.get_or_create(student=user)
-        scd_streak, _ = SCDStreak.objects.get_or_create(student=user, season=current_season)
-        
-        # Get leaderboard position
-        leaderboard_entry = LeaderboardEntry.objects.filter(
-            season=current_season,
-            student=user
-        ).first()
-        
-        percentile = PercentileBracket.objects.filter(
-            season=current_season,
-            student=user
-        ).first()
-        
-        leaderboard_position = "Not Ranked"
-        if leaderboard_entry:
-            leaderboard_position = f"Rank {leaderboard_entry.rank} - {leaderboard_entry.rank_title}"
-        elif percentile:
-            leaderboard_position = percentile.get_percentile_display()
-        
-        # Get equipped title
-        equipped_title_obj = UserTitle.objects.filter(student=user, is_equipped=True).first()
-        equipped_title = equipped_title_obj.title.name if equipped_title_obj else None
-        
-        # Compile dashboard data
-        dashboard_data = {
-            'current_season': SeasonSerializer(current_season).data,
-            'current_episode': EpisodeSerializer(current_episode).data if current_episode else None,
-            'episode_progress': EpisodeProgressSerializer(episode_progress).data if episode_progress else None,
-            'season_score': SeasonScoreSerializer(season_score).data,
-            'legacy_score': LegacyScoreSerializer(legacy_score).data,
-            'vault_wallet': VaultWalletSerializer(vault_wallet).data,
-            'scd_streak': SCDStreakSerializer(scd_streak).data,
-            'leaderboard_position': leaderboard_position,
-            'percentile': PercentileBracketSerializer(percentile).data if percentile else None,
-            'equipped_title': equipped_title,
-        }
-        
-        return Response(dashboard_data)
+        # Read-only: missing records are provisioned at user/season creation
+        return Response(StudentOverviewAssembler.get(user, current_season))
 
 
 class ProgressNotificationViewSet(viewsets.ViewSet):
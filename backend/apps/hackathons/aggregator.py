@@ -0,0 +1,418 @@
+"""
+External Hackathon Aggregator
+Scrapes Devpost, MLH and Devfolio off the request path
+
+Fetching three sites per page view made /api/hackathons/list/ take up to
+30 seconds, and every anonymous visitor caused three outbound scrapes.
+Now:
+
+- refresh() fetches all sources concurrently, parses and normalizes them,
+  and replaces each successful source's rows in ExternalHackathon. A
+  source that fails (or parses to nothing) keeps its previous rows.
+- listing() serves the table (deduped across sources, ordered by start
+  date), cached for HACKATHON_LISTING_TTL, with an ETag for conditional GETs.
+- refresh() runs from `manage.py refresh_hackathons` (cron) and, with
+  HACKATHON_BACKGROUND_REFRESH on, in a background thread when the
+  listing is older than HACKATHON_REFRESH_INTERVAL.
+
+Parsers take the raw response body, so they can be tested against
+recorded pages without network access.
+
+Usage:
+    from apps.hackathons.aggregator import HackathonAggregator
+
+    HackathonAggregator.refresh()
+    payload, etag = HackathonAggregator.listing()
+"""
+import hashlib
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from apps import http_client
+
+logger = logging.getLogger(__name__)
+
+LISTING_CACHE_KEY = 'hackathon_listing'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+PER_SOURCE_LIMIT = 15
+DATE_FORMATS = ['%b %d, %Y', '%Y-%m-%d', '%B %d, %Y', '%d %b %Y']
+
+_refresh_lock = threading.Lock()
+
+
+def dedupe_key(name):
+    """Same key the listing always used to drop cross-source duplicates"""
+    return name.lower().replace(' ', '')[:20]
+
+
+def parse_date(date_str):
+    """Parse the formats the sources publish; None when unknown"""
+    if not date_str or date_str == 'TBA':
+        return None
+    date_str = date_str.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    try:
+        # Devfolio: ISO timestamps
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
+    except ValueError:
+        return None
+
+
+def _fit(model, field, value):
+    """Trim scraped strings to the column length"""
+    max_length = model._meta.get_field(field).max_length
+    if isinstance(value, str) and max_length:
+        return value[:max_length]
+    return value
+
+
+def parse_devpost(html):
+    from bs4 import BeautifulSoup
+
+    hackathons = []
+    soup = BeautifulSoup(html, 'lxml')
+    for tile in soup.find_all('div', class_='hackathon-tile')[:PER_SOURCE_LIMIT]:
+        title_elem = tile.find('h3')
+        link_elem = tile.find('a', class_='link-to-hackathon')
+        date_elem = tile.find('div', class_='submission-period')
+        location_elem = tile.find('div', class_='info-with-icon')
+
+        name = title_elem.text.strip() if title_elem else 'Devpost Hackathon'
+        url = link_elem['href'] if link_elem and 'href' in link_elem.attrs else 'https://devpost.com'
+        date = date_elem.text.strip() if date_elem else 'TBA'
+        location = location_elem.text.strip() if location_elem else 'Online'
+
+        hackathons.append({
+            'external_id': url,
+            'name': name,
+            'start_date': date,
+            'end_date': '',
+            'location': location,
+            'url': url if url.startswith('http') else f"https://devpost.com{url}",
+            'logo': '',
+            'is_online': 'online' in location.lower() or 'remote' in location.lower(),
+            'description': f'Join {name} on Devpost and showcase your skills!',
+        })
+    return hackathons
+
+
+def parse_mlh(html):
+    from bs4 import BeautifulSoup
+
+    hackathons = []
+    soup = BeautifulSoup(html, 'lxml')
+    events = soup.find_all('div', class_='event')
+    if not events:
+        events = soup.find_all('a', href=lambda x: x and '/events/' in str(x))
+
+    for event in events[:PER_SOURCE_LIMIT]:
+        name_elem = event.find('h3') or event.find('h2') or event.find(['strong', 'b'])
+        name = name_elem.text.strip() if name_elem else 'MLH Hackathon'
+
+        date_elem = event.find('p', class_='event-date') or event.find('time')
+        date = date_elem.text.strip() if date_elem else 'TBA'
+
+        location_elem = event.find('p', class_='event-location') or event.find('span', class_='location')
+        location = location_elem.text.strip() if location_elem else 'Various Locations'
+
+        link = event.get('href', '') if event.name == 'a' else (event.find('a')['href'] if event.find('a') else '')
+        url = link if link.startswith('http') else f"https://mlh.io{link}" if link else 'https://mlh.io'
+
+        hackathons.append({
+            'external_id': url if link else name,
+            'name': name,
+            'start_date': date,
+            'end_date': '',
+            'location': location,
+            'url': url,
+            'logo': '',
+            'is_online': 'online' in location.lower() or 'virtual' in location.lower(),
+            'description': f'MLH Season 2026 event - {name}',
+        })
+    return hackathons
+
+
+def parse_devfolio(body):
+    data = json.loads(body)
+    hackathons = []
+    for event in data.get('hackathons', [])[:PER_SOURCE_LIMIT]:
+        hackathons.append({
+            'external_id': str(event.get('id') or event.get('slug', '')),
+            'name': event.get('name', 'Unnamed Hackathon'),
+            'start_date': event.get('starts_at') or 'TBA',
+            'end_date': event.get('ends_at') or '',
+            'location': event.get('city') or 'India',
+            'url': f"https://devfolio.co/hackathons/{event.get('slug', '')}",
+            'logo': event.get('logo') or '',
+            'is_online': bool(event.get('is_online', False)),
+            'description': event.get('tagline') or 'Join this exciting hackathon',
+            'prize_amount': str(event.get('prizes') or ''),
+        })
+    return hackathons
+
+
+class HackathonAggregator:
+    """Fetch external hackathons into ExternalHackathon and serve them"""
+
+    TIMEOUT = 10
+
+    # name -> (request kwargs, parser), in dedupe priority order
+    SOURCES = {
+        'Devpost': (
+            {'url': 'https://devpost.com/hackathons', 'params': {'status[]': 'open'}},
+            parse_devpost,
+        ),
+        'MLH': (
+            {'url': 'https://mlh.io/seasons/2026/events'},
+            parse_mlh,
+        ),
+        'Devfolio': (
+            {'url': 'https://api.devfolio.co/api/search/hackathons', 'params': {'status': 'UPCOMING'}},
+            parse_devfolio,
+        ),
+    }
+
+    @classmethod
+    def fetch_source(cls, name):
+        """Fetch and parse one source; raises on network or parse errors"""
+        request_kwargs, parser = cls.SOURCES[name]
+        response = http_client.get(timeout=cls.TIMEOUT, headers={'User-Agent': USER_AGENT}, **request_kwargs)
+        response.raise_for_status()
+        return parser(response.text)
+
+    @classmethod
+    def fetch_all(cls):
+        """Fetch every source concurrently; failed sources map to None"""
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(cls.SOURCES)) as pool:
+            futures = {name: pool.submit(cls.fetch_source, name) for name in cls.SOURCES}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.warning('Hackathon source %s failed: %s', name, e)
+                    results[name] = None
+        return results
+
+    @classmethod
+    def refresh(cls):
+        """
+        Replace the stored rows of every source that fetched successfully.
+        Returns {source: row count or None when the source failed}.
+        """
+        from hackathons.models import ExternalHackathon
+
+        results = cls.fetch_all()
+        now = timezone.now()
+        with transaction.atomic():
+            for source, hackathons in results.items():
+                if not hackathons:
+                    # Failed, or the markup changed and nothing parsed: keep the old rows
+                    continue
+                rows, seen = [], set()
+                for hackathon in hackathons:
+                    if hackathon['external_id'] in seen:
+                        continue
+                    seen.add(hackathon['external_id'])
+                    rows.append(ExternalHackathon(
+                        source=source,
+                        dedupe_key=dedupe_key(hackathon['name']),
+                        starts_on=parse_date(hackathon['start_date']),
+                        fetched_at=now,
+                        **{field: _fit(ExternalHackathon, field, value) for field, value in hackathon.items()},
+                    ))
+                ExternalHackathon.objects.filter(source=source).delete()
+                ExternalHackathon.objects.bulk_create(rows)
+
+        cache.delete(LISTING_CACHE_KEY)
+        return {source: (len(rows) if rows is not None else None) for source, rows in results.items()}
+
+    @classmethod
+    def listing(cls):
+        """Return (payload, etag) for the listing endpoint"""
+        cached = cache.get(LISTING_CACHE_KEY)
+        if cached is not None:
+            return cached
+
+        hackathons, fetched_at = cls._load()
+        if fetched_at is None or timezone.now() - fetched_at > timedelta(seconds=settings.HACKATHON_REFRESH_INTERVAL):
+            cls.refresh_in_background()
+        if not hackathons:
+            hackathons = get_sample_hackathons()
+
+        payload = {'success': True, 'count': len(hackathons), 'hackathons': hackathons}
+        etag = '"%s"' % hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        cache.set(LISTING_CACHE_KEY, (payload, etag), settings.HACKATHON_LISTING_TTL)
+        return payload, etag
+
+    @staticmethod
+    def _load():
+        from hackathons.models import ExternalHackathon
+
+        priority = list(HackathonAggregator.SOURCES)
+        rows = sorted(
+            ExternalHackathon.objects.all(),
+            key=lambda row: (row.starts_on is None, row.starts_on or datetime.max.date(),
+                             priority.index(row.source) if row.source in priority else len(priority)),
+        )
+
+        hackathons, seen = [], set()
+        for row in rows:
+            if row.dedupe_key in seen:
+                continue
+            seen.add(row.dedupe_key)
+            hackathon = {
+                'id': f"{row.source.lower()}_{row.id}",
+                'name': row.name,
+                'start_date': row.start_date,
+                'end_date': row.end_date,
+                'location': row.location,
+                'url': row.url,
+                'logo': row.logo,
+                'source': row.source,
+                'is_online': row.is_online,
+                'description': row.description,
+            }
+            if row.prize_amount:
+                hackathon['prize_amount'] = row.prize_amount
+            hackathons.append(hackathon)
+
+        fetched_at = max((row.fetched_at for row in rows), default=None)
+        return hackathons, fetched_at
+
+    @classmethod
+    def refresh_in_background(cls):
+        """Start one refresh thread per process, if enabled and none is running"""
+        if not getattr(settings, 'HACKATHON_BACKGROUND_REFRESH', False):
+            return False
+        if not _refresh_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                cls.refresh()
+            except Exception:
+                logger.exception('Background hackathon refresh failed')
+            finally:
+                close_old_connections()
+                _refresh_lock.release()
+
+        threading.Thread(target=run, name='hackathon-refresh', daemon=True).start()
+        return True
+
+
+def get_sample_hackathons():
+    """
+    Fallback recent hackathons data (updated with 2025-2026 dates)
+    Served until the first successful refresh
+    """
+    return [
+        {
+            'id': 'sample_1',
+            'name': 'Smart India Hackathon 2025',
+            'start_date': 'Dec 20, 2025',
+            'end_date': 'Dec 22, 2025',
+            'location': 'Pan India',
+            'url': 'https://www.sih.gov.in',
+            'logo': '',
+            'source': 'Sample',
+            'is_online': False,
+            'description': 'India\'s biggest hackathon initiative by Govt. of India. Solve real-world problems with innovative solutions.'
+        },
+        {
+            'id': 'sample_2',
+            'name': 'DevPost Winter Hackathon',
+            'start_date': 'Jan 10, 2026',
+            'end_date': 'Jan 17, 2026',
+            'location': 'Online',
+            'url': 'https://devpost.com/hackathons',
+            'logo': '',
+            'source': 'Sample',
+            'is_online': True,
+            'description': 'Week-long online hackathon with prizes. Build anything you want!'
+        },
+        {
+            'id': 'sample_3',
+            'name': 'ETHIndia 2025',
+            'start_date': 'Dec 18, 2025',
+            'end_date': 'Dec 20, 2025',
+            'location': 'Bangalore, India',
+            'url': 'https://ethindia.co',
+            'logo': '',
+            'source': 'Sample',
+            'is_online': False,
+            'description': 'India\'s largest Ethereum hackathon. Build Web3 applications and win crypto prizes.'
+        },
+        {
+            'id': 'sample_4',
+            'name': 'HackMIT 2026',
+            'start_date': 'Feb 14, 2026',
+            'end_date': 'Feb 16, 2026',
+            'location': 'MIT, Cambridge, MA',
+            'url': 'https://hackmit.org',
+            'logo': '',
+            'source': 'Sample',
+            'is_online': False,
+            'description': 'Annual hackathon at MIT with amazing prizes, workshops, and 1000+ hackers.'
+        },
+        {
+            'id': 'sample_5',
+            'name': 'Google Cloud Hackathon',
+            'start_date': 'Jan 25, 2026',
+            'end_date': 'Feb 25, 2026',
+            'location': 'Online',
+            'url': 'https://cloud.google.com',
+            'logo': '',
+            'source': 'Sample',
+            'is_online': True,
+            'description': 'Build with Google Cloud Platform. Monthly online hackathon with $10k in prizes.'
+        },
+        {
+            'id': 'sample_6',
+            'name': 'AWS India Innovate',
+            'start_date': 'Feb 1, 2026',
+            'end_date': 'Feb 28, 2026',
+            'location': 'Online',
+            'url': 'https://aws.amazon.com',
+            'logo': '',
+            'source': 'Sample',
+            'is_online': True,
+            'description': 'Build innovative solutions using AWS services. Open to students and professionals.'
+        },
+        {
+            'id': 'sample_7',
+            'name': 'Microsoft Imagine Cup India',
+            'start_date': 'Jan 15, 2026',
+            'end_date': 'Mar 15, 2026',
+            'location': 'Online + Finals in Delhi',
+            'url': 'https://imaginecup.microsoft.com',
+            'logo': '',
+            'source': 'Sample',
+            'is_online': True,
+            'description': 'Microsoft\'s premier student technology competition. Win up to $100k and mentorship.'
+        },
+        {
+            'id': 'sample_8',
+            'name': 'HackerEarth Sprint',
+            'start_date': 'Dec 23, 2025',
+            'end_date': 'Dec 30, 2025',
+            'location': 'Online',
+            'url': 'https://www.hackerearth.com',
+            'logo': '',
+            'source': 'Sample',
+            'is_online': True,
+            'description': 'Week-long coding sprint with hiring opportunities. Solve challenges and get hired.'
+        },
+    ]
@@ -0,0 +1,149 @@
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+import requests
+from django.test import TestCase, override_settings
+
+from apps.hackathons.aggregator import (
+    HackathonAggregator, parse_devfolio, parse_devpost, parse_mlh
+)
+from hackathons.models import ExternalHackathon
+
+TESTDATA = Path(__file__).parent / 'testdata'
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'hackathon-tests'}}
+
+
+def recorded(name):
+    return (TESTDATA / name).read_text()
+
+
+class FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code}')
+
+
+def fake_get(pages):
+    """http_client.get stand-in serving recorded pages by host"""
+    def get(url, **kwargs):
+        for host, response in pages.items():
+            if host in url:
+                if isinstance(response, Exception):
+                    raise response
+                return response
+        raise AssertionError(f'unexpected request to {url}')
+    return get
+
+
+RECORDED_PAGES = {
+    'devpost.com': FakeResponse(recorded('devpost.html')),
+    'mlh.io': FakeResponse(recorded('mlh.html')),
+    'devfolio.co': FakeResponse(recorded('devfolio.json')),
+}
+
+
+class HackathonParserTests(TestCase):
+    def test_devpost(self):
+        hackathons = parse_devpost(recorded('devpost.html'))
+        self.assertEqual([h['name'] for h in hackathons], ['AI for Good Challenge', 'ETHIndia 2025'])
+        self.assertTrue(hackathons[0]['is_online'])
+        self.assertEqual(hackathons[1]['url'], 'https://devpost.com/hackathons/ethindia-2025')
+
+    def test_mlh(self):
+        hackathons = parse_mlh(recorded('mlh.html'))
+        self.assertEqual(hackathons[0]['start_date'], 'Feb 14, 2026')
+        self.assertEqual(hackathons[1]['url'], 'https://mlh.io/events/global-hack-week')
+
+    def test_devfolio(self):
+        hackathons = parse_devfolio(recorded('devfolio.json'))
+        self.assertEqual(hackathons[0]['url'], 'https://devfolio.co/hackathons/ethindia-2025')
+        self.assertEqual(hackathons[1]['prize_amount'], '')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class HackathonAggregatorTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def refresh(self, pages=RECORDED_PAGES):
+        with mock.patch('apps.http_client.get', side_effect=fake_get(pages)):
+            return HackathonAggregator.refresh()
+
+    def test_refresh_stores_every_source(self):
+        self.assertEqual(self.refresh(), {'Devpost': 2, 'MLH': 2, 'Devfolio': 2})
+        self.assertEqual(ExternalHackathon.objects.count(), 6)
+        ethindia = ExternalHackathon.objects.get(source='Devfolio', external_id='4021')
+        self.assertEqual(ethindia.starts_on, date(2025, 12, 18))
+
+    def test_interval_closes_connections_before_each_sleep(self):
+        import io
+        from django.core.management import call_command
+
+        command = 'hackathons.management.commands.refresh_hackathons'
+        calls = mock.Mock()
+        calls.sleep.side_effect = [None, InterruptedError]
+        with mock.patch.object(HackathonAggregator, 'refresh', calls.refresh), \
+                mock.patch(f'{command}.connections', calls.connections), \
+                mock.patch(f'{command}.time.sleep', calls.sleep):
+            calls.refresh.return_value = {}
+            with self.assertRaises(InterruptedError):
+                call_command('refresh_hackathons', interval=60, stdout=io.StringIO())
+
+        self.assertEqual(
+            [name for name, _, _ in calls.mock_calls],
+            ['refresh', 'connections.close_all', 'sleep'] * 2,
+        )
+
+    def test_listing_dedupes_and_orders_by_start_date(self):
+        self.refresh()
+        payload, _ = HackathonAggregator.listing()
+
+        names = [h['name'] for h in payload['hackathons']]
+        self.assertEqual(names.count('ETHIndia 2025'), 1)
+        self.assertEqual(payload['hackathons'][0]['source'], 'Devpost')  # source priority on ties
+        self.assertEqual(names[:2], ['ETHIndia 2025', 'AI for Good Challenge'])
+        self.assertEqual(names[-1], 'Global Hack Week')  # TBA last
+        self.assertEqual(payload['count'], 5)
+
+    def test_failed_source_keeps_previous_rows(self):
+        self.refresh()
+        pages = dict(RECORDED_PAGES, **{'mlh.io': requests.ConnectionError('down')})
+
+        self.assertEqual(self.refresh(pages)['MLH'], None)
+        self.assertEqual(ExternalHackathon.objects.filter(source='MLH').count(), 2)
+
+    def test_empty_table_serves_samples(self):
+        payload, _ = HackathonAggregator.listing()
+        self.assertEqual(payload['hackathons'][0]['source'], 'Sample')
+
+    def test_endpoint_serves_stored_listing_with_etag(self):
+        self.refresh()
+
+        with mock.patch('apps.http_client.get') as get:
+            response = self.client.get('/api/hackathons/list/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['count'], 5)
+
+            again = self.client.get('/api/hackathons/list/', HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(again.status_code, 304)
+            get.assert_not_called()
+
+    def test_if_none_match_compares_parsed_etags(self):
+        self.refresh()
+        etag = self.client.get('/api/hackathons/list/')['ETag']
+
+        def status_for(if_none_match):
+            return self.client.get('/api/hackathons/list/', HTTP_IF_NONE_MATCH=if_none_match).status_code
+
+        # The weak form (after compression) in a list, and *
+        self.assertEqual(status_for(f'"stale", W/{etag}'), 304)
+        self.assertEqual(status_for('*'), 304)
+        # Contains the tag's characters but names a different entity
+        self.assertEqual(status_for(f'"x{etag[1:]}'), 200)
+        self.assertEqual(status_for(etag[1:-1]), 200)
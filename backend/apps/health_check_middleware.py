@@ -5,6 +5,7 @@ This middleware bypasses Django's ALLOWED_HOSTS validation for health check endp
 This is necessary because Render's load balancer makes health check requests with
 internal Host headers that won't match your ALLOWED_HOSTS configuration.
 """
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 
 
 class HealthCheckMiddleware:
@@ -13,10 +14,18 @@ class HealthCheckMiddleware:
     
     This middleware should be placed BEFORE Django's CommonMiddleware in the
     MIDDLEWARE setting to work properly.
+    
+    It only touches the request, so under ASGI it simply returns the
+    next handler's coroutine.
     """
     
+    sync_capable = True
+    async_capable = True
+    
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
     
     def __call__(self, request):
         # Check if this is a health check endpoint
@@ -25,5 +34,4 @@ class HealthCheckMiddleware:
             # This bypasses the ALLOWED_HOSTS check in CommonMiddleware
             request.META['HTTP_HOST_VALIDATED'] = True
         
-        response = self.get_response(request)
-        return response
+        return self.get_response(request)
@@ -12,6 +12,9 @@ from django.utils import timezone
 from django.conf import settings
 import time
 
+from apps.http_client import upstream_stats
+from apps.rate_limits import rate_limit_stats
+
 
 def health_check(request):
     """
@@ -20,6 +23,9 @@ def health_check(request):
     Returns system status including:
     - Database connectivity
     - Cache availability (if enabled)
+    - Third-party API circuit breakers and call metrics (of the worker
+      process that answers; an open circuit marks the app degraded)
+    - Rate-limited endpoint counters (same process)
     - Response time
     - Application readiness
     
@@ -75,6 +81,20 @@ def health_check(request):
             'message': 'Caching not enabled'
         }
     
+    # Third-party APIs (apps/http_client.py)
+    upstreams = upstream_stats()
+    open_circuits = sorted(name for name, stats in upstreams.items() if stats['state'] != 'closed')
+    health_status['checks']['upstreams'] = {
+        'status': 'degraded' if open_circuits else 'up',
+        'message': f"Circuit open for {', '.join(open_circuits)}" if open_circuits else 'All upstream circuits closed',
+        'breakers': upstreams,
+    }
+    if open_circuits and health_status['status'] == 'healthy':
+        health_status['status'] = 'degraded'
+    
+    # Rate limits (apps/rate_limits.py)
+    health_status['rate_limits'] = rate_limit_stats()
+    
     # Response time
     response_time_ms = int((time.time() - start_time) * 1000)
     health_status['response_time_ms'] = response_time_ms
@@ -85,6 +105,7 @@ def health_check(request):
         'notification_cache': settings.USE_NOTIFICATION_CACHE,
         'cloud_storage': settings.USE_CLOUD_STORAGE,
         'async_tasks': settings.USE_ASYNC_TASKS,
+        'rate_limits': settings.USE_RATE_LIMITS,
     }
     
     # Determine HTTP status code
@@ -0,0 +1,413 @@
+"""
+Outbound HTTP Client
+One pooled client for every third-party API (LeetCode, GitHub, YouTube,
+LinkedIn, Supabase storage, the hackathon sources)
+
+- Pooling: blocking calls share one requests.Session per host (keep-alive
+  connections, up to OUTBOUND_HTTP_MAX_KEEPALIVE per host); async calls
+  share one httpx.AsyncClient per event loop. Neither keeps cookies, so
+  nothing leaks from one user's call to the next.
+- Timeouts: every call has a connect timeout (OUTBOUND_HTTP_CONNECT_TIMEOUT)
+  and a read timeout (OUTBOUND_HTTP_TIMEOUT, or the call's `timeout=`).
+- Retries: up to OUTBOUND_HTTP_RETRIES, with full-jitter exponential
+  backoff (or the upstream's Retry-After). Connect failures are retried for
+  every method - the request never left. Read timeouts, dropped connections
+  and 429/502/503/504 are retried only for idempotent calls (GET, HEAD, ...,
+  or `idempotent=True`, e.g. LeetCode's read-only GraphQL POSTs).
+- Circuit breaker per upstream (host): after OUTBOUND_BREAKER_THRESHOLD
+  consecutive failures (transport errors, 429 and 5xx) calls fail fast with
+  CircuitOpenError for OUTBOUND_BREAKER_RESET seconds; then one trial call
+  decides whether it closes again. CircuitOpenError is both a
+  requests.ConnectionError and an httpx.TransportError, so existing error
+  handling treats it as the upstream being unreachable.
+- Metrics per upstream: calls, errors, fast-failed calls and latency
+  percentiles, from upstream_stats(); every call is logged at DEBUG.
+
+Under ASGI (uvicorn workers) each worker runs one event loop, so its async
+client lives as long as the worker. Under WSGI every async view runs on a
+short-lived loop; async_api_view closes that loop's client when the view
+returns. After a fork (gunicorn --preload) a process never reuses the
+parent's sessions.
+
+Usage:
+    from apps import http_client
+
+    response = http_client.get(url, params={'per_page': 1})
+    response = http_client.post(url, json=query, idempotent=True)
+    response = await http_client.aget(url, timeout=10)
+
+    async with http_client.astream('GET', url) as response:
+        async for chunk in response.aiter_bytes():
+            ...
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+import urllib3
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+RETRY_STATUSES = {429, 502, 503, 504}
+TRANSPORT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, httpx.TransportError)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError, httpx.TransportError):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+    def __init__(self, upstream, retry_in):
+        self.upstream = upstream
+        self.retry_in = retry_in
+        requests.exceptions.ConnectionError.__init__(
+            self, f'{upstream} is unavailable (circuit open, retry in {retry_in:.0f}s)'
+        )
+
+
+class Upstream:
+    """Circuit breaker and call metrics of one third-party host"""
+
+    LATENCY_SAMPLES = 500
+
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)
+
+    def acquire(self):
+        """Allow one call, or raise CircuitOpenError"""
+        with self.lock:
+            if self.state == OPEN:
+                retry_in = self.opened_at + settings.OUTBOUND_BREAKER_RESET - time.monotonic()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, retry_in)
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self.trial_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, 0)
+                self.trial_in_flight = True
+
+    def release(self):
+        """End an acquired call without an outcome (the caller's own error)"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record(self, elapsed, failed):
+        """End an acquired call: count it and move the breaker"""
+        with self.lock:
+            self.trial_in_flight = False
+            self.calls += 1
+            self.latencies.append(elapsed)
+            if not failed:
+                if self.state != CLOSED:
+                    logger.info('Circuit for %s closed', self.name)
+                self.state = CLOSED
+                self.consecutive_failures = 0
+                return
+            self.errors += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= settings.OUTBOUND_BREAKER_THRESHOLD:
+                if self.state != OPEN:
+                    logger.warning(
+                        'Circuit for %s opened after %d consecutive failures',
+                        self.name, self.consecutive_failures
+                    )
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            state, calls, errors, rejected = self.state, self.calls, self.errors, self.rejected
+
+        def percentile(fraction):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000, 1)
+
+        return {
+            'state': state,
+            'calls': calls,
+            'errors': errors,
+            'error_rate': round(errors / calls, 3) if calls else 0.0,
+            'rejected': rejected,
+            'latency_ms': {
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'max': round(latencies[-1] * 1000, 1),
+            } if latencies else None,
+        }
+
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+
+
+def get_upstream(name):
+    with _upstreams_lock:
+        upstream = _upstreams.get(name)
+        if upstream is None:
+            upstream = _upstreams[name] = Upstream(name)
+        return upstream
+
+
+def upstream_stats():
+    """{upstream: breaker state and metrics} for this process"""
+    with _upstreams_lock:
+        upstreams = list(_upstreams.values())
+    return {upstream.name: upstream.stats() for upstream in upstreams}
+
+
+def _no_cookies():
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def _timeouts(timeout):
+    """(connect, read) for a call's `timeout=` (None, read seconds or a tuple)"""
+    if isinstance(timeout, tuple):
+        return timeout
+    connect = settings.OUTBOUND_HTTP_CONNECT_TIMEOUT
+    return connect, settings.OUTBOUND_HTTP_TIMEOUT if timeout is None else timeout
+
+
+def _connect_failed(error):
+    """True when the request never reached the upstream (safe to retry any method)"""
+    if isinstance(error, (requests.exceptions.ConnectTimeout, httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def _retry_delay(attempt, retries, idempotent, error=None, response=None):
+    """Seconds to wait before the next attempt, or None to give up"""
+    if attempt >= retries:
+        return None
+    if error is not None:
+        if not (_connect_failed(error) or (idempotent and isinstance(error, TRANSPORT_ERRORS))):
+            return None
+    elif not (idempotent and response.status_code in RETRY_STATUSES):
+        return None
+
+    cap = settings.OUTBOUND_HTTP_BACKOFF_MAX
+    retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+    if retry_after.isdigit():
+        return min(int(retry_after), cap)
+    # Full jitter: spread the retries of many workers hitting the same outage
+    return random.uniform(0, min(cap, settings.OUTBOUND_HTTP_BACKOFF * 2 ** attempt))
+
+
+def _prepare(method, url, upstream, retries, idempotent):
+    method = method.upper()
+    upstream = get_upstream(upstream or urlsplit(url).netloc)
+    retries = settings.OUTBOUND_HTTP_RETRIES if retries is None else retries
+    idempotent = method in IDEMPOTENT_METHODS if idempotent is None else idempotent
+    return method, upstream, retries, idempotent
+
+
+def _log_retry(method, url, delay, attempt, retries, reason):
+    logger.info('Retrying %s %s in %.2fs (attempt %d/%d): %s', method, url, delay, attempt + 1, retries + 1, reason)
+
+
+def _log_call(method, url, outcome, elapsed):
+    logger.debug('%s %s -> %s in %.0fms', method, url, outcome, elapsed * 1000)
+
+
+# Blocking calls: one requests.Session per scheme + host
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_sessions_pid = None
+
+
+def session_for(url):
+    """The pooled session for url's host"""
+    global _sessions_pid
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            # Forked from a process that already had sessions: their sockets are the parent's
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = requests.Session()
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            # Retries happen here, not in urllib3
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.OUTBOUND_HTTP_MAX_KEEPALIVE, max_retries=0)
+            session.mount(f'{parts.scheme}://', adapter)
+    return session
+
+
+def request(method, url, *, upstream=None, retries=None, idempotent=None, timeout=None, **kwargs):
+    """
+    requests.request() on the pooled session, with retries and the
+    upstream's circuit breaker. Returns the final response (which may be
+    an error status); raises the last transport error or CircuitOpenError.
+    """
+    method, upstream, retries, idempotent = _prepare(method, url, upstream, retries, idempotent)
+    session = session_for(url)
+    for attempt in range(retries + 1):
+        upstream.acquire()
+        start = time.monotonic()
+        try:
+            response = session.request(method, url, timeout=_timeouts(timeout), **kwargs)
+        except Exception as error:
+            elapsed = time.monotonic() - start
+            if not isinstance(error, TRANSPORT_ERRORS):
+                upstream.release()
+                raise
+            upstream.record(elapsed, failed=True)
+            _log_call(method, url, type(error).__name__, elapsed)
+            delay = _retry_delay(attempt, retries, idempotent, error=error)
+            if delay is None:
+                raise
+            _log_retry(method, url, delay, attempt, retries, error)
+            time.sleep(delay)
+            continue
+
+        elapsed = time.monotonic() - start
+        upstream.record(elapsed, failed=response.status_code == 429 or response.status_code >= 500)
+        _log_call(method, url, response.status_code, elapsed)
+        delay = _retry_delay(attempt, retries, idempotent, response=response)
+        if delay is None:
+            return response
+        _log_retry(method, url, delay, attempt, retries, response.status_code)
+        response.close()
+        time.sleep(delay)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+# Async calls: one httpx.AsyncClient per event loop
+
+# event loop -> AsyncClient
+_clients = weakref.WeakKeyDictionary()
+
+
+def async_client():
+    """The pooled AsyncClient of the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.OUTBOUND_HTTP_TIMEOUT, connect=settings.OUTBOUND_HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.OUTBOUND_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OUTBOUND_HTTP_MAX_KEEPALIVE,
+            ),
+            cookies=_no_cookies(),
+            # requests follows redirects by default; keep that behaviour
+            follow_redirects=True,
+        )
+    return client
+
+
+async def close_async_client():
+    """Close the running loop's client (before a short-lived loop ends)"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _async_timeout(timeout):
+    connect, read = _timeouts(timeout)
+    return httpx.Timeout(read, connect=connect)
+
+
+async def arequest(method, url, *, upstream=None, retries=None, idempotent=None, timeout=None, **kwargs):
+    """request() on the event loop's pooled AsyncClient; returns an httpx.Response"""
+    method, upstream, retries, idempotent = _prepare(method, url, upstream, retries, idempotent)
+    for attempt in range(retries + 1):
+        upstream.acquire()
+        start = time.monotonic()
+        try:
+            response = await async_client().request(method, url, timeout=_async_timeout(timeout), **kwargs)
+        except Exception as error:
+            elapsed = time.monotonic() - start
+            if not isinstance(error, TRANSPORT_ERRORS):
+                upstream.release()
+                raise
+            upstream.record(elapsed, failed=True)
+            _log_call(method, url, type(error).__name__, elapsed)
+            delay = _retry_delay(attempt, retries, idempotent, error=error)
+            if delay is None:
+                raise
+            _log_retry(method, url, delay, attempt, retries, error)
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            # Cancelled (client went away): no outcome to record
+            upstream.release()
+            raise
+
+        elapsed = time.monotonic() - start
+        upstream.record(elapsed, failed=response.status_code == 429 or response.status_code >= 500)
+        _log_call(method, url, response.status_code, elapsed)
+        delay = _retry_delay(attempt, retries, idempotent, response=response)
+        if delay is None:
+            return response
+        _log_retry(method, url, delay, attempt, retries, response.status_code)
+        await asyncio.sleep(delay)
+
+
+async def aget(url, **kwargs):
+    return await arequest('GET', url, **kwargs)
+
+
+async def apost(url, **kwargs):
+    return await arequest('POST', url, **kwargs)
+
+
+@contextlib.asynccontextmanager
+async def astream(method, url, *, upstream=None, timeout=None, **kwargs):
+    """
+    Streamed async request (no retries). The breaker and latency cover the
+    response headers; the body is read by the caller.
+    """
+    method = method.upper()
+    upstream = get_upstream(upstream or urlsplit(url).netloc)
+    upstream.acquire()
+    start = time.monotonic()
+    recorded = False
+    try:
+        async with async_client().stream(method, url, timeout=_async_timeout(timeout), **kwargs) as response:
+            elapsed = time.monotonic() - start
+            upstream.record(elapsed, failed=response.status_code == 429 or response.status_code >= 500)
+            recorded = True
+            _log_call(method, url, response.status_code, elapsed)
+            yield response
+    except BaseException as error:
+        if not recorded:
+            if isinstance(error, TRANSPORT_ERRORS):
+                upstream.record(time.monotonic() - start, failed=True)
+            else:
+                upstream.release()
+        raise
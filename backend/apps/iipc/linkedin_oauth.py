@@ -1,11 +1,16 @@
 """
 LinkedIn OAuth Integration Service
 Handles LinkedIn Sign In and profile data fetching
+
+verify_profile() blocks; averify_profile() makes the same two calls
+asynchronously, for the async callback view. Both go through
+apps.http_client.
 """
 import os
-import requests
 from urllib.parse import urlencode
 
+from apps import http_client
+
 
 class LinkedInOAuthService:
     """Service for LinkedIn OAuth 2.0 authentication"""
@@ -18,6 +23,8 @@ class LinkedInOAuthService:
     # OAuth Scopes (what we're requesting access to)
     SCOPES = ['openid', 'profile', 'email']
     
+    TIMEOUT = 15  # seconds, per call
+    
     def __init__(self):
         self.client_id = os.getenv('LINKEDIN_CLIENT_ID')
         self.client_secret = os.getenv('LINKEDIN_CLIENT_SECRET')
@@ -56,22 +63,24 @@ class LinkedInOAuthService:
         Returns:
             dict: Token response with access_token
         """
-        data = {
+        response = http_client.post(
+            self.ACCESS_TOKEN_URL,
+            data=self._token_request_data(code),
+            headers={'Content-Type': 'application/x-www-form-urlencoded'},
+            timeout=self.TIMEOUT
+        )
+        
+        response.raise_for_status()
+        return response.json()
+    
+    def _token_request_data(self, code):
+        return {
             'grant_type': 'authorization_code',
             'code': code,
             'redirect_uri': self.redirect_uri,
             'client_id': self.client_id,
             'client_secret': self.client_secret,
         }
-        
-        response = requests.post(
-            self.ACCESS_TOKEN_URL,
-            data=data,
-            headers={'Content-Type': 'application/x-www-form-urlencoded'}
-        )
-        
-        response.raise_for_status()
-        return response.json()
     
     def get_user_profile(self, access_token):
         """
@@ -87,11 +96,13 @@ class LinkedInOAuthService:
             'Authorization': f'Bearer {access_token}',
         }
         
-        response = requests.get(self.PROFILE_URL, headers=headers)
+        response = http_client.get(self.PROFILE_URL, headers=headers, timeout=self.TIMEOUT)
         response.raise_for_status()
         
-        profile_data = response.json()
-        
+        return self._parse_profile(response.json())
+    
+    @staticmethod
+    def _parse_profile(profile_data):
         # Extract profile URL from 'sub' (LinkedIn member ID)
         linkedin_id = profile_data.get('sub')
         
@@ -126,3 +137,29 @@ class LinkedInOAuthService:
         profile_data = self.get_user_profile(access_token)
         
         return profile_data
+    
+    async def averify_profile(self, code):
+        """
+        verify_profile() for async views
+        
+        Raises httpx.HTTPStatusError when LinkedIn rejects a call
+        """
+        response = await http_client.apost(
+            self.ACCESS_TOKEN_URL,
+            data=self._token_request_data(code),
+            headers={'Content-Type': 'application/x-www-form-urlencoded'},
+            timeout=self.TIMEOUT
+        )
+        response.raise_for_status()
+        access_token = response.json().get('access_token')
+        
+        if not access_token:
+            raise ValueError('Failed to obtain access token from LinkedIn')
+        
+        response = await http_client.aget(
+            self.PROFILE_URL,
+            headers={'Authorization': f'Bearer {access_token}'},
+            timeout=self.TIMEOUT
+        )
+        response.raise_for_status()
+        return self._parse_profile(response.json())
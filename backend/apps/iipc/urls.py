@@ -4,6 +4,7 @@ from .views import (
     LinkedInPostVerificationViewSet,
     LinkedInConnectionVerificationViewSet,
     IIPCMonthlySubmissionViewSet,
+    linkedin_callback,
 )
 
 router = DefaultRouter()
@@ -12,5 +13,7 @@ router.register(r'connections', LinkedInConnectionVerificationViewSet, basename=
 router.register(r'monthly', IIPCMonthlySubmissionViewSet, basename='iipc-monthly')
 
 urlpatterns = [
+    # Async view; served ahead of the router's detail routes
+    path('connections/linkedin_callback/', linkedin_callback, name='linkedin-connection-linkedin-callback'),
     path('', include(router.urls)),
 ]
@@ -4,7 +4,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.utils import timezone
 import secrets
-import requests
+
+import httpx
+from asgiref.sync import sync_to_async
+
+from apps.async_views import async_api_view, json_response
 
 from .models import (
     LinkedInPostVerification,
@@ -232,56 +236,6 @@ class LinkedInConnectionVerificationViewSet(viewsets.ModelViewSet):
             'state': state
         })
     
-    @action(detail=False, methods=['post'])
-    def linkedin_callback(self, request):
-        """
-        Handle LinkedIn OAuth callback
-        Exchange code for access token and fetch profile data
-        """
-        code = request.data.get('code')
-        state = request.data.get('state')
-        
-        if not code:
-            return Response(
-                {'error': 'Authorization code is required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Validate state (CSRF protection)
-        stored_state = request.session.get('linkedin_oauth_state')
-        if stored_state and state != stored_state:
-            return Response(
-                {'error': 'Invalid state parameter. Possible CSRF attack.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        linkedin_service = LinkedInOAuthService()
-        
-        try:
-            # Verify LinkedIn profile and get data
-            profile_data = linkedin_service.verify_profile(code)
-            
-            # Clear the state from session
-            if 'linkedin_oauth_state' in request.session:
-                del request.session['linkedin_oauth_state']
-            
-            return Response({
-                'success': True,
-                'profile': profile_data,
-                'message': 'LinkedIn profile verified successfully'
-            })
-            
-        except requests.exceptions.HTTPError as e:
-            return Response(
-                {'error': f'LinkedIn API error: {str(e)}'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        except Exception as e:
-            return Response(
-                {'error': f'Failed to verify LinkedIn profile: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-    
     @action(detail=False, methods=['get'])
     def all_stats(self, request):
         """Get combined IIPC statistics"""
@@ -384,3 +338,55 @@ class IIPCMonthlySubmissionViewSet(viewsets.ModelViewSet):
         """All past monthly submissions for the current user."""
         qs = IIPCMonthlySubmission.objects.filter(user=request.user)
         return Response(IIPCMonthlySubmissionSerializer(qs, many=True).data)
+
+
+@async_api_view(['POST'])
+async def linkedin_callback(request):
+    """
+    Handle LinkedIn OAuth callback
+    Exchange code for access token and fetch profile data
+    
+    POST /api/iipc/connections/linkedin_callback/
+    Async: both LinkedIn calls run on the pooled async client.
+    """
+    code = request.data.get('code')
+    state = request.data.get('state')
+    
+    if not code:
+        return json_response(
+            {'error': 'Authorization code is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Validate state (CSRF protection); the session loads from the database
+    stored_state = await sync_to_async(request.session.get)('linkedin_oauth_state')
+    if stored_state and state != stored_state:
+        return json_response(
+            {'error': 'Invalid state parameter. Possible CSRF attack.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    linkedin_service = LinkedInOAuthService()
+    
+    try:
+        # Verify LinkedIn profile and get data
+        profile_data = await linkedin_service.averify_profile(code)
+    except httpx.HTTPStatusError as e:
+        return json_response(
+            {'error': f'LinkedIn API error: {str(e)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        return json_response(
+            {'error': f'Failed to verify LinkedIn profile: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    # Clear the state from session
+    await sync_to_async(request.session.pop)('linkedin_oauth_state', None)
+    
+    return json_response({
+        'success': True,
+        'profile': profile_data,
+        'message': 'LinkedIn profile verified successfully'
+    })
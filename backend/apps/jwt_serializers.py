@@ -1,6 +1,7 @@
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from django.contrib.auth.models import User
+from rest_framework_simplejwt.settings import api_settings
 from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
 
 
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -14,18 +15,13 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         username_or_email = attrs.get('username')
         password = attrs.get('password')
         
-        # Try to find user by email first, then by username
-        user = None
-        try:
-            # Check if it's an email
-            if '@' in username_or_email:
-                user_obj = User.objects.filter(email=username_or_email).first()
-                if user_obj:
-                    user = authenticate(username=user_obj.username, password=password)
-            else:
-                user = authenticate(username=username_or_email, password=password)
-        except Exception:
-            pass
+        # EmailOrUsernameBackend resolves email or username in a single
+        # indexed query (and loads the profile with it)
+        user = authenticate(
+            self.context.get('request'),
+            username=username_or_email,
+            password=password,
+        )
         
         if user is None:
             from rest_framework_simplejwt.exceptions import AuthenticationFailed
@@ -34,6 +30,11 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         # Generate tokens
         refresh = self.get_token(user)
         
+        # validate() replaces the parent's, which is what records logins;
+        # notification retention reads last_login
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        
         # Get user profile info
         profile_data = {}
         if hasattr(user, 'profile'):
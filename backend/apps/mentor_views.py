@@ -28,6 +28,7 @@ from apps.dashboard.models import Notification, Message, MessageThread
 from apps.dashboard.notifications_serializers import (
     NotificationSerializer, MessageSerializer, MessageThreadSerializer, MessageCreateSerializer
 )
+from apps.query_profiler import query_budget
 
 
 # Helper function to check if user is a mentor
@@ -675,11 +676,36 @@ def get_submission_detail(request, pillar, submission_type, submission_id):
     return Response(serializer.data)
 
 
+def _submissions_by_user(model, user_ids):
+    """{user_id: [(status, created_at), ...]} for the given users, in one query"""
+    grouped = {}
+    for user_id, status_value, created_at in model.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'status', 'created_at'
+    ):
+        grouped.setdefault(user_id, []).append((status_value, created_at))
+    return grouped
+
+
+def _pillar_stats(submissions, completed, pending):
+    """Status/count/last submission of one pillar from (status, created_at) pairs"""
+    statuses = {status_value for status_value, _ in submissions}
+    return {
+        'status': 'completed' if statuses & completed
+                 else 'pending' if statuses & pending
+                 else 'not-started',
+        'count': len(submissions),
+        'lastSubmission': max((created_at for _, created_at in submissions), default=None)
+    }
+
+
+@query_budget(12)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_mentor_students(request):
     """
     Get list of students assigned to the current mentor with their progress stats
+    
+    Submissions are fetched once per pillar model for all students, not per student.
     """
     if not is_mentor(request.user):
         return Response(
@@ -688,65 +714,48 @@ def get_mentor_students(request):
         )
     
     # Get mentor's assigned students
-    assigned_students = request.user.mentored_students.all().select_related('user')
+    assigned_students = list(request.user.mentored_students.all().select_related('user'))
+    user_ids = [profile.user_id for profile in assigned_students]
+    
+    clt_by_user = _submissions_by_user(CLTSubmission, user_ids)
+    cfc_by_user = {}
+    for model in (HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission):
+        for user_id, submissions in _submissions_by_user(model, user_ids).items():
+            cfc_by_user.setdefault(user_id, []).extend(submissions)
+    iipc_by_user = _submissions_by_user(LinkedInPostVerification, user_ids)
+    leetcode_by_user = {
+        leetcode_profile.user_id: leetcode_profile
+        for leetcode_profile in LeetCodeProfile.objects.filter(user_id__in=user_ids)
+    }
     
     students_data = []
     for profile in assigned_students:
         student = profile.user
         
-        # Get submission stats for each pillar
-        clt_submissions = CLTSubmission.objects.filter(user=student)
-        clt_stats = {
-            'status': 'completed' if clt_submissions.filter(status='approved').exists() 
-                     else 'pending' if clt_submissions.filter(status__in=['draft', 'submitted', 'under_review']).exists()
-                     else 'not-started',
-            'count': clt_submissions.count(),
-            'lastSubmission': clt_submissions.order_by('-created_at').first().created_at if clt_submissions.exists() else None
-        }
-        
-        # CFC stats (all types combined)
-        hackathons = HackathonSubmission.objects.filter(user=student)
-        bmc_videos = BMCVideoSubmission.objects.filter(user=student)
-        internships = InternshipSubmission.objects.filter(user=student)
-        genai_projects = GenAIProjectSubmission.objects.filter(user=student)
-        
-        cfc_total = hackathons.count() + bmc_videos.count() + internships.count() + genai_projects.count()
-        cfc_approved = (hackathons.filter(status='approved').count() + 
-                       bmc_videos.filter(status='approved').count() +
-                       internships.filter(status='approved').count() +
-                       genai_projects.filter(status='approved').count())
-        cfc_pending = cfc_total - cfc_approved
+        clt_stats = _pillar_stats(
+            clt_by_user.get(student.id, []),
+            completed={'approved'}, pending={'draft', 'submitted', 'under_review'}
+        )
         
-        cfc_stats = {
-            'status': 'completed' if cfc_approved > 0 
-                     else 'pending' if cfc_pending > 0
-                     else 'not-started',
-            'count': cfc_total,
-            'lastSubmission': max(
-                [s.created_at for s in list(hackathons) + list(bmc_videos) + list(internships) + list(genai_projects)],
-                default=None
-            )
-        }
+        # CFC stats (all types combined): any approved submission completes it, any other is pending
+        cfc_submissions = cfc_by_user.get(student.id, [])
+        cfc_stats = _pillar_stats(
+            cfc_submissions,
+            completed={'approved'},
+            pending={status_value for status_value, _ in cfc_submissions} - {'approved'}
+        )
         
-        # IIPC stats
-        iipc_posts = LinkedInPostVerification.objects.filter(user=student)
-        iipc_stats = {
-            'status': 'completed' if iipc_posts.filter(status='verified').exists()
-                     else 'pending' if iipc_posts.filter(status='pending').exists()
-                     else 'not-started',
-            'count': iipc_posts.count(),
-            'lastSubmission': iipc_posts.order_by('-created_at').first().created_at if iipc_posts.exists() else None
-        }
+        iipc_stats = _pillar_stats(iipc_by_user.get(student.id, []), completed={'verified'}, pending={'pending'})
         
         # SCD stats
-        try:
-            leetcode_profile = LeetCodeProfile.objects.get(user=student)
+        leetcode_profile = leetcode_by_user.get(student.id)
+        if leetcode_profile is not None:
             scd_stats = {
                 'status': 'completed' if leetcode_profile.monthly_problems_count >= 10 else 'pending',
                 'count': leetcode_profile.total_solved,
                 'lastSubmission': leetcode_profile.last_synced
             }
-        except LeetCodeProfile.DoesNotExist:
+        else:
             scd_stats = {
                 'status': 'not-started',
                 'count': 0,
@@ -6,6 +6,7 @@ from django.contrib.auth.models import User
 from django.db.models import Count, Q
 from apps.profiles.models import UserProfile
 from apps.profiles.permissions import IsAdmin
+from apps.query_profiler import query_budget
 from apps.clt.models import CLTSubmission
 from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
 from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
@@ -186,6 +187,7 @@ class AdminCampusOverviewView(APIView):
         }
 
 
+@query_budget(14)
 class AdminFloorDetailView(APIView):
     """Admin view for detailed floor information"""
     permission_classes = [IsAuthenticated, IsAdmin]
@@ -213,28 +215,26 @@ class AdminFloorDetailView(APIView):
             floor=floor
         ).select_related('user').first()
         
-        # Get mentors on this floor
+        # Get mentors on this floor, with the students assigned to them on this floor
         mentors = UserProfile.objects.filter(
             role='MENTOR',
             campus=campus,
             floor=floor
-        ).select_related('user')
+        ).select_related('user').annotate(
+            student_count=Count('user__mentored_students', filter=Q(
+                user__mentored_students__role='STUDENT',
+                user__mentored_students__campus=campus,
+                user__mentored_students__floor=floor,
+            ))
+        )
         
         mentor_data = []
         for mentor_profile in mentors:
-            # Count students assigned to this mentor on this floor
-            student_count = UserProfile.objects.filter(
-                role='STUDENT',
-                campus=campus,
-                floor=floor,
-                assigned_mentor=mentor_profile.user
-            ).count()
-            
             mentor_data.append({
                 'id': mentor_profile.user.id,
                 'name': f"{mentor_profile.user.first_name} {mentor_profile.user.last_name}",
                 'email': mentor_profile.user.email,
-                'assigned_students': student_count
+                'assigned_students': mentor_profile.student_count
             })
         
         # Get students
@@ -243,6 +243,7 @@ class AdminFloorDetailView(APIView):
             campus=campus,
             floor=floor
         ).select_related('user', 'assigned_mentor')
+        submission_counts = self._get_submission_counts([profile.user_id for profile in students])
         
         student_data = []
         for student_profile in students:
@@ -251,16 +252,13 @@ class AdminFloorDetailView(APIView):
                 mentor = student_profile.assigned_mentor
                 mentor_name = f"{mentor.first_name} {mentor.last_name}"
             
-            # Get real submission count for this student
-            submission_count = self._get_student_submission_count(student_profile.user)
-            
             student_data.append({
                 'id': student_profile.user.id,
                 'name': f"{student_profile.user.first_name} {student_profile.user.last_name}",
                 'email': student_profile.user.email,
                 'mentor': mentor_name,
                 'mentor_id': student_profile.assigned_mentor.id if student_profile.assigned_mentor else None,
-                'submissions': submission_count
+                'submissions': submission_counts.get(student_profile.user_id, 0)
             })
         
         floor_wing_data = None
@@ -284,46 +282,17 @@ class AdminFloorDetailView(APIView):
             }
         }, status=status.HTTP_200_OK)
     
-    def _get_student_submission_count(self, user):
-        """Get total submission count for a student across all pillars"""
-        count = 0
-        
-        try:
-            count += CLTSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += HackathonSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += BMCVideoSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += InternshipSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += GenAIProjectSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += LinkedInPostVerification.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += LinkedInConnectionVerification.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        return count
+    def _get_submission_counts(self, user_ids):
+        """Total submission count per student across all pillars (one query per model)"""
+        counts = {}
+        for model in (
+            CLTSubmission, HackathonSubmission, BMCVideoSubmission, InternshipSubmission,
+            GenAIProjectSubmission, LinkedInPostVerification, LinkedInConnectionVerification,
+        ):
+            rows = model.objects.filter(user_id__in=user_ids).values('user_id').annotate(total=Count('id'))
+            for row in rows:
+                counts[row['user_id']] = counts.get(row['user_id'], 0) + row['total']
+        return counts
 
 
 class AdminAssignFloorWingView(APIView):
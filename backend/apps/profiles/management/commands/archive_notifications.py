@@ -0,0 +1,112 @@
+"""
+Management Command: archive_notifications
+
+Moves old notifications (both dashboard and profile notifications) out of
+the hot tables.
+
+Usage:
+    python manage.py archive_notifications
+    python manage.py archive_notifications --dry-run
+    python manage.py archive_notifications --days 14 --batch-size 500 --pause 0.5
+    python manage.py archive_notifications --export /backups/notifications-%Y%m%d.jsonl.gz
+    python manage.py archive_notifications --export notifications.jsonl.gz --no-archive
+    python manage.py archive_notifications --interval 86400
+
+This command:
+- Archives read notifications older than NOTIFICATION_RETENTION_DAYS and
+  all notifications of users inactive for NOTIFICATION_INACTIVE_DAYS
+- Copies them to NotificationArchive and/or a gzip JSONL export
+- Deletes in batches, one short transaction each
+- Is idempotent (safe to run multiple times, or after an interruption)
+- With --interval, keeps running and repeats every N seconds (for a worker
+  process or container instead of cron)
+
+Setup as Cron Job (runs nightly at 3:30 AM):
+    30 3 * * * cd /path/to/backend && python manage.py archive_notifications
+
+See apps/profiles/notification_retention.py for the policy.
+"""
+
+import gzip
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Archive and delete old notifications in bounded batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Read notifications older than this (default: settings)')
+        parser.add_argument(
+            '--inactive-days',
+            type=int,
+            help='All notifications of users inactive this long (default: settings)',
+        )
+        parser.add_argument('--batch-size', type=int, help='Rows per transaction (default: settings)')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+        parser.add_argument(
+            '--export',
+            type=str,
+            help='Also append rows to this gzip JSONL file (strftime codes allowed)',
+        )
+        parser.add_argument(
+            '--no-archive',
+            action='store_true',
+            help='Do not copy rows into NotificationArchive (use with --export)',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be archived')
+        parser.add_argument('--interval', type=int, help='Repeat every N seconds instead of exiting')
+
+    def handle(self, *args, **options):
+        if options['no_archive'] and not options['export']:
+            self.stdout.write(self.style.ERROR('--no-archive without --export would discard notifications'))
+            return
+
+        while True:
+            self.archive(options)
+            if not options['interval']:
+                return
+            # Connections are only recycled at request boundaries; one held
+            # through the sleep would be dead by the next run
+            connections.close_all()
+            time.sleep(options['interval'])
+
+    def archive(self, options):
+        # Import here to avoid circular imports
+        from apps.profiles.notification_retention import NotificationRetentionService
+
+        policy = {'read_days': options['days'], 'inactive_days': options['inactive_days']}
+        pending = NotificationRetentionService.count(**policy)
+        self.stdout.write(
+            f"{timezone.now():%Y-%m-%d %H:%M} due for archiving: "
+            + ', '.join(f'{count} {source}' for source, count in pending.items())
+        )
+        if options['dry_run'] or not any(pending.values()):
+            return
+
+        def report(source, removed):
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'  ✓ {removed} {source} notifications archived')
+
+        export = None
+        if options['export']:
+            export = gzip.open(timezone.now().strftime(options['export']), 'at', encoding='utf-8')
+        try:
+            stats = NotificationRetentionService.run(
+                batch_size=options['batch_size'],
+                archive=not options['no_archive'],
+                export=export,
+                pause=options['pause'],
+                on_batch=report,
+                **policy,
+            )
+        finally:
+            if export is not None:
+                export.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            '✓ ARCHIVED: ' + ', '.join(f'{count} {source}' for source, count in stats.items())
+        ))
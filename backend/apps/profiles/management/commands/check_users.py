@@ -36,6 +36,9 @@ class Command(BaseCommand):
         self.stdout.write('\n\n=== Database Info ===')
         # Check sequence
         from django.db import connection
+        if connection.vendor != 'postgresql':
+            self.stdout.write(f'Database: {connection.vendor} (no user sequence)')
+            return
         with connection.cursor() as cursor:
             cursor.execute("SELECT last_value FROM auth_user_id_seq")
             seq_value = cursor.fetchone()[0]
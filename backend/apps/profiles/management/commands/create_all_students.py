@@ -5,7 +5,9 @@ Runs automatically during Render build
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.db.models import Count
 from apps.profiles.models import UserProfile
+from apps.profiles.provisioning import UserProvisioningService
 
 # Student data: (username, email, first_name, second_name, mentor_name)
 STUDENTS_DATA = [
@@ -163,113 +165,81 @@ STUDENTS_DATA = [
 class Command(BaseCommand):
     help = 'Create all 147 students with mentor assignments from hardcoded data'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Password hashing processes (default: all cores)')
+
     def handle(self, *args, **options):
         self.stdout.write('========================================')
         self.stdout.write('📚 Creating all students from hardcoded data')
         self.stdout.write(f'📊 Total student records to process: {len(STUDENTS_DATA)}')
         self.stdout.write('========================================\n')
         
-        # Create mentors first
-        mentor_users = {}
+        # Create mentors first so the students' mentor names resolve
         mentors_to_create = ['GOPI KRISHNAN', 'RESHMA RAJ', 'TULSI KRISHNA']
+        mentor_rows = []
+        for mentor_name in mentors_to_create:
+            mentor_email = f"{mentor_name.lower().replace(' ', '_')}@cohortsummit.com"
+            mentor_rows.append({
+                'username': mentor_email,
+                'email': mentor_email,
+                'first_name': mentor_name.split()[0],
+                'last_name': ' '.join(mentor_name.split()[1:]),
+            })
         
         self.stdout.write('Creating mentors...')
-        for mentor_name in mentors_to_create:
-            mentor_username = mentor_name.lower().replace(' ', '_')
-            mentor_email = f'{mentor_username}@cohortsummit.com'
-            
-            # Use email as username
-            mentor_user, created = User.objects.get_or_create(
-                email=mentor_email,
-                defaults={
-                    'username': mentor_email,
-                    'first_name': mentor_name.split()[0],
-                    'last_name': ' '.join(mentor_name.split()[1:]) if len(mentor_name.split()) > 1 else '',
-                }
-            )
-            if created:
-                mentor_user.set_password('mentor123')
-                mentor_user.save()
-                self.stdout.write(f'✅ Created mentor: {mentor_name} (login: {mentor_email})')
-            
-            # Ensure mentor profile exists
-            mentor_profile, _ = UserProfile.objects.get_or_create(user=mentor_user)
-            mentor_profile.role = 'MENTOR'
-            mentor_profile.campus = 'TECH'
-            mentor_profile.floor = 2
-            mentor_profile.save()
-            
-            mentor_users[mentor_name] = mentor_user
+        mentor_result = UserProvisioningService.provision(
+            mentor_rows, default_password='mentor123', role='MENTOR', campus='TECH', floor=2,
+            reset_passwords=False, workers=options['workers'],
+        )
+        self.stdout.write(
+            f"✅ Mentors: {mentor_result['created']} created, {mentor_result['updated']} already existed "
+            f"(login: <name>@cohortsummit.com)"
+        )
         
         self.stdout.write('\n' + '=' * 60)
         self.stdout.write('Creating students...')
         self.stdout.write('=' * 60 + '\n')
         
-        # Create students
-        created_count = 0
-        updated_count = 0
-        error_count = 0
+        student_rows = []
+        for username, email, first_name, second_name, mentor_name in STUDENTS_DATA:
+            # Use email as username for login
+            full_name = f"{first_name} {second_name}".strip() or username
+            name_parts = full_name.split(' ', 1)
+            student_rows.append({
+                'username': email,
+                'email': email,
+                'first_name': name_parts[0],
+                'last_name': name_parts[1] if len(name_parts) > 1 else '',
+                'mentor': mentor_name,
+            })
         
-        for idx, (username, email, first_name, second_name, mentor_name) in enumerate(STUDENTS_DATA, 1):
-            try:
-                # Progress indicator every 20 students
-                if idx % 20 == 0:
-                    self.stdout.write(f'Processing student {idx}/{len(STUDENTS_DATA)}...')
-                
-                # Parse name
-                full_name = f"{first_name} {second_name}".strip() if first_name or second_name else username
-                name_parts = full_name.split(' ', 1) if full_name else username.split(' ', 1)
-                first = name_parts[0]
-                last = name_parts[1] if len(name_parts) > 1 else ''
-                
-                # Use email as username for login
-                login_username = email
-                
-                # Check if user exists
-                existing_user = User.objects.filter(email=email).first()
-                if existing_user:
-                    user = existing_user
-                    updated_count += 1
-                else:
-                    # Create new user
-                    user = User.objects.create_user(
-                        username=login_username,
-                        email=email,
-                        password='student123',
-                        first_name=first,
-                        last_name=last,
-                    )
-                    created_count += 1
-                
-                # Create or update profile
-                profile, _ = UserProfile.objects.get_or_create(user=user)
-                profile.role = 'STUDENT'
-                profile.campus = 'TECH'
-                profile.floor = 2
-                
-                # Assign mentor
-                if mentor_name in mentor_users:
-                    profile.assigned_mentor = mentor_users[mentor_name]
-                
-                profile.save()
-                
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(self.style.ERROR(f'❌ Error creating {username} ({email}): {str(e)[:100]}'))
-                import traceback
-                self.stdout.write(self.style.ERROR(f'Traceback: {traceback.format_exc()[:200]}'))
+        # Existing students keep their passwords; only profiles are refreshed
+        result = UserProvisioningService.provision(
+            student_rows, default_password='student123', role='STUDENT', campus='TECH', floor=2,
+            reset_passwords=False, workers=options['workers'],
+        )
+        for error in result['errors']:
+            self.stdout.write(self.style.ERROR(f'❌ {error}'))
+        for mentor_name in result['unresolved_mentors']:
+            self.stdout.write(self.style.WARNING(f'⚠️  Unknown mentor: {mentor_name}'))
         
         # Summary
         self.stdout.write('\n' + '=' * 60)
         self.stdout.write(self.style.SUCCESS('✅ Student creation complete!'))
-        self.stdout.write(f'   Created: {created_count} students')
-        self.stdout.write(f'   Updated: {updated_count} students')
-        if error_count > 0:
-            self.stdout.write(self.style.WARNING(f'   Errors: {error_count}'))
+        self.stdout.write(f"   Created: {result['created']} students")
+        self.stdout.write(f"   Updated: {result['updated']} students")
+        if result['errors']:
+            self.stdout.write(self.style.WARNING(f"   Errors: {len(result['errors'])}"))
         self.stdout.write(f'\n📊 Total students: {User.objects.filter(profile__role="STUDENT").count()}')
         self.stdout.write(f'📊 Total mentors: {User.objects.filter(profile__role="MENTOR").count()}')
         self.stdout.write('\nMentor distribution:')
-        for mentor_name, mentor_user in mentor_users.items():
-            count = UserProfile.objects.filter(assigned_mentor=mentor_user).count()
-            self.stdout.write(f'   {mentor_name}: {count} students')
+        distribution = (
+            UserProfile.objects.filter(assigned_mentor__email__in=[row['email'] for row in mentor_rows])
+            .values('assigned_mentor__first_name', 'assigned_mentor__last_name')
+            .annotate(count=Count('id'))
+        )
+        for row in distribution:
+            mentor_name = f"{row['assigned_mentor__first_name']} {row['assigned_mentor__last_name']}".strip()
+            self.stdout.write(f"   {mentor_name}: {row['count']} students")
         self.stdout.write('=' * 60 + '\n')
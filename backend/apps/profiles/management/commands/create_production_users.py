@@ -1,6 +1,14 @@
 """
 Management command to create default users for production deployment
 Run this on Render after deployment: python manage.py create_production_users
+
+Idempotent: existing users are only saved when something differs, so a
+deploy where nothing changed writes nothing. --reset first deletes every
+user (the old behaviour) - never run it against a live cohort.
+
+Usage:
+    python manage.py create_production_users
+    python manage.py create_production_users --reset
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
@@ -11,38 +19,30 @@ from apps.profiles.models import UserProfile
 class Command(BaseCommand):
     help = 'Creates default users for production (admin, student, mentor, floorwing)'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Delete ALL users before creating the defaults')
+
     def create_or_update_user(self, username, email, password, first_name, last_name, is_superuser=False, role=None, campus='TECH', floor=2):
         """Helper to create or update a user and ensure it's properly configured"""
-        created = False
-        updated = False
-        
         try:
             user = User.objects.get(username=username)
-            self.stdout.write(f'Found existing user: {username}')
             
-            # Ensure user is active and has correct email
-            if not user.is_active:
-                user.is_active = True
-                updated = True
-            if user.email != email:
-                user.email = email
-                updated = True
-            if user.first_name != first_name:
-                user.first_name = first_name
-                updated = True
-            if user.last_name != last_name:
-                user.last_name = last_name
-                updated = True
+            # Ensure user is active and has the configured details
+            wanted = {'is_active': True, 'email': email, 'first_name': first_name, 'last_name': last_name}
+            changed = [field for field, value in wanted.items() if getattr(user, field) != value]
+            for field in changed:
+                setattr(user, field, wanted[field])
             
-            # Reset password to ensure it's correct
-            user.set_password(password)
-            updated = True
+            # Reset the password only if it no longer matches
+            if not user.check_password(password):
+                user.set_password(password)
+                changed.append('password')
             
-            if updated:
+            if changed:
                 user.save()
-                self.stdout.write(self.style.WARNING(f'⚠️  Updated existing user: {username}'))
+                self.stdout.write(self.style.WARNING(f'⚠️  Updated existing user: {username} ({", ".join(changed)})'))
             else:
-                self.stdout.write(self.style.WARNING(f'⚠️  User already exists and is configured: {username}'))
+                self.stdout.write(f'User already configured: {username}')
                 
         except User.DoesNotExist:
             # Create new user
@@ -63,7 +63,6 @@ class Command(BaseCommand):
                         first_name=first_name,
                         last_name=last_name
                     )
-                created = True
                 self.stdout.write(self.style.SUCCESS(f'✅ Created new user: {username}'))
             except IntegrityError as e:
                 self.stdout.write(self.style.ERROR(f'❌ Failed to create {username}: {e}'))
@@ -76,7 +75,7 @@ class Command(BaseCommand):
             profile = UserProfile.objects.create(user=user)
             self.stdout.write(f'Created profile for {username}')
         
-        if role:
+        if role and (profile.role, profile.campus, profile.floor) != (role, campus, floor):
             profile.role = role
             profile.campus = campus
             profile.floor = floor
@@ -84,13 +83,7 @@ class Command(BaseCommand):
         
         return user
 
-    def handle(self, *args, **options):
-        from django.db import connection
-        
-        self.stdout.write('========================================')
-        self.stdout.write('Creating/updating production users...')
-        self.stdout.write('========================================\n')
-        
+    def delete_all_users(self, connection):
         # Remove all existing users
         self.stdout.write('🧹 Removing all existing users from database...')
         user_count = User.objects.all().count()
@@ -110,6 +103,16 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'⚠️  Could not delete all users: {e}'))
             self.stdout.write(self.style.WARNING('Will update existing users instead\n'))
+
+    def handle(self, *args, **options):
+        from django.db import connection
+        
+        self.stdout.write('========================================')
+        self.stdout.write('Creating/updating production users...')
+        self.stdout.write('========================================\n')
+        
+        if options['reset']:
+            self.delete_all_users(connection)
         
         # Create/Update Admin User
         self.create_or_update_user(
@@ -1,6 +1,9 @@
 """
 Management command to fix PostgreSQL sequence for auth_user table
 Run: python manage.py fix_user_sequence
+
+Only moves the sequence when its next value would collide with an existing
+id; otherwise (and on databases without sequences) it changes nothing.
 """
 from django.core.management.base import BaseCommand
 from django.db import connection
@@ -10,15 +13,26 @@ class Command(BaseCommand):
     help = 'Fix PostgreSQL sequence for auth_user table'
 
     def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(f'No sequence to fix on {connection.vendor}')
+            return
+
         with connection.cursor() as cursor:
             # Get the current max ID
             cursor.execute("SELECT MAX(id) FROM auth_user")
             max_id = cursor.fetchone()[0] or 0
-            
+
+            cursor.execute("SELECT last_value, is_called FROM auth_user_id_seq")
+            last_value, is_called = cursor.fetchone()
+            next_value = last_value + 1 if is_called else last_value
+            if next_value > max_id:
+                self.stdout.write(f'auth_user sequence is OK. Max ID: {max_id}, Next ID: {next_value}')
+                return
+
             # Reset the sequence to max_id + 1
             cursor.execute(f"SELECT setval('auth_user_id_seq', {max_id + 1}, false)")
             new_value = cursor.fetchone()[0]
-            
+
             self.stdout.write(self.style.SUCCESS(
                 f'✅ Fixed auth_user sequence. Max ID: {max_id}, Next ID: {new_value}'
             ))
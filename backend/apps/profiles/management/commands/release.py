@@ -0,0 +1,95 @@
+"""
+Management Command: release
+
+Everything a deploy runs after installing dependencies, in one process
+(one Django startup instead of five) and skipping what has nothing to do:
+
+1. collectstatic - skipped when the static sources hash to the stamp the
+   last run left in STATIC_ROOT
+2. migrate - skipped when every migration is applied
+3. fix_user_sequence - only moves a sequence that is behind
+4. create_production_users - only saves users that differ
+5. check_users
+
+A redeploy or scale-out where nothing changed makes no writes.
+
+Usage:
+    python manage.py release
+    python manage.py release --force  # collectstatic and migrate regardless
+"""
+
+import hashlib
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+STATIC_STAMP = '.release-static.sha256'
+# collectstatic's default --ignore patterns
+STATIC_IGNORE_PATTERNS = ['CVS', '.*', '*~']
+
+
+def static_fingerprint():
+    """Hash of every file collectstatic would collect, and how it stores them"""
+    digest = hashlib.sha256()
+    digest.update(f'{settings.STATICFILES_STORAGE}|{settings.STATIC_URL}'.encode())
+    files = []
+    for finder in get_finders():
+        for path, storage in finder.list(STATIC_IGNORE_PATTERNS):
+            files.append((path, storage.path(path)))
+    for path, source in sorted(files):
+        digest.update(path.encode())
+        with open(source, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def unapplied_migrations(database=DEFAULT_DB_ALIAS):
+    executor = MigrationExecutor(connections[database])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+class Command(BaseCommand):
+    help = 'Prepare a deploy: static files, migrations and default users, skipping unchanged steps'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Run collectstatic and migrate even if unchanged')
+
+    def handle(self, *args, **options):
+        verbosity = options['verbosity']
+        self.collect_static(options['force'], verbosity)
+        self.migrate(options['force'], verbosity)
+
+        self.stdout.write('\n🔧 Fixing PostgreSQL user sequence...')
+        call_command('fix_user_sequence', stdout=self.stdout)
+
+        self.stdout.write('\n👥 Creating default production users...')
+        call_command('create_production_users', stdout=self.stdout)
+
+        self.stdout.write('\n🔍 Checking user status...')
+        call_command('check_users', stdout=self.stdout)
+
+    def collect_static(self, force, verbosity):
+        self.stdout.write('🗃️  Collecting static files...')
+        stamp_path = os.path.join(settings.STATIC_ROOT, STATIC_STAMP)
+        fingerprint = static_fingerprint()
+        if not force and os.path.exists(stamp_path):
+            with open(stamp_path) as f:
+                if f.read().strip() == fingerprint:
+                    self.stdout.write('Static files unchanged, skipping collectstatic')
+                    return
+
+        call_command('collectstatic', interactive=False, verbosity=verbosity, stdout=self.stdout)
+        with open(stamp_path, 'w') as f:
+            f.write(fingerprint)
+
+    def migrate(self, force, verbosity):
+        self.stdout.write('\n🔄 Running migrations...')
+        if not force and not unapplied_migrations():
+            self.stdout.write('No migrations to apply, skipping migrate')
+            return
+        call_command('migrate', interactive=False, verbosity=verbosity, stdout=self.stdout)
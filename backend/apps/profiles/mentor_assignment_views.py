@@ -12,9 +12,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth.models import User
 from django.db.models import Q
+from apps.query_profiler import query_budget
 from .models import UserProfile
 
 
+@query_budget(5)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_mentor_students(request):
@@ -41,8 +43,7 @@ def get_mentor_students(request):
             'user__last_name',
             'user__username',
             'campus',
-            'floor',
-            'wing'
+            'floor'
         )
         
         return Response({
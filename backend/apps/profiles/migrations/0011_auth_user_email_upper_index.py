@@ -0,0 +1,20 @@
+# Generated manually for login performance
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('profiles', '0010_alter_userprofile_campus'),
+    ]
+
+    operations = [
+        # auth_user.email has no index, so every email login scanned the table.
+        # Expression index matches EmailOrUsernameBackend's UPPER(email) lookup
+        # (works on both PostgreSQL and SQLite).
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS auth_user_email_upper_idx ON auth_user (UPPER(email));',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_upper_idx;',
+        ),
+    ]
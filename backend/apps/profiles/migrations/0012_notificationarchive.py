@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0011_auth_user_email_upper_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=10)),
+                ('source_id', models.IntegerField()),
+                ('recipient_id', models.IntegerField()),
+                ('notification_type', models.CharField(max_length=50)),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['recipient_id', '-created_at'], name='profiles_no_recipie_489e5c_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='notificationarchive',
+            constraint=models.UniqueConstraint(fields=('source', 'source_id'), name='unique_archived_notification'),
+        ),
+    ]
@@ -0,0 +1,205 @@
+"""
+Unified Notification Feed
+One newest-first feed over both notification stores
+
+Students receive notifications from two models: dashboard notifications
+(reviews, messages) and profile notifications (floor announcements). The feed:
+
+- Reads both with one UNION ALL query ordered by (created_at, source, id)
+- Pages with a keyset cursor, so older notifications stay reachable and
+  every page costs one query no matter how deep it is
+- Builds the response straight from the selected columns
+
+Feed items are identified as '<source>-<id>' (e.g. 'dashboard-12'), since
+the two tables number their rows independently.
+
+Usage:
+    from apps.profiles.notification_feed import NotificationFeed
+
+    items, next_cursor = NotificationFeed.page(user, cursor=request.GET.get('cursor'))
+    NotificationFeed.mark_read(user, 'profile-7')
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.db.models import CharField, F, IntegerField, Q, Value
+from django.utils import timezone
+
+from apps.dashboard.models import Notification as DashboardNotification
+from .notification_models import Notification as ProfileNotification
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class NotificationFeed:
+    """Merged, cursor-paginated view over both notification models"""
+
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 100
+
+    # Source names sort 'dashboard' < 'profile'; the feed breaks created_at ties on them
+    SOURCES = {
+        'dashboard': DashboardNotification,
+        'profile': ProfileNotification,
+    }
+
+    COLUMNS = ['id', 'notification_type', 'title', 'message', 'is_read', 'created_at']
+
+    @classmethod
+    def _source_queryset(cls, source, user, after):
+        model = cls.SOURCES[source]
+        queryset = model.objects.filter(recipient=user)
+
+        if after is not None:
+            created_at, cursor_source, cursor_id = after
+            # Keyset condition for descending (created_at, source, id), with
+            # this branch's source known up front
+            if source < cursor_source:
+                queryset = queryset.filter(created_at__lte=created_at)
+            elif source > cursor_source:
+                queryset = queryset.filter(created_at__lt=created_at)
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=cursor_id)
+                )
+
+        # Both branches must select the same columns in the same order
+        if model is DashboardNotification:
+            extra = {
+                'priority_value': F('priority'),
+                'action_url_value': F('action_url'),
+                'announcement_id_value': Value(None, output_field=IntegerField()),
+            }
+        else:
+            extra = {
+                'priority_value': Value('normal', output_field=CharField()),
+                'action_url_value': Value(None, output_field=CharField()),
+                'announcement_id_value': F('announcement_id'),
+            }
+        return (
+            queryset.order_by()
+            .annotate(source=Value(source, output_field=CharField()), **extra)
+            .values_list(*cls.COLUMNS, 'source', *extra)
+        )
+
+    @classmethod
+    def page(cls, user, cursor=None, page_size=None):
+        """
+        One page of the feed, newest first.
+
+        Returns (items, next_cursor); next_cursor is None on the last page.
+        Raises InvalidCursor for a cursor this feed did not produce.
+        """
+        page_size = min(page_size or cls.PAGE_SIZE, cls.MAX_PAGE_SIZE)
+        after = cls.decode_cursor(cursor) if cursor else None
+
+        dashboard, profile = (cls._source_queryset(source, user, after) for source in cls.SOURCES)
+        rows = list(
+            dashboard.union(profile, all=True)
+            .order_by('-created_at', '-source', '-id')[:page_size + 1]
+        )
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = cls.encode_cursor(rows[-1]) if has_more else None
+
+        now = timezone.now()
+        return [cls._item(row, now) for row in rows], next_cursor
+
+    @staticmethod
+    def _item(row, now):
+        pk, notification_type, title, message, is_read, created_at, source, priority, action_url, announcement_id = row
+        return {
+            'id': f'{source}-{pk}',
+            'source': source,
+            'source_id': pk,
+            'notification_type': notification_type,
+            'priority': priority,
+            'title': title,
+            'message': message,
+            'is_read': is_read,
+            'created_at': created_at.isoformat(),
+            'time_ago': time_ago(created_at, now),
+            'action_url': action_url,
+            'announcement_id': announcement_id,
+        }
+
+    @staticmethod
+    def encode_cursor(row):
+        pk, created_at, source = row[0], row[5], row[6]
+        payload = json.dumps([created_at.isoformat(), source, pk]).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        try:
+            created_at, source, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            created_at = datetime.fromisoformat(created_at)
+        except (ValueError, TypeError):
+            raise InvalidCursor('Invalid cursor')
+        if source not in cls.SOURCES or not isinstance(pk, int):
+            raise InvalidCursor('Invalid cursor')
+        return created_at, source, pk
+
+    @classmethod
+    def parse_key(cls, key):
+        """
+        Split a feed id into (model, pk). Bare numbers are accepted for
+        dashboard notifications, which is what older clients sent.
+        """
+        source, _, pk = str(key).rpartition('-')
+        source = source or 'dashboard'
+        if source not in cls.SOURCES or not pk.isdigit():
+            return None, None
+        return cls.SOURCES[source], int(pk)
+
+    @classmethod
+    def mark_read(cls, user, key):
+        """Mark one notification read; returns False when it does not exist"""
+        model, pk = cls.parse_key(key)
+        if model is None:
+            return False
+        notifications = model.objects.filter(recipient=user, pk=pk)
+        if not notifications.exists():
+            return False
+        cls._mark(notifications.filter(is_read=False))
+        return True
+
+    @classmethod
+    def mark_all_read(cls, user):
+        """Mark every unread notification in both stores read; returns the count"""
+        return sum(
+            cls._mark(model.objects.filter(recipient=user, is_read=False))
+            for model in cls.SOURCES.values()
+        )
+
+    @staticmethod
+    def _mark(queryset):
+        if queryset.model is DashboardNotification:
+            return queryset.update(is_read=True, read_at=timezone.now())
+        return queryset.update(is_read=True)
+
+
+def time_ago(created_at, now):
+    """Human-readable time difference, as in the notification serializers"""
+    diff = now - created_at
+
+    if diff < timedelta(minutes=1):
+        return "Just now"
+    elif diff < timedelta(hours=1):
+        minutes = int(diff.total_seconds() / 60)
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    elif diff < timedelta(days=1):
+        hours = int(diff.total_seconds() / 3600)
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    elif diff < timedelta(days=7):
+        days = diff.days
+        return f"{days} day{'s' if days != 1 else ''} ago"
+    elif diff < timedelta(days=30):
+        weeks = diff.days // 7
+        return f"{weeks} week{'s' if weeks != 1 else ''} ago"
+    else:
+        return created_at.strftime("%b %d, %Y")
@@ -30,3 +30,37 @@ class Notification(models.Model):
     
     def __str__(self):
         return f"{self.recipient.username} - {self.title}"
+
+
+class NotificationArchive(models.Model):
+    """
+    Compact copy of a notification removed from the hot tables by the
+    retention job (see notification_retention.py).
+    
+    Covers both stores (`source` = 'dashboard' or 'profile'). Columns that
+    are rarely read are packed into `data`. There are no foreign keys, so
+    the table can be range-partitioned on created_at (PostgreSQL) without
+    schema changes elsewhere.
+    """
+    source = models.CharField(max_length=10)
+    source_id = models.IntegerField()
+    recipient_id = models.IntegerField()
+    notification_type = models.CharField(max_length=50)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'source_id'], name='unique_archived_notification'),
+        ]
+        indexes = [
+            models.Index(fields=['recipient_id', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.source}-{self.source_id} - {self.title}"
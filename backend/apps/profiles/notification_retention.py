@@ -0,0 +1,153 @@
+"""
+Notification Retention
+Keeps the notification tables proportional to active users
+
+Every announcement fans out one row per student and nothing else removes
+them, so both notification tables (and their unread/recent indexes) grow
+without bound. The retention job moves out:
+
+- Read notifications older than NOTIFICATION_RETENTION_DAYS
+- Any notification older than NOTIFICATION_INACTIVE_DAYS whose recipient
+  has not logged in since then (last_login, set on JWT login; users with
+  no recorded login are never treated as inactive)
+
+Rows are copied to NotificationArchive and/or a gzip JSONL export, then
+deleted, NOTIFICATION_RETENTION_BATCH rows per transaction so no lock is
+held for long. Rows are picked by primary key, so an interrupted run just
+continues on the next one.
+
+Usage:
+    from apps.profiles.notification_retention import NotificationRetentionService
+
+    stats = NotificationRetentionService.run(export=gzip_text_file)
+"""
+import json
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.dashboard.models import Notification as DashboardNotification
+from .notification_models import Notification as ProfileNotification, NotificationArchive
+
+
+class NotificationRetentionService:
+    """Archive and delete old notifications in bounded batches"""
+
+    SOURCES = {
+        'dashboard': DashboardNotification,
+        'profile': ProfileNotification,
+    }
+
+    # Columns kept in NotificationArchive.data rather than as columns
+    EXTRA_FIELDS = {
+        'dashboard': [
+            'sender_id', 'priority', 'related_pillar', 'related_submission_type',
+            'related_submission_id', 'action_url',
+        ],
+        'profile': ['announcement_id'],
+    }
+
+    @classmethod
+    def expired(cls, model, now=None, read_days=None, inactive_days=None):
+        """Queryset of notifications due for archiving"""
+        now = now or timezone.now()
+        read_before = now - timedelta(days=read_days or settings.NOTIFICATION_RETENTION_DAYS)
+        inactive_before = now - timedelta(days=inactive_days or settings.NOTIFICATION_INACTIVE_DAYS)
+        # A NULL last_login is unknown, not inactive: logins before
+        # UPDATE_LAST_LOGIN was enabled were never recorded
+        return model.objects.filter(
+            Q(is_read=True, created_at__lt=read_before)
+            | Q(created_at__lt=inactive_before, recipient__last_login__lt=inactive_before)
+        )
+
+    @classmethod
+    def count(cls, **options):
+        """{source: rows due for archiving}"""
+        return {source: cls.expired(model, **options).count() for source, model in cls.SOURCES.items()}
+
+    @classmethod
+    def run(cls, read_days=None, inactive_days=None, batch_size=None, archive=True,
+            export=None, pause=0, on_batch=None):
+        """
+        Archive and delete every expired notification.
+
+        archive:  copy rows into NotificationArchive
+        export:   text file object (e.g. gzip.open(path, 'at')) that receives one
+                  JSON object per row before the row is deleted
+        pause:    seconds to sleep between batches, to leave room for live traffic
+        on_batch: called as on_batch(source, rows_in_batch)
+
+        Returns {source: rows_removed}
+        """
+        batch_size = batch_size or settings.NOTIFICATION_RETENTION_BATCH
+        now = timezone.now()
+        stats = {}
+
+        for source, model in cls.SOURCES.items():
+            expired = cls.expired(model, now, read_days, inactive_days)
+            stats[source] = 0
+            last_id = 0
+            while True:
+                ids = list(
+                    expired.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                removed = cls._move_batch(source, model, ids, archive, export)
+                stats[source] += removed
+                last_id = ids[-1]
+                if on_batch:
+                    on_batch(source, removed)
+                if pause:
+                    time.sleep(pause)
+        return stats
+
+    @classmethod
+    def _move_batch(cls, source, model, ids, archive, export):
+        extra = cls.EXTRA_FIELDS[source]
+        read_at = ['read_at'] if source == 'dashboard' else []
+        columns = ['id', 'recipient_id', 'notification_type', 'title', 'message', 'created_at', *read_at, *extra]
+
+        with transaction.atomic():
+            rows = list(model.objects.filter(pk__in=ids).values(*columns))
+            records = [
+                NotificationArchive(
+                    source=source,
+                    source_id=row['id'],
+                    recipient_id=row['recipient_id'],
+                    notification_type=row['notification_type'],
+                    title=row['title'],
+                    message=row['message'],
+                    created_at=row['created_at'],
+                    read_at=row.get('read_at'),
+                    data={field: row[field] for field in extra if row[field] is not None},
+                )
+                for row in rows
+            ]
+            if archive:
+                # ignore_conflicts: rows archived by an earlier, interrupted run
+                NotificationArchive.objects.bulk_create(records, ignore_conflicts=True)
+            if export is not None:
+                for record in records:
+                    export.write(json.dumps(cls.export_row(record)) + '\n')
+                export.flush()
+            model.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        return len(rows)
+
+    @staticmethod
+    def export_row(record):
+        return {
+            'source': record.source,
+            'source_id': record.source_id,
+            'recipient_id': record.recipient_id,
+            'notification_type': record.notification_type,
+            'title': record.title,
+            'message': record.message,
+            'data': record.data,
+            'created_at': record.created_at.isoformat(),
+            'read_at': record.read_at.isoformat() if record.read_at else None,
+        }
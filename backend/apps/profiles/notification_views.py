@@ -2,59 +2,45 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.utils import timezone
-from django.db.models import Q
 from django.core.cache import cache
 from django.conf import settings
 from apps.dashboard.models import Notification as DashboardNotification
 from .notification_models import Notification as ProfileNotification
-from apps.dashboard.serializers import NotificationSerializer
-from .notification_serializers import NotificationSerializer as ProfileNotificationSerializer
+from .notification_feed import InvalidCursor, NotificationFeed
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(viewsets.ViewSet):
     """
     User notifications API - combines both dashboard and profile notifications
-    - Get all notifications
+    - Get notifications (newest first, cursor-paginated)
     - Get unread count
     - Mark as read
     - Mark all as read
     """
     permission_classes = [IsAuthenticated]
-    serializer_class = NotificationSerializer
     
-    def get_queryset(self):
-        """Return notifications for current user from both sources"""
-        # Get dashboard notifications
-        dashboard_notifs = list(DashboardNotification.objects.filter(
-            recipient=self.request.user
-        )[:25])
-        
-        # Get profile notifications (announcements, etc.)
-        profile_notifs = list(ProfileNotification.objects.filter(
-            recipient=self.request.user
-        )[:25])
-        
-        # Combine and sort by created_at
-        all_notifs = dashboard_notifs + profile_notifs
-        all_notifs.sort(key=lambda x: x.created_at, reverse=True)
-        
-        return all_notifs[:50]  # Return top 50
-    
-    def list(self, request, *args, **kwargs):
-        """Custom list to handle mixed notification types"""
-        queryset = self.get_queryset()
-        
-        # Serialize each notification with appropriate serializer
-        serialized = []
-        for notif in queryset:
-            if isinstance(notif, ProfileNotification):
-                serializer = ProfileNotificationSerializer(notif)
-            else:
-                serializer = NotificationSerializer(notif)
-            serialized.append(serializer.data)
-        
-        return Response({'results': serialized})
+    def list(self, request):
+        """
+        GET /api/profiles/notifications/?cursor=<next>&page_size=50
+        
+        One UNION ALL query per page over both notification stores
+        (see notification_feed.py). Item ids look like 'dashboard-12'.
+        """
+        try:
+            page_size = int(request.query_params.get('page_size', NotificationFeed.PAGE_SIZE))
+        except ValueError:
+            page_size = NotificationFeed.PAGE_SIZE
+        
+        try:
+            items, next_cursor = NotificationFeed.page(
+                request.user,
+                cursor=request.query_params.get('cursor'),
+                page_size=max(page_size, 1),
+            )
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({'results': items, 'next': next_cursor})
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
@@ -102,12 +88,15 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     def mark_read(self, request, pk=None):
         """
         Mark a single notification as read
+        POST /api/profiles/notifications/{id}/mark_read/  (id as listed, e.g. 'profile-7')
         
         OPTIMIZED: Invalidates cache when notifications change
         """
-        notification = self.get_object()
-        notification.is_read = True
-        notification.save()
+        if not NotificationFeed.mark_read(request.user, pk):
+            return Response(
+                {'error': 'Notification not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
         # Invalidate cache for this user
         if settings.USE_NOTIFICATION_CACHE:
@@ -126,17 +115,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         
         OPTIMIZED: Invalidates cache after bulk update
         """
-        dashboard_updated = DashboardNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).update(is_read=True)
-        
-        profile_updated = ProfileNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).update(is_read=True)
-        
-        total_updated = dashboard_updated + profile_updated
+        total_updated = NotificationFeed.mark_all_read(request.user)
         
         # Invalidate cache for this user
         if settings.USE_NOTIFICATION_CACHE:
@@ -0,0 +1,382 @@
+"""
+Bulk User Provisioning Service
+
+Onboards a batch of users (students, mentors, floor wings) in a handful of
+queries instead of one create/set_password/save round-trip per user.
+
+- Management commands hash passwords in a process pool across all cores
+  (workers=None); PBKDF2 is CPU bound, so threads would serialize on the
+  GIL. Request handlers keep the default workers=1 and hash inline:
+  forking a threaded gunicorn/uvicorn worker can deadlock and doubles
+  its memory
+- Users, UserProfiles, LegacyScores, VaultWallets and active-season
+  records are bulk created;
+  existing users are bulk updated
+- Mentors are resolved through a single name/email/username -> id map
+
+Usage:
+    from apps.profiles.provisioning import UserProvisioningService
+
+    rows = UserProvisioningService.read_rows('students.xlsx')
+    result = UserProvisioningService.provision(
+        rows, default_password='pass123#', campus='TECH', floor=2
+    )
+
+Rows are dicts with any of: username, email, password, first_name,
+last_name, role, campus, floor, mentor, is_staff, is_superuser.
+is_staff/is_superuser only apply to new users: existing accounts keep
+their flags, and an account an admin deactivated stays inactive.
+"""
+
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.functions import Upper
+
+from .models import UserProfile
+
+
+def _init_hash_worker(settings_module):
+    """Configure Django in pool workers started with the spawn method"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _hash_password(password):
+    return make_password(password)
+
+
+def _as_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+
+class UserProvisioningService:
+    """Create or update users in bulk"""
+
+    BATCH_SIZE = 500
+    # Below this many hashes the pool start-up costs more than it saves
+    POOL_THRESHOLD = 16
+
+    USER_FIELDS = ['first_name', 'last_name', 'email']
+    PROFILE_FIELDS = ['role', 'campus', 'floor', 'assigned_mentor']
+
+    @staticmethod
+    def read_rows(source, filename=None):
+        """
+        Read rows from a CSV or XLSX file.
+
+        `source` is a path or a file-like object (e.g. an UploadedFile);
+        headers are normalized to lower_snake_case.
+        """
+        name = (filename or getattr(source, 'name', None) or str(source)).lower()
+        if name.endswith(('.xlsx', '.xlsm')):
+            rows = UserProvisioningService._read_xlsx(source)
+        else:
+            rows = UserProvisioningService._read_csv(source)
+
+        normalized = []
+        for row in rows:
+            clean = {
+                str(key).strip().lower().replace(' ', '_'): (value.strip() if isinstance(value, str) else value)
+                for key, value in row.items() if key
+            }
+            if any(value not in (None, '') for value in clean.values()):
+                normalized.append(clean)
+        return normalized
+
+    @staticmethod
+    def _read_csv(source):
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'r', encoding='utf-8-sig') as fh:
+                return list(csv.DictReader(fh))
+        content = source.read()
+        if isinstance(content, bytes):
+            content = content.decode('utf-8-sig')
+        return list(csv.DictReader(io.StringIO(content)))
+
+    @staticmethod
+    def _read_xlsx(source):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError('openpyxl is required to import .xlsx files (pip install openpyxl)')
+
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            values = sheet.iter_rows(values_only=True)
+            headers = next(values, None) or []
+            return [dict(zip(headers, row)) for row in values]
+        finally:
+            workbook.close()
+
+    @classmethod
+    def hash_passwords(cls, passwords, workers=1):
+        """
+        Hash passwords, preserving order. workers > 1 (or None for one per
+        core) uses a process pool - management commands only.
+        """
+        passwords = list(passwords)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1 or len(passwords) < cls.POOL_THRESHOLD:
+            return [make_password(password) for password in passwords]
+
+        chunksize = max(len(passwords) // (workers * 4), 1)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_hash_worker,
+            initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'),),
+        ) as pool:
+            return list(pool.map(_hash_password, passwords, chunksize=chunksize))
+
+    @staticmethod
+    def build_mentor_map():
+        """Map upper-cased full name, email and username of every mentor to its user id"""
+        mentor_map = {}
+        mentors = User.objects.filter(profile__role='MENTOR').values_list(
+            'id', 'username', 'email', 'first_name', 'last_name'
+        )
+        for user_id, username, email, first_name, last_name in mentors:
+            full_name = f'{first_name} {last_name}'.strip()
+            for key in (full_name, email, username):
+                if key:
+                    mentor_map.setdefault(key.upper(), user_id)
+        return mentor_map
+
+    @classmethod
+    def provision(cls, rows, default_password=None, role='STUDENT', campus='TECH', floor=None,
+                  match_on='email', reset_passwords=True, workers=1):
+        """
+        Create or update every row in one pass.
+
+        match_on:        'email' (case-insensitive) or 'username'
+        reset_passwords: also re-hash passwords of users that already exist
+        workers:         password hashing processes (see hash_passwords)
+
+        Returns a summary dict with created/updated counts, the affected
+        user ids, unresolved mentor names and per-row errors.
+        """
+        result = {
+            'created': 0,
+            'updated': 0,
+            'errors': [],
+            'unresolved_mentors': [],
+            'created_ids': [],
+            'updated_ids': [],
+        }
+
+        entries = cls._normalize(rows, default_password, role, campus, floor, match_on, result)
+        if not entries:
+            return result
+
+        existing = cls._existing_users(entries, match_on)
+        taken_usernames = set(
+            User.objects.filter(username__in=[e['username'] for e in entries]).values_list('username', flat=True)
+        )
+
+        new_entries, existing_entries = [], []
+        for entry in entries:
+            user = existing.get(entry['key'])
+            if user is not None:
+                existing_entries.append((entry, user))
+            elif entry['username'] in taken_usernames:
+                result['errors'].append(f"{entry['username']}: username already belongs to another account")
+            else:
+                new_entries.append(entry)
+
+        to_hash = new_entries + ([entry for entry, _ in existing_entries] if reset_passwords else [])
+        hashes = dict(zip(
+            (id(entry) for entry in to_hash),
+            cls.hash_passwords([entry['password'] for entry in to_hash], workers=workers),
+        ))
+
+        mentor_map = cls.build_mentor_map() if any(e['mentor'] for e in entries) else {}
+
+        with transaction.atomic():
+            created_users = cls._create_users(new_entries, hashes)
+            updated_users = cls._update_users(existing_entries, hashes if reset_passwords else None)
+
+            pairs = list(zip(new_entries, created_users)) + [
+                (entry, user) for (entry, _), user in zip(existing_entries, updated_users)
+            ]
+            cls._sync_profiles(pairs, mentor_map, result)
+            cls._create_gamification_records(
+                created_users, [user.pk for entry, user in pairs if entry['role'] == 'STUDENT']
+            )
+
+        if updated_users:
+            # bulk_update skips post_save, so drop cached JWT identities here
+            from apps.authentication import invalidate_identity
+            for user in updated_users:
+                invalidate_identity(user.pk)
+
+        result['created'] = len(created_users)
+        result['updated'] = len(updated_users)
+        result['created_ids'] = [user.pk for user in created_users]
+        result['updated_ids'] = [user.pk for user in updated_users]
+        return result
+
+    @staticmethod
+    def _normalize(rows, default_password, role, campus, floor, match_on, result):
+        entries, seen = [], set()
+        for index, row in enumerate(rows, 1):
+            email = (row.get('email') or '').strip()
+            username = str(row.get('username') or email).strip()
+            if not username:
+                result['errors'].append(f'Row {index}: missing username and email')
+                continue
+
+            key = email.upper() if match_on == 'email' else username
+            if not key:
+                result['errors'].append(f'Row {index}: missing {match_on}')
+                continue
+            if key in seen:
+                result['errors'].append(f'Row {index}: duplicate {match_on} {email or username}')
+                continue
+            seen.add(key)
+
+            password = row.get('password') or default_password
+            if not password:
+                result['errors'].append(f'Row {index}: no password for {username}')
+                continue
+
+            row_floor = floor
+            if row.get('floor') not in (None, ''):
+                try:
+                    row_floor = int(row['floor'])
+                except (TypeError, ValueError):
+                    result['errors'].append(f"Row {index}: invalid floor {row['floor']!r} for {username}")
+                    continue
+
+            first_name, last_name = row.get('first_name'), row.get('last_name')
+            if not first_name and not last_name:
+                # Sheets usually carry a single "NAME SURNAME" column as username
+                name = str(row.get('name') or row.get('username') or '').split(' ', 1)
+                first_name = name[0] if name else ''
+                last_name = name[1] if len(name) > 1 else ''
+
+            entries.append({
+                'key': key,
+                'username': username,
+                'email': email,
+                'password': str(password),
+                'first_name': (first_name or '')[:150],
+                'last_name': (last_name or '')[:150],
+                'is_staff': _as_bool(row.get('is_staff')),
+                'is_superuser': _as_bool(row.get('is_superuser')),
+                'role': (row.get('role') or role).upper(),
+                'campus': row.get('campus') or campus,
+                'floor': row_floor,
+                'mentor': str(row.get('mentor') or '').strip(),
+            })
+        return entries
+
+    @staticmethod
+    def _existing_users(entries, match_on):
+        keys = [entry['key'] for entry in entries]
+        if match_on == 'email':
+            users = User.objects.annotate(email_upper=Upper('email')).filter(email_upper__in=keys).order_by('id')
+            # Oldest account wins when an email is duplicated
+            return {user.email_upper: user for user in reversed(list(users))}
+        return {user.username: user for user in User.objects.filter(username__in=keys)}
+
+    @classmethod
+    def _create_users(cls, entries, hashes):
+        if not entries:
+            return []
+        User.objects.bulk_create([
+            User(
+                username=entry['username'],
+                email=entry['email'],
+                password=hashes[id(entry)],
+                first_name=entry['first_name'],
+                last_name=entry['last_name'],
+                is_staff=entry['is_staff'] or entry['is_superuser'],
+                is_superuser=entry['is_superuser'],
+            )
+            for entry in entries
+        ], batch_size=cls.BATCH_SIZE)
+        # Re-read so primary keys are set on every backend
+        by_username = User.objects.in_bulk([entry['username'] for entry in entries], field_name='username')
+        return [by_username[entry['username']] for entry in entries]
+
+    @classmethod
+    def _update_users(cls, pairs, hashes):
+        fields = list(cls.USER_FIELDS)
+        if hashes is not None:
+            fields.append('password')
+
+        users = []
+        for entry, user in pairs:
+            user.email = entry['email'] or user.email
+            user.first_name = entry['first_name'] or user.first_name
+            user.last_name = entry['last_name'] or user.last_name
+            if hashes is not None:
+                user.password = hashes[id(entry)]
+            users.append(user)
+        User.objects.bulk_update(users, fields, batch_size=cls.BATCH_SIZE)
+        return users
+
+    @classmethod
+    def _sync_profiles(cls, pairs, mentor_map, result):
+        profiles = UserProfile.objects.in_bulk([user.pk for _, user in pairs], field_name='user_id')
+        to_create, to_update = [], []
+
+        for entry, user in pairs:
+            mentor_id = None
+            if entry['mentor']:
+                mentor_id = mentor_map.get(entry['mentor'].upper())
+                if mentor_id is None and entry['mentor'] not in result['unresolved_mentors']:
+                    result['unresolved_mentors'].append(entry['mentor'])
+
+            profile = profiles.get(user.pk)
+            if profile is None:
+                to_create.append(UserProfile(
+                    user=user, role=entry['role'], campus=entry['campus'],
+                    floor=entry['floor'], assigned_mentor_id=mentor_id,
+                ))
+                continue
+
+            profile.role = entry['role']
+            profile.campus = entry['campus']
+            profile.floor = entry['floor']
+            if mentor_id is not None:
+                profile.assigned_mentor_id = mentor_id
+            to_update.append(profile)
+
+        UserProfile.objects.bulk_create(to_create, batch_size=cls.BATCH_SIZE)
+        UserProfile.objects.bulk_update(to_update, cls.PROFILE_FIELDS, batch_size=cls.BATCH_SIZE)
+
+    @classmethod
+    def _create_gamification_records(cls, users, student_ids):
+        """
+        bulk_create skips the post_save signals that normally create these.
+        Only students (new, or existing ones bulk-updated to STUDENT) are
+        enrolled in the active season.
+        """
+        from apps.gamification.active_season import get_active_season
+        from apps.gamification.models import LegacyScore, VaultWallet
+        from apps.gamification.progress_notifications import invalidate_distribution
+        from apps.gamification.services import SeasonRecordService
+
+        LegacyScore.objects.bulk_create(
+            [LegacyScore(student=user) for user in users], batch_size=cls.BATCH_SIZE, ignore_conflicts=True
+        )
+        VaultWallet.objects.bulk_create(
+            [VaultWallet(student=user) for user in users], batch_size=cls.BATCH_SIZE, ignore_conflicts=True
+        )
+        active_season = get_active_season()
+        if active_season:
+            if student_ids:
+                SeasonRecordService.enroll(active_season, student_ids)
+            # bulk_update skips the profile signal; roles may have changed
+            invalidate_distribution(active_season.id)
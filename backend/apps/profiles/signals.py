@@ -1,7 +1,23 @@
-from django.db.models.signals import post_save
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import FloorAnnouncement, UserProfile
 from apps.dashboard.models import Notification
+from apps.authentication import invalidate_identity
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_identity(sender, instance, **kwargs):
+    """Drop the cached JWT identity when the user row changes"""
+    invalidate_identity(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_identity(sender, instance, **kwargs):
+    """Drop the cached JWT identity when role/campus/floor/mentor changes"""
+    invalidate_identity(instance.user_id)
 
 
 @receiver(post_save, sender=FloorAnnouncement)
@@ -0,0 +1,385 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.gamification.models import LegacyScore, VaultWallet
+from apps.dashboard.models import Notification as DashboardNotification
+from apps.profiles.models import UserProfile
+from apps.profiles.notification_models import Notification as ProfileNotification, NotificationArchive
+from apps.profiles.notification_retention import NotificationRetentionService
+from apps.profiles.provisioning import UserProvisioningService
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserProvisioningServiceTests(TestCase):
+    def setUp(self):
+        self.mentor = User.objects.create_user(
+            username='gopi', email='gopi@cohortsummit.com', first_name='GOPI', last_name='KRISHNAN'
+        )
+        self.mentor.profile.role = 'MENTOR'
+        self.mentor.profile.save()
+
+    def test_creates_users_profiles_and_gamification_records_in_bulk(self):
+        rows = [
+            {'username': f'Student {i}', 'email': f'student{i}@college.edu', 'mentor': 'Gopi Krishnan'}
+            for i in range(20)
+        ]
+
+        with self.assertNumQueries(12):
+            result = UserProvisioningService.provision(rows, default_password='pass123#', floor=2, workers=1)
+
+        self.assertEqual((result['created'], result['updated']), (20, 0))
+        user = User.objects.get(email='student7@college.edu')
+        self.assertTrue(user.check_password('pass123#'))
+        self.assertEqual((user.first_name, user.last_name), ('Student', '7'))
+        self.assertEqual(user.profile.role, 'STUDENT')
+        self.assertEqual(user.profile.floor, 2)
+        self.assertEqual(user.profile.assigned_mentor, self.mentor)
+        self.assertTrue(LegacyScore.objects.filter(student=user).exists())
+        self.assertTrue(VaultWallet.objects.filter(student=user).exists())
+
+    def test_only_students_are_enrolled_in_the_active_season(self):
+        from datetime import date
+        from apps.gamification.active_season import invalidate_active_season
+        from apps.gamification.models import EpisodeProgress, Season, SeasonScore
+        invalidate_active_season()
+        season = Season.objects.create(
+            name='Season 1', season_number=1, start_date=date(2026, 1, 1), end_date=date(2026, 1, 28)
+        )
+
+        UserProvisioningService.provision([
+            {'username': 'new-student', 'email': 'new-student@college.edu'},
+            {'username': 'new-mentor', 'email': 'new-mentor@college.edu', 'role': 'mentor'},
+        ], default_password='pass123#', workers=1)
+
+        enrolled = set(SeasonScore.objects.filter(season=season).values_list('student__username', flat=True))
+        self.assertEqual(enrolled, {'new-student'})
+        self.assertFalse(EpisodeProgress.objects.filter(student__username='new-mentor').exists())
+        self.assertTrue(VaultWallet.objects.filter(student__username='new-mentor').exists())
+
+    def test_existing_users_keep_active_and_staff_flags(self):
+        deactivated = User.objects.create_user(username='left', email='left@college.edu', is_active=False)
+
+        UserProvisioningService.provision(
+            [{'username': 'left', 'email': 'left@college.edu', 'is_staff': 'true', 'is_superuser': 'true'}],
+            default_password='pass123#', workers=1,
+        )
+
+        deactivated.refresh_from_db()
+        self.assertEqual((deactivated.is_active, deactivated.is_staff, deactivated.is_superuser), (False, False, False))
+
+    def test_existing_users_match_email_case_insensitively_and_update(self):
+        existing = User.objects.create_user(username='abina', email='Abina@College.edu', password='old-pass')
+
+        result = UserProvisioningService.provision(
+            [{'username': 'abina', 'email': 'abina@college.edu', 'role': 'floor_wing'}],
+            default_password='new-pass', workers=1,
+        )
+
+        self.assertEqual((result['created'], result['updated']), (0, 1))
+        existing.refresh_from_db()
+        self.assertTrue(existing.check_password('new-pass'))
+        self.assertEqual(UserProfile.objects.get(user=existing).role, 'FLOOR_WING')
+
+    def test_reset_passwords_false_keeps_existing_password(self):
+        existing = User.objects.create_user(username='kept', email='kept@college.edu', password='old-pass')
+
+        UserProvisioningService.provision(
+            [{'email': 'kept@college.edu'}], default_password='new-pass', reset_passwords=False, workers=1
+        )
+
+        existing.refresh_from_db()
+        self.assertTrue(existing.check_password('old-pass'))
+
+    def test_bad_rows_are_reported_not_fatal(self):
+        User.objects.create_user(username='taken', email='someone@college.edu')
+        rows = [
+            {'username': 'taken', 'email': 'other@college.edu'},
+            {'username': 'dup', 'email': 'dup@college.edu'},
+            {'username': 'dup2', 'email': 'DUP@college.edu'},
+            {'username': 'ok', 'email': 'ok@college.edu', 'mentor': 'Nobody'},
+        ]
+
+        result = UserProvisioningService.provision(rows, default_password='pass', workers=1)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(len(result['errors']), 2)
+        self.assertEqual(result['unresolved_mentors'], ['Nobody'])
+
+    def test_read_rows_normalizes_csv_headers(self):
+        upload = io.BytesIO('﻿User Name,Email,Mentor\nABINA J, abina@college.edu ,GOPI KRISHNAN\n,,\n'.encode())
+        upload.name = 'students.csv'
+
+        rows = UserProvisioningService.read_rows(upload)
+
+        self.assertEqual(rows, [{'user_name': 'ABINA J', 'email': 'abina@college.edu', 'mentor': 'GOPI KRISHNAN'}])
+
+    def test_read_rows_xlsx(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        workbook.active.append(['username', 'email', 'floor'])
+        workbook.active.append(['ABINA J', 'abina@college.edu', 2])
+        upload = io.BytesIO()
+        workbook.save(upload)
+        upload.seek(0)
+
+        rows = UserProvisioningService.read_rows(upload, filename='students.xlsx')
+
+        self.assertEqual(rows, [{'username': 'ABINA J', 'email': 'abina@college.edu', 'floor': 2}])
+
+    def test_invalid_floor_is_reported_per_row(self):
+        rows = [
+            {'email': 'good@college.edu', 'floor': '3'},
+            {'email': 'bad@college.edu', 'floor': 'second'},
+        ]
+
+        result = UserProvisioningService.provision(rows, default_password='pass')
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'], ["Row 2: invalid floor 'second' for bad@college.edu"])
+        self.assertEqual(User.objects.get(email='good@college.edu').profile.floor, 3)
+
+    def test_provision_hashes_inline_by_default(self):
+        rows = [{'email': f'inline{i}@college.edu'} for i in range(20)]
+
+        with mock.patch('apps.profiles.provisioning.ProcessPoolExecutor') as pool:
+            result = UserProvisioningService.provision(rows, default_password='pass')
+
+        pool.assert_not_called()
+        self.assertEqual(result['created'], 20)
+
+    def test_hash_passwords_in_process_pool(self):
+        hashes = UserProvisioningService.hash_passwords(['secret'] * 20, workers=2)
+
+        self.assertEqual(len(hashes), 20)
+        self.assertEqual(len(set(hashes)), 20)  # every hash gets its own salt
+
+
+class NotificationFeedTests(TestCase):
+    def setUp(self):
+        from rest_framework.test import APIClient
+
+        self.student = User.objects.create_user(username='student', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+        now = timezone.now()
+        self.expected = []
+        # Interleaved timestamps, with one tie across the two stores
+        for minutes, model in [(1, DashboardNotification), (2, ProfileNotification), (3, DashboardNotification),
+                               (3, ProfileNotification), (4, ProfileNotification), (5, DashboardNotification),
+                               (6, DashboardNotification)]:
+            kwargs = {'notification_type': 'system'} if model is ProfileNotification else {}
+            notification = model.objects.create(recipient=self.student, title=f't{minutes}', message='m', **kwargs)
+            model.objects.filter(pk=notification.pk).update(created_at=now - timedelta(minutes=minutes))
+            source = 'profile' if model is ProfileNotification else 'dashboard'
+            self.expected.append(f'{source}-{notification.pk}')
+        # Tie at 3 minutes: 'profile' sorts after 'dashboard', so it comes first newest-first
+        self.expected[2], self.expected[3] = self.expected[3], self.expected[2]
+
+        other = User.objects.create_user(username='other', password='x')
+        DashboardNotification.objects.create(recipient=other, title='not yours', message='m')
+
+    def test_pages_through_both_stores_with_one_query_per_page(self):
+        seen, cursor = [], None
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                params = {'page_size': 3, **({'cursor': cursor} if cursor else {})}
+                response = self.client.get('/api/profiles/notifications/', params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len([q for q in queries.captured_queries if 'UNION ALL' in q['sql']]), 1)
+            self.assertEqual(len(queries.captured_queries), 1)
+            seen += [item['id'] for item in response.data['results']]
+            cursor = response.data['next']
+            if not cursor:
+                break
+
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(response.data['results'][-1]['time_ago'], '6 minutes ago')
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/profiles/notifications/', {'cursor': 'bm9wZQ=='})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_mark_read_across_both_stores(self):
+        dashboard_id, profile_id = self.expected[0], self.expected[1]
+        self.assertTrue(dashboard_id.startswith('dashboard-') and profile_id.startswith('profile-'))
+
+        for key in (profile_id, dashboard_id):
+            response = self.client.post(f'/api/profiles/notifications/{key}/mark_read/')
+            self.assertEqual(response.status_code, 200)
+        self.assertTrue(ProfileNotification.objects.get(pk=profile_id.split('-')[1]).is_read)
+        dashboard = DashboardNotification.objects.get(pk=dashboard_id.split('-')[1])
+        self.assertTrue(dashboard.is_read)
+        self.assertIsNotNone(dashboard.read_at)
+
+        not_yours = DashboardNotification.objects.get(recipient__username='other')
+        response = self.client.post(f'/api/profiles/notifications/dashboard-{not_yours.pk}/mark_read/')
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.post('/api/profiles/notifications/mark_all_read/')
+        self.assertEqual(response.data['updated_count'], 5)
+        self.assertEqual(self.client.get('/api/profiles/notifications/unread_count/').data['unread_count'], 0)
+        self.assertFalse(not_yours.__class__.objects.get(pk=not_yours.pk).is_read)
+
+
+class NotificationRetentionTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.active = User.objects.create_user(username='active', password='x', last_login=now)
+        self.inactive = User.objects.create_user(
+            username='inactive', password='x', last_login=now - timedelta(days=400)
+        )
+
+        def notification(model, user, days, is_read, **kwargs):
+            notification = model.objects.create(recipient=user, title=f'{days}d', message='m', is_read=is_read, **kwargs)
+            model.objects.filter(pk=notification.pk).update(created_at=now - timedelta(days=days))
+            return notification
+
+        self.old_read = notification(DashboardNotification, self.active, 60, True, priority='high')
+        self.old_unread = notification(DashboardNotification, self.active, 60, False)
+        self.recent_read = notification(DashboardNotification, self.active, 5, True)
+        self.old_profile = notification(
+            ProfileNotification, self.active, 90, True, notification_type='floor_announcement', announcement_id=7
+        )
+        self.abandoned = notification(ProfileNotification, self.inactive, 200, False, notification_type='system')
+
+    @override_settings(NOTIFICATION_RETENTION_DAYS=30, NOTIFICATION_INACTIVE_DAYS=180)
+    def test_archives_expired_rows_in_batches(self):
+        batches = []
+        stats = NotificationRetentionService.run(batch_size=1, on_batch=lambda source, n: batches.append(source))
+
+        self.assertEqual(stats, {'dashboard': 1, 'profile': 2})
+        self.assertEqual(batches, ['dashboard', 'profile', 'profile'])
+        self.assertEqual(
+            set(DashboardNotification.objects.values_list('pk', flat=True)),
+            {self.old_unread.pk, self.recent_read.pk},
+        )
+        self.assertFalse(ProfileNotification.objects.exists())
+
+        archived = NotificationArchive.objects.get(source='dashboard')
+        self.assertEqual((archived.source_id, archived.recipient_id), (self.old_read.pk, self.active.pk))
+        self.assertEqual(archived.data, {'priority': 'high'})
+        self.assertEqual(
+            NotificationArchive.objects.get(source_id=self.old_profile.pk, source='profile').data,
+            {'announcement_id': 7},
+        )
+
+        # Nothing left to do on the next run
+        self.assertEqual(NotificationRetentionService.run(), {'dashboard': 0, 'profile': 0})
+
+    @override_settings(NOTIFICATION_RETENTION_DAYS=30, NOTIFICATION_INACTIVE_DAYS=180)
+    def test_users_who_log_in_with_jwt_are_active(self):
+        now = timezone.now()
+        jwt_user = User.objects.create_user(username='jwt-user', password='pass123#')
+        never_recorded = User.objects.create_user(username='never-recorded', password='x')
+        kept = []
+        for user in (jwt_user, never_recorded):
+            notification = DashboardNotification.objects.create(recipient=user, title='t', message='m')
+            DashboardNotification.objects.filter(pk=notification.pk).update(created_at=now - timedelta(days=200))
+            kept.append(notification.pk)
+
+        response = self.client.post(
+            '/api/auth/token/', {'username': 'jwt-user', 'password': 'pass123#'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        jwt_user.refresh_from_db()
+        self.assertIsNotNone(jwt_user.last_login)
+
+        NotificationRetentionService.run()
+        self.assertEqual(
+            set(DashboardNotification.objects.filter(pk__in=kept).values_list('pk', flat=True)), set(kept)
+        )
+
+    def test_interval_closes_connections_before_each_sleep(self):
+        command = 'apps.profiles.management.commands.archive_notifications'
+        calls = mock.Mock()
+        calls.sleep.side_effect = [None, InterruptedError]
+        calls.count.return_value = {'dashboard': 0, 'profile': 0}
+        with mock.patch.object(NotificationRetentionService, 'count', calls.count), \
+                mock.patch(f'{command}.connections', calls.connections), \
+                mock.patch(f'{command}.time.sleep', calls.sleep):
+            with self.assertRaises(InterruptedError):
+                call_command('archive_notifications', interval=60, stdout=io.StringIO())
+
+        self.assertEqual(
+            [name for name, _, _ in calls.mock_calls],
+            ['count', 'connections.close_all', 'sleep'] * 2,
+        )
+
+    @override_settings(NOTIFICATION_RETENTION_DAYS=30, NOTIFICATION_INACTIVE_DAYS=180)
+    def test_command_exports_gzip_jsonl(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'notifications.jsonl.gz')
+        try:
+            call_command('archive_notifications', export=path, no_archive=True, stdout=io.StringIO())
+            with gzip.open(path, 'rt') as f:
+                rows = [json.loads(line) for line in f]
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+            os.rmdir(directory)
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row['source'] for row in rows}, {'dashboard', 'profile'})
+        self.assertFalse(NotificationArchive.objects.exists())
+        self.assertEqual(DashboardNotification.objects.count(), 2)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ReleaseCommandTests(TestCase):
+    def test_create_production_users_writes_nothing_when_unchanged(self):
+        student = User.objects.create_user(username='ananya', password='x')
+        call_command('create_production_users', stdout=io.StringIO())
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command('create_production_users', stdout=io.StringIO())
+
+        writes = [q['sql'] for q in queries.captured_queries if not q['sql'].startswith('SELECT')]
+        self.assertEqual(writes, [])
+        self.assertTrue(User.objects.filter(pk=student.pk).exists())
+        self.assertEqual(User.objects.get(username='mentor').profile.role, 'MENTOR')
+
+    def test_create_production_users_repairs_changed_user(self):
+        call_command('create_production_users', stdout=io.StringIO())
+        User.objects.filter(username='student').update(is_active=False)
+        admin = User.objects.get(username='admin')
+        admin.set_password('changed')
+        admin.save()
+
+        call_command('create_production_users', stdout=io.StringIO())
+
+        self.assertTrue(User.objects.get(username='student').is_active)
+        self.assertTrue(User.objects.get(username='admin').check_password('admin123'))
+
+    def test_release_skips_unchanged_steps(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        storage = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
+        with self.settings(STATIC_ROOT=static_root, STATICFILES_STORAGE=storage):
+            first = io.StringIO()
+            call_command('release', stdout=first)
+            second = io.StringIO()
+            call_command('release', stdout=second)
+
+        self.assertNotIn('Static files unchanged', first.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(static_root, 'admin', 'css', 'base.css')))
+        self.assertIn('Static files unchanged, skipping collectstatic', second.getvalue())
+        self.assertIn('No migrations to apply, skipping migrate', second.getvalue())
+        self.assertIn('No sequence to fix on sqlite', second.getvalue())
+        self.assertIn('User already configured: admin', second.getvalue())
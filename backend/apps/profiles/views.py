@@ -1,6 +1,7 @@
 import os
 import uuid
 import requests as http_requests
+from apps import http_client
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -94,7 +95,14 @@ class AvatarUploadView(APIView):
         }
 
         file_bytes = file.read()
-        resp = http_requests.post(upload_url, data=file_bytes, headers=headers)
+        try:
+            # x-upsert makes re-sending the same object safe
+            resp = http_client.post(upload_url, data=file_bytes, headers=headers, idempotent=True)
+        except http_requests.exceptions.RequestException as e:
+            return Response(
+                {'error': f'Storage service unavailable: {e}'},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
 
         if resp.status_code not in (200, 201):
             return Response(
@@ -6,8 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
-from apps.profiles.models import UserProfile
-import csv
+from apps.profiles.provisioning import UserProvisioningService
 import os
 
 
@@ -19,7 +18,8 @@ def get_test_password(username):
 @permission_classes([IsAuthenticated])
 def import_dummy_users(request):
     """
-    Import dummy users from CSV file. Admin only.
+    Import users from an uploaded CSV/XLSX (`file`), or the dummy users
+    CSV when nothing is uploaded. Admin only.
     """
     # Check if user is admin
     if not request.user.is_staff and not request.user.is_superuser:
@@ -31,74 +31,45 @@ def import_dummy_users(request):
     campus = 'TECH'  # SNS College of Technology
     floor = 2  # 2nd Year / Floor 2
     
-    # Find CSV file
+    # An uploaded CSV/XLSX takes precedence over the bundled dummy sheet
+    upload = request.FILES.get('file')
     csv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'dummy users - Sheet1.csv')
     
-    if not os.path.exists(csv_path):
+    if upload is None and not os.path.exists(csv_path):
         return Response(
             {'error': f'CSV file not found at: {csv_path}'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    created_count = 0
-    updated_count = 0
-    users_data = []
-    
     try:
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            for row in reader:
-                email = row['email'].strip()
-                username = row['username'].strip()
-                password = get_test_password('student')
-                
-                # Create or update user
-                user, created = User.objects.get_or_create(
-                    email=email,
-                    defaults={
-                        'username': username,
-                        'first_name': username.split()[0] if username else '',
-                        'last_name': ' '.join(username.split()[1:]) if len(username.split()) > 1 else ''
-                    }
-                )
-                
-                user.set_password(password)
-                user.save()
-                
-                if created:
-                    created_count += 1
-                else:
-                    updated_count += 1
-                
-                # Create or update profile
-                profile, profile_created = UserProfile.objects.get_or_create(
-                    user=user,
-                    defaults={
-                        'role': 'STUDENT',
-                        'campus': campus,
-                        'floor': floor,
-                    }
-                )
-                
-                if not profile_created:
-                    profile.role = 'STUDENT'
-                    profile.campus = campus
-                    profile.floor = floor
-                    profile.save()
-                
-                users_data.append({
-                    'username': username,
-                    'email': email,
-                    'status': 'created' if created else 'updated'
-                })
+        rows = UserProvisioningService.read_rows(upload if upload is not None else csv_path)
+        result = UserProvisioningService.provision(
+            rows,
+            default_password=get_test_password('student'),
+            role='STUDENT',
+            campus=campus,
+            floor=floor,
+        )
+        
+        created_ids = set(result['created_ids'])
+        users = User.objects.filter(pk__in=result['created_ids'] + result['updated_ids']).values('id', 'username', 'email')
+        users_data = [
+            {
+                'username': user['username'],
+                'email': user['email'],
+                'status': 'created' if user['id'] in created_ids else 'updated'
+            }
+            for user in users
+        ]
         
         return Response({
             'success': True,
             'message': 'Users imported successfully',
-            'created': created_count,
-            'updated': updated_count,
-            'total': created_count + updated_count,
+            'created': result['created'],
+            'updated': result['updated'],
+            'total': result['created'] + result['updated'],
+            'errors': result['errors'],
+            'unresolved_mentors': result['unresolved_mentors'],
             'campus': 'SNS College of Technology',
             'floor': 2,
             'users': users_data
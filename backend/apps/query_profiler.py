@@ -0,0 +1,290 @@
+"""
+Query Profiling Middleware
+
+Records the database cost of every request so N+1 regressions show up in
+development and CI instead of as production slowness.
+
+For each request it captures:
+- Query count and total SQL time
+- Duplicate-query fingerprints (the same statement shape run more than once)
+- Python time (wall time minus SQL time)
+
+Results are aggregated per URL name into an in-process report that admins
+can read from /api/admin/query-report/.
+
+Views can declare a query budget:
+
+    @query_budget(5)
+    @api_view(['GET'])
+    def get_mentor_students(request): ...
+
+    @query_budget(12)
+    class AdminFloorDetailView(APIView): ...
+
+When QUERY_BUDGET_ENFORCE=True (tests/CI), a request that runs more queries
+than its budget raises QueryBudgetExceeded, which fails the calling test.
+Profiling is only active when LOG_QUERY_TIMES or QUERY_BUDGET_ENFORCE is on.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_IN_CLAUSE_RE = re.compile(r'\bIN\s*\((?:\s*%s\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request or block runs more queries than its budget"""
+
+
+def fingerprint(sql):
+    """
+    Normalize a SQL statement into a stable fingerprint.
+
+    Parameters are already placeholders at the cursor level; IN-lists of
+    any length are collapsed so `IN (%s, %s)` and `IN (%s)` match.
+    """
+    normalized = _IN_CLAUSE_RE.sub('IN (...)', sql)
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
+    return hashlib.md5(normalized.encode('utf-8')).hexdigest()[:12]
+
+
+class QueryRecorder:
+    """Database execute wrapper that records every statement it sees"""
+
+    def __init__(self):
+        self.queries = []  # (fingerprint, sql, duration_seconds)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((fingerprint(sql), sql, time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def sql_time_ms(self):
+        return sum(duration for _, _, duration in self.queries) * 1000
+
+    def duplicates(self):
+        """Return {fingerprint: {'sql': ..., 'count': n}} for repeated statements"""
+        counts = Counter(fp for fp, _, _ in self.queries)
+        examples = {}
+        for fp, sql, _ in self.queries:
+            if counts[fp] > 1 and fp not in examples:
+                examples[fp] = {'sql': sql, 'count': counts[fp]}
+        return examples
+
+
+@contextmanager
+def record_queries():
+    """Record queries executed on every configured database connection"""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+@contextmanager
+def assert_query_budget(max_queries, label='block'):
+    """
+    Test helper: fail if the wrapped block runs more than max_queries.
+
+        with assert_query_budget(5, 'mentor students'):
+            self.client.get('/api/profiles/mentor/my-students/')
+    """
+    with record_queries() as recorder:
+        yield recorder
+    if recorder.count > max_queries:
+        raise QueryBudgetExceeded(_budget_message(label, recorder, max_queries))
+
+
+def query_budget(max_queries):
+    """Declare the maximum number of queries a view (or view method) may run"""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def resolve_query_budget(resolver_match, method):
+    """Find the budget declared on the view handling this request, if any"""
+    func = resolver_match.func
+    view_class = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+
+    if view_class is not None:
+        # ViewSet actions may declare their own budget
+        actions = getattr(func, 'actions', None) or {}
+        handler = getattr(view_class, actions.get(method.lower(), method.lower()), None)
+        budget = getattr(handler, 'query_budget', None)
+        if budget is not None:
+            return budget
+        budget = getattr(view_class, 'query_budget', None)
+        if budget is not None:
+            return budget
+
+    return getattr(func, 'query_budget', None)
+
+
+def _budget_message(label, recorder, max_queries):
+    lines = [f'{label} ran {recorder.count} queries (budget {max_queries})']
+    for fp, info in sorted(recorder.duplicates().items(), key=lambda item: -item[1]['count']):
+        lines.append(f'  x{info["count"]} [{fp}] {info["sql"][:200]}')
+    return '\n'.join(lines)
+
+
+class QueryReport:
+    """Thread-safe per-URL-name aggregate of request query profiles"""
+
+    MAX_DUPLICATES_PER_ENDPOINT = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, url_name, recorder, total_ms, budget=None):
+        sql_ms = recorder.sql_time_ms
+        duplicates = recorder.duplicates()
+
+        with self._lock:
+            stats = self._endpoints.setdefault(url_name, {
+                'requests': 0,
+                'queries_total': 0,
+                'queries_max': 0,
+                'sql_ms_total': 0.0,
+                'python_ms_total': 0.0,
+                'requests_with_duplicates': 0,
+                'budget': budget,
+                'budget_violations': 0,
+                'duplicates': Counter(),
+                'duplicate_sql': {},
+            })
+            stats['requests'] += 1
+            stats['queries_total'] += recorder.count
+            stats['queries_max'] = max(stats['queries_max'], recorder.count)
+            stats['sql_ms_total'] += sql_ms
+            stats['python_ms_total'] += max(total_ms - sql_ms, 0.0)
+            stats['budget'] = budget
+            if budget is not None and recorder.count > budget:
+                stats['budget_violations'] += 1
+            if duplicates:
+                stats['requests_with_duplicates'] += 1
+                for fp, info in duplicates.items():
+                    stats['duplicates'][fp] += info['count']
+                    stats['duplicate_sql'].setdefault(fp, info['sql'][:500])
+
+    def snapshot(self, sort_by='queries_avg'):
+        """Return the report as a list of plain dicts, worst endpoints first"""
+        with self._lock:
+            rows = []
+            for url_name, stats in self._endpoints.items():
+                requests = stats['requests']
+                rows.append({
+                    'url_name': url_name,
+                    'requests': requests,
+                    'queries_avg': round(stats['queries_total'] / requests, 1),
+                    'queries_max': stats['queries_max'],
+                    'sql_ms_avg': round(stats['sql_ms_total'] / requests, 2),
+                    'python_ms_avg': round(stats['python_ms_total'] / requests, 2),
+                    'requests_with_duplicates': stats['requests_with_duplicates'],
+                    'budget': stats['budget'],
+                    'budget_violations': stats['budget_violations'],
+                    'top_duplicates': [
+                        {'fingerprint': fp, 'count': count, 'sql': stats['duplicate_sql'][fp]}
+                        for fp, count in stats['duplicates'].most_common(self.MAX_DUPLICATES_PER_ENDPOINT)
+                    ],
+                })
+        rows.sort(key=lambda row: row.get(sort_by) or 0, reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+report = QueryReport()
+
+
+def _profiling_enabled():
+    return getattr(settings, 'LOG_QUERY_TIMES', False) or getattr(settings, 'QUERY_BUDGET_ENFORCE', False)
+
+
+class QueryProfilingMiddleware:
+    """
+    Profile every request and aggregate results per URL name.
+
+    Should be placed near the top of MIDDLEWARE so session and
+    authentication queries are counted against the endpoint.
+
+    Async-capable: under ASGI a profiled request is run in one thread (with
+    the rest of the chain called through async_to_sync), so the queries
+    async views make via sync_to_async land on the recorded connection.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not _profiling_enabled():
+            return self.get_response(request)
+        return self.profile(request, self.get_response)
+
+    async def __acall__(self, request):
+        if not _profiling_enabled():
+            return await self.get_response(request)
+        return await sync_to_async(self.profile)(request, async_to_sync(self.get_response))
+
+    def profile(self, request, get_response):
+        enforce = getattr(settings, 'QUERY_BUDGET_ENFORCE', False)
+        start = time.perf_counter()
+        with record_queries() as recorder:
+            response = get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return response
+
+        url_name = match.view_name or request.path
+        budget = resolve_query_budget(match, request.method)
+        report.record(url_name, recorder, total_ms, budget)
+
+        response['X-Query-Count'] = str(recorder.count)
+        response['X-SQL-Time-Ms'] = f'{recorder.sql_time_ms:.1f}'
+
+        if recorder.sql_time_ms >= getattr(settings, 'SLOW_REQUEST_SQL_MS', 200):
+            logger.warning(
+                'Slow SQL on %s: %d queries, %.1fms SQL, %.1fms total',
+                url_name, recorder.count, recorder.sql_time_ms, total_ms
+            )
+
+        if budget is not None and recorder.count > budget:
+            message = _budget_message(f'{request.method} {url_name}', recorder, budget)
+            if enforce:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
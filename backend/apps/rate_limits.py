@@ -0,0 +1,117 @@
+"""
+Rate Limits
+Per-user / per-IP limits for endpoints that cost a third-party call
+
+Built on django-ratelimit's counters, which live in the 'ratelimit' cache
+(Redis in production, so every worker shares them). Each limited view
+declares a group and a bucket of two rates:
+
+- burst: how many calls may arrive at once (e.g. '3/m')
+- sustained: how many calls per longer period (e.g. '30/h') - the rate the
+  bucket refills at
+
+A call is counted against both; it is rejected once either is used up. The
+client is the user for authenticated requests and the IP address (see
+client_ip) for anonymous ones.
+
+A rejected call gets DRF's 429 body with Retry-After set to the seconds
+until the exhausted window resets. Allowed/limited counts per group are
+kept per worker process and reported at /health/.
+
+Off unless USE_RATE_LIMITS is True (settings.RATELIMIT_ENABLE). If the
+cache is unreachable calls are allowed (RATELIMIT_FAIL_OPEN).
+
+Usage:
+    @async_api_view(['POST'])
+    @rate_limit('leetcode-sync', burst='3/m', sustained='30/h')
+    async def sync_leetcode_profile(request):
+        ...
+
+    class HackathonListView(APIView):
+        @rate_limit('hackathon-list', burst='60/m', sustained='1000/h')
+        def get(self, request):
+            ...
+"""
+import functools
+import logging
+import threading
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpRequest
+from django_ratelimit.core import get_usage
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+def client_ip(request):
+    """
+    The caller's IP (settings.RATELIMIT_IP_META_KEY)
+
+    Behind RATE_LIMIT_TRUSTED_PROXIES reverse proxies the client is the
+    entry that many places from the end of X-Forwarded-For; entries before
+    it are whatever the client sent and can't be trusted.
+    """
+    proxies = getattr(settings, 'RATE_LIMIT_TRUSTED_PROXIES', 0)
+    forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+    if proxies > 0 and forwarded:
+        return forwarded[-min(proxies, len(forwarded))]
+    return request.META['REMOTE_ADDR']
+
+
+def check(request, group, burst, sustained):
+    """Count one call by request's client; raise Throttled if a rate is used up"""
+    exhausted = []
+    for rate in (burst, sustained):
+        usage = get_usage(request, group=group, key='user_or_ip', rate=rate, increment=True)
+        if usage is not None and usage['should_limit']:
+            exhausted.append(usage)
+
+    _count(group, 'limited' if exhausted else 'allowed')
+    if exhausted:
+        wait = max(max(usage['time_left'] for usage in exhausted), 1)
+        logger.info('Rate limited %s (retry in %ss)', group, wait)
+        raise exceptions.Throttled(wait=wait)
+
+
+def rate_limit(group, burst='10/m', sustained='100/h'):
+    """
+    Limit a view per user (or IP) - an async_api_view, a function view or
+    an APIView/ViewSet method. Views sharing a group share the bucket.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def wrapper(*args, **kwargs):
+                await sync_to_async(check)(_request(args), group, burst, sustained)
+                return await view(*args, **kwargs)
+        else:
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                check(_request(args), group, burst, sustained)
+                return view(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _request(args):
+    # A view function's request comes first, a method's after self
+    return args[0] if isinstance(args[0], (HttpRequest, Request)) else args[1]
+
+
+def _count(group, outcome):
+    with _counters_lock:
+        counters = _counters.setdefault(group, {'allowed': 0, 'limited': 0})
+        counters[outcome] += 1
+
+
+def rate_limit_stats():
+    """Allowed/limited calls per group in this process"""
+    with _counters_lock:
+        return {group: dict(counters) for group, counters in _counters.items()}
@@ -0,0 +1,322 @@
+"""
+Report Exports
+Streams floor, mentor and cohort reports as CSV or XLSX
+
+Each report is a header row plus a generator of row tuples read with
+QuerySet.iterator(chunk_size=CHUNK_SIZE) - a server-side cursor on
+PostgreSQL - so memory stays flat however large the cohort is:
+
+- students:      per-student pillar progress (one query, counts as subqueries)
+- submissions:   submission history across every pillar
+- season-scores: season scores with legacy points
+
+Writers:
+- stream_csv yields ~64 KB blocks, gzip-compressed on the fly when asked
+- write_xlsx builds a write-only workbook (rows go to a temporary file as
+  they are added) and stream_file sends the result in chunks
+- Text that a spreadsheet would run as a formula is prefixed with '
+- Under ASGI, aiter_chunks pulls these blocks one at a time (Django would
+  otherwise list() a sync iterator, building the whole export in memory)
+
+Usage:
+    from apps.reports.exports import REPORTS, ReportScope, stream_csv
+
+    report = REPORTS['students']
+    scope = ReportScope(campus='TECH', floor=2)
+    chunks = stream_csv(report.HEADERS, report.rows(scope))
+"""
+import csv
+import tempfile
+import zlib
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+from django.utils import timezone
+
+from apps.cfc.models import (
+    BMCVideoSubmission, GenAIProjectSubmission, HackathonSubmission, InternshipSubmission
+)
+from apps.clt.models import CLTSubmission
+from apps.gamification.models import LegacyScore, SeasonScore
+from apps.iipc.models import LinkedInConnectionVerification, LinkedInPostVerification
+from apps.profiles.models import UserProfile
+from apps.scd.models import LeetCodeProfile
+from apps.sri.models import SRISubmission
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# (pillar, label, model, column describing the submission)
+SUBMISSION_MODELS = [
+    ('clt', 'Course', CLTSubmission, 'title'),
+    ('sri', 'Social Responsibility', SRISubmission, 'activity_title'),
+    ('cfc', 'Hackathon', HackathonSubmission, 'hackathon_name'),
+    ('cfc', 'BMC Video', BMCVideoSubmission, 'video_url'),
+    ('cfc', 'Internship', InternshipSubmission, 'company'),
+    ('cfc', 'GenAI Project', GenAIProjectSubmission, 'github_repo'),
+    ('iipc', 'LinkedIn Post', LinkedInPostVerification, 'post_url'),
+    ('iipc', 'LinkedIn Connections', LinkedInConnectionVerification, 'profile_url'),
+]
+
+
+class ReportScope:
+    """
+    Which students a report covers, as UserProfile lookups.
+    apply() rewrites them for querysets that reach the profile through a relation.
+    """
+
+    def __init__(self, campus=None, floor=None, mentor=None):
+        self.lookups = {}
+        if campus:
+            self.lookups['campus'] = campus
+        if floor:
+            self.lookups['floor'] = floor
+        if mentor is not None:
+            self.lookups['assigned_mentor'] = mentor
+
+    def apply(self, queryset, profile_path=''):
+        prefix = f'{profile_path}__' if profile_path else ''
+        return queryset.filter(**{f'{prefix}{key}': value for key, value in self.lookups.items()})
+
+    @property
+    def label(self):
+        parts = [str(value) for key, value in self.lookups.items() if key != 'assigned_mentor']
+        if 'assigned_mentor' in self.lookups:
+            parts.append(f"mentor-{self.lookups['assigned_mentor'].pk}")
+        return '-'.join(parts) or 'all'
+
+
+def _per_student(model, aggregate=None, **filters):
+    """Correlated subquery: one value per student from `model`, 0 when absent"""
+    aggregate = aggregate or Count('pk')
+    subquery = (
+        model.objects.filter(user=OuterRef('user_id'), **filters)
+        .order_by().values('user').annotate(value=aggregate).values('value')[:1]
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+
+class StudentProgressReport:
+    """Per-student pillar progress: submitted and approved counts per pillar"""
+
+    PILLARS = {
+        'clt': [CLTSubmission],
+        'sri': [SRISubmission],
+        'cfc': [HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission],
+        'iipc': [LinkedInPostVerification, LinkedInConnectionVerification],
+    }
+
+    HEADERS = [
+        'Student ID', 'Username', 'Name', 'Email', 'Campus', 'Floor', 'Mentor',
+        *[f'{pillar.upper()} {kind}' for pillar in PILLARS for kind in ('Submissions', 'Approved')],
+        'LeetCode Solved', 'Legacy Points',
+    ]
+
+    @classmethod
+    def rows(cls, scope, params=None):
+        annotations = {}
+        for pillar, models in cls.PILLARS.items():
+            submitted = [_per_student(model) for model in models]
+            approved = [_per_student(model, status='approved') for model in models]
+            annotations[f'{pillar}_submitted'] = sum(submitted[1:], submitted[0])
+            annotations[f'{pillar}_approved'] = sum(approved[1:], approved[0])
+
+        legacy = LegacyScore.objects.filter(student=OuterRef('user_id')).values('total_legacy_points')[:1]
+        profiles = (
+            scope.apply(UserProfile.objects.filter(role='STUDENT'))
+            .annotate(
+                full_name=Concat('user__first_name', Value(' '), 'user__last_name'),
+                mentor_name=Concat('assigned_mentor__first_name', Value(' '), 'assigned_mentor__last_name'),
+                leetcode_solved=_per_student(LeetCodeProfile, Max('total_solved')),
+                legacy_points=Coalesce(Subquery(legacy, output_field=IntegerField()), Value(0)),
+                **annotations,
+            )
+            .order_by('campus', 'floor', 'user__username')
+            .values_list(
+                'user_id', 'user__username', 'full_name', 'user__email', 'campus', 'floor', 'mentor_name',
+                *annotations, 'leetcode_solved', 'legacy_points',
+            )
+        )
+        for row in profiles.iterator(chunk_size=CHUNK_SIZE):
+            # Concat leaves a lone space when a name (or the mentor) is missing
+            yield (*row[:2], row[2].strip(), *row[3:6], (row[6] or '').strip(), *row[7:])
+
+
+class SubmissionHistoryReport:
+    """Every submission of the scoped students, pillar by pillar"""
+
+    HEADERS = [
+        'Pillar', 'Type', 'Submission ID', 'Student ID', 'Username', 'Email', 'Campus', 'Floor',
+        'Title', 'Status', 'Created', 'Submitted', 'Reviewed',
+    ]
+
+    @classmethod
+    def rows(cls, scope, params=None):
+        for pillar, label, model, title in SUBMISSION_MODELS:
+            submissions = (
+                scope.apply(model.objects.all(), 'user__profile')
+                .order_by('created_at')
+                .values_list(
+                    'id', 'user_id', 'user__username', 'user__email', 'user__profile__campus',
+                    'user__profile__floor', title, 'status', 'created_at', 'submitted_at', 'reviewed_at',
+                )
+            )
+            for row in submissions.iterator(chunk_size=CHUNK_SIZE):
+                yield (pillar.upper(), label, *row)
+
+
+class SeasonScoreReport:
+    """Season scores per student; ?season=<number> limits it to one season"""
+
+    HEADERS = [
+        'Season', 'Student ID', 'Username', 'Campus', 'Floor', 'CLT', 'IIPC', 'SCD', 'CFC', 'Outcome',
+        'Total', 'Completed', 'Completed At', 'Legacy Points',
+    ]
+
+    @classmethod
+    def rows(cls, scope, params=None):
+        scores = scope.apply(SeasonScore.objects.all(), 'student__profile')
+        season = (params or {}).get('season')
+        if season:
+            scores = scores.filter(season__season_number=int(season))
+        legacy = LegacyScore.objects.filter(student=OuterRef('student_id')).values('total_legacy_points')[:1]
+        scores = (
+            scores.annotate(legacy_points=Coalesce(Subquery(legacy, output_field=IntegerField()), Value(0)))
+            .order_by('season__season_number', '-total_score', 'student_id')
+            .values_list(
+                'season__season_number', 'student_id', 'student__username', 'student__profile__campus',
+                'student__profile__floor', 'clt_score', 'iipc_score', 'scd_score', 'cfc_score',
+                'outcome_score', 'total_score', 'season_completed', 'completed_at', 'legacy_points',
+            )
+        )
+        for row in scores.iterator(chunk_size=CHUNK_SIZE):
+            yield row
+
+
+REPORTS = {
+    'students': StudentProgressReport,
+    'submissions': SubmissionHistoryReport,
+    'season-scores': SeasonScoreReport,
+}
+
+
+def _cell(value):
+    # Titles, activity names and URLs are typed by students: a leading
+    # = + - @ tab or CR would make the spreadsheet evaluate them as a formula
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    # Spreadsheets have no time zones: export local, second-precision times
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value).replace(tzinfo=None)
+        return value.replace(microsecond=0)
+    return value
+
+
+def _xlsx_cell(sheet, value):
+    value = _cell(value)
+    if isinstance(value, str) and value.startswith("'"):
+        # An explicit string cell, whatever openpyxl would infer
+        from openpyxl.cell import WriteOnlyCell
+
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.data_type = 's'
+        return cell
+    return value
+
+
+class _Buffer:
+    """csv.writer target that just collects what it is given"""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def write(self, data):
+        self.parts.append(data)
+        self.size += len(data)
+
+    def take(self):
+        data = ''.join(self.parts).encode('utf-8')
+        self.parts, self.size = [], 0
+        return data
+
+
+def stream_csv(headers, rows, gzip=False):
+    """Yield the CSV in blocks of about BUFFER_SIZE bytes, optionally gzip-compressed"""
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    # wbits=31: gzip container, so the body is valid for Content-Encoding: gzip
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+
+    def emit(data):
+        return compressor.compress(data) if compressor else data
+
+    # UTF-8 BOM so Excel opens non-ASCII names correctly
+    buffer.write('\ufeff')
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow([_cell(value) for value in row])
+        if buffer.size >= BUFFER_SIZE:
+            data = emit(buffer.take())
+            if data:
+                yield data
+
+    data = emit(buffer.take())
+    if compressor:
+        data += compressor.flush()
+    if data:
+        yield data
+
+
+def write_xlsx(headers, rows, title='Report'):
+    """Write rows to a write-only workbook in a temporary file; returns the open file"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    sheet.append(headers)
+    for row in rows:
+        sheet.append([_xlsx_cell(sheet, value) for value in row])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+async def aiter_chunks(chunks):
+    """
+    Async iterator over a blocking chunk iterator, for StreamingHttpResponse
+    under ASGI. Each chunk is pulled with its own thread-sensitive
+    sync_to_async call, so the rows' database cursor stays on the thread
+    (and connection) of the view that opened it.
+    """
+    chunks = iter(chunks)
+    done = object()
+    try:
+        while True:
+            chunk = await sync_to_async(next, thread_sensitive=True)(chunks, done)
+            if chunk is done:
+                return
+            yield chunk
+    finally:
+        # Also when the client disconnects: release the cursor / temporary file
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+def stream_file(file, chunk_size=BUFFER_SIZE):
+    """Yield a file in chunks, closing it at the end"""
+    try:
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                break
+            yield data
+    finally:
+        file.close()
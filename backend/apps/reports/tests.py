@@ -0,0 +1,175 @@
+import csv
+import gzip
+import io
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from openpyxl import load_workbook
+from rest_framework.test import APIClient
+
+from apps.clt.models import CLTSubmission
+from apps.gamification.models import LegacyScore, Season, SeasonScore
+
+
+def make_user(username, role='STUDENT', campus='TECH', floor=2, mentor=None):
+    user = User.objects.create_user(username=username, password='x', first_name=username.title())
+    profile = user.profile
+    profile.role, profile.campus, profile.floor, profile.assigned_mentor = role, campus, floor, mentor
+    profile.save()
+    return user
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ReportExportTests(TestCase):
+    def setUp(self):
+        self.admin = make_user('admin', role='ADMIN', campus=None, floor=None)
+        self.floor_wing = make_user('wing', role='FLOOR_WING')
+        self.mentor = make_user('mentor', role='MENTOR')
+        self.students = [make_user(f'student{i}', mentor=self.mentor if i < 2 else None) for i in range(3)]
+        self.other_floor = make_user('elsewhere', floor=3)
+
+        for i, student in enumerate(self.students):
+            for n in range(i + 1):
+                CLTSubmission.objects.create(
+                    user=student, title=f'Course {n}', description='d', platform='Coursera',
+                    completion_date=date(2024, 1, 1), status='approved' if n == 0 else 'submitted',
+                )
+        LegacyScore.objects.filter(student=self.students[0]).update(total_legacy_points=420)
+
+        season = Season.objects.create(
+            name='Season 1', season_number=1, start_date=date(2024, 1, 1), end_date=date(2024, 4, 30)
+        )
+        SeasonScore.objects.update_or_create(
+            student=self.students[0], season=season, defaults={'clt_score': 100, 'total_score': 100}
+        )
+
+        self.client = APIClient()
+
+    def download_csv(self, user, url, **headers):
+        self.client.force_authenticate(user)
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        body = b''.join(response.streaming_content)
+        if response.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+
+    def test_floor_wing_gets_own_floor_progress_in_one_query(self):
+        self.client.force_authenticate(self.floor_wing)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/reports/students.csv')
+            body = b''.join(response.streaming_content)
+        rows = list(csv.reader(io.StringIO(body.decode('utf-8-sig'))))
+
+        self.assertEqual(len(queries.captured_queries), 1)
+        header, data = rows[0], rows[1:]
+        self.assertEqual([row[1] for row in data], ['student0', 'student1', 'student2'])
+        by_name = {row[1]: dict(zip(header, row)) for row in data}
+        self.assertEqual(by_name['student2']['CLT Submissions'], '3')
+        self.assertEqual(by_name['student2']['CLT Approved'], '1')
+        self.assertEqual(by_name['student0']['Legacy Points'], '420')
+        self.assertEqual(by_name['student0']['Mentor'], 'Mentor')
+        self.assertEqual(by_name['student2']['Mentor'], '')
+        self.assertIn('attachment; filename="students-TECH-2-', response['Content-Disposition'])
+
+    def test_mentor_sees_assigned_students_gzipped(self):
+        rows = self.download_csv(self.mentor, '/api/reports/submissions.csv', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(sorted(row[4] for row in rows[1:]), ['student0', 'student1', 'student1'])
+
+    def test_admin_xlsx_season_scores(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/reports/season-scores.xlsx', {'season': 1})
+
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(rows[0][:3], ('Season', 'Student ID', 'Username'))
+        self.assertEqual(rows[1][2], 'student0')
+        self.assertEqual(rows[1][-1], 420)
+
+    def test_gzip_refused_with_q_zero_is_not_sent(self):
+        self.client.force_authenticate(self.mentor)
+        response = self.client.get('/api/reports/submissions.csv', HTTP_ACCEPT_ENCODING='br, gzip;q=0')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_non_numeric_season_is_a_bad_request(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/reports/season-scores.csv', {'season': 'one'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_formulas_in_student_text_are_neutralised(self):
+        CLTSubmission.objects.filter(user=self.students[0]).update(title='=HYPERLINK("http://x","c")')
+        CLTSubmission.objects.filter(user=self.students[1]).update(title='=1+1')
+
+        rows = self.download_csv(self.admin, '/api/reports/submissions.csv')
+        titles = {row[4]: row[8] for row in rows[1:]}
+        self.assertEqual(titles['student0'], '\'=HYPERLINK("http://x","c")')
+        self.assertEqual(titles['student1'], "'=1+1")
+
+        response = self.client.get('/api/reports/submissions.xlsx')
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        cells = [row[8] for row in workbook.active.iter_rows(min_row=2) if row[4].value == 'student0']
+        self.assertEqual(cells[0].value, '\'=HYPERLINK("http://x","c")')
+        self.assertEqual(cells[0].data_type, 's')
+
+    async def test_csv_streams_chunk_by_chunk_under_asgi(self):
+        import warnings
+        from unittest import mock
+        from django.core import signals
+        from django.core.handlers.asgi import ASGIHandler
+        from django.db import close_old_connections
+        from rest_framework_simplejwt.tokens import AccessToken
+        from apps.reports.exports import StudentProgressReport
+
+        events = []
+        original_rows = StudentProgressReport.rows.__func__
+
+        def rows(cls, scope, params=None):
+            for row in original_rows(cls, scope, params):
+                events.append('row')
+                yield row
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                events.append(message['status'])
+            if message['type'] == 'http.response.body' and message.get('body'):
+                events.append(b'body')
+
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': '/api/reports/students.csv', 'query_string': b'',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'authorization', f'Bearer {AccessToken.for_user(self.admin)}'.encode()),
+            ],
+        }
+        # As the test client does: keep the test transaction's connection open
+        signals.request_finished.disconnect(close_old_connections)
+        self.addCleanup(signals.request_finished.connect, close_old_connections)
+        with mock.patch('apps.reports.exports.BUFFER_SIZE', 1), \
+                mock.patch.object(StudentProgressReport, 'rows', classmethod(rows)), \
+                warnings.catch_warnings():
+            # Django's fallback that list()s a sync iterator
+            warnings.filterwarnings('error', message='StreamingHttpResponse must consume')
+            await ASGIHandler()(scope, receive, send)
+
+        self.assertEqual(events.count('row'), 4)
+        # The first rows were sent before the last one was read
+        self.assertLess(events.index(b'body'), len(events) - 1 - events[::-1].index('row'))
+
+    def test_students_and_unknown_reports_are_refused(self):
+        self.client.force_authenticate(self.students[0])
+        self.assertEqual(self.client.get('/api/reports/students.csv').status_code, 403)
+
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.get('/api/reports/grades.csv').status_code, 404)
+        self.assertEqual(self.client.get('/api/reports/students.pdf').status_code, 404)
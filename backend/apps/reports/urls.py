@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('<slug:report>.<slug:extension>', views.export_report, name='export-report'),
+]
@@ -0,0 +1,96 @@
+"""
+Report export API
+Admins, floor wings and mentors download reports as CSV or XLSX
+
+GET /api/reports/<report>.<csv|xlsx>
+    report: students | submissions | season-scores
+
+- Admins: every student; ?campus=TECH&floor=2 narrows it down
+- Floor wings: the students of their campus and floor
+- Mentors: their assigned students
+- ?season=<number> limits season-scores to one season
+- CSV is gzip-compressed when the client's Accept-Encoding accepts gzip (q > 0)
+- Streams chunk by chunk under WSGI and ASGI (see aiter_chunks)
+"""
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.response_middleware import accepted_encodings
+
+from .exports import REPORTS, ReportScope, aiter_chunks, stream_csv, stream_file, write_xlsx
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def report_scope(request):
+    """The ReportScope this user may export, or None when they may not export"""
+    profile = getattr(request.user, 'profile', None)
+    role = profile.role if profile else None
+
+    if role == 'ADMIN' or request.user.is_superuser:
+        floor = request.query_params.get('floor')
+        return ReportScope(
+            campus=request.query_params.get('campus'),
+            floor=int(floor) if floor and floor.isdigit() else None,
+        )
+    if role == 'FLOOR_WING':
+        return ReportScope(campus=profile.campus, floor=profile.floor)
+    if role == 'MENTOR':
+        return ReportScope(mentor=request.user)
+    return None
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_report(request, report, extension):
+    """Stream a report; see the module docstring for parameters"""
+    if report not in REPORTS:
+        return Response(
+            {'error': f"Unknown report. Choose one of: {', '.join(REPORTS)}"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    if extension not in ('csv', 'xlsx'):
+        return Response({'error': 'Format must be csv or xlsx'}, status=status.HTTP_404_NOT_FOUND)
+
+    scope = report_scope(request)
+    if scope is None:
+        return Response(
+            {'error': 'Only admins, floor wings and mentors can export reports'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    # Rows are read while the response streams, too late to answer 400
+    season = request.query_params.get('season')
+    if season and not season.isdigit():
+        return Response({'error': 'season must be a season number'}, status=status.HTTP_400_BAD_REQUEST)
+
+    definition = REPORTS[report]
+    rows = definition.rows(scope, request.query_params)
+    filename = f'{report}-{scope.label}-{timezone.localdate():%Y%m%d}.{extension}'
+
+    # Each server type needs its own kind of iterator to stream without buffering
+    streaming = aiter_chunks if isinstance(request._request, ASGIRequest) else iter
+
+    if extension == 'xlsx':
+        # Already zip-compressed, so never gzipped again
+        response = StreamingHttpResponse(
+            streaming(stream_file(write_xlsx(definition.HEADERS, rows, title=report))),
+            content_type=XLSX_CONTENT_TYPE,
+        )
+    else:
+        gzip = 'gzip' in accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        response = StreamingHttpResponse(
+            streaming(stream_csv(definition.HEADERS, rows, gzip=gzip)),
+            content_type='text/csv; charset=utf-8',
+        )
+        if gzip:
+            response['Content-Encoding'] = 'gzip'
+        response['Vary'] = 'Accept-Encoding'
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
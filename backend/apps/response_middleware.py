@@ -0,0 +1,154 @@
+"""
+Response Compression and ETag Middleware
+
+CompressionMiddleware (USE_RESPONSE_COMPRESSION):
+- Compresses text and JSON responses of at least RESPONSE_COMPRESSION_MIN_SIZE
+  bytes with brotli when the client accepts it and the `brotli` package is
+  installed, otherwise with gzip
+- Leaves streaming responses (report exports, file downloads) and responses
+  that already have a Content-Encoding alone
+- Keeps the compressed body only when it is actually smaller
+
+ETagMiddleware (USE_RESPONSE_ETAGS):
+- Gives successful GET responses a strong ETag (hash of the uncompressed
+  body) unless the view set one itself
+- Answers a matching If-None-Match with 304 Not Modified, so a dashboard
+  that has not changed since the last poll costs no transfer
+- Marks those responses `Cache-Control: private, no-cache`: browsers keep
+  them but revalidate every time, and shared caches never store them
+
+Order in MIDDLEWARE: CompressionMiddleware above CorsMiddleware, and
+ETagMiddleware below it, so ETags are computed before compression and
+304 responses still get CORS headers.
+"""
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.middleware.http import ConditionalGetMiddleware
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # optional dependency; gzip only without it
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+# Random bytes in the gzip header, as django.middleware.gzip adds against BREACH
+GZIP_MAX_RANDOM_BYTES = 100
+BROTLI_QUALITY = 5
+
+_STRONG_ETAG_RE = re.compile(r'^"')
+
+
+def accepted_encodings(header):
+    """Encodings the client accepts (q > 0) from an Accept-Encoding header"""
+    encodings = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def choose_encoding(header):
+    encodings = accepted_encodings(header)
+    if brotli is not None and 'br' in encodings:
+        return 'br'
+    if 'gzip' in encodings:
+        return 'gzip'
+    return None
+
+
+def is_compressible(content_type):
+    media_type = content_type.split(';')[0].strip().lower()
+    return (
+        media_type.startswith('text/')
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(('+json', '+xml'))
+    )
+
+
+class CompressionMiddleware:
+    """Compress large text/JSON responses with brotli or gzip (inert unless enabled)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if not getattr(settings, 'USE_RESPONSE_COMPRESSION', False):
+            return response
+        return self.compress(request, response)
+
+    def compress(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not is_compressible(response.get('Content-Type', '')):
+            return response
+        if len(response.content) < getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024):
+            return response
+
+        # The body now depends on Accept-Encoding, whether or not this client gets it compressed
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            content = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        else:
+            content = compress_string(response.content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        # The bytes differ from what the strong ETag described; a weak ETag
+        # still matches If-None-Match (which uses weak comparison)
+        etag = response.get('ETag')
+        if etag:
+            response['ETag'] = _STRONG_ETAG_RE.sub('W/"', etag)
+        return response
+
+
+class ETagMiddleware(ConditionalGetMiddleware):
+    """Strong ETags and 304 Not Modified for GET responses (inert unless enabled)"""
+
+    def process_response(self, request, response):
+        if not getattr(settings, 'USE_RESPONSE_ETAGS', False):
+            return response
+        if request.method != 'GET' or response.streaming or not 200 <= response.status_code < 300:
+            return response
+        if not response.has_header('Cache-Control'):
+            patch_cache_control(response, private=True, no_cache=True)
+        return super().process_response(request, response)
@@ -2,20 +2,34 @@
 LeetCode API Integration Utility
 
 This module handles fetching data from LeetCode's GraphQL API.
+
+Every fetch has a blocking form (fetch_user_profile) and an async form
+(afetch_user_profile) for async views; both send the same query through
+apps.http_client (pooled connections, jittered retries, circuit breaker)
+and parse the response with the same code.
 """
 
-import requests
-import time
-from datetime import datetime
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+import httpx
+import requests
+
+from apps import http_client
+
+logger = logging.getLogger(__name__)
+
 
 class LeetCodeAPI:
     """Handler for LeetCode GraphQL API requests"""
     
     GRAPHQL_URL = "https://leetcode.com/graphql"
-    MAX_RETRIES = 3
-    RETRY_DELAY = 2  # seconds
+    MAX_RETRIES = 3  # attempts per query
+    TIMEOUT = 45
     
     HEADERS = {
         'Content-Type': 'application/json',
@@ -85,8 +99,79 @@ class LeetCodeAPI:
     }
     """
     
+    @classmethod
+    def _post(cls, query: str, variables: Dict, what: str) -> Optional[Dict]:
+        """
+        Run a GraphQL query (read-only, so safe to retry)
+
+        Returns the response's `data` object, or None if the query failed
+        """
+        try:
+            response = http_client.post(
+                cls.GRAPHQL_URL,
+                json={'query': query, 'variables': variables},
+                headers=cls.HEADERS,
+                timeout=cls.TIMEOUT,
+                retries=cls.MAX_RETRIES - 1,
+                idempotent=True,
+            )
+        except requests.exceptions.RequestException as e:
+            logger.warning('Error fetching LeetCode %s: %s', what, e)
+            return None
+        return cls._data(response.status_code, response.text, what)
+
+    @classmethod
+    async def _apost(cls, query: str, variables: Dict, what: str) -> Optional[Dict]:
+        """Async form of _post"""
+        try:
+            response = await http_client.apost(
+                cls.GRAPHQL_URL,
+                json={'query': query, 'variables': variables},
+                headers=cls.HEADERS,
+                timeout=cls.TIMEOUT,
+                retries=cls.MAX_RETRIES - 1,
+                idempotent=True,
+            )
+        except httpx.HTTPError as e:
+            logger.warning('Error fetching LeetCode %s: %s', what, e)
+            return None
+        return cls._data(response.status_code, response.text, what)
+
     @staticmethod
-    def fetch_user_profile(username: str) -> Optional[Dict]:
+    def _data(status_code: int, text: str, what: str) -> Optional[Dict]:
+        if status_code != 200:
+            logger.warning('LeetCode API returned status %s for %s: %s', status_code, what, text[:200])
+            return None
+        try:
+            return json.loads(text).get('data') or {}
+        except (ValueError, AttributeError):
+            logger.warning('LeetCode API returned invalid JSON for %s', what)
+            return None
+
+    @classmethod
+    def fetch_all(cls, username: str, submission_limit: int = 20) -> Dict:
+        """Profile, contest, calendar and recent submissions, fetched concurrently"""
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = {
+                'profile': pool.submit(cls.fetch_user_profile, username),
+                'contest': pool.submit(cls.fetch_contest_info, username),
+                'calendar': pool.submit(cls.fetch_calendar_data, username),
+                'submissions': pool.submit(cls.fetch_recent_submissions, username, limit=submission_limit),
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    @classmethod
+    async def afetch_all(cls, username: str, submission_limit: int = 20) -> Dict:
+        profile, contest, calendar, submissions = await asyncio.gather(
+            cls.afetch_user_profile(username),
+            cls.afetch_contest_info(username),
+            cls.afetch_calendar_data(username),
+            cls.afetch_recent_submissions(username, limit=submission_limit),
+        )
+        return {'profile': profile, 'contest': contest, 'calendar': calendar, 'submissions': submissions}
+
+    @classmethod
+    def fetch_user_profile(cls, username: str) -> Optional[Dict]:
         """
         Fetch user profile data from LeetCode
         
@@ -96,38 +181,18 @@ class LeetCodeAPI:
         Returns:
             Dictionary with user profile data or None if failed
         """
-        for attempt in range(LeetCodeAPI.MAX_RETRIES):
-            try:
-                response = requests.post(
-                    LeetCodeAPI.GRAPHQL_URL,
-                    json={
-                        'query': LeetCodeAPI.USER_PROFILE_QUERY,
-                        'variables': {'username': username}
-                    },
-                    headers=LeetCodeAPI.HEADERS,
-                    timeout=45
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('data') and data['data'].get('matchedUser'):
-                        return LeetCodeAPI._parse_profile_data(data['data']['matchedUser'])
-                else:
-                    print(f"LeetCode API returned status {response.status_code}: {response.text[:200]}")
-                
-                return None
-                
-            except requests.exceptions.Timeout:
-                if attempt < LeetCodeAPI.MAX_RETRIES - 1:
-                    print(f"Timeout fetching profile for {username}, retrying in {LeetCodeAPI.RETRY_DELAY}s... (attempt {attempt + 1}/{LeetCodeAPI.MAX_RETRIES})")
-                    time.sleep(LeetCodeAPI.RETRY_DELAY)
-                    continue
-                else:
-                    print(f"Error fetching LeetCode profile for {username}: Max retries exceeded")
-                    return None
-            except Exception as e:
-                print(f"Error fetching LeetCode profile for {username}: {str(e)}")
-                return None
+        data = cls._post(cls.USER_PROFILE_QUERY, {'username': username}, f'profile for {username}')
+        return cls._parse_profile(data)
+
+    @classmethod
+    async def afetch_user_profile(cls, username: str) -> Optional[Dict]:
+        data = await cls._apost(cls.USER_PROFILE_QUERY, {'username': username}, f'profile for {username}')
+        return cls._parse_profile(data)
+
+    @classmethod
+    def _parse_profile(cls, data: Optional[Dict]) -> Optional[Dict]:
+        matched_user = (data or {}).get('matchedUser')
+        return cls._parse_profile_data(matched_user) if matched_user else None
     
     @staticmethod
     def _parse_profile_data(matched_user: Dict) -> Dict:
@@ -172,8 +237,8 @@ class LeetCodeAPI:
             'reputation': profile.get('reputation')
         }
     
-    @staticmethod
-    def fetch_recent_submissions(username: str, limit: int = 10) -> List[Dict]:
+    @classmethod
+    def fetch_recent_submissions(cls, username: str, limit: int = 10) -> List[Dict]:
         """
         Fetch recent accepted submissions
         
@@ -184,46 +249,32 @@ class LeetCodeAPI:
         Returns:
             List of submission dictionaries
         """
-        for attempt in range(LeetCodeAPI.MAX_RETRIES):
-            try:
-                response = requests.post(
-                    LeetCodeAPI.GRAPHQL_URL,
-                    json={
-                        'query': LeetCodeAPI.RECENT_SUBMISSIONS_QUERY,
-                        'variables': {'username': username, 'limit': limit}
-                    },
-                    headers=LeetCodeAPI.HEADERS,
-                    timeout=45
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    submissions = data.get('data', {}).get('recentAcSubmissionList', [])
-                    
-                    return [{
-                        'problem_title': sub.get('title'),
-                        'problem_slug': sub.get('titleSlug'),
-                        'status': sub.get('statusDisplay'),
-                        'language': sub.get('lang'),
-                        'timestamp': datetime.fromtimestamp(int(sub.get('timestamp', 0)))
-                    } for sub in submissions]
-                
-                return []
-                
-            except requests.exceptions.Timeout:
-                if attempt < LeetCodeAPI.MAX_RETRIES - 1:
-                    print(f"Timeout fetching submissions for {username}, retrying in {LeetCodeAPI.RETRY_DELAY}s... (attempt {attempt + 1}/{LeetCodeAPI.MAX_RETRIES})")
-                    time.sleep(LeetCodeAPI.RETRY_DELAY)
-                    continue
-                else:
-                    print(f"Error fetching recent submissions for {username}: Max retries exceeded")
-                    return []
-            except Exception as e:
-                print(f"Error fetching recent submissions for {username}: {str(e)}")
-                return []
-    
+        variables = {'username': username, 'limit': limit}
+        data = cls._post(cls.RECENT_SUBMISSIONS_QUERY, variables, f'submissions for {username}')
+        return cls._parse_submissions(data)
+
+    @classmethod
+    async def afetch_recent_submissions(cls, username: str, limit: int = 10) -> List[Dict]:
+        variables = {'username': username, 'limit': limit}
+        data = await cls._apost(cls.RECENT_SUBMISSIONS_QUERY, variables, f'submissions for {username}')
+        return cls._parse_submissions(data)
+
     @staticmethod
-    def fetch_contest_info(username: str) -> Optional[Dict]:
+    def _parse_submissions(data: Optional[Dict]) -> List[Dict]:
+        try:
+            return [{
+                'problem_title': sub.get('title'),
+                'problem_slug': sub.get('titleSlug'),
+                'status': sub.get('statusDisplay'),
+                'language': sub.get('lang'),
+                'timestamp': datetime.fromtimestamp(int(sub.get('timestamp', 0)))
+            } for sub in (data or {}).get('recentAcSubmissionList') or []]
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.warning('Unexpected LeetCode submissions payload: %s', e)
+            return []
+    
+    @classmethod
+    def fetch_contest_info(cls, username: str) -> Optional[Dict]:
         """
         Fetch user contest information
         
@@ -233,46 +284,28 @@ class LeetCodeAPI:
         Returns:
             Dictionary with contest info or None if failed
         """
-        for attempt in range(LeetCodeAPI.MAX_RETRIES):
-            try:
-                response = requests.post(
-                    LeetCodeAPI.GRAPHQL_URL,
-                    json={
-                        'query': LeetCodeAPI.CONTEST_INFO_QUERY,
-                        'variables': {'username': username}
-                    },
-                    headers=LeetCodeAPI.HEADERS,
-                    timeout=45
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    contest_data = data.get('data', {}).get('userContestRanking')
-                    
-                    if contest_data:
-                        return {
-                            'rating': int(contest_data.get('rating', 0)),
-                            'global_ranking': contest_data.get('globalRanking'),
-                            'contests_attended': contest_data.get('attendedContestsCount'),
-                            'top_percentage': contest_data.get('topPercentage')
-                        }
-                
-                return None
-                
-            except requests.exceptions.Timeout:
-                if attempt < LeetCodeAPI.MAX_RETRIES - 1:
-                    print(f"Timeout fetching contest info for {username}, retrying in {LeetCodeAPI.RETRY_DELAY}s... (attempt {attempt + 1}/{LeetCodeAPI.MAX_RETRIES})")
-                    time.sleep(LeetCodeAPI.RETRY_DELAY)
-                    continue
-                else:
-                    print(f"Error fetching contest info for {username}: Max retries exceeded")
-                    return None
-            except Exception as e:
-                print(f"Error fetching contest info for {username}: {str(e)}")
-                return None
-    
+        data = cls._post(cls.CONTEST_INFO_QUERY, {'username': username}, f'contest info for {username}')
+        return cls._parse_contest(data)
+
+    @classmethod
+    async def afetch_contest_info(cls, username: str) -> Optional[Dict]:
+        data = await cls._apost(cls.CONTEST_INFO_QUERY, {'username': username}, f'contest info for {username}')
+        return cls._parse_contest(data)
+
     @staticmethod
-    def fetch_calendar_data(username: str) -> Optional[Dict]:
+    def _parse_contest(data: Optional[Dict]) -> Optional[Dict]:
+        contest_data = (data or {}).get('userContestRanking')
+        if not contest_data:
+            return None
+        return {
+            'rating': int(contest_data.get('rating') or 0),
+            'global_ranking': contest_data.get('globalRanking'),
+            'contests_attended': contest_data.get('attendedContestsCount'),
+            'top_percentage': contest_data.get('topPercentage')
+        }
+    
+    @classmethod
+    def fetch_calendar_data(cls, username: str) -> Optional[Dict]:
         """
         Fetch user calendar data including streak and monthly submissions
         
@@ -282,81 +315,61 @@ class LeetCodeAPI:
         Returns:
             Dictionary with streak and calendar data or None if failed
         """
-        for attempt in range(LeetCodeAPI.MAX_RETRIES):
+        variables = {'username': username, 'year': datetime.now().year}
+        data = cls._post(cls.USER_CALENDAR_QUERY, variables, f'calendar for {username}')
+        return cls._parse_calendar(data)
+
+    @classmethod
+    async def afetch_calendar_data(cls, username: str) -> Optional[Dict]:
+        variables = {'username': username, 'year': datetime.now().year}
+        data = await cls._apost(cls.USER_CALENDAR_QUERY, variables, f'calendar for {username}')
+        return cls._parse_calendar(data)
+
+    @staticmethod
+    def _parse_calendar(data: Optional[Dict]) -> Optional[Dict]:
+        matched_user = (data or {}).get('matchedUser')
+        if not matched_user or not matched_user.get('userCalendar'):
+            return None
+
+        calendar_data = matched_user['userCalendar']
+        submission_calendar_str = calendar_data.get('submissionCalendar', '{}')
+        
+        # Parse submission calendar JSON string
+        try:
+            submission_calendar = json.loads(submission_calendar_str) if isinstance(submission_calendar_str, str) else submission_calendar_str
+        except ValueError:
+            submission_calendar = {}
+        
+        # Convert to proper format and filter last 12 months
+        now = datetime.now()
+        twelve_months_ago = now - timedelta(days=365)
+        twelve_months_ago_timestamp = int(twelve_months_ago.timestamp())
+        
+        # Filter and convert calendar data
+        filtered_calendar = {}
+        for timestamp_str, count in (submission_calendar or {}).items():
             try:
-                from datetime import datetime
-                current_year = datetime.now().year
-                
-                response = requests.post(
-                    LeetCodeAPI.GRAPHQL_URL,
-                    json={
-                        'query': LeetCodeAPI.USER_CALENDAR_QUERY,
-                        'variables': {'username': username, 'year': current_year}
-                    },
-                    headers=LeetCodeAPI.HEADERS,
-                    timeout=45
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    matched_user = data.get('data', {}).get('matchedUser')
-                    
-                    if matched_user and matched_user.get('userCalendar'):
-                        calendar_data = matched_user['userCalendar']
-                        submission_calendar_str = calendar_data.get('submissionCalendar', '{}')
-                        
-                        # Parse submission calendar JSON string
-                        import json
-                        try:
-                            submission_calendar = json.loads(submission_calendar_str) if isinstance(submission_calendar_str, str) else submission_calendar_str
-                        except:
-                            submission_calendar = {}
-                        
-                        # Convert to proper format and filter last 12 months
-                        from datetime import datetime, timedelta
-                        now = datetime.now()
-                        twelve_months_ago = now - timedelta(days=365)
-                        twelve_months_ago_timestamp = int(twelve_months_ago.timestamp())
-                        
-                        # Filter and convert calendar data
-                        filtered_calendar = {}
-                        for timestamp_str, count in submission_calendar.items():
-                            try:
-                                timestamp = int(timestamp_str)
-                                if timestamp >= twelve_months_ago_timestamp:
-                                    # Store as string key for JSON compatibility
-                                    filtered_calendar[str(timestamp)] = int(count)
-                            except (ValueError, TypeError):
-                                continue
-                        
-                        # Calculate current month's problems
-                        current_month_start = datetime(now.year, now.month, 1).timestamp()
-                        next_month = now.month + 1 if now.month < 12 else 1
-                        next_month_year = now.year if now.month < 12 else now.year + 1
-                        current_month_end = datetime(next_month_year, next_month, 1).timestamp()
-                        
-                        monthly_problems = sum(
-                            int(count) for timestamp_str, count in filtered_calendar.items()
-                            if current_month_start <= int(timestamp_str) < current_month_end
-                        )
-                        
-                        return {
-                            'streak': calendar_data.get('streak', 0),
-                            'total_active_days': calendar_data.get('totalActiveDays', 0),
-                            'monthly_problems': monthly_problems,
-                            'submission_calendar': filtered_calendar
-                        }
-                
-                return None
-                
-            except requests.exceptions.Timeout:
-                if attempt < LeetCodeAPI.MAX_RETRIES - 1:
-                    print(f"Timeout fetching calendar for {username}, retrying in {LeetCodeAPI.RETRY_DELAY}s... (attempt {attempt + 1}/{LeetCodeAPI.MAX_RETRIES})")
-                    time.sleep(LeetCodeAPI.RETRY_DELAY)
-                    continue
-                else:
-                    print(f"Error fetching calendar data for {username}: Max retries exceeded")
-                    return None
-            except Exception as e:
-                print(f"Error fetching calendar data for {username}: {str(e)}")
-                return None
+                timestamp = int(timestamp_str)
+                if timestamp >= twelve_months_ago_timestamp:
+                    # Store as string key for JSON compatibility
+                    filtered_calendar[str(timestamp)] = int(count)
+            except (ValueError, TypeError):
+                continue
+        
+        # Calculate current month's problems
+        current_month_start = datetime(now.year, now.month, 1).timestamp()
+        next_month = now.month + 1 if now.month < 12 else 1
+        next_month_year = now.year if now.month < 12 else now.year + 1
+        current_month_end = datetime(next_month_year, next_month, 1).timestamp()
+        
+        monthly_problems = sum(
+            int(count) for timestamp_str, count in filtered_calendar.items()
+            if current_month_start <= int(timestamp_str) < current_month_end
+        )
+        
+        return {
+            'streak': calendar_data.get('streak', 0),
+            'total_active_days': calendar_data.get('totalActiveDays', 0),
+            'monthly_problems': monthly_problems,
+            'submission_calendar': filtered_calendar
+        }
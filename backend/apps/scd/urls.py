@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import LeetCodeProfileViewSet
+from .views import LeetCodeProfileViewSet, sync_leetcode_profile
 
 router = DefaultRouter()
 router.register(r'profiles', LeetCodeProfileViewSet, basename='leetcode-profile')
 
 urlpatterns = [
+    # Async view; served ahead of the router's profile routes
+    path('profiles/sync/', sync_leetcode_profile, name='leetcode-profile-sync'),
     path('', include(router.urls)),
 ]
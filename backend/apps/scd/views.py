@@ -1,3 +1,7 @@
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -5,6 +9,10 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from django.db import transaction
 
+from apps.async_views import async_api_view, json_response
+from apps.rate_limits import rate_limit
+from apps.swr_cache import SWRCache
+
 from .models import LeetCodeProfile, LeetCodeSubmission, ProgressSnapshot
 from .serializers import (
     LeetCodeProfileSerializer,
@@ -43,8 +51,6 @@ class LeetCodeProfileViewSet(viewsets.ModelViewSet):
         """Return appropriate serializer based on action"""
         if self.action in ['create', 'update', 'partial_update']:
             return LeetCodeProfileCreateSerializer
-        elif self.action == 'sync':
-            return LeetCodeSyncSerializer
         return LeetCodeProfileSerializer
     
     def create(self, request, *args, **kwargs):
@@ -57,143 +63,6 @@ class LeetCodeProfileViewSet(viewsets.ModelViewSet):
         output_serializer = LeetCodeProfileSerializer(instance)
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
     
-    @action(detail=False, methods=['post'])
-    def sync(self, request):
-        """
-        Sync LeetCode profile data from the API
-        
-        POST /api/scd/profiles/sync/
-        Body: {"leetcode_username": "username"}
-        """
-        serializer = LeetCodeSyncSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        username = serializer.validated_data['leetcode_username']
-        
-        # Fetch data from LeetCode API
-        profile_data = LeetCodeAPI.fetch_user_profile(username)
-        
-        if not profile_data:
-            return Response(
-                {'error': 'Failed to fetch LeetCode profile. Please check the username and try again.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Fetch additional data (non-critical, can timeout)
-        warnings = []
-        
-        contest_info = LeetCodeAPI.fetch_contest_info(username)
-        if not contest_info:
-            warnings.append('Contest data unavailable - LeetCode API timeout or no contest history')
-        
-        calendar_data = LeetCodeAPI.fetch_calendar_data(username)
-        if not calendar_data:
-            warnings.append('Calendar data unavailable - LeetCode API timeout')
-        
-        try:
-            with transaction.atomic():
-                # Get or create profile
-                profile, created = LeetCodeProfile.objects.get_or_create(
-                    user=request.user,
-                    leetcode_username=username,
-                    defaults={
-                        'total_solved': profile_data['total_solved'],
-                        'easy_solved': profile_data['easy_solved'],
-                        'medium_solved': profile_data['medium_solved'],
-                        'hard_solved': profile_data['hard_solved'],
-                        'ranking': profile_data['ranking'],
-                        'contest_rating': contest_info['rating'] if contest_info else None,
-                        'streak': calendar_data['streak'] if calendar_data else 0,
-                        'monthly_problems_count': calendar_data['monthly_problems'] if calendar_data else 0,
-                        'total_active_days': calendar_data['total_active_days'] if calendar_data else 0,
-                        'submission_calendar': calendar_data['submission_calendar'] if calendar_data else {},
-                    }
-                )
-                
-                # Update existing profile
-                if not created:
-                    profile.total_solved = profile_data['total_solved']
-                    profile.easy_solved = profile_data['easy_solved']
-                    profile.medium_solved = profile_data['medium_solved']
-                    profile.hard_solved = profile_data['hard_solved']
-                    profile.ranking = profile_data['ranking']
-                    if contest_info:
-                        profile.contest_rating = contest_info['rating']
-                    if calendar_data:
-                        profile.streak = calendar_data['streak']
-                        profile.monthly_problems_count = calendar_data['monthly_problems']
-                        profile.total_active_days = calendar_data['total_active_days']
-                        profile.submission_calendar = calendar_data['submission_calendar']
-                    profile.save()
-                
-                # Check if monthly target is met (minimum 10 problems)
-                monthly_target_met = (calendar_data and calendar_data['monthly_problems'] >= 10) if calendar_data else False
-                
-                # If target not met, create notification for mentor
-                if not monthly_target_met and hasattr(request.user, 'profile') and request.user.profile.assigned_mentor:
-                    from apps.dashboard.models import Notification
-                    from datetime import datetime
-                    
-                    # Check if notification already exists for this month
-                    current_month = datetime.now().strftime('%Y-%m')
-                    existing_notif = Notification.objects.filter(
-                        user=request.user.profile.assigned_mentor,
-                        message__contains=f"monthly target ({current_month})",
-                        created_at__month=datetime.now().month,
-                        created_at__year=datetime.now().year
-                    ).exists()
-                    
-                    if not existing_notif:
-                        problems_count = calendar_data['monthly_problems'] if calendar_data else 0
-                        student_name = request.user.get_full_name() or request.user.username
-                        Notification.objects.create(
-                            user=request.user.profile.assigned_mentor,
-                            message=f"{student_name} has only solved {problems_count}/10 problems this month on LeetCode (monthly target ({current_month}))",
-                            notification_type='warning'
-                        )
-                
-                # Create progress snapshot
-                ProgressSnapshot.objects.create(
-                    profile=profile,
-                    total_solved=profile_data['total_solved'],
-                    easy_solved=profile_data['easy_solved'],
-                    medium_solved=profile_data['medium_solved'],
-                    hard_solved=profile_data['hard_solved'],
-                    ranking=profile_data['ranking']
-                )
-                
-                # Fetch and save recent submissions (non-critical)
-                recent_submissions = LeetCodeAPI.fetch_recent_submissions(username, limit=20)
-                if not recent_submissions:
-                    warnings.append('Recent submissions unavailable - LeetCode API timeout')
-                
-                # Clear old submissions and add new ones
-                if recent_submissions:
-                    profile.submissions.all().delete()
-                    for sub_data in recent_submissions:
-                        LeetCodeSubmission.objects.create(
-                            profile=profile,
-                            **sub_data
-                        )
-                
-                # Return updated profile with warnings
-                output_serializer = LeetCodeProfileSerializer(profile)
-                response_data = {
-                    'message': 'Profile synced successfully' + (' with warnings' if warnings else ''),
-                    'profile': output_serializer.data
-                }
-                
-                if warnings:
-                    response_data['warnings'] = warnings
-                
-                return Response(response_data, status=status.HTTP_200_OK)
-                
-        except Exception as e:
-            return Response(
-                {'error': f'Failed to sync profile: {str(e)}'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-    
     @action(detail=True, methods=['post'])
     def submit(self, request, pk=None):
         """
@@ -261,3 +130,179 @@ class LeetCodeProfileViewSet(viewsets.ModelViewSet):
             }
         
         return Response(stats, status=status.HTTP_200_OK)
+
+
+@async_api_view(['POST'])
+@rate_limit('leetcode-sync', burst='3/m', sustained='30/h')
+async def sync_leetcode_profile(request):
+    """
+    Sync LeetCode profile data from the API
+    
+    POST /api/scd/profiles/sync/
+    Body: {"leetcode_username": "username"}
+    
+    Async: the four LeetCode queries run concurrently on the pooled client
+    and no worker thread waits on them; only the database writes run in a
+    thread, after every query has finished.
+    
+    With USE_LEETCODE_CACHE the fetched data is cached per LeetCode
+    username (stale-while-revalidate): a sync within LEETCODE_CACHE_TTL
+    makes no LeetCode calls, and a later one saves the last known stats
+    at once while a background thread fetches and saves fresh ones.
+    """
+    serializer = LeetCodeSyncSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    
+    username = serializer.validated_data['leetcode_username']
+    
+    cache_key = leetcode_cache_key(username)
+    use_cache = getattr(settings, 'USE_LEETCODE_CACHE', False)
+    entry = await SWRCache.aget(cache_key) if use_cache else None
+    stale = bool(entry) and not SWRCache.is_fresh(entry, settings.LEETCODE_CACHE_TTL)
+    if entry:
+        data = entry['data']
+        if stale:
+            user = request.user
+            await SWRCache.arefresh_in_background(cache_key, lambda: refresh_leetcode_sync(user, username))
+    else:
+        data = await LeetCodeAPI.afetch_all(username)
+        if use_cache and data['profile']:
+            await SWRCache.astore(cache_key, SWRCache.entry(data=data))
+    
+    profile_data, contest_info = data['profile'], data['contest']
+    calendar_data, recent_submissions = data['calendar'], data['submissions']
+    
+    if not profile_data:
+        return json_response(
+            {'error': 'Failed to fetch LeetCode profile. Please check the username and try again.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Additional data is non-critical and can time out
+    warnings = []
+    if not contest_info:
+        warnings.append('Contest data unavailable - LeetCode API timeout or no contest history')
+    if not calendar_data:
+        warnings.append('Calendar data unavailable - LeetCode API timeout')
+    if not recent_submissions:
+        warnings.append('Recent submissions unavailable - LeetCode API timeout')
+    if stale:
+        warnings.append('Showing your last known LeetCode stats - fresh ones are being fetched in the background')
+    
+    try:
+        profile = await sync_to_async(save_leetcode_sync)(
+            request.user, username, profile_data, contest_info, calendar_data, recent_submissions
+        )
+    except Exception as e:
+        return json_response(
+            {'error': f'Failed to sync profile: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    
+    response_data = {
+        'message': 'Profile synced successfully' + (' with warnings' if warnings else ''),
+        'profile': profile
+    }
+    if warnings:
+        response_data['warnings'] = warnings
+    return json_response(response_data, status=status.HTTP_200_OK)
+
+
+def leetcode_cache_key(username):
+    return f'leetcode_sync_{username.lower()}'
+
+
+def refresh_leetcode_sync(user, username):
+    """Background refresh of stale cached LeetCode data: fetch, save, return the new cache entry"""
+    data = LeetCodeAPI.fetch_all(username)
+    if not data['profile']:
+        # Keep serving the last known stats; SWRCache retries later
+        raise ValueError(f'LeetCode profile of {username} unavailable')
+    save_leetcode_sync(
+        user, username, data['profile'], data['contest'], data['calendar'], data['submissions']
+    )
+    return SWRCache.entry(data=data)
+
+
+def save_leetcode_sync(user, username, profile_data, contest_info, calendar_data, recent_submissions):
+    """Store fetched LeetCode data for a user; returns the serialized profile"""
+    with transaction.atomic():
+        # Get or create profile
+        profile, created = LeetCodeProfile.objects.get_or_create(
+            user=user,
+            leetcode_username=username,
+            defaults={
+                'total_solved': profile_data['total_solved'],
+                'easy_solved': profile_data['easy_solved'],
+                'medium_solved': profile_data['medium_solved'],
+                'hard_solved': profile_data['hard_solved'],
+                'ranking': profile_data['ranking'],
+                'contest_rating': contest_info['rating'] if contest_info else None,
+                'streak': calendar_data['streak'] if calendar_data else 0,
+                'monthly_problems_count': calendar_data['monthly_problems'] if calendar_data else 0,
+                'total_active_days': calendar_data['total_active_days'] if calendar_data else 0,
+                'submission_calendar': calendar_data['submission_calendar'] if calendar_data else {},
+            }
+        )
+        
+        # Update existing profile
+        if not created:
+            profile.total_solved = profile_data['total_solved']
+            profile.easy_solved = profile_data['easy_solved']
+            profile.medium_solved = profile_data['medium_solved']
+            profile.hard_solved = profile_data['hard_solved']
+            profile.ranking = profile_data['ranking']
+            if contest_info:
+                profile.contest_rating = contest_info['rating']
+            if calendar_data:
+                profile.streak = calendar_data['streak']
+                profile.monthly_problems_count = calendar_data['monthly_problems']
+                profile.total_active_days = calendar_data['total_active_days']
+                profile.submission_calendar = calendar_data['submission_calendar']
+            profile.save()
+        
+        # Check if monthly target is met (minimum 10 problems)
+        monthly_target_met = bool(calendar_data and calendar_data['monthly_problems'] >= 10)
+        
+        # If target not met, create notification for mentor
+        mentor = user.profile.assigned_mentor if hasattr(user, 'profile') else None
+        if not monthly_target_met and mentor:
+            from apps.dashboard.models import Notification
+            
+            # Check if notification already exists for this month
+            now = datetime.now()
+            current_month = now.strftime('%Y-%m')
+            existing_notif = Notification.objects.filter(
+                recipient=mentor,
+                message__contains=f"monthly target ({current_month})",
+                created_at__month=now.month,
+                created_at__year=now.year
+            ).exists()
+            
+            if not existing_notif:
+                problems_count = calendar_data['monthly_problems'] if calendar_data else 0
+                student_name = user.get_full_name() or user.username
+                Notification.objects.create(
+                    recipient=mentor,
+                    message=f"{student_name} has only solved {problems_count}/10 problems this month on LeetCode (monthly target ({current_month}))",
+                    notification_type='warning'
+                )
+        
+        # Create progress snapshot
+        ProgressSnapshot.objects.create(
+            profile=profile,
+            total_solved=profile_data['total_solved'],
+            easy_solved=profile_data['easy_solved'],
+            medium_solved=profile_data['medium_solved'],
+            hard_solved=profile_data['hard_solved'],
+            ranking=profile_data['ranking']
+        )
+        
+        # Replace old submissions with the recent ones
+        if recent_submissions:
+            profile.submissions.all().delete()
+            LeetCodeSubmission.objects.bulk_create([
+                LeetCodeSubmission(profile=profile, **sub_data) for sub_data in recent_submissions
+            ])
+        
+        return LeetCodeProfileSerializer(profile).data
@@ -8,8 +8,8 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import timedelta
 from apps.profiles.models import UserProfile
+from apps.profiles.provisioning import UserProvisioningService
 from apps.gamification.models import Season, Title
-import csv
 import os
 
 
@@ -106,42 +106,16 @@ def setup_database(request):
     floor = 2
     
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                try:
-                    email = row['email'].strip()
-                    username = row['username'].strip()
-                    
-                    user, is_new = User.objects.get_or_create(
-                        email=email,
-                        defaults={
-                            'username': username,
-                            'first_name': username.split()[0] if username else '',
-                            'last_name': ' '.join(username.split()[1:]) if len(username.split()) > 1 else ''
-                        }
-                    )
-                    
-                    user.set_password('pass123#')
-                    user.save()
-                    
-                    profile, _ = UserProfile.objects.get_or_create(
-                        user=user,
-                        defaults={'role': 'STUDENT', 'campus': campus, 'floor': floor}
-                    )
-                    profile.role = 'STUDENT'
-                    profile.campus = campus
-                    profile.floor = floor
-                    profile.save()
-                    
-                    if is_new:
-                        results['students_created'] += 1
-                    else:
-                        results['students_updated'] += 1
-                        
-                except Exception as e:
-                    results['errors'].append(f'Error with {email}: {str(e)}')
-                    
+        import_result = UserProvisioningService.provision(
+            UserProvisioningService.read_rows(csv_path),
+            default_password='pass123#',
+            role='STUDENT',
+            campus=campus,
+            floor=floor,
+        )
+        results['students_created'] = import_result['created']
+        results['students_updated'] = import_result['updated']
+        results['errors'].extend(import_result['errors'])
     except Exception as e:
         results['errors'].append(f'CSV reading error: {str(e)}')
     
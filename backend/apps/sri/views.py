@@ -2,9 +2,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from django.db import transaction
 from django.db.models import Sum, Count, Q
 from django.utils import timezone
 from datetime import datetime, timedelta
+from apps.uploads.services import ChunkedUploadService, EvidenceUploadService, UploadError
 from .models import SRISubmission, SRIFile
 from .serializers import (
     SRISubmissionSerializer,
@@ -83,6 +86,42 @@ class SRISubmissionViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(submission)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['post'], url_path='upload_files',
+            parser_classes=[MultiPartParser, FormParser, JSONParser])
+    def upload_files(self, request, pk=None):
+        """
+        Attach photos/certificates to your own submission.
+        Body: files (multipart) and/or upload_ids (completed /api/uploads/ ids), file_type (optional)
+        """
+        submission = self.get_object()
+        
+        if submission.user != request.user:
+            return Response(
+                {'error': 'You can only upload files to your own submissions'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        files = request.FILES.getlist('files')
+        upload_ids = EvidenceUploadService.upload_ids(request.data)
+        if not files and not upload_ids:
+            return Response({'error': 'No files provided'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            with transaction.atomic():
+                uploads = ChunkedUploadService.claim(request.user, upload_ids)
+                error = EvidenceUploadService.validate(SRIFile, files, uploads)
+                if error:
+                    raise UploadError(error)
+                created_files = EvidenceUploadService.store(
+                    SRIFile, submission, files, uploads,
+                    file_type=request.data.get('file_type', 'photo')
+                )
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = SRIFileSerializer(created_files, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
     @action(detail=True, methods=['post'], url_path='review')
     def review_submission(self, request, pk=None):
         """Review a submission (approve/reject)"""
@@ -0,0 +1,123 @@
+"""
+Stale-While-Revalidate Cache
+Last-known third-party data, served without waiting on the third party
+
+Entries live in the default cache as dicts with a `fetched_at` timestamp
+and are kept for STALE_RETENTION. Callers decide what to do with them:
+
+- fresh (younger than the caller's TTL): serve it
+- stale: serve it now and call refresh_in_background(), which runs one
+  refresh thread per key and stores the entry the refresh returns
+- missing: fetch inline, then store()
+
+A cache.add lock keeps it to one refresh per key across every process that
+shares the cache. A successful refresh releases the lock. A failed one
+(upstream down, rate-limited, circuit open) keeps the old entry and leaves
+the lock to expire, so a failing upstream is retried at most once per
+REFRESH_LOCK_TTL per key instead of on every request.
+
+Used by GitHubRepoService (per owner/repo) and the LeetCode profile sync
+(per LeetCode username).
+
+Usage:
+    from apps.swr_cache import SWRCache
+
+    entry = SWRCache.get(key)
+    if entry and not SWRCache.is_fresh(entry, ttl):
+        SWRCache.refresh_in_background(key, lambda: fetch_entry(...))
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# Stale entries are kept this long so they can be served while an upstream is down
+STALE_RETENTION = 7 * 24 * 3600
+REFRESH_LOCK_TTL = 60
+
+_threads = set()
+_threads_lock = threading.Lock()
+
+
+class SWRCache:
+    """Stale-while-revalidate entries in the default cache"""
+
+    @staticmethod
+    def entry(**fields):
+        """A new entry, stamped now"""
+        return {**fields, 'fetched_at': time.time()}
+
+    @staticmethod
+    def is_fresh(entry, ttl):
+        return bool(entry) and time.time() - entry['fetched_at'] < ttl
+
+    @staticmethod
+    def get(key):
+        return cache.get(key)
+
+    @staticmethod
+    async def aget(key):
+        return await cache.aget(key)
+
+    @staticmethod
+    def store(key, entry):
+        cache.set(key, entry, STALE_RETENTION)
+
+    @staticmethod
+    async def astore(key, entry):
+        await cache.aset(key, entry, STALE_RETENTION)
+
+    @classmethod
+    def refresh_in_background(cls, key, refresh):
+        """
+        Start a thread that stores refresh()'s entry under key (a None entry
+        keeps the old one). Returns the thread, or None when a refresh of
+        key is already running or recently failed.
+        """
+        if not cache.add(cls._lock_key(key), True, REFRESH_LOCK_TTL):
+            return None
+        return cls._start(key, refresh)
+
+    @classmethod
+    async def arefresh_in_background(cls, key, refresh):
+        """refresh_in_background() for async views (refresh itself is blocking)"""
+        if not await cache.aadd(cls._lock_key(key), True, REFRESH_LOCK_TTL):
+            return None
+        return cls._start(key, refresh)
+
+    @staticmethod
+    def _lock_key(key):
+        return f'{key}:refreshing'
+
+    @classmethod
+    def _start(cls, key, refresh):
+        def run():
+            try:
+                entry = refresh()
+                if entry is not None:
+                    cls.store(key, entry)
+                cache.delete(cls._lock_key(key))
+            except Exception as e:
+                logger.warning('Background refresh of %s failed: %r', key, e)
+            finally:
+                close_old_connections()
+                with _threads_lock:
+                    _threads.discard(thread)
+
+        thread = threading.Thread(target=run, name=f'swr-refresh-{key}', daemon=True)
+        with _threads_lock:
+            _threads.add(thread)
+        thread.start()
+        return thread
+
+    @staticmethod
+    def wait(timeout=None):
+        """Wait for running refreshes (management commands and tests)"""
+        with _threads_lock:
+            threads = list(_threads)
+        for thread in threads:
+            thread.join(timeout)
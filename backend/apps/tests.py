@@ -0,0 +1,731 @@
+import gzip
+import json
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import httpx
+import requests
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import router
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import path
+from django.utils.translation import gettext_lazy
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps import http_client, rate_limits
+from apps.authentication import CachedJWTAuthentication
+from apps.db_router import PIN_CACHE, read_replica, routing
+from apps.query_profiler import (
+    QueryBudgetExceeded, assert_query_budget, fingerprint, query_budget, report
+)
+from apps.rate_limits import client_ip, rate_limit, rate_limit_stats
+from apps.renderers import ORJSONParser, ORJSONRenderer
+from apps.response_middleware import accepted_encodings
+
+
+@query_budget(1)
+def _user_count_view(request):
+    return JsonResponse({'count': User.objects.count()})
+
+
+@query_budget(1)
+def _n_plus_one_view(request):
+    usernames = [User.objects.get(pk=pk).username for pk in User.objects.values_list('pk', flat=True)]
+    return JsonResponse({'usernames': usernames})
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def _leaderboard_view(request):
+    if request.method == 'POST':
+        return Response({'received': request.data})
+    rows = [{'rank': rank, 'student_username': f'student{rank}', 'season_score': 1000 - rank} for rank in range(200)]
+    return Response({'leaderboard': rows})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@rate_limit('tests', burst='3/m', sustained='2/h')
+def _rate_limited_view(request):
+    return Response({'ok': True})
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+def _routing_view(request):
+    reads = [router.db_for_read(User)]
+    if 'write' in request.GET:
+        router.db_for_write(User)
+    reads.append(router.db_for_read(User))
+    return Response({'reads': reads})
+
+
+urlpatterns = [
+    path('count/', _user_count_view, name='user-count'),
+    path('n-plus-one/', _n_plus_one_view, name='n-plus-one'),
+    path('leaderboard/', _leaderboard_view, name='leaderboard'),
+    path('routing/', _routing_view, name='routing'),
+    path('rate-limited/', _rate_limited_view, name='rate-limited'),
+]
+
+
+class QueryFingerprintTests(TestCase):
+    def test_in_lists_of_any_length_share_a_fingerprint(self):
+        one = 'SELECT "id" FROM "auth_user" WHERE "id" IN (%s)'
+        three = 'SELECT "id" FROM "auth_user" WHERE "id" IN (%s, %s, %s)'
+        self.assertEqual(fingerprint(one), fingerprint(three))
+
+    def test_different_statements_differ(self):
+        self.assertNotEqual(
+            fingerprint('SELECT 1 FROM "auth_user"'),
+            fingerprint('SELECT 1 FROM "auth_group"'),
+        )
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            User.objects.create(username=f'budget{i}')
+
+    def setUp(self):
+        report.reset()
+
+    def test_assert_query_budget_reports_duplicates(self):
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with assert_query_budget(2, 'loop'):
+                for user in User.objects.all():
+                    User.objects.get(pk=user.pk)
+        self.assertIn('loop ran 4 queries (budget 2)', str(ctx.exception))
+        self.assertIn('x3', str(ctx.exception))
+
+    @override_settings(ROOT_URLCONF=__name__, QUERY_BUDGET_ENFORCE=True)
+    def test_view_within_budget_passes_and_is_reported(self):
+        response = self.client.get('/count/')
+        self.assertEqual(response['X-Query-Count'], '1')
+
+        row = next(r for r in report.snapshot() if r['url_name'] == 'user-count')
+        self.assertEqual(row['requests'], 1)
+        self.assertEqual(row['budget'], 1)
+        self.assertEqual(row['budget_violations'], 0)
+
+    @override_settings(ROOT_URLCONF=__name__, QUERY_BUDGET_ENFORCE=True)
+    def test_view_over_budget_fails(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/n-plus-one/')
+
+    @override_settings(ROOT_URLCONF=__name__, LOG_QUERY_TIMES=True, QUERY_BUDGET_ENFORCE=False)
+    def test_violation_is_recorded_without_enforcement(self):
+        self.client.get('/n-plus-one/')
+        row = next(r for r in report.snapshot() if r['url_name'] == 'n-plus-one')
+        self.assertEqual(row['budget_violations'], 1)
+        self.assertEqual(row['top_duplicates'][0]['count'], 3)
+
+
+@override_settings(QUERY_BUDGET_ENFORCE=True)
+class EndpointQueryBudgetTests(TestCase):
+    """Budgeted endpoints against a seeded floor: an N+1 raises QueryBudgetExceeded"""
+
+    @classmethod
+    def setUpTestData(cls):
+        from apps.analytics_summary.synthetic_cohort import SyntheticCohortSeeder
+
+        cls.cohort = SyntheticCohortSeeder(students=30, mentors=2, floors=1, submissions_per_pillar=2).seed()
+
+    def get(self, user, url):
+        response = self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_mentor_students(self):
+        response = self.get(self.cohort['mentors'][0], '/api/mentor/students/')
+        self.assertEqual(response.json()['total'], 15)
+
+    def test_mentor_assignment_students(self):
+        response = self.get(self.cohort['mentors'][0], '/api/profiles/mentor/my-students/')
+        self.assertEqual(response.json()['total_count'], 15)
+
+    def test_admin_floor_detail(self):
+        body = self.get(self.cohort['admin'], '/api/profiles/admin/campus/TECH/floor/1/').json()
+        self.assertEqual(body['stats']['total_students'], 30)
+        self.assertEqual(sorted(m['assigned_students'] for m in body['mentors']), [15, 15])
+        # 2 submissions in each of CLT, hackathons and LinkedIn posts
+        self.assertEqual({student['submissions'] for student in body['students']}, {6})
+
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'auth-tests'}}
+
+
+@override_settings(USE_AUTH_CACHE=True, CACHES=LOCMEM_CACHE)
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from rest_framework_simplejwt.tokens import AccessToken
+        from apps.authentication import CachedJWTAuthentication
+
+        cache.clear()
+        self.user = User.objects.create_user(username='cached', password='pass-12345')
+        self.user.profile.role = 'MENTOR'
+        self.user.profile.campus = 'TECH'
+        self.user.profile.floor = 2
+        self.user.profile.save()
+        self.token = AccessToken.for_user(self.user)
+        self.auth = CachedJWTAuthentication()
+
+    def test_cache_hit_hydrates_user_and_profile_without_queries(self):
+        self.auth.get_user(self.token)
+
+        with self.assertNumQueries(0):
+            user = self.auth.get_user(self.token)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.profile.role, 'MENTOR')
+            self.assertEqual((user.profile.campus, user.profile.floor), ('TECH', 2))
+            self.assertIs(user.profile.user, user)
+
+    def test_profile_change_invalidates_cached_identity(self):
+        self.auth.get_user(self.token)
+
+        self.user.profile.role = 'FLOOR_WING'
+        self.user.profile.save()
+
+        self.assertEqual(self.auth.get_user(self.token).profile.role, 'FLOOR_WING')
+
+    def test_hydrated_user_save_keeps_password(self):
+        self.auth.get_user(self.token)
+        user = self.auth.get_user(self.token)
+        user.first_name = 'Renamed'
+        user.save()
+
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('pass-12345'))
+
+    def test_inactive_user_is_rejected(self):
+        from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class EmailOrUsernameLoginTests(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username='student@college.edu', email='student@college.edu', password='pass-12345'
+        )
+        self.mentor = User.objects.create_user(
+            username='mentor1', email='Mentor.One@College.edu', password='pass-12345'
+        )
+
+    def login(self, username):
+        return self.client.post(
+            '/api/auth/token/', {'username': username, 'password': 'pass-12345'},
+            content_type='application/json'
+        )
+
+    def test_username_login(self):
+        response = self.login('mentor1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['id'], self.mentor.id)
+
+    def test_email_login_is_case_insensitive(self):
+        response = self.login('mentor.one@college.edu')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['id'], self.mentor.id)
+
+    def test_email_shaped_username_login(self):
+        self.assertEqual(self.login('student@college.edu').json()['user']['id'], self.student.id)
+
+    def test_login_resolves_user_and_profile_in_one_query(self):
+        # Plus the last_login UPDATE (SIMPLE_JWT UPDATE_LAST_LOGIN)
+        with self.assertNumQueries(2):
+            self.assertEqual(self.login('MENTOR.ONE@college.edu').status_code, 200)
+
+    def test_inactive_user_cannot_log_in(self):
+        self.mentor.is_active = False
+        self.mentor.save()
+        self.assertEqual(self.login('mentor1').status_code, 401)
+
+
+class ORJSONRendererTests(TestCase):
+    def test_output_matches_drf_json_renderer(self):
+        data = {
+            'created_at': datetime(2024, 3, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'naive': datetime(2024, 3, 1, 9, 30),
+            'score': Decimal('12.50'),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'label': gettext_lazy('Season'),
+            'tags': {'clt'},
+            'text': 'line\u2028break \u00e9',
+            7: None,
+        }
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data)),
+        )
+        self.assertIn(b'"2024-03-01T09:30:15.123456Z"', ORJSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_parser_rejects_invalid_json(self):
+        ok = self.client.post('/leaderboard/', '{"a": [1, 2]}', content_type='application/json')
+        bad = self.client.post('/leaderboard/', '{"a": ', content_type='application/json')
+        self.assertEqual(ok.json(), {'received': {'a': [1, 2]}})
+        self.assertEqual(bad.status_code, 400)
+        self.assertIs(ORJSONParser.renderer_class, ORJSONRenderer)
+
+
+@override_settings(ROOT_URLCONF=__name__, USE_RESPONSE_COMPRESSION=True, USE_RESPONSE_ETAGS=True,
+                   RESPONSE_COMPRESSION_MIN_SIZE=1024)
+class ResponseMiddlewareTests(TestCase):
+    def test_large_json_is_gzipped_with_a_weak_etag(self):
+        response = self.client.get('/leaderboard/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['leaderboard']), 200)
+
+    def test_unchanged_response_is_not_modified(self):
+        first = self.client.get('/leaderboard/')
+        self.assertNotIn('Content-Encoding', first)
+        self.assertTrue(first['ETag'].startswith('"'))
+
+        again = self.client.get('/leaderboard/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+
+        # The weak ETag of the compressed variant matches too
+        gzipped = self.client.get('/leaderboard/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(
+            self.client.get('/leaderboard/', HTTP_IF_NONE_MATCH=gzipped['ETag']).status_code, 304
+        )
+
+    def test_small_and_refused_responses_are_left_alone(self):
+        with self.settings(RESPONSE_COMPRESSION_MIN_SIZE=10 ** 6):
+            response = self.client.get('/leaderboard/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+        response = self.client.get('/leaderboard/', HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(accepted_encodings('gzip;q=0, br;q=0.5, identity'), {'br', 'identity'})
+
+
+LEETCODE_PROFILE = {
+    'username': 'sam', 'ranking': 1200, 'total_solved': 150, 'easy_solved': 80, 'medium_solved': 60,
+    'hard_solved': 10, 'real_name': 'Sam', 'avatar': '', 'reputation': 0,
+}
+LEETCODE_CALENDAR = {'streak': 4, 'total_active_days': 30, 'monthly_problems': 3, 'submission_calendar': {}}
+LEETCODE_SUBMISSIONS = [{
+    'problem_title': 'Two Sum', 'problem_slug': 'two-sum', 'status': 'Accepted', 'language': 'python3',
+    'timestamp': datetime(2024, 3, 1, tzinfo=dt_timezone.utc),
+}]
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AsyncApiViewTests(TestCase):
+    def setUp(self):
+        self.mentor = User.objects.create_user(username='mentor', password='x')
+        self.student = User.objects.create_user(username='sam', password='x', first_name='Sam')
+        self.student.profile.assigned_mentor = self.mentor
+        self.student.profile.save()
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.student)}'}
+
+    def patch_leetcode(self, profile=LEETCODE_PROFILE, contest=None, calendar=LEETCODE_CALENDAR,
+                       submissions=LEETCODE_SUBMISSIONS):
+        from apps.scd.leetcode_api import LeetCodeAPI
+
+        patches = [
+            mock.patch.object(LeetCodeAPI, name, mock.AsyncMock(return_value=value))
+            for name, value in (
+                ('afetch_user_profile', profile), ('afetch_contest_info', contest),
+                ('afetch_calendar_data', calendar), ('afetch_recent_submissions', submissions),
+            )
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_authentication_and_methods_match_drf(self):
+        url = '/api/scd/profiles/sync/'
+        response = self.client.post(url, {'leetcode_username': 'sam'}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+        self.assertEqual(response.json(), {'detail': 'Authentication credentials were not provided.'})
+
+        response = self.client.get(url, **self.auth)
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'POST')
+
+        response = self.client.post(url, {'leetcode_username': ''}, content_type='application/json', **self.auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('leetcode_username', response.json())
+
+    def test_leetcode_sync_saves_profile_and_warns_mentor(self):
+        from apps.dashboard.models import Notification
+        from apps.scd.models import LeetCodeProfile
+
+        self.patch_leetcode()
+        response = self.client.post(
+            '/api/scd/profiles/sync/', {'leetcode_username': 'sam'}, content_type='application/json', **self.auth
+        )
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['profile']['total_solved'], 150)
+        self.assertEqual(body['warnings'], ['Contest data unavailable - LeetCode API timeout or no contest history'])
+        profile = LeetCodeProfile.objects.get(user=self.student)
+        self.assertEqual((profile.streak, profile.submissions.count(), profile.snapshots.count()), (4, 1, 1))
+        self.assertIn('3/10 problems', Notification.objects.get(recipient=self.mentor).message)
+
+    @override_settings(USE_LEETCODE_CACHE=True, LEETCODE_CACHE_TTL=3600, CACHES=LOCMEM_CACHE)
+    def test_fresh_cached_sync_makes_no_leetcode_calls(self):
+        from django.core.cache import cache
+        from apps.scd.leetcode_api import LeetCodeAPI
+
+        cache.clear()
+        self.patch_leetcode()
+        for _ in range(2):
+            response = self.client.post(
+                '/api/scd/profiles/sync/', {'leetcode_username': 'Sam'}, content_type='application/json', **self.auth
+            )
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(LeetCodeAPI.afetch_user_profile.await_count, 1)
+
+    @override_settings(USE_LEETCODE_CACHE=True, LEETCODE_CACHE_TTL=0, CACHES=LOCMEM_CACHE)
+    def test_stale_sync_answers_at_once_and_refreshes_in_background(self):
+        from django.core.cache import cache
+        from apps.scd.leetcode_api import LeetCodeAPI
+        from apps.swr_cache import SWRCache
+
+        cache.clear()
+        self.patch_leetcode()
+        url, body = '/api/scd/profiles/sync/', {'leetcode_username': 'sam'}
+        self.client.post(url, body, content_type='application/json', **self.auth)
+        # The refresh saves from its own thread; here it only needs to be started.
+        # None keeps the cached entry (a MagicMock entry could not be pickled)
+        with mock.patch('apps.scd.views.refresh_leetcode_sync', return_value=None) as refresh:
+            response = self.client.post(url, body, content_type='application/json', **self.auth)
+            SWRCache.wait(5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('last known LeetCode stats', response.json()['warnings'][-1])
+        self.assertEqual(LeetCodeAPI.afetch_user_profile.await_count, 1)
+        refresh.assert_called_once_with(self.student, 'sam')
+
+    def test_unknown_leetcode_user_is_rejected(self):
+        self.patch_leetcode(profile=None)
+        response = self.client.post(
+            '/api/scd/profiles/sync/', {'leetcode_username': 'ghost'}, content_type='application/json', **self.auth
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_check_duration_under_asgi(self):
+        from apps.cfc.youtube import YouTubeDurationProbe
+
+        url = '/api/cfc/bmc-videos/check_duration/'
+        payload = {'video_url': 'https://youtu.be/dQw4w9WgXcQ'}
+        response = await self.async_client.post(url, payload, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+        with mock.patch.object(YouTubeDurationProbe, 'aprobe', mock.AsyncMock(return_value=425)):
+            response = await self.async_client.post(
+                url, payload, content_type='application/json', AUTHORIZATION=self.auth['HTTP_AUTHORIZATION']
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['duration_seconds'], 425)
+        self.assertTrue(response.json()['is_valid'])
+
+
+@override_settings(ROOT_URLCONF=__name__, DATABASE_REPLICAS=['replica', 'replica_2'])
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        caches[PIN_CACHE].clear()
+
+    def test_without_routing_everything_uses_the_primary(self):
+        self.assertEqual(router.db_for_read(User), 'default')
+        self.assertEqual(router.db_for_write(User), 'default')
+
+    def test_read_replica_block(self):
+        with read_replica():
+            alias = router.db_for_read(User)
+            self.assertIn(alias, ['replica', 'replica_2'])
+            self.assertEqual(router.db_for_read(User), alias)
+            self.assertEqual(router.db_for_write(User), 'default')
+            self.assertEqual(router.db_for_read(User), 'default')
+
+        with read_replica(sticky=False):
+            router.db_for_write(User)
+            self.assertIn(router.db_for_read(User), ['replica', 'replica_2'])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_falls_back_to_primary_without_replicas(self):
+        with read_replica():
+            self.assertEqual(router.db_for_read(User), 'default')
+        self.assertEqual(self.client.get('/routing/').json()['reads'], ['default', 'default'])
+
+    def test_reads_in_a_primary_transaction_stay_on_the_primary(self):
+        with routing(True), mock.patch('apps.db_router.connections') as connections:
+            connections.__getitem__.return_value.in_atomic_block = True
+            self.assertEqual(router.db_for_read(User), 'default')
+
+    def test_safe_requests_read_from_a_replica(self):
+        reads = self.client.get('/routing/').json()['reads']
+        self.assertIn(reads[0], ['replica', 'replica_2'])
+        self.assertEqual(reads[1], reads[0])
+        self.assertEqual(self.client.post('/routing/').json()['reads'], ['default', 'default'])
+
+    def test_writes_pin_the_rest_of_the_request_to_the_primary(self):
+        reads = self.client.get('/routing/?write=1').json()['reads']
+        self.assertIn(reads[0], ['replica', 'replica_2'])
+        self.assertEqual(reads[1], 'default')
+
+        # Anonymous writers cannot be recognised on their next request
+        self.assertIn(self.client.get('/routing/').json()['reads'][0], ['replica', 'replica_2'])
+
+    def test_writes_pin_the_user_to_the_primary_without_cookies(self):
+        writer, other = User(pk=7, username='writer'), User(pk=8, username='other')
+
+        def get(user):
+            # A new client per request: nothing carries over but the token
+            return self.client_class().get(
+                '/routing/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+            ).json()['reads']
+
+        with mock.patch.object(CachedJWTAuthentication, 'get_user', side_effect=lambda token: {
+            '7': writer, '8': other,
+        }[str(token['user_id'])]):
+            response = self.client_class().post(
+                '/routing/?write=1', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(writer)}'
+            )
+            self.assertFalse(response.cookies)
+
+            self.assertEqual(get(writer), ['default', 'default'])
+            self.assertIn(get(other)[0], ['replica', 'replica_2'])
+
+            # The pin lasts REPLICA_PIN_SECONDS
+            caches[PIN_CACHE].clear()
+            self.assertIn(get(writer)[0], ['replica', 'replica_2'])
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(router.allow_migrate('replica', 'profiles'))
+        self.assertTrue(router.allow_migrate('default', 'profiles'))
+
+
+class FakeUpstream(BaseHTTPRequestHandler):
+    """Keep-alive server answering from a script of (status, delay) replies, then 200"""
+    protocol_version = 'HTTP/1.1'
+    script = []
+    seen = []
+
+    def do_GET(self):
+        FakeUpstream.seen.append((self.command, self.client_address[1], self.headers.get('Cookie')))
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        status_code, delay = FakeUpstream.script.pop(0) if FakeUpstream.script else (200, 0)
+        time.sleep(delay)
+        body = b'{"ok": true}'
+        try:
+            self.send_response(status_code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Set-Cookie', 'session=upstream')
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            # The client gave up (read timeout tests)
+            self.close_connection = True
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(OUTBOUND_HTTP_BACKOFF=0, OUTBOUND_HTTP_RETRIES=2, OUTBOUND_BREAKER_THRESHOLD=3)
+class HttpClientTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeUpstream)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.host = f'127.0.0.1:{cls.server.server_port}'
+        cls.url = f'http://{cls.host}/graphql'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        FakeUpstream.script = []
+        FakeUpstream.seen = []
+        http_client._upstreams.clear()
+
+    def stats(self):
+        return http_client.upstream_stats()[self.host]
+
+    def test_pooled_keep_alive_without_cookies(self):
+        for _ in range(3):
+            self.assertEqual(http_client.get(self.url).json(), {'ok': True})
+
+        self.assertEqual(len({port for _, port, _ in FakeUpstream.seen}), 1)
+        self.assertEqual([cookie for _, _, cookie in FakeUpstream.seen], [None] * 3)
+        stats = self.stats()
+        self.assertEqual((stats['state'], stats['calls'], stats['errors']), ('closed', 3, 0))
+        self.assertIsNotNone(stats['latency_ms']['p95'])
+
+    def test_idempotent_calls_are_retried(self):
+        FakeUpstream.script = [(503, 0), (502, 0)]
+        self.assertEqual(http_client.get(self.url).status_code, 200)
+        self.assertEqual(len(FakeUpstream.seen), 3)
+        self.assertEqual(self.stats()['errors'], 2)
+
+    def test_posts_are_retried_only_when_idempotent(self):
+        FakeUpstream.script = [(503, 0), (503, 0)]
+        self.assertEqual(http_client.post(self.url, json={}).status_code, 503)
+        self.assertEqual(http_client.post(self.url, json={}, idempotent=True).status_code, 200)
+        self.assertEqual(len(FakeUpstream.seen), 3)
+
+    def test_read_timeout(self):
+        FakeUpstream.script = [(200, 0.5)]
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            http_client.get(self.url, timeout=0.1, retries=0)
+        self.assertEqual(self.stats()['errors'], 1)
+
+    def test_connect_failures_are_retried_for_any_method(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            http_client.post(f'http://127.0.0.1:{port}/token', data={'code': 'x'})
+        self.assertEqual(http_client.upstream_stats()[f'127.0.0.1:{port}']['calls'], 3)
+
+    def test_breaker_fails_fast_then_recovers(self):
+        FakeUpstream.script = [(503, 0)] * 3
+        self.assertEqual(http_client.get(self.url).status_code, 503)
+        self.assertEqual(self.stats()['state'], 'open')
+
+        with self.assertRaises(http_client.CircuitOpenError):
+            http_client.get(self.url)
+        with self.assertRaises(httpx.HTTPError):
+            async_to_sync(http_client.aget)(self.url)
+        self.assertEqual(len(FakeUpstream.seen), 3)
+        self.assertEqual(self.stats()['rejected'], 2)
+
+        http_client.get_upstream(self.host).opened_at -= 60
+        self.assertEqual(http_client.get(self.url).status_code, 200)
+        self.assertEqual(self.stats()['state'], 'closed')
+
+    def test_async_calls_retry_and_share_metrics(self):
+        FakeUpstream.script = [(503, 0)]
+
+        async def call():
+            try:
+                response = await http_client.apost(self.url, json={}, idempotent=True)
+                async with http_client.astream('GET', self.url) as streamed:
+                    body = b''.join([chunk async for chunk in streamed.aiter_bytes()])
+                return response.status_code, body
+            finally:
+                await http_client.close_async_client()
+
+        self.assertEqual(async_to_sync(call)(), (200, b'{"ok": true}'))
+        self.assertEqual(len(FakeUpstream.seen), 3)
+        self.assertEqual((self.stats()['calls'], self.stats()['errors']), (3, 1))
+
+
+@override_settings(RATELIMIT_ENABLE=True)
+class RateLimitTests(TestCase):
+    def setUp(self):
+        caches['ratelimit'].clear()
+        rate_limits._counters.clear()
+        self.addCleanup(rate_limits._counters.clear)
+        self.student = User.objects.create_user(username='sam', password='x')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.student)}'}
+
+    def validate(self, **extra):
+        return self.client.post('/api/cfc/hackathons/validate_repo/', {}, content_type='application/json', **extra)
+
+    def test_async_view_is_limited_per_user_with_retry_after(self):
+        for _ in range(10):
+            self.assertEqual(self.validate(**self.auth).status_code, 400)
+
+        response = self.validate(**self.auth)
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+        self.assertIn('throttled', response.json()['detail'])
+
+        # Both validate_repo routes share the bucket; other users have their own
+        response = self.client.post('/api/cfc/genai-projects/validate_repo/', {}, content_type='application/json',
+                                    **self.auth)
+        self.assertEqual(response.status_code, 429)
+        other = User.objects.create_user(username='alex', password='x')
+        response = self.validate(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(other)}')
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(rate_limit_stats()['repo-validation'], {'allowed': 11, 'limited': 2})
+        self.assertEqual(self.client.get('/health/').json()['rate_limits']['repo-validation']['limited'], 2)
+
+    def test_unauthenticated_call_is_rejected_before_counting(self):
+        self.assertEqual(self.validate().status_code, 401)
+        self.assertEqual(rate_limit_stats(), {})
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_sustained_rate_limits_below_burst(self):
+        statuses = [self.client.get('/rate-limited/').status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_anonymous_callers_are_limited_per_ip(self):
+        for _ in range(2):
+            self.client.get('/rate-limited/', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(self.client.get('/rate-limited/', REMOTE_ADDR='10.0.0.1').status_code, 429)
+        self.assertEqual(self.client.get('/rate-limited/', REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    def test_client_ip_trusts_only_configured_proxies(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.9', HTTP_X_FORWARDED_FOR='6.6.6.6, 1.2.3.4')
+        self.assertEqual(client_ip(request), '10.0.0.9')
+        with self.settings(RATE_LIMIT_TRUSTED_PROXIES=1):
+            self.assertEqual(client_ip(request), '1.2.3.4')
+
+    @override_settings(RATELIMIT_ENABLE=False, ROOT_URLCONF=__name__)
+    def test_disabled_by_default(self):
+        statuses = {self.client.get('/rate-limited/').status_code for _ in range(5)}
+        self.assertEqual(statuses, {200})
+
+
+class HealthCheckTests(TestCase):
+    def test_open_circuit_is_reported_as_degraded(self):
+        http_client._upstreams.clear()
+        self.addCleanup(http_client._upstreams.clear)
+        http_client.get_upstream('leetcode.com').record(0.2, failed=False)
+        github = http_client.get_upstream('api.github.com')
+        with self.settings(OUTBOUND_BREAKER_THRESHOLD=1):
+            github.record(10.0, failed=True)
+
+        response = self.client.get('/health/')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['status'], 'degraded')
+        upstreams = body['checks']['upstreams']
+        self.assertEqual(upstreams['status'], 'degraded')
+        self.assertEqual(upstreams['breakers']['api.github.com']['state'], 'open')
+        self.assertEqual(upstreams['breakers']['leetcode.com']['state'], 'closed')
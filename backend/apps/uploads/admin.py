@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import ChunkedUpload
+
+
+@admin.register(ChunkedUpload)
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'user', 'status', 'received_bytes', 'total_size', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['file_name', 'user__username', 'user__email']
+    readonly_fields = ['id', 'storage_path', 'content_hash', 'created_at', 'updated_at']
@@ -0,0 +1,28 @@
+"""
+Upload handler that never holds a file in memory.
+
+Django's default handlers keep uploads up to FILE_UPLOAD_MAX_MEMORY_SIZE in
+memory. This one writes every upload to a temporary file in 64 KB chunks and
+hashes the chunks as they arrive, so FileStorageService.save_stream can move
+the file into storage without reading it again.
+"""
+import hashlib
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Spool uploads to disk, recording their SHA-256 as `file.sha256`"""
+    
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hash = hashlib.sha256()
+    
+    def receive_data_chunk(self, raw_data, start):
+        self.hash.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+    
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.hash.hexdigest()
+        return file
@@ -0,0 +1,42 @@
+"""
+Management Command: purge_chunked_uploads
+
+Deletes resumable uploads that were abandoned: never finished, or finished
+but never attached to a submission.
+
+Usage:
+    python manage.py purge_chunked_uploads
+    python manage.py purge_chunked_uploads --hours 6
+
+This command:
+- Removes the stored parts (or assembled file) and the upload row
+- Leaves uploads attached to a CLT/SRI submission alone
+- Is idempotent (safe to run multiple times)
+
+Setup as Cron Job (runs nightly at 3 AM):
+    0 3 * * * cd /path/to/backend && python manage.py purge_chunked_uploads
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Delete abandoned resumable uploads and their stored parts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=24,
+            help='Purge uploads untouched for this many hours (default: 24)',
+        )
+
+    def handle(self, *args, **options):
+        from apps.uploads.services import ChunkedUploadService
+
+        older_than = timezone.now() - timedelta(hours=options['hours'])
+        count = ChunkedUploadService.purge_stale(older_than)
+        self.stdout.write(self.style.SUCCESS(f'✓ Purged {count} abandoned upload(s)'))
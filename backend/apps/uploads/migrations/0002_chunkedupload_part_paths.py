@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chunkedupload',
+            name='part_paths',
+            field=models.TextField(blank=True, default='', help_text='Stored paths of the accepted parts, one per line, in order'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload of one large evidence file.
+    
+    The client sends the file in parts of at most UPLOAD_CHUNK_SIZE bytes;
+    `received_bytes` is the offset the next part must start at. Once every
+    byte has arrived the parts listed in `part_paths` are joined into
+    `storage_path` and the upload can be attached to a CLT or SRI
+    submission (once).
+    """
+    
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('attached', 'Attached'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chunked_uploads')
+    file_name = models.CharField(max_length=255)
+    total_size = models.BigIntegerField(help_text="Declared file size in bytes")
+    received_bytes = models.BigIntegerField(default=0)
+    part_paths = models.TextField(blank=True, default='', help_text="Stored paths of the accepted parts, one per line, in order")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    storage_path = models.CharField(max_length=500, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the assembled file")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Chunked Upload'
+        verbose_name_plural = 'Chunked Uploads'
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.received_bytes}/{self.total_size})"
+    
+    @property
+    def parts_dir(self):
+        return f'uploads/partial/{self.id}'
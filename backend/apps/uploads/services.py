@@ -0,0 +1,250 @@
+"""
+Evidence Upload Pipeline
+Streams CLT and SRI evidence files into storage
+
+- Multipart uploads are spooled to disk by HashingTemporaryFileUploadHandler
+  and saved through FileStorageService.save_stream, so no file is ever held
+  in worker memory
+- Large files can be sent as resumable chunked uploads (ChunkedUploadService):
+  each part is streamed from the request body into storage, and the
+  recorded parts are joined (and their total size checked) once the last
+  one arrives
+- File rows for a request are inserted with one bulk_create, together with
+  a SHA-256 content hash
+
+Usage:
+    from apps.uploads.services import EvidenceUploadService
+
+    error = EvidenceUploadService.validate(CLTFile, files, uploads)
+    rows = EvidenceUploadService.store(CLTFile, submission, files, uploads, file_type='evidence')
+"""
+import os
+import uuid
+
+from django.conf import settings
+from django.core.validators import FileExtensionValidator
+from django.db.models import Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from apps.file_storage_service import ConcatenatedReader, FileStorageService
+from .models import ChunkedUpload
+
+
+class UploadError(Exception):
+    """Raised for uploads that cannot be accepted; the message is user-facing"""
+
+
+class OffsetMismatch(UploadError):
+    """A part did not start where the server expects the next one"""
+
+    def __init__(self, offset):
+        super().__init__(f'Expected a part starting at byte {offset}')
+        self.offset = offset
+
+
+class EvidenceUploadService:
+    """Validate and store the evidence files of one submission request"""
+
+    MAX_FILES = 10
+    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB for direct (multipart) uploads
+
+    @staticmethod
+    def allowed_extensions(model):
+        for validator in model._meta.get_field('file').validators:
+            if isinstance(validator, FileExtensionValidator):
+                return validator.allowed_extensions
+        return None
+
+    @classmethod
+    def validate(cls, model, files, uploads=()):
+        """Return an error message, or None when the files can be stored"""
+        if len(files) + len(uploads) > cls.MAX_FILES:
+            return f'Maximum {cls.MAX_FILES} files allowed per request'
+
+        allowed = cls.allowed_extensions(model)
+        for file in files:
+            if file.size > cls.MAX_FILE_SIZE:
+                return f'File {file.name} exceeds 10MB limit'
+        for name in [file.name for file in files] + [upload.file_name for upload in uploads]:
+            extension = os.path.splitext(name)[1][1:].lower()
+            if allowed and extension not in allowed:
+                return f'File {name} must be one of: {", ".join(allowed)}'
+        return None
+
+    @staticmethod
+    def upload_ids(data):
+        """Chunked upload ids from multipart (`upload_ids` repeated) or JSON (a list)"""
+        if hasattr(data, 'getlist'):
+            return data.getlist('upload_ids')
+        return data.get('upload_ids') or []
+
+    @classmethod
+    def store(cls, model, submission, files, uploads=(), **fields):
+        """
+        Stream `files` into storage, attach completed chunked `uploads`, and
+        insert all rows with one bulk_create. Call inside transaction.atomic().
+
+        Returns the created rows.
+        """
+        storage = FileStorageService()
+        file_field = model._meta.get_field('file')
+        rows, saved_paths = [], []
+
+        try:
+            for file in files:
+                saved = storage.save_stream(file, file_field.generate_filename(None, file.name))
+                saved_paths.append(saved['path'])
+                rows.append(model(
+                    submission=submission, file=saved['path'], file_name=file.name,
+                    file_size=saved['size'], content_hash=saved['sha256'], **fields
+                ))
+
+            for upload in uploads:
+                rows.append(model(
+                    submission=submission, file=upload.storage_path, file_name=upload.file_name,
+                    file_size=upload.total_size, content_hash=upload.content_hash, **fields
+                ))
+
+            return model.objects.bulk_create(rows)
+        except Exception:
+            # Nothing references the stored files if the insert failed
+            for path in saved_paths:
+                storage.delete_file(path)
+            raise
+
+
+class ChunkedUploadService:
+    """Resumable uploads: start, append parts at the current offset, claim when complete"""
+
+    @staticmethod
+    def start(user, file_name, total_size):
+        if total_size <= 0:
+            raise UploadError('total_size must be positive')
+        if total_size > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise UploadError(f'File exceeds the {settings.CHUNKED_UPLOAD_MAX_SIZE} byte limit')
+        return ChunkedUpload.objects.create(user=user, file_name=file_name, total_size=total_size)
+
+    @classmethod
+    def append(cls, upload, offset, stream, length):
+        """
+        Stream one part of `length` bytes from `stream` into storage.
+
+        The part must start at upload.received_bytes; a retried part for an
+        offset that was already accepted raises OffsetMismatch carrying the
+        offset to resume from. Returns the refreshed upload.
+        """
+        if upload.status != 'uploading':
+            raise UploadError('Upload is already complete')
+        if offset != upload.received_bytes:
+            raise OffsetMismatch(upload.received_bytes)
+        if length <= 0 or length > settings.UPLOAD_CHUNK_SIZE:
+            raise UploadError(f'Parts must be between 1 and {settings.UPLOAD_CHUNK_SIZE} bytes')
+        if offset + length > upload.total_size:
+            raise UploadError('Part extends past the declared file size')
+
+        storage = FileStorageService()
+        # Every attempt gets its own path, so concurrent attempts for one
+        # offset never write to (or delete) each other's file
+        path = f'{upload.parts_dir}/{offset:012d}-{uuid.uuid4().hex}.part'
+        saved = storage.save_stream(stream, path, limit=length)
+        if saved['size'] != length:
+            storage.delete_file(saved['path'])
+            raise UploadError('Request body ended before the part was complete')
+
+        # Conditional update: of two concurrent requests for the same offset,
+        # one wins and records its part; the other's part is discarded
+        updated = ChunkedUpload.objects.filter(
+            pk=upload.pk, status='uploading', received_bytes=offset
+        ).update(
+            received_bytes=offset + length,
+            part_paths=Concat('part_paths', Value(saved['path'] + '\n')),
+            updated_at=timezone.now(),
+        )
+        upload.refresh_from_db()
+        if not updated:
+            storage.delete_file(saved['path'])
+            raise OffsetMismatch(upload.received_bytes)
+
+        if upload.received_bytes == upload.total_size:
+            cls._assemble(upload)
+        return upload
+
+    @classmethod
+    def _assemble(cls, upload):
+        """Join the recorded parts in offset order; start over if they do not add up to total_size"""
+        storage = FileStorageService()
+        parts = upload.part_paths.splitlines()
+
+        reader = ConcatenatedReader(storage.storage, parts)
+        try:
+            extension = os.path.splitext(upload.file_name)[1].lower()
+            directory = timezone.now().strftime('uploads/%Y/%m')
+            saved = storage.save_stream(reader, f'{directory}/{upload.id.hex}{extension}')
+        finally:
+            reader.close()
+
+        if saved['size'] != upload.total_size:
+            storage.delete_file(saved['path'])
+            cls._delete_parts(storage, upload)
+            ChunkedUpload.objects.filter(pk=upload.pk).update(
+                received_bytes=0, part_paths='', updated_at=timezone.now()
+            )
+            raise OffsetMismatch(0)
+
+        upload.storage_path = saved['path']
+        upload.content_hash = saved['sha256']
+        upload.status = 'complete'
+        upload.part_paths = ''
+        upload.save(update_fields=['storage_path', 'content_hash', 'status', 'part_paths', 'updated_at'])
+        # Also removes parts of attempts that failed before they were recorded
+        cls._delete_parts(storage, upload)
+
+    @staticmethod
+    def _delete_parts(storage, upload):
+        for name in storage.list_files(upload.parts_dir):
+            storage.delete_file(f'{upload.parts_dir}/{name}')
+
+    @staticmethod
+    def claim(user, upload_ids):
+        """
+        Mark the user's completed uploads as attached and return them.
+        Call inside the transaction that inserts the file rows.
+        """
+        if not upload_ids:
+            return []
+        try:
+            upload_ids = {uuid.UUID(str(upload_id)) for upload_id in upload_ids}
+        except ValueError:
+            raise UploadError('Invalid upload id')
+        uploads = list(
+            ChunkedUpload.objects.select_for_update()
+            .filter(user=user, pk__in=upload_ids, status='complete')
+        )
+        if len(uploads) != len(upload_ids):
+            raise UploadError('Unknown, incomplete or already attached upload')
+        ChunkedUpload.objects.filter(pk__in=[upload.pk for upload in uploads]).update(
+            status='attached', updated_at=timezone.now()
+        )
+        return uploads
+
+    @classmethod
+    def discard(cls, upload):
+        """Delete an upload's stored parts (or unattached file) and its row"""
+        storage = FileStorageService()
+        cls._delete_parts(storage, upload)
+        if upload.status == 'complete' and upload.storage_path:
+            storage.delete_file(upload.storage_path)
+        upload.delete()
+
+    @classmethod
+    def purge_stale(cls, older_than):
+        """Discard uploads not attached and not touched since `older_than`; returns the count"""
+        stale = ChunkedUpload.objects.filter(
+            status__in=['uploading', 'complete'], updated_at__lt=older_than
+        )
+        count = 0
+        for upload in stale.iterator():
+            cls.discard(upload)
+            count += 1
+        return count
@@ -0,0 +1,203 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.clt.models import CLTFile, CLTSubmission
+from apps.file_storage_service import FileStorageService, HashingReader
+from apps.sri.models import SRIFile, SRISubmission
+from .models import ChunkedUpload
+
+
+class MediaRootTestCase(TestCase):
+    """Store uploads in a throwaway MEDIA_ROOT"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.media_root = media_root
+
+        self.student = User.objects.create_user(username='student', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def stored(self, name):
+        with open(os.path.join(self.media_root, name), 'rb') as f:
+            return f.read()
+
+
+class SaveStreamTests(MediaRootTestCase):
+    def test_hashes_and_counts_while_saving(self):
+        data = os.urandom(200 * 1024)
+        saved = FileStorageService().save_stream(io.BytesIO(data), 'evidence/report.pdf')
+
+        self.assertEqual(saved['size'], len(data))
+        self.assertEqual(saved['sha256'], hashlib.sha256(data).hexdigest())
+        self.assertEqual(self.stored(saved['path']), data)
+
+    def test_limit_stops_reading_the_source(self):
+        source = io.BytesIO(b'a' * 100 + b'b' * 100)
+        reader = HashingReader(source, limit=100)
+
+        self.assertEqual(reader.read(), b'a' * 100)
+        self.assertEqual(reader.read(10), b'')
+        self.assertEqual(source.tell(), 100)
+
+
+class EvidenceUploadTests(MediaRootTestCase):
+    def setUp(self):
+        super().setUp()
+        self.clt = CLTSubmission.objects.create(
+            user=self.student, title='Course', description='d', platform='Coursera',
+            completion_date=date(2024, 1, 1),
+        )
+
+    def test_multipart_files_are_hashed_and_inserted_in_one_query(self):
+        files = [
+            SimpleUploadedFile(f'proof{i}.pdf', f'content {i}'.encode(), content_type='application/pdf')
+            for i in range(3)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                f'/api/clt/submissions/{self.clt.pk}/upload_files/',
+                {'files': files, 'file_type': 'certificate'}, format='multipart',
+            )
+
+        self.assertEqual(response.status_code, 201, response.content)
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "clt_cltfile"')]
+        self.assertEqual(len(inserts), 1)
+
+        rows = CLTFile.objects.filter(submission=self.clt).order_by('file_name')
+        self.assertEqual(rows.count(), 3)
+        for i, row in enumerate(rows):
+            self.assertEqual(row.file_type, 'certificate')
+            self.assertEqual(row.file_size, len(f'content {i}'))
+            self.assertEqual(row.content_hash, hashlib.sha256(f'content {i}'.encode()).hexdigest())
+            self.assertEqual(self.stored(row.file.name), f'content {i}'.encode())
+
+    def test_rejects_disallowed_extension_before_writing(self):
+        response = self.client.post(
+            f'/api/clt/submissions/{self.clt.pk}/upload_files/',
+            {'files': [SimpleUploadedFile('script.exe', b'MZ')]}, format='multipart',
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CLTFile.objects.exists())
+
+
+@override_settings(UPLOAD_CHUNK_SIZE=1024)
+class ChunkedUploadTests(MediaRootTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sri = SRISubmission.objects.create(
+            user=self.student, activity_title='Beach cleanup', description='d',
+            photo_drive_link='https://drive.google.com/x',
+        )
+
+    def put_part(self, upload_id, offset, data):
+        return self.client.put(
+            f'/api/uploads/{upload_id}/', data, content_type='application/octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_resumable_upload_is_assembled_and_attached(self):
+        data = os.urandom(2500)
+        response = self.client.post(
+            '/api/uploads/', {'file_name': 'photo.jpg', 'total_size': len(data)}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.data['id']
+        self.assertEqual(response.data['chunk_size'], 1024)
+
+        self.assertEqual(self.put_part(upload_id, 0, data[:1024]).data['offset'], 1024)
+
+        # A retried part (e.g. the response was lost) is told where to resume
+        conflict = self.put_part(upload_id, 0, data[:1024])
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.data['offset'], 1024)
+
+        # Parts larger than UPLOAD_CHUNK_SIZE are refused
+        self.assertEqual(self.put_part(upload_id, 1024, data[1024:]).status_code, 400)
+
+        self.put_part(upload_id, 1024, data[1024:2048])
+        response = self.put_part(upload_id, 2048, data[2048:])
+        self.assertEqual(response.data['status'], 'complete')
+        self.assertEqual(response.data['content_hash'], hashlib.sha256(data).hexdigest())
+
+        upload = ChunkedUpload.objects.get(pk=upload_id)
+        self.assertEqual(self.stored(upload.storage_path), data)
+        self.assertFalse(os.listdir(os.path.join(self.media_root, upload.parts_dir)))
+
+        response = self.client.post(
+            f'/api/sri/submissions/{self.sri.pk}/upload_files/', {'upload_ids': [upload_id]}, format='json'
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        row = SRIFile.objects.get(submission=self.sri)
+        self.assertEqual((row.file.name, row.file_size), (upload.storage_path, len(data)))
+        self.assertEqual(row.content_hash, hashlib.sha256(data).hexdigest())
+
+        # An upload can only be attached once
+        response = self.client.post(
+            f'/api/sri/submissions/{self.sri.pk}/upload_files/', {'upload_ids': [upload_id]}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(SRIFile.objects.count(), 1)
+
+    def test_incomplete_upload_cannot_be_attached(self):
+        upload = ChunkedUpload.objects.create(user=self.student, file_name='photo.jpg', total_size=10)
+
+        response = self.client.post(
+            f'/api/sri/submissions/{self.sri.pk}/upload_files/', {'upload_ids': [str(upload.pk)]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(SRIFile.objects.exists())
+
+    def test_losing_a_race_for_an_offset_removes_only_its_own_part(self):
+        from .services import ChunkedUploadService, OffsetMismatch
+
+        data = os.urandom(1500)
+        upload = ChunkedUploadService.start(self.student, 'photo.jpg', len(data))
+        stale = ChunkedUpload.objects.get(pk=upload.pk)
+
+        ChunkedUploadService.append(upload, 0, io.BytesIO(data[:1024]), 1024)
+        # Passed the offset check before the first request was recorded
+        with self.assertRaises(OffsetMismatch) as raised:
+            ChunkedUploadService.append(stale, 0, io.BytesIO(b'x' * 1024), 1024)
+        self.assertEqual(raised.exception.offset, 1024)
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, upload.parts_dir))), 1)
+
+        upload = ChunkedUploadService.append(upload, 1024, io.BytesIO(data[1024:]), len(data) - 1024)
+        self.assertEqual(upload.status, 'complete')
+        self.assertEqual(self.stored(upload.storage_path), data)
+
+    def test_parts_that_do_not_add_up_restart_the_upload(self):
+        from .services import ChunkedUploadService, OffsetMismatch
+
+        upload = ChunkedUploadService.start(self.student, 'photo.jpg', 1500)
+        ChunkedUploadService.append(upload, 0, io.BytesIO(os.urandom(1024)), 1024)
+        # The stored part lost bytes after it was accepted
+        with open(os.path.join(self.media_root, upload.part_paths.splitlines()[0]), 'wb') as f:
+            f.write(b'short')
+
+        with self.assertRaises(OffsetMismatch) as raised:
+            ChunkedUploadService.append(upload, 1024, io.BytesIO(os.urandom(476)), 476)
+
+        self.assertEqual(raised.exception.offset, 0)
+        upload.refresh_from_db()
+        self.assertEqual((upload.status, upload.received_bytes, upload.part_paths), ('uploading', 0, ''))
+        self.assertFalse(os.listdir(os.path.join(self.media_root, upload.parts_dir)))
+        stored_files = [name for _, _, names in os.walk(os.path.join(self.media_root, 'uploads')) for name in names]
+        self.assertEqual(stored_files, [])
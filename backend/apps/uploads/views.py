@@ -0,0 +1,90 @@
+from rest_framework import viewsets, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+
+from .models import ChunkedUpload
+from .services import ChunkedUploadService, OffsetMismatch, UploadError
+
+
+def _upload_data(upload):
+    return {
+        'id': str(upload.id),
+        'file_name': upload.file_name,
+        'total_size': upload.total_size,
+        'offset': upload.received_bytes,
+        'chunk_size': settings.UPLOAD_CHUNK_SIZE,
+        'status': upload.status,
+        'content_hash': upload.content_hash,
+    }
+
+
+class ChunkedUploadViewSet(viewsets.ViewSet):
+    """
+    Resumable uploads for large CLT/SRI evidence files.
+
+    Endpoints:
+    - POST   /api/uploads/       - Start an upload. Body: {file_name, total_size}
+    - GET    /api/uploads/{id}/  - Current offset (resume from here after a dropped connection)
+    - PUT    /api/uploads/{id}/  - Send the next part as the raw request body
+                                   (Content-Type: application/octet-stream,
+                                   Upload-Offset: <offset the part starts at>)
+    - DELETE /api/uploads/{id}/  - Abandon the upload
+
+    A part that does not start at the current offset gets 409 with the
+    offset to resume from. When the last part arrives the upload becomes
+    'complete'; attach it by passing its id in `upload_ids` to
+    /api/clt/submissions/ (create or upload_files) or
+    /api/sri/submissions/{id}/upload_files/.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_upload(self, pk):
+        return get_object_or_404(ChunkedUpload, pk=pk, user=self.request.user)
+
+    def create(self, request):
+        file_name = (request.data.get('file_name') or '').strip()
+        try:
+            total_size = int(request.data.get('total_size'))
+        except (TypeError, ValueError):
+            total_size = 0
+        if not file_name:
+            return Response({'error': 'file_name is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            upload = ChunkedUploadService.start(request.user, file_name[:255], total_size)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(_upload_data(upload), status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, pk=None):
+        return Response(_upload_data(self.get_upload(pk)))
+
+    def update(self, request, pk=None):
+        upload = self.get_upload(pk)
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return Response({'error': 'Upload-Offset header is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # request.stream is read in storage-sized chunks, never as a whole
+            upload = ChunkedUploadService.append(upload, offset, request.stream, length)
+        except OffsetMismatch as e:
+            return Response({'error': str(e), 'offset': e.offset}, status=status.HTTP_409_CONFLICT)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(_upload_data(upload))
+
+    def destroy(self, request, pk=None):
+        upload = self.get_upload(pk)
+        if upload.status == 'attached':
+            return Response(
+                {'error': 'Attached uploads are removed with their submission file'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        ChunkedUploadService.discard(upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -2,33 +2,27 @@
 # exit on error
 set -o errexit
 
+# Safe to re-run: each step skips itself when nothing changed
+# - pip install: skipped when requirements.txt matches the stamp in the Python environment
+# - collectstatic, migrate and the default users: see apps/profiles/management/commands/release.py
+
 echo "========================================="
 echo "🚀 Starting Build Process"
 echo "========================================="
 
 echo ""
 echo "🔧 Installing dependencies..."
-pip install -r requirements.txt
-
-echo ""
-echo "🗃️  Collecting static files..."
-python manage.py collectstatic --no-input
-
-echo ""
-echo "🔄 Running migrations..."
-python manage.py migrate
-
-echo ""
-echo "🔧 Fixing PostgreSQL user sequence..."
-python manage.py fix_user_sequence
-
-echo ""
-echo "👥 Creating default production users..."
-python manage.py create_production_users
+REQUIREMENTS_STAMP="$(python -c 'import sys; print(sys.prefix)')/.requirements.sha256"
+REQUIREMENTS_HASH="$(python -c 'import hashlib; print(hashlib.sha256(open("requirements.txt", "rb").read()).hexdigest())')"
+if [ -f "$REQUIREMENTS_STAMP" ] && [ "$(cat "$REQUIREMENTS_STAMP")" = "$REQUIREMENTS_HASH" ]; then
+    echo "requirements.txt unchanged, skipping pip install"
+else
+    pip install -r requirements.txt
+    echo "$REQUIREMENTS_HASH" > "$REQUIREMENTS_STAMP" || true
+fi
 
 echo ""
-echo "🔍 Checking user status..."
-python manage.py check_users
+python manage.py release
 
 echo ""
 echo "========================================="
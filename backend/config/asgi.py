@@ -1,3 +1,10 @@
+"""
+ASGI entry point, used when SERVER_MODE=asgi (see gunicorn.conf.py)
+
+Served by uvicorn workers. Every middleware in settings.MIDDLEWARE is
+async-capable, so async views (apps/async_views.py) run on the event loop
+and only sync views and database work go to threads.
+"""
 import os
 from django.core.asgi import get_asgi_application
 
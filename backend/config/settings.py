@@ -44,13 +44,20 @@ INSTALLED_APPS = [
     
     # Analytics & Scaling (NEW - for 2000+ students)
     'apps.analytics_summary',
+    
+    # Resumable evidence uploads
+    'apps.uploads',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Static files
+    'apps.db_router.ReplicaRoutingMiddleware',  # Read replicas (inert unless DATABASE_REPLICA_URLS is set)
+    'apps.static_files_middleware.StaticFilesMiddleware',  # Static files (WhiteNoise, async-capable)
     'apps.health_check_middleware.HealthCheckMiddleware',  # Allow health checks
+    'apps.query_profiler.QueryProfilingMiddleware',  # Query budgets (inert unless enabled)
+    'apps.response_middleware.CompressionMiddleware',  # gzip/brotli (inert unless enabled)
     'corsheaders.middleware.CorsMiddleware',  # CORS
+    'apps.response_middleware.ETagMiddleware',  # ETag / 304 (inert unless enabled)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -91,6 +98,12 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Serving mode (see gunicorn.conf.py)
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+# 'wsgi': config.wsgi on gthread workers
+# 'asgi': config.asgi on uvicorn workers; async views wait on third-party APIs without holding a thread
 
 # Database - PostgreSQL (production) or SQLite (development)
 if os.getenv('DATABASE_URL'):
@@ -138,10 +151,41 @@ else:
         }
     }
 
+# Read Replicas (apps/db_router.py)
+# DATABASE_REPLICA_URLS: comma-separated database URLs, e.g. postgres://...@replica-host/db
+# or, to try it locally, sqlite:///db.sqlite3 (the same file as the primary)
+# When set: GET/HEAD requests and analytics commands read from a replica (aliases 'replica', 'replica_2', ...);
+#           a request that writes reads from the primary afterwards, and so does that user for
+#           REPLICA_PIN_SECONDS (replication lag; a per-user key in the 'replica_pins' cache)
+# When empty: Everything reads from and writes to 'default'
+DATABASE_REPLICAS = []
+for _index, _url in enumerate(filter(None, os.getenv('DATABASE_REPLICA_URLS', '').split(',')), 1):
+    _alias = 'replica' if _index == 1 else f'replica_{_index}'
+    _replica = dj_database_url.parse(
+        _url.strip(),
+        conn_max_age=DATABASES['default'].get('CONN_MAX_AGE', 0),
+        conn_health_checks=True,
+    )
+    if _replica['ENGINE'] == DATABASES['default']['ENGINE']:
+        _replica['OPTIONS'] = dict(DATABASES['default'].get('OPTIONS', {}))
+    # Tests run against one database; the replica aliases point at it
+    _replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[_alias] = _replica
+    DATABASE_REPLICAS.append(_alias)
+DATABASE_ROUTERS = ['apps.db_router.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+if SERVER_MODE == 'asgi':
+    # Under ASGI each request's sync code runs in its own thread and connections
+    # are per thread, so persistent connections would pile up instead of being reused
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = 0
+
 # Authentication Backends (allow login with email or username)
+# EmailOrUsernameBackend already covers plain username logins, so a
+# ModelBackend fallback would only re-hash the password on every failed login.
 AUTHENTICATION_BACKENDS = [
     'apps.authentication.EmailOrUsernameBackend',
-    'django.contrib.auth.backends.ModelBackend',
 ]
 
 # Password validation
@@ -195,11 +239,20 @@ CORS_ALLOW_HEADERS = ['accept', 'accept-encoding', 'authorization', 'content-typ
 # Django REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -217,6 +270,7 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': os.getenv('JWT_ALGORITHM', 'HS256'),
     'SIGNING_KEY': os.getenv('JWT_SECRET_KEY', SECRET_KEY),
+    'UPDATE_LAST_LOGIN': True,
 }
 
 # Swagger/OpenAPI Settings
@@ -232,8 +286,14 @@ SWAGGER_SETTINGS = {
 }
 
 # File Upload Settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
+# Uploads are spooled to a temporary file in 64KB chunks and hashed on the way
+# (apps/uploads/handlers.py), so FILE_UPLOAD_MAX_MEMORY_SIZE no longer applies
+FILE_UPLOAD_HANDLERS = ['apps.uploads.handlers.HashingTemporaryFileUploadHandler']
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
+# Resumable uploads (/api/uploads/): largest part per request, largest file
+UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024))
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv('CHUNKED_UPLOAD_MAX_SIZE', 100 * 1024 * 1024))
 
 # ============================================================================
 # SCALING FEATURE FLAGS (LOCAL SAFE, CLOUD READY)
@@ -251,6 +311,101 @@ USE_NOTIFICATION_CACHE = os.getenv('USE_NOTIFICATION_CACHE', 'False') == 'True'
 # When True: Caches notification counts for 30 seconds
 # When False: Always computes counts live (current behavior)
 
+# Authentication Identity Cache
+USE_AUTH_CACHE = os.getenv('USE_AUTH_CACHE', 'False') == 'True'
+AUTH_CACHE_TTL = int(os.getenv('AUTH_CACHE_TTL', 120))
+# When True: JWT requests hydrate request.user and request.user.profile from cache
+# When False: User and profile are loaded with one joined query per request
+
+# Student Overview Cache
+USE_OVERVIEW_CACHE = os.getenv('USE_OVERVIEW_CACHE', 'False') == 'True'
+OVERVIEW_CACHE_TTL = int(os.getenv('OVERVIEW_CACHE_TTL', 300))
+# When True: /api/gamification/dashboard/student_overview/ is cached per student until a score changes
+# When False: The overview is assembled from the database on every request
+
+# Active Season Cache
+USE_SEASON_CACHE = os.getenv('USE_SEASON_CACHE', 'False') == 'True'
+# When True: Each process keeps the active season in memory, revalidated against a shared cache version
+# When False: Gamification endpoints query the active season on every request
+
+# Batch Progress Distribution Cache (progress comparison / batch statistics)
+USE_PROGRESS_DISTRIBUTION_CACHE = os.getenv('USE_PROGRESS_DISTRIBUTION_CACHE', 'False') == 'True'
+# When True: A season's sorted completion percentages and their total are cached until a completion changes
+# When False: Batch statistics read the season's completion percentages on every request
+
+# External Hackathon Listing
+HACKATHON_LISTING_TTL = int(os.getenv('HACKATHON_LISTING_TTL', 300))
+HACKATHON_REFRESH_INTERVAL = int(os.getenv('HACKATHON_REFRESH_INTERVAL', 6 * 3600))
+HACKATHON_BACKGROUND_REFRESH = os.getenv('HACKATHON_BACKGROUND_REFRESH', 'False') == 'True'
+# When True: A listing older than HACKATHON_REFRESH_INTERVAL starts one background scrape per process
+# When False: The listing only changes when `manage.py refresh_hackathons` runs (cron, or the hackathon-refresh service with --interval)
+
+# GitHub Repository Validation Cache
+USE_GITHUB_REPO_CACHE = os.getenv('USE_GITHUB_REPO_CACHE', 'False') == 'True'
+GITHUB_REPO_CACHE_TTL = int(os.getenv('GITHUB_REPO_CACHE_TTL', 3600))
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+# When True: Repo metadata is cached per owner/repo; once older than GITHUB_REPO_CACHE_TTL it is served stale while
+#            a background thread revalidates it with ETags (and while GitHub is rate-limiting or down)
+# When False: Every validation makes three (concurrent) GitHub API calls
+
+# LeetCode Profile Cache (POST /api/scd/profiles/sync/)
+USE_LEETCODE_CACHE = os.getenv('USE_LEETCODE_CACHE', 'False') == 'True'
+LEETCODE_CACHE_TTL = int(os.getenv('LEETCODE_CACHE_TTL', 900))
+# When True: LeetCode data is cached per LeetCode username; a sync within LEETCODE_CACHE_TTL makes no LeetCode
+#            calls, and a later one saves the last known stats at once while a background thread refreshes them
+# When False: Every sync waits on four LeetCode queries
+
+# YouTube Duration Cache (BMC video validation)
+USE_VIDEO_DURATION_CACHE = os.getenv('USE_VIDEO_DURATION_CACHE', 'False') == 'True'
+VIDEO_DURATION_CACHE_TTL = int(os.getenv('VIDEO_DURATION_CACHE_TTL', 7 * 24 * 3600))
+# When True: Video durations are cached by video id
+# When False: Every create/check_duration streams the watch page (stopping at the duration)
+
+# Notification Retention (manage.py archive_notifications)
+NOTIFICATION_RETENTION_DAYS = int(os.getenv('NOTIFICATION_RETENTION_DAYS', 30))
+NOTIFICATION_INACTIVE_DAYS = int(os.getenv('NOTIFICATION_INACTIVE_DAYS', 180))
+NOTIFICATION_RETENTION_BATCH = int(os.getenv('NOTIFICATION_RETENTION_BATCH', 1000))
+# Read notifications older than NOTIFICATION_RETENTION_DAYS, and all notifications of users inactive for
+# NOTIFICATION_INACTIVE_DAYS, move to NotificationArchive in batches of NOTIFICATION_RETENTION_BATCH
+
+# Response Compression and ETags (apps/response_middleware.py)
+USE_RESPONSE_COMPRESSION = os.getenv('USE_RESPONSE_COMPRESSION', 'False') == 'True'
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', 1024))
+# When True: Text/JSON responses of at least RESPONSE_COMPRESSION_MIN_SIZE bytes are brotli (if installed)
+#            or gzip compressed for clients that accept it
+# When False: Responses leave gunicorn uncompressed (compress at the proxy instead)
+USE_RESPONSE_ETAGS = os.getenv('USE_RESPONSE_ETAGS', 'False') == 'True'
+# When True: GET responses carry a strong ETag and a matching If-None-Match gets 304 Not Modified
+# When False: Every poll downloads the full body
+
+# Outbound HTTP (apps/http_client.py - pooled client for every third-party API)
+OUTBOUND_HTTP_TIMEOUT = float(os.getenv('OUTBOUND_HTTP_TIMEOUT', 30))
+OUTBOUND_HTTP_CONNECT_TIMEOUT = float(os.getenv('OUTBOUND_HTTP_CONNECT_TIMEOUT', 5))
+OUTBOUND_HTTP_MAX_CONNECTIONS = int(os.getenv('OUTBOUND_HTTP_MAX_CONNECTIONS', 100))
+OUTBOUND_HTTP_MAX_KEEPALIVE = int(os.getenv('OUTBOUND_HTTP_MAX_KEEPALIVE', 20))
+# Default read/connect timeouts (calls may pass their own read timeout) and connection pool size per worker
+OUTBOUND_HTTP_RETRIES = int(os.getenv('OUTBOUND_HTTP_RETRIES', 2))
+OUTBOUND_HTTP_BACKOFF = float(os.getenv('OUTBOUND_HTTP_BACKOFF', 0.5))
+OUTBOUND_HTTP_BACKOFF_MAX = float(os.getenv('OUTBOUND_HTTP_BACKOFF_MAX', 8))
+# Retries after the first attempt; attempt n waits a random 0..min(BACKOFF_MAX, BACKOFF * 2^n) seconds
+OUTBOUND_BREAKER_THRESHOLD = int(os.getenv('OUTBOUND_BREAKER_THRESHOLD', 5))
+OUTBOUND_BREAKER_RESET = float(os.getenv('OUTBOUND_BREAKER_RESET', 30))
+# After THRESHOLD consecutive failures an upstream's calls fail fast for RESET seconds, then one trial call
+# decides whether the circuit closes
+
+# Rate Limits (apps/rate_limits.py - endpoints that call third-party APIs)
+USE_RATE_LIMITS = os.getenv('USE_RATE_LIMITS', 'False') == 'True'
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', 0))
+# When True: LeetCode sync, repo validation, video duration checks and the hackathon listing are limited per user
+#            (per IP when anonymous) with counters in the 'ratelimit' cache; over the limit returns 429 + Retry-After
+# When False: No limits
+# Set RATE_LIMIT_TRUSTED_PROXIES to the number of reverse proxies that append to X-Forwarded-For
+RATELIMIT_ENABLE = USE_RATE_LIMITS
+RATELIMIT_USE_CACHE = 'ratelimit'
+RATELIMIT_FAIL_OPEN = True
+RATELIMIT_IP_META_KEY = 'apps.rate_limits.client_ip'
+
 # File Storage
 USE_CLOUD_STORAGE = os.getenv('USE_CLOUD_STORAGE', 'False') == 'True'
 # When True: Uses AWS S3 or cloud storage (production)
@@ -265,11 +420,20 @@ USE_ASYNC_TASKS = os.getenv('USE_ASYNC_TASKS', 'False') == 'True'
 LOG_QUERY_TIMES = DEBUG and os.getenv('LOG_QUERY_TIMES', 'False') == 'True'
 # When True: Logs slow queries to console (helpful for optimization)
 # When False: No query logging (default)
+# Per-request query counts are aggregated per URL name at /api/admin/query-report/
+
+# Query Budgets (tests/CI)
+QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', 'False') == 'True'
+# When True: Requests exceeding a view's @query_budget raise QueryBudgetExceeded
+# When False: Budget violations are only logged while LOG_QUERY_TIMES is on
+SLOW_REQUEST_SQL_MS = int(os.getenv('SLOW_REQUEST_SQL_MS', 200))
 
 # ============================================================================
 # CACHING CONFIGURATION (LOCAL SAFE, REDIS READY)
 # ============================================================================
-if USE_NOTIFICATION_CACHE or USE_ANALYTICS_SUMMARY:
+if (USE_NOTIFICATION_CACHE or USE_ANALYTICS_SUMMARY or USE_AUTH_CACHE or USE_OVERVIEW_CACHE
+        or USE_SEASON_CACHE or USE_GITHUB_REPO_CACHE or USE_VIDEO_DURATION_CACHE
+        or USE_LEETCODE_CACHE or USE_PROGRESS_DISTRIBUTION_CACHE):
     # Use Redis if available in production, otherwise local memory cache
     REDIS_URL = os.getenv('REDIS_URL', None)
     if REDIS_URL and not DEBUG:
@@ -301,6 +465,23 @@ else:
         }
     }
 
+# Rate limit counters need a working cache even with the caches above off
+if os.getenv('REDIS_URL') and not DEBUG:
+    CACHES['ratelimit'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+        'KEY_PREFIX': 'cohort',
+    }
+else:
+    # Per process: each worker counts on its own
+    CACHES['ratelimit'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'rate-limits',
+    }
+
+# Read-your-writes pins (apps/db_router.py) are shared the same way, under their own prefix
+CACHES['replica_pins'] = dict(CACHES['ratelimit'], KEY_PREFIX='cohort-replica-pin')
+
 # ============================================================================
 # AWS/CLOUD STORAGE CONFIGURATION (OPTIONAL)
 # ============================================================================
@@ -66,6 +66,8 @@ urlpatterns = [
     # App URLs
     path('api/clt/', include('apps.clt.urls')),
     path('api/sri/', include('apps.sri.urls')),
+    path('api/uploads/', include('apps.uploads.urls')),
+    path('api/reports/', include('apps.reports.urls')),
     path('api/cfc/', include('apps.cfc.urls')),
     path('api/iipc/', include('apps.iipc.urls')),
     path('api/scd/', include('apps.scd.urls')),
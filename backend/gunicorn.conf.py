@@ -0,0 +1,62 @@
+"""
+Gunicorn configuration
+
+SERVER_MODE picks how Django is served:
+- wsgi (default): config.wsgi on gthread workers, GUNICORN_WORKERS x GUNICORN_THREADS
+  requests at a time
+- asgi: config.asgi on uvicorn workers. Async views (LeetCode sync, repository
+  validation, video duration, LinkedIn callback) wait on third-party APIs
+  without holding a thread, so a slow upstream cannot starve the workers
+
+GUNICORN_PRELOAD (default True) imports Django, every app and the URLconf
+once in the master before forking. Workers start without importing
+anything and share those pages copy-on-write; gc.freeze() keeps the
+collector from touching (and so copying) them. Measure import cost with
+`python manage.py profile_startup`.
+
+Usage:
+    gunicorn -c gunicorn.conf.py
+    SERVER_MODE=asgi GUNICORN_WORKERS=4 gunicorn -c gunicorn.conf.py
+"""
+import gc
+import os
+
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Heartbeat files in memory rather than on a (possibly slow) container disk
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'config.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.getenv('GUNICORN_THREADS', 2))
+
+
+def when_ready(server):
+    """Master, after the app is loaded and before the first fork"""
+    if not preload_app:
+        return
+    from django.db import connections
+    from django.urls import get_resolver
+
+    # Import every view module now rather than in each worker's first request
+    get_resolver().url_patterns
+    # A connection opened while importing must not be shared by the workers
+    connections.close_all()
+    gc.freeze()
+
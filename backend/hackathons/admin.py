@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ExternalHackathon
+
+
+@admin.register(ExternalHackathon)
+class ExternalHackathonAdmin(admin.ModelAdmin):
+    list_display = ['name', 'source', 'start_date', 'location', 'is_online', 'fetched_at']
+    list_filter = ['source', 'is_online']
+    search_fields = ['name', 'location']
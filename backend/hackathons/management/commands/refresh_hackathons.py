@@ -0,0 +1,56 @@
+"""
+Management Command: refresh_hackathons
+
+Scrapes Devpost, MLH and Devfolio concurrently and stores the results for
+/api/hackathons/list/.
+
+Usage:
+    python manage.py refresh_hackathons
+    python manage.py refresh_hackathons --interval 21600
+
+This command:
+- Fetches all sources in parallel (one request timeout in total, not three)
+- Replaces each source's stored hackathons when it fetched successfully
+- Keeps the previous rows of a source that failed
+- Is idempotent (safe to run multiple times)
+- With --interval, keeps running and repeats every N seconds (the
+  hackathon-refresh service in docker-compose.prod.yml)
+
+Setup as Cron Job (every 6 hours):
+    0 */6 * * * cd /path/to/backend && python manage.py refresh_hackathons
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Refresh the stored external hackathon listing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, help='Repeat every N seconds instead of exiting')
+
+    def handle(self, *args, **options):
+        while True:
+            self.refresh()
+            if not options['interval']:
+                return
+            # Connections are only recycled at request boundaries; one held
+            # through the sleep would be dead by the next run
+            connections.close_all()
+            time.sleep(options['interval'])
+
+    def refresh(self):
+        from apps.hackathons.aggregator import HackathonAggregator
+
+        self.stdout.write(f'{timezone.now():%Y-%m-%d %H:%M} refreshing hackathons')
+        results = HackathonAggregator.refresh()
+
+        for source, count in results.items():
+            if count:
+                self.stdout.write(self.style.SUCCESS(f'  ✓ {source}: {count} hackathons'))
+            else:
+                self.stdout.write(self.style.WARNING(f'  ✗ {source}: fetch failed, kept previous listing'))
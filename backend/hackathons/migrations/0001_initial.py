@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExternalHackathon',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(db_index=True, max_length=20)),
+                ('external_id', models.CharField(max_length=255)),
+                ('dedupe_key', models.CharField(db_index=True, max_length=20)),
+                ('name', models.CharField(max_length=255)),
+                ('start_date', models.CharField(blank=True, max_length=100)),
+                ('end_date', models.CharField(blank=True, max_length=100)),
+                ('starts_on', models.DateField(blank=True, null=True)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('url', models.URLField(max_length=500)),
+                ('logo', models.URLField(blank=True, max_length=500)),
+                ('is_online', models.BooleanField(default=False)),
+                ('description', models.TextField(blank=True)),
+                ('prize_amount', models.CharField(blank=True, max_length=255)),
+                ('fetched_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['starts_on', 'name'],
+                'unique_together': {('source', 'external_id')},
+            },
+        ),
+    ]
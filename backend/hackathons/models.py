@@ -1,3 +1,31 @@
 from django.db import models
 
-# Create your models here.
+
+class ExternalHackathon(models.Model):
+    """
+    Upcoming hackathon scraped from an external source (Devpost, MLH, Devfolio)
+    Filled by apps.hackathons.aggregator; the listing endpoint only reads it
+    """
+    source = models.CharField(max_length=20, db_index=True)
+    external_id = models.CharField(max_length=255)
+    dedupe_key = models.CharField(max_length=20, db_index=True)  # normalized name prefix
+
+    name = models.CharField(max_length=255)
+    start_date = models.CharField(max_length=100, blank=True)  # as published, e.g. "Jan 10, 2026"
+    end_date = models.CharField(max_length=100, blank=True)
+    starts_on = models.DateField(null=True, blank=True)  # parsed start_date, for ordering
+    location = models.CharField(max_length=255, blank=True)
+    url = models.URLField(max_length=500)
+    logo = models.URLField(max_length=500, blank=True)
+    is_online = models.BooleanField(default=False)
+    description = models.TextField(blank=True)
+    prize_amount = models.CharField(max_length=255, blank=True)
+
+    fetched_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ['source', 'external_id']
+        ordering = ['starts_on', 'name']
+
+    def __str__(self):
+        return f"{self.source} - {self.name}"
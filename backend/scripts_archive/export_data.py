@@ -1,7 +1,5 @@
 import os
 import django
-import json
-import sys
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
@@ -12,16 +10,24 @@ from django.contrib.auth.models import Permission
 from django.apps import apps
 
 # Get all models except ContentType and Permission
-all_objects = []
-for model in apps.get_models():
-    if model not in [ContentType, Permission]:
-        all_objects.extend(model.objects.all())
+models = [model for model in apps.get_models() if model not in [ContentType, Permission]]
+exported = 0
 
-# Serialize with natural keys
-data = serializers.serialize('json', all_objects, use_natural_foreign_keys=True, use_natural_primary_keys=True)
 
-# Write with UTF-8 encoding
+def all_objects():
+    """Yield every object, reading each table in chunks instead of all at once"""
+    global exported
+    for model in models:
+        for obj in model.objects.order_by('pk').iterator(chunk_size=2000):
+            exported += 1
+            yield obj
+
+
+# Serialize with natural keys, writing to the file as objects are read
 with open('backup_data.json', 'w', encoding='utf-8') as f:
-    f.write(data)
+    serializers.serialize(
+        'json', all_objects(), stream=f,
+        use_natural_foreign_keys=True, use_natural_primary_keys=True
+    )
 
-print(f'✅ Exported {len(all_objects)} objects to backup_data.json')
+print(f'✅ Exported {exported} objects to backup_data.json')